@@ -0,0 +1,16 @@
+from tools.av_model import System
+from tools.create_av_diagram import BOX_W, LAYOUT_LEFT, LAYOUT_TOP, PX_TO_PT, device_geometry
+
+
+def test_canvas_positions_are_kept_and_the_rest_stacked_beside_them():
+    system = System.from_dicts([
+        {"name": "Camera", "outputs": ["SDI"], "position": {"x": 100, "y": 40}},
+        {"name": "Switcher", "inputs": ["SDI 1"], "outputs": ["PGM"], "position": {"x": 500, "y": 240}},
+        {"name": "Monitor", "inputs": ["HDMI"]},
+    ])
+    geometry = device_geometry(system)
+    camera, switcher, monitor = (geometry[d.id] for d in system.devices)
+    assert (camera["x"], camera["y"]) == (LAYOUT_LEFT, LAYOUT_TOP)
+    assert (switcher["x"], switcher["y"]) == (LAYOUT_LEFT + 400 * PX_TO_PT, LAYOUT_TOP + 200 * PX_TO_PT)
+    assert monitor["x"] >= switcher["x"] + BOX_W and monitor["y"] == LAYOUT_TOP
+    assert camera["position"] == {"x": 100, "y": 40}
@@ -0,0 +1,44 @@
+import base64
+import json
+import struct
+import zlib
+
+from tools.images import ImageStore, project_images
+
+
+def png(width, height):
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    raw = b"".join(b"\0" + b"\xff\0\0" * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+
+def test_project_images_reach_devices(tmp_path):
+    data = png(40, 20)
+    project = {"nodes": {"node-1": {"id": "node-1", "imageBlobKey": "screen-1"}}, "connections": [],
+               "_imageBlobs": {"screen-1": "data:image/png;base64," + base64.b64encode(data).decode()}}
+    path = tmp_path / "show.vsf"
+    path.write_text(json.dumps(project, indent=2))
+
+    store = ImageStore(tmp_path / "images")
+    images = project_images(path, store)
+    assert list(images) == ["screen-1"]
+    ref = store.device_image(project["nodes"]["node-1"], images)
+    assert (ref.format, ref.width, ref.height) == ("png", 40, 20)
+    assert open(ref.path, "rb").read() == data
+    assert store.device_image({"imageBlobKey": "gone"}, images) is None
+
+
+def test_logo_for_looks_a_manufacturer_up_once(tmp_path, monkeypatch):
+    logos = tmp_path / "logos"
+    logos.mkdir()
+    (logos / "blackmagic-design.png").write_bytes(png(8, 8))
+    store = ImageStore(tmp_path / "images")
+    calls = []
+    put_file = store.put_file
+    monkeypatch.setattr(store, "put_file", lambda p: calls.append(p) or put_file(p))
+
+    refs = {store.logo_for("Blackmagic Design", str(logos)) for _ in range(50)}
+    assert len(refs) == 1 and len(calls) == 1
+    assert store.logo_for("Nobody", str(logos)) is None
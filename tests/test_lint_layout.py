@@ -0,0 +1,30 @@
+import random
+import time
+
+from tools.lint_layout import find_overlaps
+
+
+def brute_force(rects, min_overlap=1.0):
+    found = []
+    for i, (x0, y0, x1, y1) in enumerate(rects):
+        for j, (a0, b0, a1, b1) in enumerate(rects):
+            if (a0, j) < (x0, i) and min(y1, b1) - max(y0, b0) >= min_overlap and min(x1, a1) - x0 >= min_overlap:
+                found.append((j, i))
+    return sorted(found)
+
+
+def test_overlaps_match_brute_force():
+    rng = random.Random(7)
+    rects = []
+    for _ in range(400):
+        x, y = rng.uniform(0, 2000), rng.uniform(0, 2000)
+        rects.append((x, y, x + rng.uniform(20, 300), y + rng.uniform(20, 300)))
+    assert [(i, j) for i, j, _shared in find_overlaps(rects)] == brute_force(rects)
+
+
+def test_column_of_nodes_is_not_quadratic():
+    # 5,000 nodes sharing one x-extent, stacked without touching
+    rects = [(0.0, i * 120.0, 200.0, i * 120.0 + 100.0) for i in range(5000)]
+    start = time.perf_counter()
+    assert find_overlaps(rects) == []
+    assert time.perf_counter() - start < 1.0
@@ -0,0 +1,31 @@
+import json
+
+from tools.migrate_legacy import migrate_tree
+from tools.vsf import load_project, to_system
+
+LEGACY = {
+    "name": "Legacy",
+    "nodes": [
+        {"id": "cam", "data": {"label": "Camera", "outputs": [{"id": "o1", "name": "OUT 1", "type": "SDI"}]}},
+        {"id": "mon", "data": {"label": "Monitor", "inputs": [{"id": "i1", "name": "IN 1", "type": "SDI"}]}},
+    ],
+    "edges": [{"id": "e1", "source": "cam", "sourceHandle": "output-o1", "target": "mon", "targetHandle": "input-i1"}],
+}
+
+
+def test_sources_sharing_an_output_are_failed_not_overwritten(tmp_path):
+    archive, out = tmp_path / "archive", tmp_path / "out"
+    archive.mkdir()
+    for name in ("show.json", "show.vsf", "other.sfw"):
+        (archive / name).write_text(json.dumps(LEGACY))
+
+    for jobs in (1, 4):
+        results = {r["source"].rsplit("/", 1)[-1]: r for r in migrate_tree([archive], out, jobs=jobs)}
+        assert results["show.json"]["status"] == results["show.vsf"]["status"] == "failed"
+        assert "show.vsf" in results["show.json"]["error"]
+        assert results["other.sfw"]["status"] in ("converted", "unchanged")
+    assert not (out / "show.vsf").exists()
+    assert list(json.loads((out / ".migrated.json").read_text())) == ["other.vsf"]
+
+    system = to_system(load_project(out / "other.vsf"))
+    assert [system.port_label(r.src) for r in system.routes] == ["Camera: OUT 1"]
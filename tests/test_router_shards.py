@@ -0,0 +1,26 @@
+import pytest
+
+from tools.av_model import System, sample_system
+from tools.router_shards import partition, shard_router
+from tools.vsf import load_project, to_system
+
+GEAR = "nexus-x/public/samples/gear.vsf"
+
+
+def test_zone_and_system_read_node_fields():
+    system = to_system(load_project(GEAR))
+    zones = dict(partition(system, "zone"))
+    assert set(zones) == {"", "grp-1772758639944"} and len(zones["grp-1772758639944"]) == 6
+    systems = dict(partition(system, "system"))
+    assert {"Source", "Router", "Switcher", "Destination", "Converter"} <= set(systems)
+
+
+def test_key_no_device_has_is_an_error():
+    with pytest.raises(ValueError, match="shard by zone"):
+        partition(sample_system(), "zone")
+
+
+def test_single_device_over_budget_is_warned_about(tmp_path, capsys):
+    system = System.from_dicts([{"name": "Big", "color": "4A90D9", "inputs": [f"In {i}" for i in range(400)]}])
+    shard_router(str(tmp_path / "router.xlsx"), system=system, max_cells=1000, jobs=1)
+    assert "Warning: shard 1 (Big)" in capsys.readouterr().err
@@ -0,0 +1,61 @@
+import pytest
+
+from tools.av_model import INPUT, OUTPUT, System, sample_system
+from tools.scenes import SceneBook, sample_scenes
+
+
+def test_save_load_round_trip(tmp_path):
+    system = sample_system()
+    book = sample_scenes(system)
+    path = tmp_path / "scenes.json"
+    book.save(path)
+
+    loaded = SceneBook.load(system, path)
+    assert list(loaded.scenes) == list(book.scenes)
+    for scene in book:
+        assert loaded.routes(scene.name) == book.routes(scene)
+
+
+def test_input_and_output_sharing_a_port_code():
+    # Audio Mixer has both a "USB" input and a "USB" output
+    system = sample_system()
+    book = SceneBook(system)
+    book.add_named("USB", [("Laptop", "3.5mm", "Audio Mixer", "USB Audio"),
+                           ("Audio Mixer", "USB Out", "Video Switcher", "SDI In")])
+    loaded = SceneBook.from_json(system, book.to_json())
+    assert loaded.routes("USB") == book.routes("USB")
+
+
+def test_unknown_port_is_a_clear_error():
+    system = sample_system()
+    data = sample_scenes(system).to_json()
+    smaller = System.from_dicts([
+        {"name": "Laptop", "outputs": ["HDMI"]},
+        {"name": "Video Switcher", "inputs": ["HDMI 1"]},
+    ])
+    with pytest.raises(ValueError, match="not in the system"):
+        SceneBook.from_json(smaller, data)
+
+
+def test_add_named_resolves_sources_among_outputs():
+    # "USB" is both an input and an output of the mixer; a source must be the output
+    system = sample_system()
+    book = SceneBook(system)
+    book.add_named("x", [("Audio Mixer", "USB", "Video Switcher", "SDI 1")])
+    (route,) = book.routes("x")
+    src, dst = route
+    assert system.port_label(src) == "Audio Mixer: USB"
+    assert system.ports.direction[src] == OUTPUT
+    assert system.ports.direction[dst] == INPUT
+
+
+def test_from_dicts_route_from_a_port_code_shared_by_both_sides():
+    system = System.from_dicts(
+        [{"name": "Mixer", "inputs": ["USB"], "outputs": ["USB"]},
+         {"name": "Recorder", "inputs": ["USB"], "outputs": ["USB"]}],
+        [("Mixer", "USB", "Recorder", "USB"), ("Recorder", "USB", "Mixer", "USB")],
+    )
+    for route in system.routes:
+        assert system.ports.direction[route.src] == OUTPUT
+        assert system.ports.direction[route.dst] == INPUT
+    assert system.find_port("Mixer", "USB") == system.find_port("Mixer", "USB", INPUT)
@@ -0,0 +1,27 @@
+from tools.tracker_import import TrackerImport, import_tracker
+
+
+def test_auto_task_ids_do_not_collide_with_explicit_ones(tmp_path):
+    tasks = tmp_path / "tasks.csv"
+    tasks.write_text("Task Name,TaskID,Depends On\nA,,\nB,1,\nC,,1\nD,T-4,\nE,,\nF,1,\n", encoding="utf-8")
+    imp = TrackerImport()
+    assert [row[0] for row in imp.tasks(str(tasks))] == ["T-1", "1", "T-3", "T-4", "T-5", "1"]
+    assert imp.report()["duplicates"] == [
+        {"table": "tasks", "field": "id", "value": "1", "count": 1, "first_line": 7, "kept_line": 3},
+    ]
+
+
+def test_task_id_taken_before_its_auto_number_is_skipped(tmp_path):
+    tasks = tmp_path / "tasks.jsonl"
+    tasks.write_text('{"id": "T-2"}\n{"name": "no id"}\n', encoding="utf-8")
+    imp = TrackerImport()
+    assert [row[0] for row in imp.tasks(str(tasks))] == ["T-2", "T-3"]
+    assert imp.report()["duplicates"] == []
+
+
+def test_import_writes_the_workbook(tmp_path):
+    tasks = tmp_path / "tasks.csv"
+    tasks.write_text("Task Name,TaskID\nA,\nB,1\n", encoding="utf-8")
+    report = import_tracker(str(tasks), output_path=str(tmp_path / "tracker.xlsx"))
+    assert report["tasks"] == 2 and report["duplicates"] == []
+    assert (tmp_path / "tracker.xlsx").exists()
@@ -0,0 +1,78 @@
+import time
+
+import numpy as np
+import pytest
+
+from tools import tracker_schedule
+from tools.tracker_schedule import NO_DEADLINE, critical_path
+
+
+def reference(duration, release, deadline, pred, succ):
+    """Plain Kahn forward pass and reverse-order backward pass; early / late days and the scheduled set."""
+    n = len(duration)
+    succs = [[] for _ in range(n)]
+    indegree = [0] * n
+    for p, s in zip(pred.tolist(), succ.tolist()):
+        succs[p].append(s)
+        indegree[s] += 1
+    es = release.tolist()
+    order = [u for u in range(n) if not indegree[u]]
+    for u in order:
+        for v in succs[u]:
+            es[v] = max(es[v], es[u] + int(duration[u]))
+            indegree[v] -= 1
+            if not indegree[v]:
+                order.append(v)
+    ef = [es[u] + int(duration[u]) for u in range(n)]
+    finish = max((ef[u] for u in order), default=0)
+    lf = [int(d) if d < NO_DEADLINE else finish for d in deadline.tolist()]
+    for u in reversed(order):
+        lf[u] = min([lf[u]] + [lf[v] - int(duration[v]) for v in succs[u]])
+    return es, lf, set(order)
+
+
+def random_graph(n, deps, seed, cycles=0):
+    rng = np.random.default_rng(seed)
+    succ = np.repeat(np.arange(1, n), deps)
+    pred = (rng.random(len(succ)) * succ).astype(np.int64)
+    if cycles:
+        back = rng.integers(0, len(succ), cycles)     # reversing an edge closes a cycle
+        pred, succ = np.concatenate([pred, succ[back]]), np.concatenate([succ, pred[back]])
+    perm = rng.permutation(n)   # task order is not a topological order
+    duration = rng.integers(0, 5, n)
+    release = 700_000 + rng.integers(0, 3, n)
+    deadline = np.where(rng.random(n) < 0.3, 700_000 + rng.integers(5, 200, n), NO_DEADLINE)
+    return duration[perm], release[perm], deadline[perm], perm[pred], perm[succ]
+
+
+@pytest.mark.parametrize("narrow, wide", [(256, 4096), (4, 16), (1, 1)])
+@pytest.mark.parametrize("deps, cycles", [(1, 0), (2, 0), (3, 0), (2, 3)])
+def test_matches_plain_kahn(monkeypatch, narrow, wide, deps, cycles):
+    # Thresholds move the mix of array levels and list loops; the schedule must not change
+    monkeypatch.setattr(tracker_schedule, "NARROW_LEVEL", narrow)
+    monkeypatch.setattr(tracker_schedule, "WIDE_LEVEL", wide)
+    duration, release, deadline, pred, succ = random_graph(3000, deps, seed=deps * 10 + cycles, cycles=cycles)
+    es, ef, ls, lf, driver, scheduled, cycle = critical_path(duration, release, deadline, pred, succ)
+
+    ref_es, ref_lf, ref_scheduled = reference(duration, release, deadline, pred, succ)
+    assert set(np.flatnonzero(scheduled).tolist()) == ref_scheduled
+    assert es[scheduled].tolist() == [ref_es[u] for u in np.flatnonzero(scheduled)]
+    assert lf[scheduled].tolist() == [ref_lf[u] for u in np.flatnonzero(scheduled)]
+    assert (ef == es + duration)[scheduled].all() and (ls == lf - duration)[scheduled].all()
+    assert bool(cycle) == bool(cycles)
+
+    # A driver is a predecessor whose finish set the start; none when the release did
+    edges = set(zip(pred.tolist(), succ.tolist()))
+    for v in np.flatnonzero(scheduled).tolist():
+        u = int(driver[v])
+        if u < 0:
+            assert es[v] == release[v]
+        else:
+            assert (u, v) in edges and ef[u] == es[v] > release[v]
+
+
+def test_200k_tasks_under_a_second():
+    graph = random_graph(200_000, 2, seed=1)
+    start = time.perf_counter()
+    critical_path(*graph)
+    assert time.perf_counter() - start < 1.0
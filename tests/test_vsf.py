@@ -0,0 +1,86 @@
+import json
+
+from tools.catalog import connect, index_paths, load_system
+from tools.migrate_legacy import convert_legacy_react_flow
+from tools.node_layout import anchor_positions, layout_nodes
+from tools.validate_vsf import validate_project
+from tools.vsf import normalize_project, parse_length_ft, to_system
+
+LEGACY = {
+    "name": "Legacy",
+    "nodes": [
+        {"id": "cam", "position": {"x": 0, "y": 0},
+         "data": {"label": "Camera", "outputs": [{"id": "o1", "name": "OUT 1", "type": "SDI"}]}},
+        {"id": "sw", "position": {"x": 600, "y": 0},
+         "data": {"label": "Switcher", "inputs": [{"id": "i1", "name": "IN 1", "type": "SDI"},
+                                                  {"id": "i2", "name": "Cam 2", "type": "SDI"}]}},
+    ],
+    "edges": [{"id": "e1", "source": "cam", "sourceHandle": "output-o1", "target": "sw", "targetHandle": "input-i2",
+               "data": {"cableType": "SDI"}}],
+}
+
+
+def supernode_project():
+    return convert_legacy_react_flow(LEGACY, base_ts=1700000000000)
+
+
+def test_supernodes_read_as_sections():
+    project = normalize_project(supernode_project())
+    switcher = project["nodes"]["node-1700000000001"]
+    assert switcher["layout"] == "c_ab"
+    assert switcher["sections"]["a"]["rows"][1][:2] == ["Cam 2", "SDI"]
+    assert project["connections"][0]["from"] == "node-1700000000000-b-0"
+    assert project["connections"][0]["to"] == "node-1700000000001-a-1"
+
+    system = to_system(project)
+    (route,) = system.routes
+    assert system.port_label(route.src) == "Camera: OUT 1"
+    assert system.port_label(route.dst) == "Switcher: Cam 2"
+    assert "node-1700000000001-a-1" in anchor_positions(layout_nodes(project))
+
+
+def test_wires_on_supernodes_without_port_ids_are_invalid():
+    project = supernode_project()
+    assert validate_project(project) == []
+    for node in project["nodes"].values():
+        for part in ("inputSection", "outputSection"):
+            for port in node[part]["ports"]:
+                del port["id"]
+    problems = validate_project(project)
+    assert len(problems) == 2 and all("has no port ids" in message for _, message in problems)
+
+
+
+def test_malformed_supernode_ports_are_reported():
+    project = supernode_project()
+    cam, sw = project["nodes"]
+    project["nodes"][cam]["outputSection"]["ports"] = 5
+    project["nodes"][sw]["inputSection"]["ports"][0] = "IN 1"
+    project["nodes"][sw]["system"] = []
+    problems = dict(validate_project(project))
+    assert problems[f'$.nodes["{cam}"].outputSection.ports'] == "expected array, got integer"
+    assert problems[f'$.nodes["{sw}"].inputSection.ports[0]'] == "expected object, got string"
+    assert problems[f'$.nodes["{sw}"].system'] == "expected object, got array"
+
+
+def test_parse_length_ft():
+    assert parse_length_ft("25 ft") == 25
+    assert parse_length_ft(".5'") == 0.5
+    assert parse_length_ft("10m") == 32.81
+    for text in ("", None, "12.5.1 ft", "3..5 m", ".", "5.", "long"):
+        assert parse_length_ft(text) is None
+
+
+def test_same_named_devices_skip_names_already_taken(tmp_path):
+    project = {"nodes": {
+        f"node-{i}": {"id": f"node-{i}", "title": title, "sections": {}}
+        for i, title in enumerate(["X", "X (2)", "X", "X", "X (2)"], 1)
+    }, "connections": []}
+    names = ["X", "X (2)", "X (3)", "X (4)", "X (2) (2)"]
+    assert [d.name for d in to_system(project).devices] == names
+
+    path = tmp_path / "show.vsf"
+    path.write_text(json.dumps(project), encoding="utf-8")
+    conn = connect(str(tmp_path / "catalog.sqlite"))
+    index_paths(conn, [str(path)])
+    assert [d.name for d in load_system(conn).devices] == names
@@ -0,0 +1,73 @@
+import copy
+
+from tools.vsf import load_project
+from tools.vsf_diff import ADDED, MODIFIED, MOVED, REMOVED, diff_projects
+
+GEAR = "nexus-x/public/samples/gear.vsf"
+
+
+def node_with_rows(project, section):
+    return next(nid for nid, node in project["nodes"].items()
+                if len((node.get("sections") or {}).get(section, {}).get("rows") or ()) >= 2)
+
+
+def test_identical_revisions_have_no_changes():
+    old = load_project(GEAR)
+    diff = diff_projects(old, copy.deepcopy(old))
+    assert not diff
+    assert diff.unchanged_nodes == len(old["nodes"])
+    assert diff.unchanged_wires == len(old["connections"])
+
+
+def test_added_removed_modified_and_moved_only():
+    old = load_project(GEAR)
+    new = copy.deepcopy(old)
+    ids = list(new["nodes"])
+    edited = node_with_rows(new, "a")
+    gone, moved, retitled = [nid for nid in ids if nid != edited][:3]
+
+    # Devices: one removed, one added, one with a new field value, one only moved
+    del new["nodes"][gone]
+    new["nodes"]["node-1999999999999"] = dict(copy.deepcopy(old["nodes"][gone]), id="node-1999999999999")
+    new["nodes"][retitled]["manufacturer"] = "Changed Co"
+    position = new["nodes"][moved]["position"]
+    position["x"] += 120
+
+    # Ports: first row of section a changed, its last row removed, a copy of it added to section b
+    rows = new["nodes"][edited]["sections"]["a"]["rows"]
+    rows[0] = ["renamed"] + list(rows[0][1:])
+    removed_row = len(rows) - 1
+    b_rows = new["nodes"][edited]["sections"].setdefault("b", {"cols": [], "rows": []}).setdefault("rows", [])
+    added_row = len(b_rows)
+    b_rows.append(rows.pop())
+
+    # Wires: one modified, one removed, one redrawn between the same ports under a new id, one added
+    wires = new["connections"]
+    wires[0]["cableType"] = "Fiber"
+    removed_wire = wires.pop(1)["id"]
+    wires[1]["id"] = "wire-redrawn"
+    wires.append(dict(copy.deepcopy(wires[2]), id="wire-new", to=wires[3]["to"]))
+
+    diff = diff_projects(old, new)
+    devices = {(c.kind, c.node_id, c.item) for c in diff.devices}
+    assert devices == {
+        (REMOVED, gone, ""), (ADDED, "node-1999999999999", ""), (MODIFIED, retitled, "manufacturer"),
+    }
+    assert [(c.kind, c.node_id) for c in diff.moved] == [(MOVED, moved)]
+    assert diff.moved[0].new[0] == diff.moved[0].old[0] + 120
+
+    ports = {(c.kind, c.node_id, c.item) for c in diff.ports}
+    assert ports == {
+        (MODIFIED, edited, "a 0"), (REMOVED, edited, f"a {removed_row}"), (ADDED, edited, f"b {added_row}"),
+    }
+    (renamed,) = [c for c in diff.ports if c.kind == MODIFIED]
+    assert "'renamed'" in renamed.detail
+
+    wires_by_kind = {(c.kind, c.item): c for c in diff.wires}
+    assert set(wires_by_kind) == {
+        (MODIFIED, old["connections"][0]["id"]), (REMOVED, removed_wire),
+        (MODIFIED, "wire-redrawn"), (ADDED, "wire-new"),
+    }
+    assert "cableType" in wires_by_kind[(MODIFIED, old["connections"][0]["id"])].detail
+    assert wires_by_kind[(MODIFIED, "wire-redrawn")].detail.startswith("id:")
+    assert diff.counts()["devices moved only"] == 1
@@ -0,0 +1,78 @@
+import json
+import os
+
+import pytest
+
+from tools.migrate_legacy import convert_legacy_react_flow
+from tools.vsf import load_project
+from tools.vsf_journal import Journal
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "nexus-x", "public", "samples", "gear.vsf")
+LOGO = "data:image/png;base64," + "iVBORw0KGgo" * 40
+
+
+def native():
+    with open(SAMPLE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def supernode():
+    legacy = {
+        "name": "Legacy",
+        "nodes": [{"id": "cam", "data": {"label": "Camera", "outputs": [{"id": "o1", "name": "OUT 1"}]}},
+                  {"id": "mon", "data": {"label": "Monitor", "inputs": [{"id": "i1", "name": "IN 1"}]}}],
+        "edges": [{"id": "e1", "source": "cam", "sourceHandle": "output-o1", "target": "mon",
+                   "targetHandle": "input-i1"}],
+    }
+    return convert_legacy_react_flow(legacy, base_ts=1000)
+
+
+def pages():
+    project = native()
+    nodes, connections = project.pop("nodes"), project.pop("connections")
+    first = dict(list(nodes.items())[:10])
+    project["pages"] = [{"id": "p1", "nodes": first, "connections": []},
+                        {"id": "p2", "nodes": nodes, "connections": connections}]
+    return project
+
+
+def write(tmp_path, name, project):
+    path = tmp_path / name
+    path.write_text(json.dumps(project), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("make", [native, supernode, pages])
+def test_revisions_check_out_as_saved(tmp_path, make):
+    project = make()
+    journal = Journal(tmp_path / "show.journal", create=True)
+    assert journal.commit_file(write(tmp_path, "show.vsf", project)) == 1
+    assert journal.checkout(1) == project
+
+    # Readers still get the normalized project
+    loaded = load_project(f"{tmp_path / 'show.journal'}@1")
+    assert isinstance(loaded["nodes"], dict) and all("sections" in n for n in loaded["nodes"].values())
+
+
+def test_deltas_replay_and_blobs_are_stored_once(tmp_path):
+    journal = Journal(tmp_path / "show.journal", create=True)
+    project = native()
+    node_ids = list(project["nodes"])
+    project["nodes"][node_ids[0]]["logo"] = LOGO
+    project["nodes"][node_ids[1]]["logo"] = LOGO
+    revisions = []
+    for i in range(20):
+        project["nodes"][node_ids[i % len(node_ids)]]["tag"] = f"T{i}"
+        if i % 3 == 0:
+            project["connections"].insert(0, {**project["connections"][-1], "id": f"wire-new-{i}"})
+        revisions.append(json.loads(json.dumps(project)))
+        journal.commit(project, f"r{i + 1}")
+
+    assert journal.commit(project) == 20     # unchanged: no new revision
+    assert any("ops" in e for e in journal.entries) and any("snapshot" in e for e in journal.entries[1:])
+    reopened = Journal(tmp_path / "show.journal")
+    for rev, expected in enumerate(revisions, 1):
+        assert reopened.checkout(rev) == expected
+    blob_files = [f for _root, _dirs, files in os.walk(tmp_path / "show.journal" / "blobs") for f in files]
+    assert len(blob_files) == 1
+    assert reopened.checkout(20, blobs=False)["nodes"][node_ids[0]]["logo"] == {"$blob": blob_files[0]}
@@ -0,0 +1,55 @@
+import json
+import os
+
+import pytest
+
+from tools.vsf import load_project
+from tools.wire_numbers import SCHEMES, WireNumbering
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "nexus-x", "public", "samples", "gear.vsf")
+
+
+def project(names, wires):
+    """names: node titles; wires: (wire id, source node index, cable type)."""
+    nodes = {f"node-{i + 1}": {"id": f"node-{i + 1}", "title": name} for i, name in enumerate(names)}
+    connections = [{"id": wire_id, "from": f"node-{src + 1}-b-0", "to": f"node-{len(names)}-a-{n}",
+                    "cableType": cable} for n, (wire_id, src, cable) in enumerate(wires)]
+    return {"nodes": nodes, "connections": connections}
+
+
+@pytest.mark.parametrize("scheme", SCHEMES)
+def test_labels_are_unique_on_the_sample(scheme):
+    labels = WireNumbering(scheme).assign(load_project(SAMPLE))
+    assert len(set(labels.values())) == len(labels) == 99
+
+
+def test_groups_that_print_alike_get_told_apart():
+    doc = project(["X", "X (2)", "X", "Sink"], [("w1", 0, "WIRE"), ("w2", 1, ""), ("w3", 2, "")])
+    assert WireNumbering("source").assign(doc) == {"w1": "X-001", "w2": "X (2)-001", "w3": "X (3)-001"}
+    assert WireNumbering("signal").assign(doc) == {"w1": "WIRE-0001", "w2": "WIRE (2)-0001", "w3": "WIRE (2)-0002"}
+
+    doc["nodes"]["node-1"]["signalColor"] = "red"
+    doc["nodes"]["node-2"]["signalColor"] = "RED"
+    doc["nodes"]["node-3"]["signalColor"] = "NONE"
+    labels = WireNumbering("color").assign(doc)
+    assert len(set(labels.values())) == 3
+
+
+def test_numbers_survive_a_revision(tmp_path):
+    path = tmp_path / "show.wires.json"
+    r1 = project(["CAM", "Sink"], [(f"w{i}", 0, "SDI") for i in range(1, 6)])
+    numbering = WireNumbering("source")
+    assert sorted(numbering.assign(r1).values()) == [f"CAM-00{i}" for i in range(1, 6)]
+    numbering.save(path)
+
+    # r2: w2 deleted, w4 deleted and redrawn as w9 between the same ports, one brand new wire
+    r2 = json.loads(json.dumps(r1))
+    conns = {c["id"]: c for c in r2["connections"]}
+    redrawn = {**conns.pop("w4"), "id": "w9"}
+    del conns["w2"]
+    new = {**conns["w5"], "id": "w10", "to": "node-2-a-7"}
+    r2["connections"] = list(conns.values()) + [redrawn, new]
+    numbering = WireNumbering.load(path)
+    labels = numbering.assign(r2)
+    assert labels == {"w1": "CAM-001", "w3": "CAM-003", "w5": "CAM-005", "w9": "CAM-004", "w10": "CAM-002"}
+    assert numbering.stats == {"kept": 3, "inherited": 1, "new": 1, "released": 2}
@@ -0,0 +1,46 @@
+from openpyxl import load_workbook
+
+from tools.av_model import sample_system
+from tools.create_av_router import create_av_router
+from tools.xlsx_patch import ROUTE_FIRST_ROW, WorkbookPatch
+
+
+def routing_rows(ws):
+    return [[c.value for c in row[1:9]] for row in ws.iter_rows(min_row=ROUTE_FIRST_ROW)
+            if row[4].value == "→"]
+
+
+def test_patch_router_workbook(tmp_path):
+    path = str(tmp_path / "router.xlsx")
+    create_av_router(path, system=sample_system(), deterministic=True)
+    before = load_workbook(path)
+    blank = len(routing_rows(before["Routing"])) - 3   # sample system: 3 routes plus blank rows
+
+    with WorkbookPatch(path) as patch:
+        patch.set_route_status(2, "Fault")
+        patch.rename_device("Laptop", "Laptop [spare]")
+    for _ in range(blank + 1):   # fill the blank rows, then one past the table
+        with WorkbookPatch(path) as patch:
+            patch.add_route("Audio Mixer", "USB", "Display", "HDMI", "Audio", "Testing")
+
+    wb = load_workbook(path)
+    rows = routing_rows(wb["Routing"])
+    assert len(rows) == 3 + blank + 1
+    assert rows[1][7] == "Fault"
+    assert rows[0][1] == "Laptop [spare]"
+    assert rows[-1] == [len(rows), "Audio Mixer", "USB", "→", "Display", "HDMI", "Audio", "Testing"]
+    last = ROUTE_FIRST_ROW + len(rows) - 1
+    new, above = wb["Routing"].cell(last, 3), wb["Routing"].cell(last - 1, 3)
+    assert (new.font.color.rgb, new.fill.fgColor.rgb) == (above.font.color.rgb, above.fill.fgColor.rgb)
+    covered = {col for dv in wb["Routing"].data_validations.dataValidation for col in "CFI" if f"{col}{last}" in dv.sqref}
+    assert covered == set("CFI")   # the new row keeps its dropdowns
+
+    assert "Laptop [spare]" not in wb.sheetnames and "Laptop _spare_" in wb.sheetnames
+    assert "Laptop" not in wb.sheetnames
+    devices = wb["Devices"]
+    names = [row[2].value for row in devices.iter_rows(min_row=5) if row[2].value]
+    assert "Laptop [spare]" in names and "Laptop" not in names
+    links = [c.hyperlink.target or c.hyperlink.location for row in devices.iter_rows(min_row=5)
+             for c in row if c.hyperlink]
+    assert "#'Laptop _spare_'!A1" in links
+    assert not any("'Laptop'!" in link for link in links)
@@ -0,0 +1,9 @@
+"""
+WAT tools package
+Deterministic generators and helpers. Run them through the single entry point:
+
+    python -m tools --help
+
+Keep this module free of imports: `python -m tools` loads it before every
+subcommand, so anything imported here is paid for on every invocation.
+"""
@@ -0,0 +1,433 @@
+"""
+Single CLI entry point for every generator in tools/
+
+    python -m tools router -o out.xlsx
+    python -m tools router --gear "24x URSA Broadcast G2 tagged CAM 1..24" --gear "Videohub 40x40"
+    python -m tools router --gear "Videohub 40x40" --cache
+    python -m tools router --project show.vsf -o show_router.xlsx
+    python -m tools tracker
+    python -m tools batch jobs.json
+    python -m tools startup-check
+    python -m tools catalog index ~/Shows
+    python -m tools render show.vsf -o show.pdf
+    python -m tools lint show.vsf -o lint.json
+    python -m tools cable-schedule show.vsf --scale 0.1
+    python -m tools budget show.vsf
+    python -m tools tracker-import --people people.csv --projects projects.csv --tasks tasks.jsonl
+    python -m tools migrate-legacy ~/Archive -o ~/Migrated --jobs 8
+    python -m tools validate shows/ && python -m tools batch jobs.json
+    python -m tools diff show_r13.vsf show_r14.vsf
+    python -m tools journal commit show.journal show.vsf && python -m tools diff show.journal@-1 show.journal
+    python -m tools export show.vsf --format csv --format jsonl -o .tmp/show_tables
+    python -m tools wire-numbers show.vsf --scheme source && python -m tools cable-schedule show.vsf --wire-numbers
+    python -m tools router --catalog shows.sqlite --project show --shard-by signalColor --max-cells 200000
+    python -m tools patch show_router.xlsx --status 12=Fault --rename "CAM 3=CAM 3 (spare)"
+    python -m tools bench --scale 1 --scale 4 --report bench.json --baseline last_bench.json
+
+Heavy dependencies (openpyxl, win32com) are only imported by the module that
+implements the chosen subcommand, so `--help` and argument errors stay fast.
+A `batch` manifest runs many jobs in one process and pays each import once.
+"""
+
+import sys
+
+# ===== COMMAND REGISTRY =====
+# subcommand -> (module, function, help). Modules are imported on dispatch only.
+COMMANDS = {
+    "router": ("tools.create_av_router", "create_av_router",
+               "AV routing workbook with device sheets and routing matrix"),
+    "system-router": ("tools.create_system_router", "create_system_router",
+                      "System router workbook (devices, sources, colors)"),
+    "tracker": ("tools.create_project_tracker", "create_project_tracker",
+                "Project tracker workbook (people, projects, tasks, dashboard)"),
+    "diagram": ("tools.create_av_diagram", "create_av_diagram",
+                "AV diagram with movable shapes (Windows + Excel COM)"),
+    "router-macro": ("tools.create_av_router_macro", "create_av_router_macro",
+                     "Macro-enabled AV router (Windows + Excel COM)"),
+}
+
+# Wire numbering schemes (tools/wire_numbers.py), listed here to keep --help import-free
+WIRE_SCHEMES = ("global", "source", "signal", "color")
+
+# Router shard keys (tools/router_shards.py)
+SHARD_KEYS = ("zone", "system", "signalColor", "size")
+
+# Generators the open-cost benchmark drives (tools/open_bench.py)
+BENCH_GENERATORS = ("router", "system-router", "tracker", "cable-schedule", "budget")
+
+# Generators that render an av_model.System and accept one from the catalog
+SYSTEM_COMMANDS = ("router", "system-router", "diagram", "router-macro")
+
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m tools",
+        description="Generate AV and project workbooks.",
+    )
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
+    sub.required = True
+
+    for name, (_module, _func, help_text) in COMMANDS.items():
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("-o", "--output", help="output path (default: .tmp/<name>.xlsx)")
+        if name in SYSTEM_COMMANDS:
+            p.add_argument("--catalog", metavar="DB", help="pull the device set from a project catalog")
+            p.add_argument("--project", help="catalog project name or file path; without --catalog, a .vsf "
+                                              "(or journal@rev) read directly, embedded images included")
+            p.add_argument("--model", help="only catalog devices of this model")
+            p.add_argument("--gear", action="append", metavar="SPEC",
+                           help='devices from the preset library, e.g. "24x URSA Broadcast G2 tagged CAM 1..24" (repeatable)')
+        if name == "router":
+            p.add_argument("--scenes", metavar="JSON", help="routing scenes file (see tools/scenes.py)")
+            p.add_argument("--export", metavar="DIR", help="also write device / port / route tables to DIR")
+            p.add_argument("--export-format", action="append", choices=("csv", "jsonl", "parquet"),
+                           help="table format for --export (repeatable; default: csv)")
+            p.add_argument("--cache", nargs="?", const="", metavar="DIR",
+                           help="reuse the stored workbook for unchanged input (default store: .tmp/artifacts)")
+            p.add_argument("--cache-size", type=int, default=1024, metavar="MB",
+                           help="evict least recently used artifacts past this size (default: 1024)")
+            p.add_argument("--shard-by", choices=SHARD_KEYS, metavar="KEY",
+                           help="split into shard workbooks plus an index at -o (zone = canvas group, "
+                                "system = primary device type, signalColor, size)")
+            p.add_argument("--max-cells", type=int, default=500_000, help="cell budget per shard (default: 500000)")
+            p.add_argument("--max-mb", type=float, help="file size budget per shard, estimated")
+            p.add_argument("--jobs", type=int, help="shards built in parallel (default: CPU count)")
+
+    p = sub.add_parser("batch", help="run many jobs from a JSON / JSON Lines manifest in one process")
+    p.add_argument("manifest", help='manifest file: [{"command": "router", "output": "..."}, ...]')
+    p.add_argument("--keep-going", action="store_true", help="continue after a failed job")
+
+    p = sub.add_parser("startup-check", help="check `--help` startup time and lazy imports")
+    p.add_argument("--budget-ms", type=float, default=50.0, help="wall-clock budget (default: 50)")
+    p.add_argument("--runs", type=int, default=7, help="runs to take the best of (default: 7)")
+
+    p = sub.add_parser("catalog", help="SQLite catalog of .vsf projects (index, search, cables)")
+    p.add_argument("--db", default=None, help="catalog database (default: .tmp/catalog.sqlite)")
+    catalog_sub = p.add_subparsers(dest="action", metavar="ACTION")
+    catalog_sub.required = True
+    c = catalog_sub.add_parser("index", help="index .vsf files or directories (incremental)")
+    c.add_argument("paths", nargs="+")
+    c.add_argument("--prune", action="store_true", help="drop catalog entries whose file is gone")
+    c = catalog_sub.add_parser("search", help="full-text search across devices, ports and cables")
+    c.add_argument("query")
+    c.add_argument("--limit", type=int, default=50)
+    c = catalog_sub.add_parser("cables", help="wires by device model, cable type and length")
+    c.add_argument("--model")
+    c.add_argument("--manufacturer")
+    c.add_argument("--cable-type")
+    c.add_argument("--min-ft", type=float)
+
+    p = sub.add_parser("render", help="render a .vsf diagram to vector PDF or SVG pages (no browser)")
+    p.add_argument("project", help=".vsf project file")
+    p.add_argument("-o", "--output", help="PDF file or SVG directory (default: .tmp/<project>.pdf)")
+    p.add_argument("--format", choices=("pdf", "svg"), default="pdf")
+
+    p = sub.add_parser("lint", help="find overlapping nodes and wires running through nodes in a .vsf")
+    p.add_argument("project", help=".vsf project file")
+    p.add_argument("-o", "--output", help="report file: .json or .xlsx (default: summary only)")
+    p.add_argument("--min-overlap", type=float, default=1.0, help="ignore overlaps thinner than this, px (default: 1)")
+
+    p = sub.add_parser("tracker-import", help="project tracker from People / Projects / Tasks CSV or JSON Lines")
+    p.add_argument("--tasks", required=True, help="tasks file (.csv, .jsonl or .json)")
+    p.add_argument("--people", help="people file")
+    p.add_argument("--projects", help="projects file")
+    p.add_argument("-o", "--output", help="output path (default: .tmp/project_tracker.xlsx)")
+    p.add_argument("--report", metavar="JSON", help="write dangling / duplicate references to a JSON file")
+    p.add_argument("--weekly-capacity", type=float, default=40.0, help="hours per person per week (default: 40)")
+
+    p = sub.add_parser("cable-schedule", help="cable schedule with lengths estimated from a .vsf drawing")
+    p.add_argument("project", help=".vsf project file")
+    p.add_argument("-o", "--output", help="output path (default: .tmp/<project>_cables.xlsx)")
+    p.add_argument("--scale", type=float, default=0.1, help="drawing scale in ft per px (default: 0.1)")
+    p.add_argument("--patch", action="append", metavar="NODE",
+                   help="patch panel / tie-line node id or name (repeatable; default: nodes named like one)")
+    p.add_argument("--slack", type=float, default=1.1, help="length multiplier for dressing and loops (default: 1.1)")
+    p.add_argument("--direct-max", type=float, default=50.0,
+                   help="runs up to this many ft skip the patch points (default: 50)")
+    p.add_argument("--wire-numbers", nargs="?", const="", metavar="SCHEME", choices=("", *WIRE_SCHEMES),
+                   help="number wires stably (global / source / signal / color; default: the project's map)")
+
+    p = sub.add_parser("budget", help="signal format vs connector / cable data rate for every .vsf wire")
+    p.add_argument("project", help=".vsf project file")
+    p.add_argument("-o", "--output", help="output path (default: .tmp/<project>_budget.xlsx)")
+
+    p = sub.add_parser("migrate-legacy", help="convert legacy React Flow projects under directories to .vsf")
+    p.add_argument("paths", nargs="+", help="project files or directories (searched recursively)")
+    p.add_argument("-o", "--output", help="output directory (default: .tmp/migrated)")
+    p.add_argument("--jobs", type=int, help="worker processes (default: one per CPU)")
+    p.add_argument("--report", metavar="JSON", help="write per-file status and timings to a JSON file")
+
+    p = sub.add_parser("validate", help="check .vsf structure, types and wire anchors (exit 1 if any file is invalid)")
+    p.add_argument("paths", nargs="+", help="project files or directories (searched recursively)")
+    p.add_argument("-o", "--output", metavar="JSON", help="write every problem, by file, to a JSON report")
+
+    p = sub.add_parser("diff", help="change-report workbook between two .vsf revisions")
+    p.add_argument("old", help="earlier revision (.vsf)")
+    p.add_argument("new", help="later revision (.vsf)")
+    p.add_argument("-o", "--output", help="output path (default: .tmp/<new>_changes.xlsx)")
+
+    p = sub.add_parser("journal", help="revision journal of a .vsf project: one snapshot plus deltas, shared blobs")
+    journal_sub = p.add_subparsers(dest="action", metavar="ACTION")
+    journal_sub.required = True
+    j = journal_sub.add_parser("commit", help="append .vsf files as the next revisions, in order")
+    j.add_argument("journal", help="journal directory, e.g. show.journal (created if missing)")
+    j.add_argument("files", nargs="+")
+    j.add_argument("-m", "--message", help="revision message (default: the file name)")
+    j = journal_sub.add_parser("log", help="list revisions and the journal's size on disk")
+    j.add_argument("journal")
+    j = journal_sub.add_parser("checkout", help="write one revision out as a .vsf file")
+    j.add_argument("ref", help="JOURNAL@REV, e.g. show.journal@14 or show.journal@-1 (no @: the latest)")
+    j.add_argument("-o", "--output", help="output path (default: .tmp/<project>_r<REV>.vsf)")
+
+    p = sub.add_parser("export", help="device, port, route and cable tables as CSV / JSON Lines / Parquet")
+    p.add_argument("project", nargs="?", help=".vsf project file (default: the sample system)")
+    p.add_argument("--gear", action="append", metavar="SPEC", help="devices from the preset library (repeatable)")
+    p.add_argument("-o", "--output", help="output directory (default: .tmp/export)")
+    p.add_argument("--format", action="append", choices=("csv", "jsonl", "parquet"),
+                   help="repeatable (default: csv)")
+    p.add_argument("--table", action="append", choices=("devices", "ports", "routes", "cables"),
+                   help="repeatable (default: all)")
+    p.add_argument("--wire-numbers", nargs="?", const="", metavar="SCHEME", choices=("", *WIRE_SCHEMES),
+                   help="fill wire_number from the project's stable numbering (see wire-numbers)")
+
+    p = sub.add_parser("wire-numbers", help="stable cable numbers for a .vsf project, kept in <project>.wires.json")
+    p.add_argument("project", help=".vsf project file")
+    p.add_argument("--scheme", choices=WIRE_SCHEMES,
+                   help="group wires by this (default: the map's scheme, or source for a new map)")
+    p.add_argument("--map", metavar="JSON", help="number map (default: next to the project)")
+    p.add_argument("--renumber", action="store_true", help="discard the map and number every wire again")
+
+    p = sub.add_parser("patch", help="edit a generated router workbook in place (no full load or rebuild)")
+    p.add_argument("workbook", help="xlsx written by the router command")
+    p.add_argument("-o", "--output", help="write the patched copy here (default: replace the workbook)")
+    p.add_argument("--status", action="append", metavar="N=STATUS",
+                   help="set the Status of route N, e.g. 12=Fault (repeatable)")
+    p.add_argument("--route", nargs="+", metavar="FIELD",
+                   help="add a route: SRC_DEVICE SRC_PORT DST_DEVICE DST_PORT [SIGNAL]")
+    p.add_argument("--rename", action="append", metavar="OLD=NEW", help="rename a device (repeatable)")
+    p.add_argument("--set", action="append", metavar="SHEET!REF=VALUE",
+                   help="set one cell's text, e.g. Routing!H9=SDI (repeatable)")
+
+    p = sub.add_parser("bench", help="generation and open / recalc cost of each generator's output at increasing scale")
+    p.add_argument("--generator", action="append", choices=BENCH_GENERATORS, help="repeatable (default: all)")
+    p.add_argument("--scale", action="append", type=float, metavar="FACTOR",
+                   help="input size as a multiple of the generator's base size (repeatable; default: 1 and 4)")
+    p.add_argument("-o", "--output", help="directory for the generated files (default: .tmp/bench)")
+    p.add_argument("--report", metavar="JSON", help="write timings and structural profiles to a JSON file")
+    p.add_argument("--baseline", metavar="JSON", help="earlier report: list what grew (exit 1 if the structure did)")
+    p.add_argument("--threshold", type=float, default=0.10, help="growth worth reporting (default: 0.10)")
+    p.add_argument("--no-full-load", action="store_true", help="skip the full openpyxl load")
+    p.add_argument("--no-libreoffice", action="store_true", help="skip the LibreOffice open / recalc")
+    p.add_argument("--keep", action="store_true", help="keep the generated files")
+    p.add_argument("--profile", nargs="+", metavar="XLSX", help="only print the structural profile of these files")
+
+    return parser
+
+
+def resolve(command):
+    """Import the module behind a subcommand and return its entry function."""
+    from importlib import import_module
+
+    module_name, func_name, _help = COMMANDS[command]
+    return getattr(import_module(module_name), func_name)
+
+
+def run_job(command, **kwargs):
+    if command not in COMMANDS:
+        raise ValueError(f"Unknown command in manifest: {command!r}")
+    return resolve(command)(**kwargs)
+
+
+def load_manifest(path):
+    """Jobs from a JSON list or JSON Lines file. Each job is {"command": ..., **kwargs}."""
+    import json
+
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        jobs = json.loads(stripped)
+    else:
+        jobs = [json.loads(line) for line in text.splitlines() if line.strip()]
+    for i, job in enumerate(jobs, 1):
+        if not isinstance(job, dict) or "command" not in job:
+            raise ValueError(f"{path}: job {i} must be an object with a 'command' key")
+    return jobs
+
+
+def run_batch(manifest, keep_going=False):
+    from time import perf_counter
+
+    jobs = load_manifest(manifest)
+    failed = 0
+    total_start = perf_counter()
+    for i, job in enumerate(jobs, 1):
+        job = dict(job)
+        command = job.pop("command")
+        if "output" in job:
+            job["output_path"] = job.pop("output")
+        start = perf_counter()
+        try:
+            run_job(command, **job)
+        except Exception as e:
+            failed += 1
+            print(f"[{i}/{len(jobs)}] {command} FAILED: {e}", file=sys.stderr)
+            if not keep_going:
+                break
+        else:
+            print(f"[{i}/{len(jobs)}] {command} ({(perf_counter() - start) * 1000:.0f} ms)")
+    print(f"Batch finished: {len(jobs)} jobs, {failed} failed, {perf_counter() - total_start:.2f} s")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == "batch":
+        return run_batch(args.manifest, keep_going=args.keep_going)
+    if args.command == "startup-check":
+        from tools.startup_check import check_startup
+        return check_startup(budget_ms=args.budget_ms, runs=args.runs)
+
+    if args.command == "catalog":
+        from tools.catalog import DEFAULT_DB, run
+        args.db = args.db or DEFAULT_DB
+        return run(args)
+
+    if args.command == "render":
+        from tools.render_diagram import render_diagram
+        render_diagram(args.project, args.output, format=args.format)
+        return 0
+
+    if args.command == "lint":
+        from tools.lint_layout import lint_layout
+        report = lint_layout(args.project, args.output, min_overlap=args.min_overlap)
+        return 1 if report["overlaps"] or report["wire_crossings"] else 0
+
+    if args.command == "tracker-import":
+        from tools.tracker_import import import_tracker
+        report = import_tracker(args.tasks, args.people, args.projects, args.output, args.report,
+                                weekly_capacity=args.weekly_capacity)
+        return 1 if report["dangling"] or report["duplicates"] or report["unnamed"] else 0
+
+    if args.command == "cable-schedule":
+        from tools.create_cable_schedule import create_cable_schedule
+        create_cable_schedule(args.project, args.output, ft_per_px=args.scale, patch=args.patch,
+                              slack=args.slack, direct_max_ft=args.direct_max, wire_numbers=args.wire_numbers)
+        return 0
+
+    if args.command == "budget":
+        from tools.create_signal_budget import create_signal_budget
+        create_signal_budget(args.project, args.output)
+        return 0
+
+    if args.command == "migrate-legacy":
+        from tools.migrate_legacy import migrate_tree
+        results = migrate_tree(args.paths, args.output, jobs=args.jobs, report_path=args.report)
+        return 1 if any(r["status"] == "failed" for r in results) else 0
+
+    if args.command == "validate":
+        from tools.validate_vsf import validate_paths
+        return 1 if validate_paths(args.paths, args.output) else 0
+
+    if args.command == "diff":
+        from tools.create_change_report import create_change_report
+        create_change_report(args.old, args.new, args.output)
+        return 0
+
+    if args.command == "journal":
+        from tools.vsf_journal import run
+        return run(args)
+
+    if args.command == "export":
+        from tools.export_tables import TABLES, export_system
+        if args.project:
+            from tools.vsf import load_project, to_system
+            project = load_project(args.project)
+            system = to_system(project)
+            if args.wire_numbers is not None:
+                from tools.wire_numbers import number_project, number_routes
+                number_routes(system, number_project(project, args.project, args.wire_numbers or None))
+        elif args.gear:
+            from tools.presets import build_system
+            system = build_system(args.gear)
+        else:
+            from tools.av_model import sample_system
+            system = sample_system()
+        export_system(system, args.output, formats=args.format or ("csv",), tables=args.table or tuple(TABLES))
+        return 0
+
+    if args.command == "wire-numbers":
+        from tools.vsf import load_project
+        from tools.wire_numbers import number_project
+        number_project(load_project(args.project), args.project, args.scheme, args.map, args.renumber)
+        return 0
+
+    if args.command == "patch":
+        from tools.xlsx_patch import patch_workbook
+        if args.route is not None and len(args.route) not in (4, 5):
+            build_parser().error("--route takes SRC_DEVICE SRC_PORT DST_DEVICE DST_PORT [SIGNAL]")
+        statuses = [(int(n), status) for n, status in (s.split("=", 1) for s in args.status or ())]
+        renames = [tuple(r.split("=", 1)) for r in args.rename or ()]
+        cells = [(ref.split("!", 1)[0], ref.split("!", 1)[1], value)
+                 for ref, value in (c.split("=", 1) for c in args.set or ())]
+        patch_workbook(args.workbook, args.output, statuses=statuses, routes=[args.route] if args.route else (),
+                       renames=renames, cells=cells)
+        return 0
+
+    if args.command == "bench":
+        from tools.open_bench import DEFAULT_OUTPUT, bench, print_profile, profile_xlsx
+        if args.profile:
+            for path in args.profile:
+                print_profile(path, profile_xlsx(path))
+            return 0
+        return bench(args.generator, args.scale or (1, 4), args.output or DEFAULT_OUTPUT, args.report, args.baseline,
+                     full_load=not args.no_full_load, libreoffice=not args.no_libreoffice,
+                     threshold=args.threshold, keep=args.keep)
+
+    kwargs = {"output_path": args.output}
+    if getattr(args, "catalog", None):
+        from tools.catalog import connect, load_system
+        conn = connect(args.catalog)
+        kwargs["system"] = load_system(conn, project=args.project, model=args.model)
+        conn.close()
+    elif getattr(args, "project", None):
+        from tools.vsf import is_journal_ref, load_project, to_system
+        kwargs["system"] = to_system(load_project(args.project))
+        if args.command in ("router", "diagram") and not is_journal_ref(args.project):
+            from tools.images import ImageStore, project_images
+            kwargs["project_images"] = project_images(args.project, ImageStore())
+    if getattr(args, "gear", None):
+        from tools.presets import preset_library
+        kwargs["system"] = preset_library().build_system(args.gear, system=kwargs.get("system"))
+    if getattr(args, "scenes", None):
+        kwargs["scenes"] = args.scenes
+    if getattr(args, "shard_by", None):
+        if args.cache is not None or args.scenes:
+            build_parser().error("--shard-by does not combine with --cache or --scenes")
+        from tools.router_shards import shard_router
+        try:
+            shard_router(kwargs["output_path"], kwargs.get("system"), by=args.shard_by, max_cells=args.max_cells,
+                         max_bytes=int(args.max_mb * (1 << 20)) if args.max_mb else None, jobs=args.jobs,
+                         project_images=kwargs.get("project_images"))
+        except ValueError as e:
+            build_parser().error(str(e))
+    elif getattr(args, "cache", None) is not None:
+        from tools.artifact_store import DEFAULT_ROOT, ArtifactStore, cached_router
+        cached_router(store=ArtifactStore(args.cache or DEFAULT_ROOT, args.cache_size << 20), **kwargs)
+    else:
+        resolve(args.command)(**kwargs)
+    if getattr(args, "export", None):
+        from tools.export_tables import export_system
+        system = kwargs.get("system")
+        if system is None:
+            from tools.av_model import sample_system
+            system = sample_system()
+        export_system(system, args.export, formats=args.export_format or ("csv",))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+Content-Addressed Artifact Store
+Generated workbooks kept by what they were generated from, so asking again for
+an unchanged project returns the stored file instead of regenerating it:
+- Key: sha256 of the generator name, the generator version (a hash of the
+  tools/ sources plus the openpyxl version) and digests of the inputs
+- system_digest(): canonical hash of an av_model.System (devices with their
+  identity fields, every port, every route); scenes_digest() for a SceneBook,
+  images_digest() for a project's embedded images
+- Artifacts are built with deterministic output (xlsx_writer.save_workbook), so
+  one key always means the same bytes
+- The store is bounded by max_bytes: least recently used artifacts go first.
+  A file's mtime is its last use; a hit touches it
+
+    store = ArtifactStore()
+    cached_router(".tmp/show_router.xlsx", system=system, store=store)
+    python -m tools router --gear "24x URSA Broadcast G2 tagged CAM 1..24" --cache
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'artifacts')
+DEFAULT_MAX_BYTES = 1 << 30
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Device.meta fields that change a generated workbook (name, logo, tag)
+META_FIELDS = ("manufacturer", "model", "tag", "image", "imageBlobKey")
+
+
+@lru_cache(maxsize=None)
+def generator_version():
+    """Hash of every tools/*.py source and the openpyxl version: any code change is a new version."""
+    h = hashlib.sha256()
+    for name in sorted(os.listdir(TOOLS_DIR)):
+        if name.endswith(".py"):
+            h.update(name.encode() + b"\0")
+            with open(os.path.join(TOOLS_DIR, name), "rb") as f:
+                h.update(f.read())
+    try:
+        from importlib.metadata import version
+        h.update(version("openpyxl").encode())
+    except Exception:   # not installed as a distribution: the sources alone decide
+        pass
+    return h.hexdigest()
+
+
+def _update_strings(h, values):
+    for v in values:
+        h.update(str(v).encode("utf-8"))
+        h.update(b"\0")
+
+
+def system_digest(system):
+    """sha256 hex of everything in a System that shows up in a generated workbook."""
+    h = hashlib.sha256(b"system\0")
+    for d in system.devices:
+        meta = d.meta if isinstance(d.meta, dict) else {}
+        _update_strings(h, (d.id, d.name, d.color, d.type, *(meta.get(k) or "" for k in META_FIELDS)))
+        _update_strings(h, (len(d.inputs), len(d.outputs)))
+        h.update(d.inputs.tobytes())
+        h.update(d.outputs.tobytes())
+    ports = system.ports
+    h.update(b"ports\0")
+    h.update(ports.device.tobytes())
+    h.update(ports.direction.tobytes())
+    for column in (ports.port, ports.name, ports.signal):
+        _update_strings(h, column)
+    h.update(b"routes\0")
+    for r in system.routes:
+        _update_strings(h, (r.src, r.dst, r.signal, r.status, r.number))
+    return h.hexdigest()
+
+
+def scenes_digest(scenes):
+    """sha256 hex of a SceneBook (scene names and crosspoints), or of no scenes."""
+    h = hashlib.sha256(b"scenes\0")
+    for scene in scenes or ():
+        _update_strings(h, (scene.name, len(scene.cells)))
+        h.update(scene.cells.tobytes())
+    return h.hexdigest()
+
+
+def images_digest(project_images):
+    """sha256 hex of {blob key: ImageRef} (tools.images.project_images), or of no images."""
+    h = hashlib.sha256(b"images\0")
+    for key, ref in sorted((project_images or {}).items()):
+        _update_strings(h, (key, ref.sha))
+    return h.hexdigest()
+
+
+def directory_digest(path):
+    """sha256 hex of a directory listing (names, sizes, mtimes): cheap stand-in for its content."""
+    h = hashlib.sha256(b"dir\0")
+    try:
+        entries = sorted(os.scandir(path), key=lambda e: e.name)
+    except OSError:
+        return h.hexdigest()
+    for e in entries:
+        st = e.stat()
+        _update_strings(h, (e.name, st.st_size, st.st_mtime_ns))
+    return h.hexdigest()
+
+
+class ArtifactStore:
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def key(self, generator, *digests):
+        h = hashlib.sha256(json.dumps([generator, generator_version(), *digests]).encode())
+        return h.hexdigest()
+
+    def path(self, key, ext=".xlsx"):
+        return os.path.join(self.root, key[:2], key + ext)
+
+    def get(self, key, ext=".xlsx"):
+        """Stored artifact path for key (marked as just used), or None."""
+        path = self.path(key, ext)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, src, ext=".xlsx"):
+        """Copy src into the store under key (atomically), then evict down to max_bytes."""
+        path = self.path(key, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict(keep=path)
+        return path
+
+    def entries(self):
+        """[(mtime, size, path)] of every stored artifact."""
+        out = []
+        if not os.path.isdir(self.root):
+            return out
+        for sub in os.scandir(self.root):
+            if not sub.is_dir():
+                continue
+            for e in os.scandir(sub.path):
+                if e.is_file() and not e.name.startswith("."):
+                    st = e.stat()
+                    out.append((st.st_mtime_ns, st.st_size, e.path))
+        return out
+
+    def evict(self, keep=None):
+        """Delete least recently used artifacts until the store fits max_bytes. Returns bytes freed."""
+        entries = sorted(self.entries())
+        total = sum(size for _t, size, _p in entries)
+        freed = 0
+        for _t, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and os.path.samefile(path, keep):
+                continue
+            os.remove(path)
+            total -= size
+            freed += size
+        return freed
+
+    def fetch_or_build(self, key, output_path, build, ext=".xlsx"):
+        """
+        Copy the artifact for key to output_path, building it first on a miss.
+        build(path) writes the artifact to path. Returns (output_path, hit).
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        stored = self.get(key, ext)
+        if stored is not None:
+            shutil.copyfile(stored, output_path)
+            print(f"Artifact reused: {output_path} ({key[:12]})")
+            return output_path, True
+        build(output_path)
+        self.put(key, output_path, ext)
+        return output_path, False
+
+
+def cached_router(output_path=None, system=None, scenes=None, store=None, project_images=None):
+    """create_av_router() through the store: same system, scenes and images -> the stored workbook."""
+    from tools.av_model import sample_system
+    from tools.images import LOGOS_DIR
+    from tools.scenes import SceneBook, sample_scenes
+
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'av_router.xlsx')
+    if system is None:
+        system = sample_system()
+        if scenes is None:
+            scenes = sample_scenes(system)
+    if isinstance(scenes, str):
+        scenes = SceneBook.load(system, scenes)
+    store = store or ArtifactStore()
+    key = store.key("router", system_digest(system), scenes_digest(scenes), directory_digest(LOGOS_DIR),
+                    images_digest(project_images))
+
+    def build(path):
+        from tools.create_av_router import create_av_router   # openpyxl only on a miss
+        create_av_router(path, system=system, scenes=scenes, deterministic=True, project_images=project_images)
+
+    return store.fetch_or_build(key, output_path, build)[0]
+
+
+if __name__ == "__main__":
+    cached_router()
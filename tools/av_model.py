@@ -0,0 +1,309 @@
+"""
+Shared AV System Model
+Compact, index-based representation of an AV system used by every generator:
+- Device: slotted record holding port ids (array of int), not port dicts
+- PortTable: struct-of-arrays port storage; a port is just an integer id
+- Route: slotted record connecting an output port id to an input port id
+- System: owns all three plus the name -> id indexes
+- PortTemplate: a device model's ports, built once and cloned onto every
+  device of that model with System.add_ports
+
+Device names, port codes and signal types are interned, so a system with
+thousands of identical "HDMI 1" / "Video" ports stores each string once.
+"""
+
+import sys
+from array import array
+
+INPUT = 0
+OUTPUT = 1
+
+_intern = sys.intern
+
+
+def _istr(value):
+    return _intern(str(value)) if value else ""
+
+
+class Device:
+    __slots__ = ("id", "name", "color", "inputs", "outputs", "meta")
+
+    def __init__(self, id, name, color=""):
+        self.id = id
+        self.name = name
+        self.color = color
+        self.inputs = array("i")    # port ids
+        self.outputs = array("i")   # port ids
+        self.meta = None            # generator-specific extras (geometry, model, tag...)
+
+    @property
+    def type(self):
+        if self.outputs and not self.inputs:
+            return "Source"
+        if self.inputs and not self.outputs:
+            return "Destination"
+        return "Processor"
+
+    def __repr__(self):
+        return f"Device({self.id}, {self.name!r}, in={len(self.inputs)}, out={len(self.outputs)})"
+
+
+class PortTable:
+    """Struct-of-arrays port storage. Row index == port id."""
+
+    __slots__ = ("device", "direction", "port", "name", "signal")
+
+    def __init__(self):
+        self.device = array("i")      # owning device id
+        self.direction = array("b")   # INPUT / OUTPUT
+        self.port = []                # interned connector/port code ("HDMI 1")
+        self.name = []                # display name ("Program")
+        self.signal = []              # interned signal type ("Video")
+
+    def append(self, device_id, direction, port, name="", signal=""):
+        pid = len(self.device)
+        self.device.append(device_id)
+        self.direction.append(direction)
+        self.port.append(_istr(port))
+        self.name.append(_istr(name) if name else self.port[-1])
+        self.signal.append(_istr(signal))
+        return pid
+
+    def extend(self, device_id, template):
+        """Append a PortTemplate's ports for one device. Returns the first new port id."""
+        start = len(self.device)
+        self.device.extend(array("i", [device_id]) * len(template))
+        self.direction.extend(template.direction)
+        self.port.extend(template.port)
+        self.name.extend(template.name)
+        self.signal.extend(template.signal)
+        return start
+
+    def __len__(self):
+        return len(self.device)
+
+
+class PortTemplate:
+    """
+    The ports of one device model, interned once. Positions of the inputs and
+    outputs are kept so cloning onto a device is a handful of array extends.
+    """
+
+    __slots__ = ("direction", "port", "name", "signal", "inputs", "outputs")
+
+    def __init__(self, ports):
+        """ports: (direction, port code[, name[, signal]]) tuples."""
+        self.direction = array("b")
+        self.port, self.name, self.signal = [], [], []
+        self.inputs, self.outputs = array("i"), array("i")
+        for i, (direction, port, *rest) in enumerate(ports):
+            port = _istr(port)
+            name = rest[0] if rest else ""
+            self.direction.append(direction)
+            self.port.append(port)
+            self.name.append(_istr(name) if name else port)
+            self.signal.append(_istr(rest[1]) if len(rest) > 1 else "")
+            (self.inputs if direction == INPUT else self.outputs).append(i)
+
+    def __len__(self):
+        return len(self.direction)
+
+
+class Route:
+    __slots__ = ("id", "src", "dst", "signal", "status", "number", "meta")
+
+    def __init__(self, id, src, dst, signal="", status=""):
+        self.id = id
+        self.src = src          # output port id
+        self.dst = dst          # input port id
+        self.signal = signal
+        self.status = status
+        self.number = ""        # wire number (tools/wire_numbers.py), if assigned
+        self.meta = None
+
+    def __repr__(self):
+        return f"Route({self.id}, {self.src} -> {self.dst}, {self.status!r})"
+
+
+class System:
+    __slots__ = ("devices", "ports", "routes", "_device_index", "_port_index")
+
+    def __init__(self):
+        self.devices = []
+        self.ports = PortTable()
+        self.routes = []
+        self._device_index = {}   # name -> device id
+        self._port_index = None   # (device id, direction, port code or name) -> port id, built on demand
+
+    # ===== BUILDING =====
+    def add_device(self, name, color=""):
+        name = _istr(name)
+        if name in self._device_index:
+            raise ValueError(f"Duplicate device name: {name!r}")
+        device = Device(len(self.devices), name, color)
+        self.devices.append(device)
+        self._device_index[name] = device.id
+        return device
+
+    def add_port(self, device, direction, port, name="", signal=""):
+        pid = self.ports.append(device.id, direction, port, name, signal)
+        (device.inputs if direction == INPUT else device.outputs).append(pid)
+        self._port_index = None
+        return pid
+
+    def add_ports(self, device, template):
+        """Clone a PortTemplate onto a device (same result as add_port per port, in order)."""
+        start = self.ports.extend(device.id, template)
+        device.inputs.extend(array("i", [start + i for i in template.inputs]))
+        device.outputs.extend(array("i", [start + i for i in template.outputs]))
+        self._port_index = None
+
+    def add_route(self, src, dst, signal="", status=""):
+        if self.ports.direction[src] != OUTPUT or self.ports.direction[dst] != INPUT:
+            raise ValueError(f"Route must go from an output to an input: {src} -> {dst}")
+        route = Route(len(self.routes), src, dst, _istr(signal or self.ports.signal[src]), _istr(status))
+        self.routes.append(route)
+        return route
+
+    # ===== LOOKUPS =====
+    def device(self, name):
+        return self.devices[self._device_index[name]]
+
+    def has_device(self, name):
+        return name in self._device_index
+
+    def find_port(self, device_name, port, direction=None):
+        """
+        Port id by device name and port code or display name. Pass direction=OUTPUT
+        or INPUT to resolve among that side only ("USB" may be both an input and an
+        output of the same device).
+        """
+        if self._port_index is None:
+            # Index by code and display name, per side and side-less; first port wins on duplicates
+            index = {}
+            ports = self.ports
+            for pid in range(len(ports) - 1, -1, -1):
+                device, side = ports.device[pid], ports.direction[pid]
+                for code in (ports.name[pid], ports.port[pid]):
+                    index[(device, None, code)] = pid
+                    index[(device, side, code)] = pid
+            self._port_index = index
+        return self._port_index[(self._device_index[device_name], direction, port)]
+
+    def port_device(self, pid):
+        return self.devices[self.ports.device[pid]]
+
+    def port_key(self, pid):
+        """Stable text key, e.g. "Laptop|HDMI"."""
+        return f"{self.devices[self.ports.device[pid]].name}|{self.ports.port[pid]}"
+
+    def port_label(self, pid):
+        """Dropdown label, e.g. "Laptop: HDMI"."""
+        return f"{self.devices[self.ports.device[pid]].name}: {self.ports.port[pid]}"
+
+    def sources(self):
+        return [d for d in self.devices if d.outputs]
+
+    def destinations(self):
+        return [d for d in self.devices if d.inputs]
+
+    def all_outputs(self):
+        return [pid for pid in range(len(self.ports)) if self.ports.direction[pid] == OUTPUT]
+
+    def all_inputs(self):
+        return [pid for pid in range(len(self.ports)) if self.ports.direction[pid] == INPUT]
+
+    # ===== CONVERSION =====
+    @classmethod
+    def from_dicts(cls, devices, routes=()):
+        """
+        Build from the legacy dict layout:
+            {"name", "color", "inputs": [{"port", "name", "signal"} | "port"], "outputs": [...]}
+        Routes are (src device, src port, dst device, dst port[, status]) tuples; ports
+        may be given by code or display name. Extra device keys land in Device.meta.
+        """
+        system = cls()
+        for d in devices:
+            device = system.add_device(d["name"], d.get("color", ""))
+            extras = {k: v for k, v in d.items() if k not in ("name", "color", "inputs", "outputs")}
+            device.meta = extras or None
+            for direction, key in ((INPUT, "inputs"), (OUTPUT, "outputs")):
+                for p in d.get(key, ()):
+                    if isinstance(p, str):
+                        system.add_port(device, direction, p)
+                    else:
+                        system.add_port(device, direction, p["port"], p.get("name", ""), p.get("signal", ""))
+        for r in routes:
+            src_dev, src_port, dst_dev, dst_port, *rest = r
+            system.add_route(
+                system.find_port(src_dev, src_port, OUTPUT),
+                system.find_port(dst_dev, dst_port, INPUT),
+                status=rest[0] if rest else "",
+            )
+        return system
+
+
+# ===== SAMPLE SYSTEM =====
+# Shared by the router generators when no system is passed in
+SAMPLE_DEVICES = [
+    {
+        "name": "Laptop",
+        "color": "4472C4",
+        "inputs": [],
+        "outputs": [
+            {"port": "HDMI", "name": "HDMI Out", "signal": "Video"},
+            {"port": "USB-C", "name": "USB-C DP", "signal": "Video"},
+            {"port": "3.5mm", "name": "Headphone", "signal": "Audio"},
+        ]
+    },
+    {
+        "name": "Video Switcher",
+        "color": "7B68EE",
+        "manufacturer": "Blackmagic",
+        "inputs": [
+            {"port": "HDMI 1", "name": "Input 1", "signal": "Video"},
+            {"port": "HDMI 2", "name": "Input 2", "signal": "Video"},
+            {"port": "HDMI 3", "name": "Input 3", "signal": "Video"},
+            {"port": "SDI 1", "name": "SDI In", "signal": "Video"},
+        ],
+        "outputs": [
+            {"port": "HDMI", "name": "Program", "signal": "Video"},
+            {"port": "SDI", "name": "SDI Out", "signal": "Video"},
+        ]
+    },
+    {
+        "name": "Display",
+        "color": "20B2AA",
+        "inputs": [
+            {"port": "HDMI 1", "name": "HDMI Input", "signal": "Video"},
+            {"port": "HDMI 2", "name": "HDMI 2", "signal": "Video"},
+            {"port": "DP", "name": "DisplayPort", "signal": "Video"},
+        ],
+        "outputs": []
+    },
+    {
+        "name": "Audio Mixer",
+        "color": "FF6347",
+        "inputs": [
+            {"port": "XLR 1", "name": "Mic 1", "signal": "Audio"},
+            {"port": "XLR 2", "name": "Mic 2", "signal": "Audio"},
+            {"port": "Line 1", "name": "Line In", "signal": "Audio"},
+            {"port": "USB", "name": "USB Audio", "signal": "Audio"},
+        ],
+        "outputs": [
+            {"port": "XLR L", "name": "Main L", "signal": "Audio"},
+            {"port": "XLR R", "name": "Main R", "signal": "Audio"},
+            {"port": "USB", "name": "USB Out", "signal": "Audio"},
+        ]
+    },
+]
+
+SAMPLE_ROUTES = [
+    ("Laptop", "HDMI Out", "Video Switcher", "Input 1", "Active"),
+    ("Video Switcher", "Program", "Display", "HDMI Input", "Active"),
+    ("Laptop", "3.5mm", "Audio Mixer", "Line In", "Active"),
+]
+
+
+def sample_system():
+    return System.from_dicts(SAMPLE_DEVICES, SAMPLE_ROUTES)
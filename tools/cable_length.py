@@ -0,0 +1,245 @@
+"""
+Cable Length Estimation
+Estimates every run in a .vsf from the drawing instead of trusting hand-typed lengths:
+- Run endpoints are the wire's two anchors (tools/node_layout.py); distance is
+  Manhattan (cable follows trays, not diagonals), times a drawing scale in ft/px
+  and a slack factor for dressing and service loops
+- Optional patch panels / tie-line nodes: a run longer than `direct_max_ft`
+  goes source -> nearest patch point -> patch point nearest the destination ->
+  destination. Nearest points come from a KD-tree, queried for all runs at once
+- Lengths round up to the stock lengths of their cableType (the app's
+  CablePrompt list, capped per type); runs past the longest stock are flagged
+
+All distance math is numpy over whole arrays, so 100k runs take milliseconds.
+
+    est = estimate_project(load_project("show.vsf"), ft_per_px=0.1)
+    est["estimated_ft"], est["stock_ft"]
+"""
+
+import os
+import re
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: numpy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from tools.node_layout import anchor_positions, layout_nodes
+from tools.vsf import device_name, parse_anchor, parse_length_ft
+
+# components/CablePrompt.jsx holds the stock lengths offered in the app; read it instead of copying it
+CABLE_PROMPT_JSX = os.path.join(os.path.dirname(__file__), '..', 'nexus-x', 'src', 'components', 'CablePrompt.jsx')
+_stock_lengths = None
+
+DEFAULT_FT_PER_PX = 0.1    # 10 px per foot; set per drawing
+DEFAULT_SLACK = 1.1        # +10% for dressing, drops and service loops
+DEFAULT_DIRECT_MAX_FT = 50.0
+
+# Longest practical stock run per cable type, ft (passive copper stops well short of fiber)
+MAX_STOCK_FT = {
+    "HDMI 2.0": 50,
+    "DisplayPort 1.4": 15,
+    "DisplayPort 2.0": 10,
+    "USB-C (Thunderbolt 3)": 5,
+    "12G-SDI": 300,
+    "3G-SDI": 300,
+    "CAT5e": 300,
+    "CAT6a": 300,
+    "CAT7": 300,
+}
+
+PATCH_NAME_RE = re.compile(r"patch|tie[\s-]?line|\bPP\b", re.IGNORECASE)
+
+
+def stock_lengths():
+    """Stock lengths in ft from the app's CABLE_LENGTHS list."""
+    global _stock_lengths
+    if _stock_lengths is None:
+        try:
+            with open(CABLE_PROMPT_JSX, encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            text = ""
+        block = re.search(r"CABLE_LENGTHS\s*=\s*\[(.*?)\]", text, re.DOTALL)
+        found = [parse_length_ft(m) for m in re.findall(r"'([^']+)'", block.group(1))] if block else []
+        _stock_lengths = sorted({v for v in found if v}) or [3, 5, 10, 15, 25, 50, 100, 150, 200, 250, 300, 500, 1000]
+    return _stock_lengths
+
+
+def stock_for(cable_type):
+    limit = MAX_STOCK_FT.get(cable_type)
+    lengths = stock_lengths()
+    return [v for v in lengths if v <= limit] if limit else lengths
+
+
+# ===== KD-TREE =====
+class KDTree:
+    """
+    2-D points split at the median of their wider axis; leaves hold up to
+    `leaf_size` points. query() walks the tree with all query points at once:
+    each node splits the batch by side, and only queries whose current best
+    distance reaches past the split plane visit the far child.
+    """
+
+    def __init__(self, points, leaf_size=16):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.leaf_size = leaf_size
+        self.order = np.arange(len(self.points))
+        self.nodes = []   # (axis, split, left, right) or (-1, start, end, 0) for leaves
+        if len(self.points):
+            self._build(0, len(self.points))
+
+    def _build(self, lo, hi):
+        idx = len(self.nodes)
+        self.nodes.append(None)
+        if hi - lo <= self.leaf_size:
+            self.nodes[idx] = (-1, lo, hi, 0)
+            return idx
+        pts = self.points[self.order[lo:hi]]
+        axis = int(np.argmax(pts.max(0) - pts.min(0)))
+        mid = (hi - lo) // 2
+        part = np.argpartition(pts[:, axis], mid)
+        self.order[lo:hi] = self.order[lo:hi][part]
+        split = float(self.points[self.order[lo + mid], axis])
+        left = self._build(lo, lo + mid)
+        right = self._build(lo + mid, hi)
+        self.nodes[idx] = (axis, split, left, right)
+        return idx
+
+    def query(self, xy):
+        """(distance, point index) of the nearest point for each row of xy."""
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        best_d2 = np.full(len(xy), np.inf)
+        best_i = np.full(len(xy), -1, dtype=np.int64)
+        if len(self.points) and len(xy):
+            self._query(0, np.arange(len(xy)), xy, best_d2, best_i)
+        return np.sqrt(best_d2), best_i
+
+    def _query(self, node, q, xy, best_d2, best_i):
+        axis, a, b, c = self.nodes[node]
+        if axis < 0:
+            ids = self.order[a:b]
+            diff = xy[q, None, :] - self.points[ids][None, :, :]
+            d2 = (diff * diff).sum(-1)
+            k = d2.argmin(1)
+            d2 = d2[np.arange(len(q)), k]
+            better = d2 < best_d2[q]
+            best_d2[q[better]] = d2[better]
+            best_i[q[better]] = ids[k[better]]
+            return
+        off = xy[q, axis] - a
+        near_left = off < 0
+        for child, near, far in ((b, near_left, c), (c, ~near_left, b)):
+            sub = q[near]
+            if len(sub):
+                self._query(child, sub, xy, best_d2, best_i)
+                reach = sub[off[near] ** 2 < best_d2[sub]]
+                if len(reach):
+                    self._query(far, reach, xy, best_d2, best_i)
+
+
+# ===== ESTIMATION =====
+def round_to_stock(length_ft, cable_types):
+    """Smallest stock length >= each run for its cable type; NaN past the longest stock."""
+    length_ft = np.asarray(length_ft, dtype=float)
+    out = np.full(len(length_ft), np.nan)
+    types, inverse = np.unique(np.asarray(cable_types, dtype=object).astype(str), return_inverse=True)
+    for t, cable_type in enumerate(types):
+        rows = np.flatnonzero(inverse == t)
+        stock = np.array(stock_for(cable_type), dtype=float)
+        k = np.searchsorted(stock, length_ft[rows] - 1e-9)
+        ok = k < len(stock)
+        out[rows[ok]] = stock[k[ok]]
+    return out
+
+
+def estimate_lengths(src, dst, cable_types, patch_points=None, ft_per_px=DEFAULT_FT_PER_PX,
+                     slack=DEFAULT_SLACK, direct_max_ft=DEFAULT_DIRECT_MAX_FT, direct=None):
+    """
+    src, dst: (n, 2) run endpoints in drawing px. patch_points: (m, 2) or None.
+    direct: optional bool mask of runs that never go through patch points.
+    Returns a dict of arrays: estimated_ft, stock_ft, via_src / via_dst
+    (patch point indexes, -1 for direct runs).
+    """
+    src = np.asarray(src, dtype=float).reshape(-1, 2)
+    dst = np.asarray(dst, dtype=float).reshape(-1, 2)
+    length = np.abs(src - dst).sum(1) * ft_per_px
+    via_src = np.full(len(src), -1, dtype=np.int64)
+    via_dst = np.full(len(src), -1, dtype=np.int64)
+    if patch_points is not None and len(patch_points):
+        pts = np.asarray(patch_points, dtype=float).reshape(-1, 2)
+        use = length > direct_max_ft
+        if direct is not None:
+            use &= ~np.asarray(direct, dtype=bool)
+        rows = np.flatnonzero(use)
+        tree = KDTree(pts)
+        _d, ps = tree.query(src[rows])
+        _d, pd = tree.query(dst[rows])
+        length[rows] = (np.abs(src[rows] - pts[ps]).sum(1) + np.abs(pts[ps] - pts[pd]).sum(1)
+                        + np.abs(pts[pd] - dst[rows]).sum(1)) * ft_per_px
+        via_src[rows], via_dst[rows] = ps, pd
+    estimated = np.round(length * slack, 1)
+    return {
+        "estimated_ft": estimated,
+        "stock_ft": round_to_stock(estimated, cable_types),
+        "via_src": via_src,
+        "via_dst": via_dst,
+    }
+
+
+def is_patch_node(node):
+    return any(PATCH_NAME_RE.search(str(node.get(k) or "")) for k in ("title", "model", "tag"))
+
+
+def estimate_project(project, ft_per_px=DEFAULT_FT_PER_PX, patch=None, slack=DEFAULT_SLACK,
+                     direct_max_ft=DEFAULT_DIRECT_MAX_FT):
+    """
+    Estimate every connection in a project.
+    patch: node ids or names to use as patch points (default: nodes named like a
+    patch panel or tie line). Runs that start or end on a patch node are direct.
+    Returns the estimate_lengths() dict plus "connections" (the wires estimated,
+    in order) and "patch_nodes" (node ids behind via_src / via_dst).
+    """
+    boxes = layout_nodes(project)
+    anchors = anchor_positions(boxes)
+    if patch is None:
+        patch_ids = [b.id for b in boxes if is_patch_node(b.node)]
+    else:
+        wanted = set(patch)
+        patch_ids = [b.id for b in boxes if b.id in wanted or device_name(b.node) in wanted]
+    patch_set = set(patch_ids)
+    centers = {b.id: ((b.bounds[0] + b.bounds[2]) / 2, (b.bounds[1] + b.bounds[3]) / 2) for b in boxes}
+
+    conns, src, dst, types, direct = [], [], [], [], []
+    for conn in project.get("connections") or []:
+        a, b = anchors.get(conn.get("from")), anchors.get(conn.get("to"))
+        if a is None or b is None:
+            continue
+        conns.append(conn)
+        src.append(a[:2])
+        dst.append(b[:2])
+        types.append(conn.get("cableType") or "")
+        direct.append(parse_anchor(conn["from"])[0] in patch_set or parse_anchor(conn["to"])[0] in patch_set)
+
+    est = estimate_lengths(
+        src, dst, types, [centers[i] for i in patch_ids] or None, ft_per_px=ft_per_px,
+        slack=slack, direct_max_ft=direct_max_ft, direct=direct,
+    )
+    est["connections"] = conns
+    est["patch_nodes"] = patch_ids
+    return est
+
+
+def run_status(entered_ft, stock_ft):
+    """Compare an entered length with the estimate: Blank / No stock / Short / Long / OK."""
+    if entered_ft is None:
+        return "Blank"
+    if stock_ft != stock_ft:   # NaN
+        return "No stock"
+    if entered_ft < stock_ft:
+        return "Short"
+    if entered_ft >= 2 * stock_ft:
+        return "Long"
+    return "OK"
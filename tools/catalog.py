@@ -0,0 +1,402 @@
+"""
+Project Catalog (SQLite)
+Indexes an archive of nexus-x .vsf projects into one local SQLite database:
+- files: one row per project file, keyed by path, with its SHA-256
+- nodes: model / manufacturer / tag / signal color / position per device
+- rows: every section row (port, connector, resolution, rate)
+- connections: every wire with cable type and length (parsed to feet)
+- search: FTS5 table over devices, ports and cables
+
+Re-indexing is incremental: files whose hash has not changed are skipped, and a
+changed file has its rows replaced inside a single transaction.
+
+    python -m tools catalog index ~/Shows
+    python -m tools catalog search "URSA Broadcast"
+    python -m tools catalog cables --model "URSA Broadcast G2" --cable-type "SMPTE Fiber" --min-ft 300
+    python -m tools router --catalog .tmp/catalog.sqlite --project "GEAR"
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from tools.av_model import INPUT, OUTPUT, System
+from tools.vsf import (
+    SECTION_IDS, device_name, normalize_project, parse_anchor, parse_length_ft, port_column, signal_color_hex,
+    unique_device_name,
+)
+
+DEFAULT_DB = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'catalog.sqlite')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id          INTEGER PRIMARY KEY,
+    path        TEXT NOT NULL UNIQUE,
+    sha256      TEXT NOT NULL,
+    project_id  TEXT,
+    name        TEXT,
+    version     TEXT,
+    saved_at    TEXT,
+    indexed_at  REAL
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    file_id      INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    node_id      TEXT NOT NULL,
+    name         TEXT,
+    title        TEXT,
+    model        TEXT,
+    manufacturer TEXT,
+    tag          TEXT,
+    signal_color TEXT,
+    device_types TEXT,
+    x            REAL,
+    y            REAL,
+    PRIMARY KEY (file_id, node_id)
+);
+CREATE TABLE IF NOT EXISTS rows (
+    file_id     INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    node_id     TEXT NOT NULL,
+    section     TEXT NOT NULL,
+    row_idx     INTEGER NOT NULL,
+    port        TEXT,
+    connector   TEXT,
+    resolution  TEXT,
+    rate        TEXT,
+    cells       TEXT,
+    PRIMARY KEY (file_id, node_id, section, row_idx)
+);
+CREATE TABLE IF NOT EXISTS connections (
+    file_id      INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    wire_id      TEXT,
+    from_anchor  TEXT,
+    to_anchor    TEXT,
+    from_node    TEXT,
+    to_node      TEXT,
+    cable_type   TEXT,
+    cable_length TEXT,
+    length_ft    REAL,
+    label        TEXT,
+    rp_code      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_nodes_model ON nodes(model);
+CREATE INDEX IF NOT EXISTS idx_nodes_manufacturer ON nodes(manufacturer);
+CREATE INDEX IF NOT EXISTS idx_rows_connector ON rows(connector);
+CREATE INDEX IF NOT EXISTS idx_conn_file ON connections(file_id);
+CREATE INDEX IF NOT EXISTS idx_conn_cable ON connections(cable_type, length_ft);
+CREATE INDEX IF NOT EXISTS idx_conn_from ON connections(file_id, from_node);
+CREATE INDEX IF NOT EXISTS idx_conn_to ON connections(file_id, to_node);
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(
+    kind UNINDEXED, file_id UNINDEXED, ref UNINDEXED, text,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def connect(db_path=DEFAULT_DB):
+    if db_path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def iter_project_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield os.path.abspath(path)
+            continue
+        for root, _dirs, files in os.walk(path):
+            for name in sorted(files):
+                if name.lower().endswith(".vsf"):
+                    yield os.path.abspath(os.path.join(root, name))
+
+
+def _cell(section, row, col_name):
+    cols = section.get("cols") or []
+    if col_name in cols:
+        i = cols.index(col_name)
+        return row[i] if i < len(row) else ""
+    return ""
+
+
+def extract(project):
+    """Flatten a project into (node rows, section rows, connection rows, search rows) tuples."""
+    node_rows, section_rows, conn_rows, search_rows = [], [], [], []
+    nodes = project["nodes"]
+
+    for node_id, node in nodes.items():
+        pos = node.get("position") or {}
+        name = device_name(node)
+        node_rows.append((
+            node_id, name, node.get("title"), node.get("model"), node.get("manufacturer"),
+            node.get("tag"), node.get("signalColor"), ",".join(node.get("deviceTypes") or ()),
+            pos.get("x"), pos.get("y"),
+        ))
+        search_rows.append(("node", node_id, " ".join(filter(None, (
+            name, node.get("title"), node.get("model"), node.get("manufacturer"),
+            " ".join(node.get("deviceTypes") or ()),
+        )))))
+        for sec_id in SECTION_IDS:
+            section = (node.get("sections") or {}).get(sec_id)
+            if not section:
+                continue
+            col = port_column(section)
+            for ri, row in enumerate(section.get("rows") or ()):
+                port = row[col] if col < len(row) else ""
+                section_rows.append((
+                    node_id, sec_id, ri, port,
+                    _cell(section, row, "CONNECTOR"), _cell(section, row, "RESOLUTION"),
+                    _cell(section, row, "RATE"), json.dumps(row),
+                ))
+                text = " ".join(str(v) for v in row if v)
+                if text:
+                    search_rows.append(("row", f"{node_id}-{sec_id}-{ri}", f"{name} {text}"))
+
+    for c in project.get("connections") or ():
+        from_anchor, to_anchor = c.get("from") or "", c.get("to") or ""
+        try:
+            from_node = parse_anchor(from_anchor)[0]
+            to_node = parse_anchor(to_anchor)[0]
+        except ValueError:
+            from_node = to_node = None
+        length = c.get("cableLength") or c.get("length") or ""
+        conn_rows.append((
+            c.get("id"), from_anchor, to_anchor, from_node, to_node,
+            c.get("cableType"), length, parse_length_ft(length), c.get("label"), c.get("rpCode"),
+        ))
+        text = " ".join(filter(None, (c.get("cableType"), length, c.get("label"), c.get("rpCode"), c.get("description"))))
+        if text:
+            search_rows.append(("wire", c.get("id") or from_anchor, text))
+
+    return node_rows, section_rows, conn_rows, search_rows
+
+
+def index_file(conn, path, sha=None):
+    """(Re)index one file. Returns True if it was written, False if unchanged."""
+    sha = sha or file_sha256(path)
+    existing = conn.execute("SELECT id, sha256 FROM files WHERE path = ?", (path,)).fetchone()
+    if existing and existing[1] == sha:
+        return False
+
+    with open(path, encoding="utf-8") as f:
+        project = normalize_project(json.load(f))
+    node_rows, section_rows, conn_rows, search_rows = extract(project)
+
+    with conn:  # one transaction per file
+        if existing:
+            file_id = existing[0]
+            remove_file_rows(conn, file_id)
+            conn.execute(
+                "UPDATE files SET sha256 = ?, project_id = ?, name = ?, version = ?, saved_at = ?, indexed_at = ? WHERE id = ?",
+                (sha, project.get("id"), project.get("name"), project.get("version"), project.get("savedAt"), time.time(), file_id),
+            )
+        else:
+            file_id = conn.execute(
+                "INSERT INTO files (path, sha256, project_id, name, version, saved_at, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, sha, project.get("id"), project.get("name"), project.get("version"), project.get("savedAt"), time.time()),
+            ).lastrowid
+        conn.executemany("INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         [(file_id, *r) for r in node_rows])
+        conn.executemany("INSERT INTO rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         [(file_id, *r) for r in section_rows])
+        conn.executemany("INSERT INTO connections VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         [(file_id, *r) for r in conn_rows])
+        conn.executemany("INSERT INTO search (kind, file_id, ref, text) VALUES (?, ?, ?, ?)",
+                         [(kind, file_id, ref, text) for kind, ref, text in search_rows])
+    return True
+
+
+def remove_file_rows(conn, file_id):
+    for table in ("nodes", "rows", "connections", "search"):
+        conn.execute(f"DELETE FROM {table} WHERE file_id = ?", (file_id,))
+
+
+def index_paths(conn, paths, prune=False):
+    """Index every .vsf under `paths`. Returns (indexed, unchanged, failed) counts."""
+    indexed = unchanged = failed = 0
+    seen = set()
+    for path in iter_project_files(paths):
+        seen.add(path)
+        try:
+            if index_file(conn, path):
+                indexed += 1
+            else:
+                unchanged += 1
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            failed += 1
+            print(f"  skipped {path}: {e}")
+    if prune:
+        with conn:
+            for file_id, path in conn.execute("SELECT id, path FROM files").fetchall():
+                if path not in seen and not os.path.exists(path):
+                    remove_file_rows(conn, file_id)
+                    conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+    return indexed, unchanged, failed
+
+
+# ===== QUERIES =====
+def fts_query(text):
+    """
+    User text -> FTS5 query: every word is matched as a quoted phrase, so
+    "12G-SDI" or "M/E 1" are searched for rather than parsed as query syntax.
+    A trailing * keeps its prefix meaning.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*") and len(word) > 1
+        word = word[:-1] if prefix else word
+        terms.append('"' + word.replace('"', '""') + '"' + (" *" if prefix else ""))
+    return " ".join(terms)
+
+
+def search(conn, query, limit=50):
+    """Full-text search for all words of query. Returns (file path, project name, kind, ref, snippet) rows."""
+    query = fts_query(query)
+    if not query:
+        return []
+    return conn.execute(
+        """
+        SELECT f.path, f.name, s.kind, s.ref, snippet(search, 3, '[', ']', '…', 12)
+        FROM search s JOIN files f ON f.id = s.file_id
+        WHERE search MATCH ?
+        ORDER BY rank
+        LIMIT ?
+        """,
+        (query, limit),
+    ).fetchall()
+
+
+def find_cables(conn, model=None, manufacturer=None, cable_type=None, min_ft=None):
+    """
+    Wires attached to a device matching model/manufacturer, filtered by cable type
+    and minimum length. Returns (file path, project, device, wire id, cable type, length) rows.
+    """
+    where, params = [], []
+    if model:
+        where.append("n.model = ?")
+        params.append(model)
+    if manufacturer:
+        where.append("n.manufacturer = ?")
+        params.append(manufacturer)
+    if cable_type:
+        where.append("c.cable_type = ? COLLATE NOCASE")
+        params.append(cable_type)
+    if min_ft is not None:
+        where.append("c.length_ft >= ?")
+        params.append(min_ft)
+    sql = f"""
+        SELECT DISTINCT f.path, f.name, n.name, c.wire_id, c.cable_type, c.cable_length
+        FROM connections c
+        JOIN nodes n ON n.file_id = c.file_id AND n.node_id IN (c.from_node, c.to_node)
+        JOIN files f ON f.id = c.file_id
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY f.name, n.name
+    """
+    return conn.execute(sql, params).fetchall()
+
+
+def load_system(conn, project=None, model=None, manufacturer=None):
+    """
+    Build an av_model.System straight from catalog rows.
+    `project` matches a file path or project name; model/manufacturer narrow the
+    device set. Routes are kept when both ends are in the selected devices.
+    """
+    where, params = [], []
+    if project:
+        where.append("(f.path = ? OR f.name = ?)")
+        params += [project, project]
+    if model:
+        where.append("n.model = ?")
+        params.append(model)
+    if manufacturer:
+        where.append("n.manufacturer = ?")
+        params.append(manufacturer)
+    node_sql = f"""
+        SELECT n.file_id, n.node_id, n.name, n.signal_color, n.model, n.manufacturer, n.tag, n.device_types
+        FROM nodes n JOIN files f ON f.id = n.file_id
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY f.id, n.rowid
+    """
+    system = System()
+    devices = {}   # (file id, node id) -> Device
+    seen = {}
+    for file_id, node_id, name, color, model_, manufacturer_, tag, types in conn.execute(node_sql, params):
+        name = unique_device_name(system, name or node_id, seen)
+        device = system.add_device(name, signal_color_hex(color))
+        device.meta = {"id": node_id, "model": model_, "manufacturer": manufacturer_, "tag": tag,
+                       "deviceTypes": types.split(",") if types else []}
+        devices[(file_id, node_id)] = device
+    if not devices:
+        return system
+
+    anchors = {}
+    file_ids = sorted({k[0] for k in devices})
+    marks = ",".join("?" * len(file_ids))
+    wired = {}
+    for file_id, from_anchor, to_anchor in conn.execute(
+            f"SELECT file_id, from_anchor, to_anchor FROM connections WHERE file_id IN ({marks})", file_ids):
+        wired.setdefault((file_id, from_anchor), OUTPUT)
+        wired.setdefault((file_id, to_anchor), INPUT)
+    for file_id, node_id, section, row_idx, port in conn.execute(
+            f"SELECT file_id, node_id, section, row_idx, port FROM rows WHERE file_id IN ({marks}) "
+            f"ORDER BY file_id, node_id, section, row_idx", file_ids):
+        device = devices.get((file_id, node_id))
+        if device is None:
+            continue
+        aid = f"{node_id}-{section}-{row_idx}"
+        direction = {"a": INPUT, "b": OUTPUT}.get(section, wired.get((file_id, aid)))
+        if direction is None:
+            continue
+        anchors[(file_id, aid)] = system.add_port(device, direction, port or f"{section.upper()}{row_idx + 1}")
+
+    for file_id, wire_id, from_anchor, to_anchor, cable_type, cable_length in conn.execute(
+            f"SELECT file_id, wire_id, from_anchor, to_anchor, cable_type, cable_length FROM connections "
+            f"WHERE file_id IN ({marks}) ORDER BY rowid", file_ids):
+        src = anchors.get((file_id, from_anchor))
+        dst = anchors.get((file_id, to_anchor))
+        if src is None or dst is None:
+            continue
+        if system.ports.direction[src] != OUTPUT or system.ports.direction[dst] != INPUT:
+            continue
+        route = system.add_route(src, dst, signal=cable_type or "")
+        route.meta = {"id": wire_id, "cableType": cable_type, "cableLength": cable_length}
+    return system
+
+
+# ===== CLI =====
+def run(args):
+    conn = connect(args.db)
+    try:
+        if args.action == "index":
+            start = time.perf_counter()
+            indexed, unchanged, failed = index_paths(conn, args.paths, prune=args.prune)
+            print(f"Catalog {args.db}: {indexed} indexed, {unchanged} unchanged, {failed} failed "
+                  f"({time.perf_counter() - start:.2f} s)")
+            return 1 if failed else 0
+        if args.action == "search":
+            for path, name, kind, ref, snippet in search(conn, args.query, limit=args.limit):
+                print(f"{name or os.path.basename(path)}  [{kind}] {ref}: {snippet}")
+            return 0
+        if args.action == "cables":
+            rows = find_cables(conn, model=args.model, manufacturer=args.manufacturer,
+                               cable_type=args.cable_type, min_ft=args.min_ft)
+            for path, name, device, wire_id, cable_type, length in rows:
+                print(f"{name or os.path.basename(path)}  {device}  {wire_id}  {cable_type}  {length}")
+            print(f"{len(rows)} matching wires")
+            return 0
+    finally:
+        conn.close()
+    return 2
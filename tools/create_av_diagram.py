@@ -3,14 +3,92 @@ AV Diagram with Movable Shapes and Anchor Connectors
 Creates Excel with:
 - Movable device boxes (shapes)
 - Anchor points on edges for connections
-- Connector lines between devices
+- Wires routed port-to-port around device boxes (see tools/wire_router.py)
+- Device images from the project, or manufacturer logos, inside device boxes
+  (cached thumbnails, see tools/images.py)
+- Devices placed where the .vsf canvas has them; devices without geometry
+  (catalog, presets) stacked in source / processor / destination columns
 - Add/delete controls
 """
 
 import os
 import sys
 
-def create_av_diagram(output_path=None):
+if __package__ in (None, ""):
+    # Run as a script (python tools/create_av_diagram.py): put the repo root on the path so `tools` imports
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.av_model import System
+from tools.images import ImageStore, fit_size
+from tools.wire_router import WireRouter
+
+# Auto layout for devices without geometry (catalog, presets): points
+LAYOUT_LEFT, LAYOUT_TOP = 80, 100
+LAYOUT_COL_GAP, LAYOUT_ROW_GAP = 230, 40
+BOX_W, BOX_MIN_H, PORT_PITCH = 140, 80, 18
+LAYOUT_COLUMNS = {"Source": 0, "Processor": 1, "Destination": 2}
+PX_TO_PT = 0.75     # .vsf canvas px (96 DPI) -> points
+
+
+def _canvas_position(meta):
+    position = (meta or {}).get("position")
+    if isinstance(position, dict) and all(isinstance(position.get(k), (int, float)) for k in ("x", "y")):
+        return position["x"], position["y"]
+    return None
+
+
+def port_height(device):
+    return max(BOX_MIN_H, 24 + PORT_PITCH * max(len(device.inputs), len(device.outputs)))
+
+
+def device_geometry(system):
+    """
+    Device.meta plus x, y, w, h per device id. Devices from a .vsf keep their
+    canvas layout (position scaled to points, the top-left one at the layout
+    origin). Devices that carry neither geometry nor a position are stacked in
+    three columns to the right of those: sources, processors, destinations.
+    Boxes are tall enough for their ports.
+    """
+    geometry = {}
+    stacked = []
+    positions = {d.id: _canvas_position(d.meta) for d in system.devices}
+    min_x = min((p[0] for p in positions.values() if p), default=0)
+    min_y = min((p[1] for p in positions.values() if p), default=0)
+    right = LAYOUT_LEFT - LAYOUT_COL_GAP
+    for device in system.devices:
+        dev = dict(device.meta or {})
+        if not all(k in dev for k in ("x", "y", "w", "h")):
+            if positions[device.id] is None:
+                stacked.append(device)
+                continue
+            x, y = positions[device.id]
+            dev.update(x=LAYOUT_LEFT + (x - min_x) * PX_TO_PT, y=LAYOUT_TOP + (y - min_y) * PX_TO_PT,
+                       w=BOX_W, h=port_height(device))
+        right = max(right, dev["x"])
+        geometry[device.id] = dev
+    left = right + LAYOUT_COL_GAP
+    next_y = {}
+    for device in stacked:
+        col = LAYOUT_COLUMNS[device.type]
+        h = port_height(device)
+        y = next_y.get(col, LAYOUT_TOP)
+        geometry[device.id] = dict(device.meta or {}, x=left + col * LAYOUT_COL_GAP, y=y, w=BOX_W, h=h)
+        next_y[col] = y + h + LAYOUT_ROW_GAP
+    return {device.id: geometry[device.id] for device in system.devices}
+
+
+def color_value(color, default=0x7F7F7F):
+    """Excel RGB int from an int (already BGR-packed) or a hex string such as "4472C4"."""
+    if isinstance(color, int):
+        return color
+    try:
+        r, g, b = bytes.fromhex(str(color).lstrip("#"))
+    except ValueError:
+        return default
+    return r + (g * 256) + (b * 256 * 256)
+
+
+def create_av_diagram(output_path=None, system=None, images=None, project_images=None):
     if output_path is None:
         output_path = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'av_diagram.xlsm')
 
@@ -58,100 +136,122 @@ def create_av_diagram(output_path=None):
         # Shape constants
         msoShapeRoundedRectangle = 5
         msoShapeOval = 9
-        msoConnectorStraight = 1
-        msoConnectorElbow = 2
-
-        devices = [
-            {"name": "Laptop", "x": 50, "y": 100, "w": 140, "h": 80, "color": rgb(68, 114, 196), "outputs": ["HDMI", "USB-C"]},
-            {"name": "Switcher", "x": 280, "y": 100, "w": 140, "h": 120, "color": rgb(123, 104, 238), "inputs": ["IN 1", "IN 2", "IN 3"], "outputs": ["OUT"]},
-            {"name": "Display", "x": 510, "y": 100, "w": 140, "h": 80, "color": rgb(32, 178, 170), "inputs": ["HDMI"]},
-            {"name": "Audio Mixer", "x": 280, "y": 280, "w": 140, "h": 100, "color": rgb(255, 99, 71), "inputs": ["CH1", "CH2"], "outputs": ["Main L", "Main R"]},
-        ]
-
-        shapes_dict = {}
-
-        for dev in devices:
+        msoEditingAuto = 0
+        msoSegmentLine = 0
+
+        # Device geometry lives in Device.meta: x, y, w, h (points); device_geometry() lays out the rest
+        if system is None:
+            system = System.from_dicts([
+                {"name": "Laptop", "x": 50, "y": 100, "w": 140, "h": 80, "color": rgb(68, 114, 196), "outputs": ["HDMI", "USB-C"]},
+                {"name": "Switcher", "x": 280, "y": 100, "w": 140, "h": 120, "color": rgb(123, 104, 238), "manufacturer": "Blackmagic", "inputs": ["IN 1", "IN 2", "IN 3"], "outputs": ["OUT"]},
+                {"name": "Display", "x": 510, "y": 100, "w": 140, "h": 80, "color": rgb(32, 178, 170), "inputs": ["HDMI"]},
+                {"name": "Audio Mixer", "x": 280, "y": 280, "w": 140, "h": 100, "color": rgb(255, 99, 71), "inputs": ["CH1", "CH2"], "outputs": ["Main L", "Main R"]},
+            ], [
+                ("Laptop", "HDMI", "Switcher", "IN 1"),
+                ("Switcher", "OUT", "Display", "HDMI"),
+            ])
+        ports = system.ports
+        geometry = device_geometry(system)
+        if images is None:
+            images = ImageStore()
+
+        anchor_xy = {}   # port id -> (x, y, side) at the centre of its anchor oval
+
+        for device in system.devices:
+            dev = geometry[device.id]
             # Main device shape
             shp = ws.Shapes.AddShape(msoShapeRoundedRectangle, dev["x"], dev["y"], dev["w"], dev["h"])
-            shp.Name = dev["name"]
-            shp.Fill.ForeColor.RGB = dev["color"]
+            shp.Name = device.name
+            shp.Fill.ForeColor.RGB = color_value(device.color)
             shp.Line.ForeColor.RGB = rgb(255, 255, 255)
             shp.Line.Weight = 2
 
             # Device title
-            shp.TextFrame2.TextRange.Text = dev["name"]
+            shp.TextFrame2.TextRange.Text = device.name
             shp.TextFrame2.TextRange.Font.Fill.ForeColor.RGB = rgb(255, 255, 255)
             shp.TextFrame2.TextRange.Font.Bold = True
             shp.TextFrame2.TextRange.Font.Size = 12
             shp.TextFrame2.TextRange.ParagraphFormat.Alignment = 2  # Center
             shp.TextFrame2.VerticalAnchor = 1  # Top
 
-            shapes_dict[dev["name"]] = shp
+
+            # Device image or manufacturer logo along the bottom of the box
+            logo = images.device_image(device.meta, project_images)
+            if logo is not None:
+                box_w, box_h = dev["w"] - 20, 24
+                logo = images.thumbnail(logo, box_w * 2, box_h * 2)  # 2x for print
+                w, h = fit_size(logo, box_w, box_h)
+                pic = ws.Shapes.AddPicture(os.path.abspath(logo.path), False, True,
+                                           dev["x"] + (dev["w"] - w) / 2, dev["y"] + dev["h"] - h - 8, w, h)
+                pic.Name = f"{device.name}_logo"
 
             # ===== INPUT ANCHOR POINTS (Left edge) =====
-            if "inputs" in dev:
-                input_count = len(dev["inputs"])
-                for i, inp in enumerate(dev["inputs"]):
-                    # Calculate vertical position
-                    y_offset = dev["h"] * (i + 1) / (input_count + 1)
-
-                    # Small circle as anchor point on left edge
-                    anchor = ws.Shapes.AddShape(msoShapeOval, dev["x"] - 8, dev["y"] + y_offset - 6, 12, 12)
-                    anchor.Name = f"{dev['name']}_IN_{inp}"
-                    anchor.Fill.ForeColor.RGB = rgb(46, 125, 50)  # Green for input
-                    anchor.Line.ForeColor.RGB = rgb(255, 255, 255)
-                    anchor.Line.Weight = 1
-
-                    # Label
-                    lbl = ws.Shapes.AddTextbox(1, dev["x"] - 50, dev["y"] + y_offset - 8, 40, 16)
-                    lbl.Name = f"{dev['name']}_IN_{inp}_lbl"
-                    lbl.TextFrame2.TextRange.Text = inp
-                    lbl.TextFrame2.TextRange.Font.Size = 8
-                    lbl.TextFrame2.TextRange.Font.Fill.ForeColor.RGB = rgb(200, 200, 200)
-                    lbl.TextFrame2.TextRange.ParagraphFormat.Alignment = 3  # Right
-                    lbl.Fill.Visible = False
-                    lbl.Line.Visible = False
+            input_count = len(device.inputs)
+            for i, pid in enumerate(device.inputs):
+                inp = ports.port[pid]
+                # Calculate vertical position
+                y_offset = dev["h"] * (i + 1) / (input_count + 1)
+
+                # Small circle as anchor point on left edge
+                anchor = ws.Shapes.AddShape(msoShapeOval, dev["x"] - 8, dev["y"] + y_offset - 6, 12, 12)
+                anchor.Name = f"{device.name}_IN_{inp}"
+                anchor_xy[pid] = (dev["x"] - 2, dev["y"] + y_offset, "left")
+                anchor.Fill.ForeColor.RGB = rgb(46, 125, 50)  # Green for input
+                anchor.Line.ForeColor.RGB = rgb(255, 255, 255)
+                anchor.Line.Weight = 1
+
+                # Label
+                lbl = ws.Shapes.AddTextbox(1, dev["x"] - 50, dev["y"] + y_offset - 8, 40, 16)
+                lbl.Name = f"{device.name}_IN_{inp}_lbl"
+                lbl.TextFrame2.TextRange.Text = inp
+                lbl.TextFrame2.TextRange.Font.Size = 8
+                lbl.TextFrame2.TextRange.Font.Fill.ForeColor.RGB = rgb(200, 200, 200)
+                lbl.TextFrame2.TextRange.ParagraphFormat.Alignment = 3  # Right
+                lbl.Fill.Visible = False
+                lbl.Line.Visible = False
 
             # ===== OUTPUT ANCHOR POINTS (Right edge) =====
-            if "outputs" in dev:
-                output_count = len(dev["outputs"])
-                for i, out in enumerate(dev["outputs"]):
-                    y_offset = dev["h"] * (i + 1) / (output_count + 1)
-
-                    # Small circle as anchor point on right edge
-                    anchor = ws.Shapes.AddShape(msoShapeOval, dev["x"] + dev["w"] - 4, dev["y"] + y_offset - 6, 12, 12)
-                    anchor.Name = f"{dev['name']}_OUT_{out}"
-                    anchor.Fill.ForeColor.RGB = rgb(21, 101, 192)  # Blue for output
-                    anchor.Line.ForeColor.RGB = rgb(255, 255, 255)
-                    anchor.Line.Weight = 1
-
-                    # Label
-                    lbl = ws.Shapes.AddTextbox(1, dev["x"] + dev["w"] + 10, dev["y"] + y_offset - 8, 50, 16)
-                    lbl.Name = f"{dev['name']}_OUT_{out}_lbl"
-                    lbl.TextFrame2.TextRange.Text = out
-                    lbl.TextFrame2.TextRange.Font.Size = 8
-                    lbl.TextFrame2.TextRange.Font.Fill.ForeColor.RGB = rgb(200, 200, 200)
-                    lbl.Fill.Visible = False
-                    lbl.Line.Visible = False
+            output_count = len(device.outputs)
+            for i, pid in enumerate(device.outputs):
+                out = ports.port[pid]
+                y_offset = dev["h"] * (i + 1) / (output_count + 1)
+
+                # Small circle as anchor point on right edge
+                anchor = ws.Shapes.AddShape(msoShapeOval, dev["x"] + dev["w"] - 4, dev["y"] + y_offset - 6, 12, 12)
+                anchor.Name = f"{device.name}_OUT_{out}"
+                anchor_xy[pid] = (dev["x"] + dev["w"] + 2, dev["y"] + y_offset, "right")
+                anchor.Fill.ForeColor.RGB = rgb(21, 101, 192)  # Blue for output
+                anchor.Line.ForeColor.RGB = rgb(255, 255, 255)
+                anchor.Line.Weight = 1
+
+                # Label
+                lbl = ws.Shapes.AddTextbox(1, dev["x"] + dev["w"] + 10, dev["y"] + y_offset - 8, 50, 16)
+                lbl.Name = f"{device.name}_OUT_{out}_lbl"
+                lbl.TextFrame2.TextRange.Text = out
+                lbl.TextFrame2.TextRange.Font.Size = 8
+                lbl.TextFrame2.TextRange.Font.Fill.ForeColor.RGB = rgb(200, 200, 200)
+                lbl.Fill.Visible = False
+                lbl.Line.Visible = False
 
         # ===== CONNECTOR LINES =====
-        # Laptop HDMI -> Switcher IN 1
-        conn1 = ws.Shapes.AddConnector(msoConnectorElbow, 0, 0, 0, 0)
-        conn1.Name = "Conn_Laptop_Switcher"
-        conn1.ConnectorFormat.BeginConnect(shapes_dict["Laptop"], 4)  # Right edge
-        conn1.ConnectorFormat.EndConnect(shapes_dict["Switcher"], 2)  # Left edge
-        conn1.Line.ForeColor.RGB = rgb(0, 255, 100)
-        conn1.Line.Weight = 2
-        conn1.Line.EndArrowheadStyle = 2  # Arrow
-
-        # Switcher OUT -> Display
-        conn2 = ws.Shapes.AddConnector(msoConnectorElbow, 0, 0, 0, 0)
-        conn2.Name = "Conn_Switcher_Display"
-        conn2.ConnectorFormat.BeginConnect(shapes_dict["Switcher"], 4)
-        conn2.ConnectorFormat.EndConnect(shapes_dict["Display"], 2)
-        conn2.Line.ForeColor.RGB = rgb(0, 255, 100)
-        conn2.Line.Weight = 2
-        conn2.Line.EndArrowheadStyle = 2
+        # Port anchor to port anchor, orthogonal, around every device box
+        router = WireRouter([
+            (g["x"], g["y"], g["x"] + g["w"], g["y"] + g["h"])
+            for g in geometry.values()
+        ])
+        for route in system.routes:
+            src_name = system.port_device(route.src).name
+            dst_name = system.port_device(route.dst).name
+            points = router.route(anchor_xy[route.src], anchor_xy[route.dst])
+            ff = ws.Shapes.BuildFreeform(msoEditingAuto, *points[0])
+            for x, y in points[1:]:
+                ff.AddNodes(msoSegmentLine, msoEditingAuto, x, y)
+            conn = ff.ConvertToShape()
+            conn.Name = f"Conn_{src_name}_{ports.port[route.src]}_{dst_name}_{ports.port[route.dst]}"
+            conn.Fill.Visible = False
+            conn.Line.ForeColor.RGB = rgb(0, 255, 100)
+            conn.Line.Weight = 2
+            conn.Line.EndArrowheadStyle = 2  # Arrow
 
         # ===== DATA TABLE SHEET =====
         ws2 = wb.Worksheets.Add(After=wb.Worksheets(wb.Worksheets.Count))
@@ -170,13 +270,13 @@ def create_av_diagram(output_path=None):
             cell.Interior.Color = rgb(50, 50, 70)
 
         # Data rows
-        for row, dev in enumerate(devices, 2):
-            ws2.Cells(row, 1).Value = dev["name"]
-            ws2.Cells(row, 2).Value = "Source" if "outputs" in dev and "inputs" not in dev else "Dest" if "inputs" in dev and "outputs" not in dev else "Processor"
-            ws2.Cells(row, 3).Value = ", ".join(dev.get("inputs", []))
-            ws2.Cells(row, 4).Value = ", ".join(dev.get("outputs", []))
-            ws2.Cells(row, 5).Value = dev["x"]
-            ws2.Cells(row, 6).Value = dev["y"]
+        for row, device in enumerate(system.devices, 2):
+            ws2.Cells(row, 1).Value = device.name
+            ws2.Cells(row, 2).Value = "Dest" if device.type == "Destination" else device.type
+            ws2.Cells(row, 3).Value = ", ".join(ports.port[pid] for pid in device.inputs)
+            ws2.Cells(row, 4).Value = ", ".join(ports.port[pid] for pid in device.outputs)
+            ws2.Cells(row, 5).Value = geometry[device.id]["x"]
+            ws2.Cells(row, 6).Value = geometry[device.id]["y"]
             ws2.Cells(row, 7).Value = "Custom"
             for col in range(1, 8):
                 ws2.Cells(row, col).Font.Color = rgb(200, 200, 200)
@@ -5,16 +5,75 @@ Creates Excel workbook with:
 - Individual device I/O tables
 - Routing matrix (anchor points connecting devices)
 - Signal flow tracking
+- Device images embedded in the project, or manufacturer logos, on device sheets
+  (stored once in xl/media, see tools/images.py)
+
+`external` makes a shard (tools/router_shards.py): those devices are listed and
+routed but have no sheet here; their link opens their sheet in another workbook.
 """
 
 import os
+import sys
+from copy import copy
+
 from openpyxl import Workbook
+from openpyxl.cell.cell import MergedCell
 from openpyxl.worksheet.datavalidation import DataValidation
+from openpyxl.worksheet.hyperlink import Hyperlink
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 from openpyxl.utils import get_column_letter
 from openpyxl.workbook.defined_name import DefinedName
 
-def create_av_router(output_path=None):
+if __package__ in (None, ""):
+    # Run as a script (python tools/create_av_router.py): put the repo root on the path so `tools` imports
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.av_model import sample_system
+from tools.images import ImageStore
+from tools.scenes import SceneBook, sample_scenes
+from tools.xlsx_writer import SharedImage, save_workbook
+
+LOGO_BOX = (160, 40)  # px: right of the title bar, two rows tall
+INVALID_SHEET_CHARS = str.maketrans({c: "_" for c in '[]:*?/\\'})
+MAX_INLINE_LIST = 255  # Excel's limit for a literal list in a data validation
+
+def sheet_titles(devices):
+    """Unique, Excel-safe sheet title per device id (max 31 chars, no []:*?/\\)."""
+    titles, taken = {}, {"devices", "routing", "lists", "scenes", "scene changes"}
+    for device in devices:
+        base = device.name.translate(INVALID_SHEET_CHARS).strip("'")[:31] or f"Device {device.id + 1}"
+        title, n = base, 1
+        while title.lower() in taken:
+            n += 1
+            title = f"{base[:31 - len(str(n)) - 1]} {n}"
+        taken.add(title.lower())
+        titles[device.id] = title
+    return titles
+
+def list_formula(wb, values, column):
+    """
+    Data validation source for a dropdown. Short lists are inlined; long lists (or
+    values with quotes/commas) go to a hidden "Lists" sheet and are referenced by range.
+    """
+    if not values:
+        return '"None"'
+    inline = ",".join(values)
+    if len(inline) + 2 <= MAX_INLINE_LIST and not any('"' in v or "," in v for v in values):
+        return f'"{inline}"'
+    if "Lists" not in wb.sheetnames:
+        wb.create_sheet("Lists").sheet_state = "hidden"
+    ws_lists = wb["Lists"]
+    for row, value in enumerate(values, 1):
+        ws_lists.cell(row=row, column=column, value=value)
+    letter = get_column_letter(column)
+    return f"=Lists!${letter}$1:${letter}${len(values)}"
+
+def create_av_router(output_path=None, system=None, scenes=None, images=None, deterministic=False,
+                     external=None, project_images=None):
+    """
+    external: {device id: (workbook file name, sheet title)} for devices whose sheet lives elsewhere.
+    project_images: {blob key: ImageRef} embedded in the source .vsf (tools.images.project_images).
+    """
     if output_path is None:
         output_path = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'av_router.xlsx')
 
@@ -54,58 +113,18 @@ def create_av_router(output_path=None):
     )
 
     # ===== DEVICE DEFINITIONS =====
-    # Each device: (name, color_hex, inputs, outputs)
-    DEVICES = [
-        {
-            "name": "Laptop",
-            "color": "4472C4",
-            "inputs": [],
-            "outputs": [
-                {"port": "HDMI", "name": "HDMI Out", "signal": "Video"},
-                {"port": "USB-C", "name": "USB-C DP", "signal": "Video"},
-                {"port": "3.5mm", "name": "Headphone", "signal": "Audio"},
-            ]
-        },
-        {
-            "name": "Video Switcher",
-            "color": "7B68EE",
-            "inputs": [
-                {"port": "HDMI 1", "name": "Input 1", "signal": "Video"},
-                {"port": "HDMI 2", "name": "Input 2", "signal": "Video"},
-                {"port": "HDMI 3", "name": "Input 3", "signal": "Video"},
-                {"port": "SDI 1", "name": "SDI In", "signal": "Video"},
-            ],
-            "outputs": [
-                {"port": "HDMI", "name": "Program", "signal": "Video"},
-                {"port": "SDI", "name": "SDI Out", "signal": "Video"},
-            ]
-        },
-        {
-            "name": "Display",
-            "color": "20B2AA",
-            "inputs": [
-                {"port": "HDMI 1", "name": "HDMI Input", "signal": "Video"},
-                {"port": "HDMI 2", "name": "HDMI 2", "signal": "Video"},
-                {"port": "DP", "name": "DisplayPort", "signal": "Video"},
-            ],
-            "outputs": []
-        },
-        {
-            "name": "Audio Mixer",
-            "color": "FF6347",
-            "inputs": [
-                {"port": "XLR 1", "name": "Mic 1", "signal": "Audio"},
-                {"port": "XLR 2", "name": "Mic 2", "signal": "Audio"},
-                {"port": "Line 1", "name": "Line In", "signal": "Audio"},
-                {"port": "USB", "name": "USB Audio", "signal": "Audio"},
-            ],
-            "outputs": [
-                {"port": "XLR L", "name": "Main L", "signal": "Audio"},
-                {"port": "XLR R", "name": "Main R", "signal": "Audio"},
-                {"port": "USB", "name": "USB Out", "signal": "Audio"},
-            ]
-        },
-    ]
+    if system is None:
+        system = sample_system()
+        if scenes is None:
+            scenes = sample_scenes(system)
+    if isinstance(scenes, str):
+        scenes = SceneBook.load(system, scenes)
+    ports = system.ports
+    external = external or {}
+    titles = sheet_titles([d for d in system.devices if d.id not in external])
+    sheet_devices = [d for d in system.devices if d.id not in external]
+    if images is None:
+        images = ImageStore()
 
     # ===== SHEET 1: MASTER DEVICE LIST =====
     ws_master = wb.active
@@ -134,38 +153,38 @@ def create_av_router(output_path=None):
         cell.alignment = Alignment(horizontal='center')
 
     # Device rows
-    for i, device in enumerate(DEVICES, 1):
+    for i, device in enumerate(system.devices, 1):
         row = 4 + i
         ws_master.cell(row=row, column=2, value=i).font = cell_font
         ws_master.cell(row=row, column=2).fill = row_fill
         ws_master.cell(row=row, column=2).border = thin_border
 
-        ws_master.cell(row=row, column=3, value=device["name"]).font = cell_font
-        ws_master.cell(row=row, column=3).fill = make_fill(device["color"])
+        ws_master.cell(row=row, column=3, value=device.name).font = cell_font
+        ws_master.cell(row=row, column=3).fill = make_fill(device.color)
         ws_master.cell(row=row, column=3).border = thin_border
 
-        # Determine type
-        has_in = len(device["inputs"]) > 0
-        has_out = len(device["outputs"]) > 0
-        dev_type = "Source" if has_out and not has_in else "Destination" if has_in and not has_out else "Processor"
-        ws_master.cell(row=row, column=4, value=dev_type).font = cell_font
+        ws_master.cell(row=row, column=4, value=device.type).font = cell_font
         ws_master.cell(row=row, column=4).fill = row_fill
         ws_master.cell(row=row, column=4).border = thin_border
 
-        ws_master.cell(row=row, column=5, value=len(device["inputs"])).font = cell_font
+        ws_master.cell(row=row, column=5, value=len(device.inputs)).font = cell_font
         ws_master.cell(row=row, column=5).fill = input_fill
         ws_master.cell(row=row, column=5).border = thin_border
 
-        ws_master.cell(row=row, column=6, value=len(device["outputs"])).font = cell_font
+        ws_master.cell(row=row, column=6, value=len(device.outputs)).font = cell_font
         ws_master.cell(row=row, column=6).fill = output_fill
         ws_master.cell(row=row, column=6).border = thin_border
 
         # Hyperlink to device sheet
-        link_cell = ws_master.cell(row=row, column=7, value=f"Go to {device['name']}")
+        link_cell = ws_master.cell(row=row, column=7, value=f"Go to {device.name}")
         link_cell.font = link_font
         link_cell.fill = row_fill
         link_cell.border = thin_border
-        link_cell.hyperlink = f"#'{device['name']}'!A1"
+        if device.id in external:
+            workbook, title = external[device.id]
+            link_cell.hyperlink = Hyperlink(ref=link_cell.coordinate, target=workbook, location=f"'{title}'!A1")
+        else:
+            link_cell.hyperlink = f"#'{titles[device.id]}'!A1"
 
     # Column widths
     widths = [3, 6, 18, 12, 8, 8, 16]
@@ -173,34 +192,8 @@ def create_av_router(output_path=None):
         ws_master.column_dimensions[get_column_letter(i)].width = w
 
     # ===== CREATE DEVICE SHEETS =====
-    all_inputs = []  # For routing dropdown
-    all_outputs = []
-
-    for device in DEVICES:
-        ws = wb.create_sheet(device["name"])
-        ws.sheet_properties.tabColor = device["color"]
-
-        # Dark background
-        for row in range(1, 25):
-            for col in range(1, 12):
-                ws.cell(row=row, column=col).fill = dark_fill
-
-        # Device title bar
-        ws.merge_cells('B2:I2')
-        ws['B2'] = device["name"]
-        ws['B2'].font = title_font
-        ws['B2'].fill = make_fill(device["color"])
-        ws['B2'].alignment = Alignment(horizontal='center', vertical='center')
-
-        # Color indicator row
-        colors_row = ["FF0000", "00FF00", "0000FF", "00FFFF", "FF00FF", "8B00FF", "FFFF00", "FFA500"]
-        for i, c in enumerate(colors_row):
-            cell = ws.cell(row=3, column=2+i)
-            cell.fill = make_fill(c)
-            cell.border = thin_border
-
+    def io_block(ws, device):
         # ===== INPUTS SECTION =====
-        ws.merge_cells('B5:D5')
         ws['B5'] = "INPUTS"
         ws['B5'].font = header_font
         ws['B5'].fill = input_fill
@@ -213,12 +206,12 @@ def create_av_router(output_path=None):
             cell.fill = row_fill
             cell.border = thin_border
 
-        for i, inp in enumerate(device["inputs"], 7):
-            ws.cell(row=i, column=2, value=inp["port"]).font = cell_font
+        for i, pid in enumerate(device.inputs, 7):
+            ws.cell(row=i, column=2, value=ports.port[pid]).font = cell_font
             ws.cell(row=i, column=2).fill = row_fill
             ws.cell(row=i, column=2).border = thin_border
 
-            ws.cell(row=i, column=3, value=inp["name"]).font = cell_font
+            ws.cell(row=i, column=3, value=ports.name[pid]).font = cell_font
             ws.cell(row=i, column=3).fill = row_fill
             ws.cell(row=i, column=3).border = thin_border
 
@@ -233,10 +226,7 @@ def create_av_router(output_path=None):
                 bottom=Side(style='medium', color="00BFFF")
             )
 
-            all_inputs.append(f"{device['name']}|{inp['port']}")
-
         # ===== OUTPUTS SECTION =====
-        ws.merge_cells('F5:H5')
         ws['F5'] = "OUTPUTS"
         ws['F5'].font = header_font
         ws['F5'].fill = output_fill
@@ -249,12 +239,12 @@ def create_av_router(output_path=None):
             cell.fill = row_fill
             cell.border = thin_border
 
-        for i, out in enumerate(device["outputs"], 7):
-            ws.cell(row=i, column=6, value=out["port"]).font = cell_font
+        for i, pid in enumerate(device.outputs, 7):
+            ws.cell(row=i, column=6, value=ports.port[pid]).font = cell_font
             ws.cell(row=i, column=6).fill = row_fill
             ws.cell(row=i, column=6).border = thin_border
 
-            ws.cell(row=i, column=7, value=out["name"]).font = cell_font
+            ws.cell(row=i, column=7, value=ports.name[pid]).font = cell_font
             ws.cell(row=i, column=7).fill = row_fill
             ws.cell(row=i, column=7).border = thin_border
 
@@ -269,7 +259,53 @@ def create_av_router(output_path=None):
                 bottom=Side(style='medium', color="FFA500")
             )
 
-            all_outputs.append(f"{device['name']}|{out['port']}")
+    # Devices of the same model have the same I/O block. The first sheet of each
+    # port layout is styled cell by cell; later ones copy its values and styles.
+    block_cache = {}   # (input ports, output ports) -> [(row, col, value, style)]
+    for device in sheet_devices:
+        ws = wb.create_sheet(titles[device.id])
+        ws.sheet_properties.tabColor = device.color
+        layout = (tuple((ports.port[p], ports.name[p]) for p in device.inputs),
+                  tuple((ports.port[p], ports.name[p]) for p in device.outputs))
+        cached = block_cache.get(layout)
+
+        # Dark background (rows 5+ come with a cached block)
+        for row in range(1, 25 if cached is None else 5):
+            for col in range(1, 12):
+                ws.cell(row=row, column=col).fill = dark_fill
+
+        # Device title bar
+        ws.merge_cells('B2:I2')
+        ws['B2'] = device.name
+        ws['B2'].font = title_font
+        ws['B2'].fill = make_fill(device.color)
+        ws['B2'].alignment = Alignment(horizontal='center', vertical='center')
+
+        logo = images.device_image(device.meta, project_images)
+        if logo is not None:
+            logo = images.thumbnail(logo, *LOGO_BOX)
+            ws.add_image(SharedImage(logo, *LOGO_BOX), 'J2')
+            ws.column_dimensions['J'].width = 24
+
+        # Color indicator row
+        colors_row = ["FF0000", "00FF00", "0000FF", "00FFFF", "FF00FF", "8B00FF", "FFFF00", "FFA500"]
+        for i, c in enumerate(colors_row):
+            cell = ws.cell(row=3, column=2+i)
+            cell.fill = make_fill(c)
+            cell.border = thin_border
+
+        ws.merge_cells('B5:D5')
+        ws.merge_cells('F5:H5')
+        if cached is not None:
+            for row, col, value, style in cached:
+                cell = ws.cell(row=row, column=col, value=value)
+                cell._style = copy(style)
+        else:
+            io_block(ws, device)
+            block_cache[layout] = [
+                (cell.row, cell.column, cell.value, copy(cell._style))
+                for (row, _col), cell in ws._cells.items() if row >= 5 and not isinstance(cell, MergedCell)
+            ]
 
         # Back link
         ws['B20'] = "← Back to Devices"
@@ -308,14 +344,14 @@ def create_av_router(output_path=None):
         cell.fill = header_fill
         cell.border = thin_border
 
-    # Pre-fill some routing rows
+    # Routing rows from the model, plus blank rows to fill in; "#" is the wire number if there is one
     routes = [
-        (1, "Laptop", "HDMI Out", "→", "Video Switcher", "Input 1", "Video", "Active"),
-        (2, "Video Switcher", "Program", "→", "Display", "HDMI Input", "Video", "Active"),
-        (3, "Laptop", "3.5mm", "→", "Audio Mixer", "Line In", "Audio", "Active"),
-        (4, "", "", "→", "", "", "", ""),
-        (5, "", "", "→", "", "", "", ""),
+        (r.number or n, system.port_device(r.src).name, ports.name[r.src], "→",
+         system.port_device(r.dst).name, ports.name[r.dst], r.signal, r.status)
+        for n, r in enumerate(system.routes, 1)
     ]
+    for n in range(len(routes) + 1, max(len(routes) + 2, 5) + 1):
+        routes.append((n, "", "", "→", "", "", "", ""))
 
     for i, route in enumerate(routes, 7):
         for j, val in enumerate(route):
@@ -327,61 +363,139 @@ def create_av_router(output_path=None):
                 cell.font = Font(color="00FF00", size=12, bold=True)
                 cell.alignment = Alignment(horizontal='center')
 
+    last_route_row = max(20, 6 + len(routes))
+
     # Dropdowns for source device
-    source_devices = ",".join([d["name"] for d in DEVICES if d["outputs"]])
-    source_dv = DataValidation(type="list", formula1=f'"{source_devices}"', allow_blank=True)
+    source_devices = list_formula(wb, [d.name for d in system.sources()], 1)
+    source_dv = DataValidation(type="list", formula1=source_devices, allow_blank=True)
     ws_routing.add_data_validation(source_dv)
-    source_dv.add('C7:C20')
+    source_dv.add(f'C7:C{last_route_row}')
 
     # Dropdowns for dest device
-    dest_devices = ",".join([d["name"] for d in DEVICES if d["inputs"]])
-    dest_dv = DataValidation(type="list", formula1=f'"{dest_devices}"', allow_blank=True)
+    dest_devices = list_formula(wb, [d.name for d in system.destinations()], 2)
+    dest_dv = DataValidation(type="list", formula1=dest_devices, allow_blank=True)
     ws_routing.add_data_validation(dest_dv)
-    dest_dv.add('F7:F20')
+    dest_dv.add(f'F7:F{last_route_row}')
 
     # Status dropdown
     status_dv = DataValidation(type="list", formula1='"Active,Inactive,Testing,Fault"', allow_blank=True)
     ws_routing.add_data_validation(status_dv)
-    status_dv.add('I7:I20')
+    status_dv.add(f'I7:I{last_route_row}')
 
     # Column widths
-    for col, w in zip('ABCDEFGHIJ', [3, 5, 16, 14, 5, 16, 14, 12, 10, 3]):
+    number_width = 12 if any(r.number for r in system.routes) else 5
+    for col, w in zip('ABCDEFGHIJ', [3, number_width, 16, 14, 5, 16, 14, 12, 10, 3]):
         ws_routing.column_dimensions[col].width = w
 
     # ===== ADD DROPDOWNS TO DEVICE SHEETS =====
     # Build output list for input dropdowns (source selection)
-    output_list = []
-    for d in DEVICES:
-        for o in d["outputs"]:
-            output_list.append(f"{d['name']}: {o['port']}")
-    output_formula = '"{}"'.format(",".join(output_list)) if output_list else '"None"'
+    output_list = [system.port_label(pid) for pid in system.all_outputs()]
+    output_formula = list_formula(wb, output_list, 3)
 
     # Build input list for output dropdowns (destination selection)
-    input_list = []
-    for d in DEVICES:
-        for i in d["inputs"]:
-            input_list.append(f"{d['name']}: {i['port']}")
-    input_formula = '"{}"'.format(",".join(input_list)) if input_list else '"None"'
+    input_list = [system.port_label(pid) for pid in system.all_inputs()]
+    input_formula = list_formula(wb, input_list, 4)
 
     # Add validations to device sheets
-    for device in DEVICES:
-        ws = wb[device["name"]]
+    for device in sheet_devices:
+        ws = wb[titles[device.id]]
 
         # Source dropdown for inputs (column D)
-        if device["inputs"]:
+        if device.inputs:
             src_dv = DataValidation(type="list", formula1=output_formula, allow_blank=True)
             ws.add_data_validation(src_dv)
-            src_dv.add(f'D7:D{6 + len(device["inputs"])}')
+            src_dv.add(f'D7:D{6 + len(device.inputs)}')
 
         # Destination dropdown for outputs (column H)
-        if device["outputs"]:
+        if device.outputs:
             dst_dv = DataValidation(type="list", formula1=input_formula, allow_blank=True)
             ws.add_data_validation(dst_dv)
-            dst_dv.add(f'H7:H{6 + len(device["outputs"])}')
+            dst_dv.add(f'H7:H{6 + len(device.outputs)}')
+
+    # ===== SCENE SHEETS =====
+    if scenes is not None and scenes.scenes:
+        scene_fill = make_fill("3a2a5c")
+
+        def scene_row(ws, row, values, arrow_col=None):
+            for j, val in enumerate(values):
+                cell = ws.cell(row=row, column=2 + j, value=val)
+                cell.font = cell_font
+                cell.fill = row_fill
+                cell.border = thin_border
+                if j == arrow_col:
+                    cell.font = Font(color="00FF00", size=12, bold=True)
+                    cell.alignment = Alignment(horizontal='center')
+
+        # One section per scene
+        ws_scenes = wb.create_sheet("Scenes")
+        ws_scenes.sheet_properties.tabColor = COLORS["routing_purple"]
+        ws_scenes.merge_cells('B2:H2')
+        ws_scenes['B2'] = "ROUTING SCENES"
+        ws_scenes['B2'].font = title_font
+        ws_scenes['B2'].fill = routing_fill
+        ws_scenes['B2'].alignment = Alignment(horizontal='center')
+
+        scene_headers = ["#", "Source Device", "Output Port", "→", "Dest Device", "Input Port", "Signal Type"]
+        row = 4
+        for scene in scenes:
+            ws_scenes.merge_cells(start_row=row, start_column=2, end_row=row, end_column=8)
+            title = ws_scenes.cell(row=row, column=2, value=f"{scene.name.upper()}  ({len(scene)} routes)")
+            title.font = header_font
+            title.fill = scene_fill
+            row += 1
+            for col, header in enumerate(scene_headers, 2):
+                cell = ws_scenes.cell(row=row, column=col, value=header)
+                cell.font = header_font
+                cell.fill = header_fill
+                cell.border = thin_border
+            row += 1
+            for n, (src, dst) in enumerate(scenes.routes(scene), 1):
+                scene_row(ws_scenes, row, (
+                    n, system.port_device(src).name, ports.name[src], "→",
+                    system.port_device(dst).name, ports.name[dst], ports.signal[src],
+                ), arrow_col=3)
+                row += 1
+            row += 1
+
+        for col, w in zip('ABCDEFGH', [3, 5, 16, 14, 5, 16, 14, 12]):
+            ws_scenes.column_dimensions[col].width = w
+
+        # Changes between consecutive scenes
+        ws_changes = wb.create_sheet("Scene Changes")
+        ws_changes.sheet_properties.tabColor = COLORS["routing_purple"]
+        ws_changes.merge_cells('B2:H2')
+        ws_changes['B2'] = "CHANGES BETWEEN SCENES"
+        ws_changes['B2'].font = title_font
+        ws_changes['B2'].fill = routing_fill
+        ws_changes['B2'].alignment = Alignment(horizontal='center')
+
+        change_headers = ["From Scene", "To Scene", "Dest Device", "Input Port", "Old Source", "New Source", "Change"]
+        for col, header in enumerate(change_headers, 2):
+            cell = ws_changes.cell(row=4, column=col, value=header)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.border = thin_border
+
+        def source_text(pids):
+            return ", ".join(system.port_label(pid) for pid in pids)
+
+        row = 5
+        ordered = list(scenes)
+        for a, b in zip(ordered, ordered[1:]):
+            for dst, old, new in scenes.changes(a, b):
+                change = "Changed" if old and new else "Added" if new else "Removed"
+                scene_row(ws_changes, row, (
+                    a.name, b.name, system.port_device(dst).name, ports.name[dst],
+                    source_text(old), source_text(new), change,
+                ))
+                row += 1
+
+        for col, w in zip('ABCDEFGH', [3, 14, 14, 16, 14, 24, 24, 10]):
+            ws_changes.column_dimensions[col].width = w
 
     # ===== SAVE =====
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    wb.save(output_path)
+    save_workbook(wb, output_path, deterministic=deterministic)
     print(f"AV Router created: {output_path}")
     return output_path
 
@@ -9,7 +9,16 @@ Creates macro-enabled Excel (.xlsm) with:
 import os
 import sys
 
-def create_av_router_macro(output_path=None):
+if __package__ in (None, ""):
+    # Run as a script (python tools/create_av_router_macro.py): put the repo root on the path so `tools` imports
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.av_model import sample_system
+
+# Display names for the sample device colors
+COLOR_NAMES = {"4472C4": "Blue", "7B68EE": "Purple", "20B2AA": "Teal", "FF6347": "Red"}
+
+def create_av_router_macro(output_path=None, system=None):
     if output_path is None:
         output_path = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'av_router_interactive.xlsm')
 
@@ -76,12 +85,13 @@ def create_av_router_macro(output_path=None):
             cell.Interior.Color = HEADER_BG
             cell.Borders.LineStyle = 1
 
-        # Sample devices
+        # Devices from the model
+        if system is None:
+            system = sample_system()
+        ports = system.ports
         devices = [
-            [1, "Laptop", "Source", 0, 3, "Blue"],
-            [2, "Video Switcher", "Processor", 4, 2, "Purple"],
-            [3, "Display", "Destination", 3, 0, "Teal"],
-            [4, "Audio Mixer", "Processor", 4, 3, "Red"],
+            [d.id + 1, d.name, d.type, len(d.inputs), len(d.outputs), COLOR_NAMES.get(d.color, "Custom")]
+            for d in system.devices
         ]
 
         for row_idx, dev in enumerate(devices):
@@ -127,11 +137,11 @@ def create_av_router_macro(output_path=None):
             cell.Interior.Color = HEADER_BG
             cell.Borders.LineStyle = 1
 
-        # Sample routes
+        # Routes from the model
         routes = [
-            [1, "Laptop", "HDMI Out", "→", "Video Switcher", "Input 1", "Video", "Active"],
-            [2, "Video Switcher", "Program", "→", "Display", "HDMI 1", "Video", "Active"],
-            [3, "Laptop", "Audio Out", "→", "Audio Mixer", "Line In", "Audio", "Active"],
+            [n, system.port_device(r.src).name, ports.name[r.src], "→",
+             system.port_device(r.dst).name, ports.name[r.dst], r.signal, r.status]
+            for n, r in enumerate(system.routes, 1)
         ]
 
         for row_idx, route in enumerate(routes):
@@ -0,0 +1,173 @@
+"""
+Create Cable Schedule Excel Workbook
+One row per wire in a .vsf project with its entered length next to the length
+estimated from the drawing (tools/cable_length.py):
+- Cable Schedule: from / to device and port, route via patch points, entered,
+  estimated and stock length, and a status (Blank / Short / Long / No stock / OK)
+- Stock Totals: cable count per type and stock length, for ordering
+- With wire_numbers, "#" is the wire's stable number (tools/wire_numbers.py)
+  instead of its row
+
+    python -m tools cable-schedule show.vsf --scale 0.1 -o .tmp/show_cables.xlsx
+"""
+
+import os
+import sys
+from collections import Counter
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+if __package__ in (None, ""):
+    # Run as a script (python tools/create_cable_schedule.py): put the repo root on the path so `tools` imports
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.cable_length import (
+    DEFAULT_DIRECT_MAX_FT, DEFAULT_FT_PER_PX, DEFAULT_SLACK, estimate_project, run_status,
+)
+from tools.vsf import device_name, load_project, parse_anchor, parse_length_ft, port_column, project_stem
+
+STATUS_COLORS = {
+    "OK": "2E7D32",
+    "Short": "C62828",
+    "Long": "EF6C00",
+    "Blank": "6A1B9A",
+    "No stock": "AD1457",
+}
+
+
+def port_label(nodes, anchor):
+    """(device name, port) for an anchor id."""
+    node_id, sec_id, row = parse_anchor(anchor)
+    node = nodes.get(node_id) or {}
+    section = (node.get("sections") or {}).get(sec_id) or {}
+    rows = section.get("rows") or []
+    port = ""
+    if row < len(rows):
+        col = port_column(section)
+        port = rows[row][col] if col < len(rows[row]) else ""
+    return device_name(node) or node_id, port or f"{sec_id.upper()}{row + 1}"
+
+
+def create_cable_schedule(project_path, output_path=None, ft_per_px=DEFAULT_FT_PER_PX, patch=None,
+                          slack=DEFAULT_SLACK, direct_max_ft=DEFAULT_DIRECT_MAX_FT, wire_numbers=None):
+    """wire_numbers: a numbering scheme, or "" for the one the project's map already uses."""
+    if output_path is None:
+        name = project_stem(project_path)
+        output_path = os.path.join(os.path.dirname(__file__), '..', '.tmp', f'{name}_cables.xlsx')
+
+    project = load_project(project_path)
+    nodes = project["nodes"]
+    est = estimate_project(project, ft_per_px=ft_per_px, patch=patch, slack=slack, direct_max_ft=direct_max_ft)
+    patch_names = [device_name(nodes[i]) or i for i in est["patch_nodes"]]
+    numbers = {}
+    if wire_numbers is not None:
+        from tools.wire_numbers import number_project
+        numbers = number_project(project, project_path, wire_numbers or None)
+
+    wb = Workbook()
+
+    # Colors matching the other workbooks
+    DARK_BG = "1a1a2e"
+    HEADER_BG = "2d2d44"
+    ROW_BG = "252538"
+
+    header_font = Font(bold=True, color="FFFFFF", size=11)
+    title_font = Font(bold=True, color="FFFFFF", size=14)
+    cell_font = Font(color="FFFFFF", size=10)
+    muted_font = Font(color="AAAAAA", size=10, italic=True)
+    header_fill = PatternFill(start_color=HEADER_BG, end_color=HEADER_BG, fill_type="solid")
+    row_fill = PatternFill(start_color=ROW_BG, end_color=ROW_BG, fill_type="solid")
+    dark_fill = PatternFill(start_color=DARK_BG, end_color=DARK_BG, fill_type="solid")
+    thin_border = Border(
+        left=Side(style='thin', color="444466"),
+        right=Side(style='thin', color="444466"),
+        top=Side(style='thin', color="444466"),
+        bottom=Side(style='thin', color="444466")
+    )
+
+    def table(ws, title, note, headers, rows, widths):
+        for row in range(1, 5):
+            for col in range(1, len(headers) + 2):
+                ws.cell(row=row, column=col).fill = dark_fill
+        ws['B2'] = title
+        ws['B2'].font = title_font
+        ws['B3'] = note
+        ws['B3'].font = muted_font
+        for col, header in enumerate(headers, 2):
+            cell = ws.cell(row=5, column=col, value=header)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.border = thin_border
+            cell.alignment = Alignment(horizontal='center')
+        for r, values in enumerate(rows, 6):
+            for col, val in enumerate(values, 2):
+                cell = ws.cell(row=r, column=col, value=val)
+                cell.font = cell_font
+                cell.fill = row_fill
+                cell.border = thin_border
+        ws.freeze_panes = 'B6'
+        if rows:
+            ws.auto_filter.ref = f"B5:{get_column_letter(len(headers) + 1)}{len(rows) + 5}"
+        ws.column_dimensions['A'].width = 3
+        for col, w in enumerate(widths, 2):
+            ws.column_dimensions[get_column_letter(col)].width = w
+
+    # ========== CABLE SCHEDULE SHEET ==========
+    rows, statuses, totals = [], [], Counter()
+    for n, conn in enumerate(est["connections"]):
+        from_dev, from_port = port_label(nodes, conn["from"])
+        to_dev, to_port = port_label(nodes, conn["to"])
+        entered = conn.get("cableLength") or conn.get("length") or ""
+        stock = float(est["stock_ft"][n])
+        status = run_status(parse_length_ft(entered), stock)
+        via = ""
+        if est["via_src"][n] >= 0:
+            a, b = patch_names[est["via_src"][n]], patch_names[est["via_dst"][n]]
+            via = a if a == b else f"{a} → {b}"
+        cable_type = conn.get("cableType") or ""
+        rows.append([
+            numbers.get(conn.get("id")) or n + 1, conn.get("label") or conn.get("id") or "", cable_type, from_dev, from_port, to_dev, to_port,
+            via, entered, float(est["estimated_ft"][n]), stock if stock == stock else None, status,
+        ])
+        statuses.append(status)
+        totals[(cable_type, stock if stock == stock else None)] += 1
+
+    ws = wb.active
+    ws.title = "Cable Schedule"
+    ws.sheet_properties.tabColor = "4472C4"
+    counts = Counter(statuses)
+    table(
+        ws, f"CABLE SCHEDULE — {project.get('name') or os.path.basename(project_path)}",
+        f"{ft_per_px:g} ft per px, x{slack:g} slack, patch points: {', '.join(patch_names) or 'none'}   |   "
+        + "   ".join(f"{s}: {counts[s]}" for s in STATUS_COLORS if counts[s]),
+        ["#", "Wire", "Cable Type", "From Device", "From Port", "To Device", "To Port",
+         "Via", "Entered", "Est. ft", "Stock ft", "Status"],
+        rows, [12 if numbers else 5, 16, 16, 20, 12, 20, 12, 20, 10, 9, 9, 10],
+    )
+    for r, status in enumerate(statuses, 6):
+        cell = ws.cell(row=r, column=13)
+        cell.fill = PatternFill(start_color=STATUS_COLORS[status], end_color=STATUS_COLORS[status], fill_type="solid")
+        cell.font = Font(bold=True, color="FFFFFF", size=10)
+        cell.alignment = Alignment(horizontal='center')
+        ws.cell(row=r, column=11).number_format = '0.0'
+
+    # ========== STOCK TOTALS SHEET ==========
+    ws_totals = wb.create_sheet("Stock Totals")
+    ws_totals.sheet_properties.tabColor = "70AD47"
+    table(
+        ws_totals, "STOCK TOTALS", "Cables to order per type and stock length (blank: longer than any stock)",
+        ["Cable Type", "Stock ft", "Count"],
+        [[t, s, c] for (t, s), c in sorted(totals.items(), key=lambda kv: (kv[0][0], kv[0][1] or float("inf")))],
+        [22, 10, 8],
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    wb.save(output_path)
+    print(f"Cable schedule created: {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    create_cable_schedule(sys.argv[1], *sys.argv[2:3])
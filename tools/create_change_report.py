@@ -0,0 +1,186 @@
+"""
+Create Change Report Excel Workbook
+What changed between two revisions of a .vsf project (tools/vsf_diff.py):
+- Summary: both revisions (name, version, saved at) and a count per change
+- Devices: nodes added, removed and modified (one row per changed field)
+- Ports: section rows added, removed and modified, with the columns that changed
+- Wires: connections added, removed and modified
+- Moved: nodes whose content is unchanged but which moved or were rescaled
+
+    python -m tools diff show_r13.vsf show_r14.vsf -o .tmp/show_r14_changes.xlsx
+"""
+
+import math
+import os
+import sys
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+if __package__ in (None, ""):
+    # Run as a script (python tools/create_change_report.py): put the repo root on the path so `tools` imports
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.vsf import load_project, project_stem
+from tools.vsf_diff import ADDED, MODIFIED, REMOVED, diff_projects
+
+CHANGE_COLORS = {
+    ADDED: "2E7D32",
+    REMOVED: "C62828",
+    MODIFIED: "EF6C00",
+}
+
+
+def create_change_report(old_path, new_path, output_path=None):
+    if output_path is None:
+        name = project_stem(new_path)
+        output_path = os.path.join(os.path.dirname(__file__), '..', '.tmp', f'{name}_changes.xlsx')
+
+    old, new = load_project(old_path), load_project(new_path)
+    diff = diff_projects(old, new)
+
+    wb = Workbook()
+
+    # Colors matching the other workbooks
+    DARK_BG = "1a1a2e"
+    HEADER_BG = "2d2d44"
+    ROW_BG = "252538"
+
+    header_font = Font(bold=True, color="FFFFFF", size=11)
+    title_font = Font(bold=True, color="FFFFFF", size=14)
+    cell_font = Font(color="FFFFFF", size=10)
+    muted_font = Font(color="AAAAAA", size=10, italic=True)
+    change_font = Font(bold=True, color="FFFFFF", size=10)
+    header_fill = PatternFill(start_color=HEADER_BG, end_color=HEADER_BG, fill_type="solid")
+    row_fill = PatternFill(start_color=ROW_BG, end_color=ROW_BG, fill_type="solid")
+    dark_fill = PatternFill(start_color=DARK_BG, end_color=DARK_BG, fill_type="solid")
+    change_fills = {k: PatternFill(start_color=c, end_color=c, fill_type="solid") for k, c in CHANGE_COLORS.items()}
+    thin_border = Border(
+        left=Side(style='thin', color="444466"),
+        right=Side(style='thin', color="444466"),
+        top=Side(style='thin', color="444466"),
+        bottom=Side(style='thin', color="444466")
+    )
+
+    def table(ws, title, note, headers, rows, widths, change_col=None):
+        for row in range(1, 5):
+            for col in range(1, len(headers) + 2):
+                ws.cell(row=row, column=col).fill = dark_fill
+        ws['B2'] = title
+        ws['B2'].font = title_font
+        ws['B3'] = note
+        ws['B3'].font = muted_font
+        for col, header in enumerate(headers, 2):
+            cell = ws.cell(row=5, column=col, value=header)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.border = thin_border
+            cell.alignment = Alignment(horizontal='center')
+        for r, values in enumerate(rows, 6):
+            for col, val in enumerate(values, 2):
+                cell = ws.cell(row=r, column=col, value=val)
+                cell.font = cell_font
+                cell.fill = row_fill
+                cell.border = thin_border
+            if change_col is not None:
+                cell = ws.cell(row=r, column=change_col + 2)
+                cell.fill = change_fills.get(values[change_col], row_fill)
+                cell.font = change_font
+                cell.alignment = Alignment(horizontal='center')
+        ws.freeze_panes = 'B6'
+        if rows:
+            ws.auto_filter.ref = f"B5:{get_column_letter(len(headers) + 1)}{len(rows) + 5}"
+        ws.column_dimensions['A'].width = 3
+        for col, w in enumerate(widths, 2):
+            ws.column_dimensions[get_column_letter(col)].width = w
+
+    def revision(project, path):
+        return [project.get("name") or os.path.basename(path), project.get("version") or "",
+                project.get("savedAt") or "", len(project["nodes"]), len(project.get("connections") or []), path]
+
+    # ========== SUMMARY SHEET ==========
+    ws = wb.active
+    ws.title = "Summary"
+    ws.sheet_properties.tabColor = "4472C4"
+    table(
+        ws, "CHANGE REPORT", f"{os.path.basename(old_path)} → {os.path.basename(new_path)}",
+        ["Revision", "Name", "Version", "Saved At", "Nodes", "Wires", "File"],
+        [["Old"] + revision(old, old_path), ["New"] + revision(new, new_path)],
+        [10, 24, 10, 24, 8, 8, 40],
+    )
+    ws.cell(row=9, column=2, value="Change").font = header_font
+    ws.cell(row=9, column=3, value="Count").font = header_font
+    for col in (2, 3):
+        ws.cell(row=9, column=col).fill = header_fill
+        ws.cell(row=9, column=col).border = thin_border
+    counts = diff.counts()
+    counts["devices unchanged"] = diff.unchanged_nodes
+    counts["wires unchanged"] = diff.unchanged_wires
+    for r, (label, count) in enumerate(counts.items(), 10):
+        for col, val in ((2, label.capitalize()), (3, count)):
+            cell = ws.cell(row=r, column=col, value=val)
+            cell.font = cell_font
+            cell.fill = row_fill
+            cell.border = thin_border
+
+    # ========== DEVICES SHEET ==========
+    ws_devices = wb.create_sheet("Devices")
+    ws_devices.sheet_properties.tabColor = "70AD47"
+    table(
+        ws_devices, "DEVICES", "Nodes added or removed, and each field changed on the others",
+        ["Change", "Device", "Node ID", "Field", "Old", "New"],
+        [[c.kind, c.device, c.node_id, c.item, c.old, c.new] for c in diff.devices],
+        [11, 22, 22, 18, 30, 30], change_col=0,
+    )
+
+    # ========== PORTS SHEET ==========
+    ws_ports = wb.create_sheet("Ports")
+    ws_ports.sheet_properties.tabColor = "70AD47"
+    table(
+        ws_ports, "PORTS", "Section rows compared by position (wire anchors point at row numbers)",
+        ["Change", "Device", "Section", "Row", "Old", "New", "Changed Columns"],
+        [[c.kind, c.device, c.item.split()[0], int(c.item.split()[1]) + 1, c.old, c.new, c.detail]
+         for c in diff.ports],
+        [11, 22, 9, 6, 40, 40, 40], change_col=0,
+    )
+
+    # ========== WIRES SHEET ==========
+    ws_wires = wb.create_sheet("Wires")
+    ws_wires.sheet_properties.tabColor = "4472C4"
+    table(
+        ws_wires, "WIRES", "Matched by wire id, then by from / to for redrawn wires",
+        ["Change", "Wire", "Old", "New", "Details"],
+        [[c.kind, c.item, c.old, c.new, c.detail] for c in diff.wires],
+        [11, 22, 40, 40, 50], change_col=0,
+    )
+
+    # ========== MOVED SHEET ==========
+    ws_moved = wb.create_sheet("Moved")
+    ws_moved.sheet_properties.tabColor = "A5A5A5"
+    moved_rows = []
+    for c in diff.moved:
+        (ox, oy, os_), (nx, ny, ns) = c.old, c.new
+        try:
+            distance = round(math.hypot(nx - ox, ny - oy), 1)
+        except TypeError:
+            distance = None
+        moved_rows.append([c.device, c.node_id, ox, oy, nx, ny, distance, os_, ns])
+    table(
+        ws_moved, "MOVED ONLY", "Unchanged content, new position or scale",
+        ["Device", "Node ID", "Old X", "Old Y", "New X", "New Y", "Distance", "Old Scale", "New Scale"],
+        moved_rows, [22, 22, 9, 9, 9, 9, 9, 10, 10],
+    )
+    for r in range(6, len(moved_rows) + 6):
+        for col in range(4, 11):
+            ws_moved.cell(row=r, column=col).number_format = '0.0' if col < 9 else '0.00'
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    wb.save(output_path)
+    summary = ", ".join(f"{v} {k}" for k, v in diff.counts().items() if v) or "no changes"
+    print(f"Change report created: {output_path} ({summary})")
+    return output_path
+
+
+if __name__ == "__main__":
+    create_change_report(sys.argv[1], sys.argv[2], *sys.argv[3:4])
@@ -2,20 +2,80 @@
 Create Project Management Excel Workbook
 Generates an Excel file with connected tables: People, Projects, Tasks, Dashboard
 Includes: dropdown validation, lookups, and calculations
+
+Includes: Capacity heat map (hours per person per week), Project Cost,
+Timeline (Gantt) and Critical Path sheets (from the tasks' Depends On column)
+
+Rows can come from tools/tracker_import.py instead of the samples below. The
+workbook is written in openpyxl's write-only mode and `tasks` may be a
+generator, so a 500k-task tracker streams to disk instead of sitting in memory.
 """
 
 import os
+import sys
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.worksheet.datavalidation import DataValidation
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+from openpyxl.formatting.rule import CellIsRule, ColorScaleRule
+from openpyxl.styles import Font, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
 from openpyxl.workbook.defined_name import DefinedName
 
-def create_project_tracker(output_path=None):
+if __package__ in (None, ""):
+    # Run as a script (python tools/create_project_tracker.py): put the repo root on the path so `tools` imports
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.tracker_capacity import DEFAULT_WEEKLY_CAPACITY, CapacityCollector, compute_capacity
+from tools.tracker_schedule import DependencyCollector, add_critical_path_sheet
+from tools.tracker_timeline import add_timeline_sheet
+
+PEOPLE_HEADERS = ["PersonID", "Name", "Role", "Email", "Hourly Rate"]
+PROJECT_HEADERS = ["ProjectID", "Project Name", "Client", "Start Date", "End Date", "Budget"]
+TASK_HEADERS = ["TaskID", "Task Name", "Project", "Assignee", "Status", "Priority", "Hours Est.", "Hours Actual",
+                "Due Date", "Depends On"]
+
+# Sample data
+SAMPLE_PEOPLE = [
+    [1, "Alice Johnson", "Developer", "alice@example.com", 75],
+    [2, "Bob Smith", "Designer", "bob@example.com", 65],
+    [3, "Carol Williams", "Manager", "carol@example.com", 85],
+    [4, "David Brown", "Developer", "david@example.com", 70],
+]
+SAMPLE_PROJECTS = [
+    [1, "Website Redesign", "Acme Corp", "2024-01-15", "2024-04-30", 25000],
+    [2, "Mobile App", "TechStart Inc", "2024-02-01", "2024-06-30", 45000],
+    [3, "Database Migration", "Global Ltd", "2024-03-01", "2024-05-15", 18000],
+]
+SAMPLE_TASKS = [
+    [1, "Design mockups", "Website Redesign", "Bob Smith", "Completed", "High", 20, 18, "2024-02-01", None],
+    [2, "Frontend development", "Website Redesign", "Alice Johnson", "In Progress", "High", 40, 25, "2024-03-15", "1"],
+    [3, "API integration", "Mobile App", "David Brown", "Not Started", "Medium", 30, 0, "2024-04-01", "5"],
+    [4, "User testing", "Website Redesign", "Carol Williams", "Not Started", "Medium", 15, 0, "2024-04-15", "2, 3"],
+    [5, "Database schema", "Database Migration", "Alice Johnson", "In Progress", "High", 25, 12, "2024-03-20", None],
+]
+
+STATUSES = ["Not Started", "In Progress", "On Hold", "Completed", "Cancelled"]
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+
+# Validation / formula ranges reach at least this row so rows can be added by hand
+MIN_LAST_ROW = 100
+
+
+def create_project_tracker(output_path=None, people=None, projects=None, tasks=None,
+                           weekly_capacity=DEFAULT_WEEKLY_CAPACITY):
+    """
+    people / projects: row lists in PEOPLE_HEADERS / PROJECT_HEADERS order.
+    tasks: any iterable of TASK_HEADERS rows, read once (a generator is fine).
+    Defaults are the sample rows. weekly_capacity: hours per person per week
+    above which the Capacity sheet flags a week as over-allocated.
+    """
     if output_path is None:
         output_path = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'project_tracker.xlsx')
+    people = SAMPLE_PEOPLE if people is None else people
+    projects = SAMPLE_PROJECTS if projects is None else projects
+    tasks = SAMPLE_TASKS if tasks is None else tasks
 
-    wb = Workbook()
+    wb = Workbook(write_only=True)
 
     # Styles
     header_font = Font(bold=True, color="FFFFFF")
@@ -27,28 +87,41 @@ def create_project_tracker(output_path=None):
         bottom=Side(style='thin')
     )
 
-    # ========== PEOPLE SHEET ==========
-    ws_people = wb.active
-    ws_people.title = "People"
-
-    people_headers = ["PersonID", "Name", "Role", "Email", "Hourly Rate"]
-    for col, header in enumerate(people_headers, 1):
-        cell = ws_people.cell(row=1, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.border = thin_border
+    def styled(ws, value, font=None, fill=None, number_format=None):
+        cell = WriteOnlyCell(ws, value=value)
+        if font:
+            cell.font = font
+        if fill:
+            cell.fill = fill
+        if number_format:
+            cell.number_format = number_format
+        return cell
+
+    def header_row(ws, headers, border=True):
+        row = [styled(ws, h, header_font, header_fill) for h in headers]
+        for cell in row:
+            if border:
+                cell.border = thin_border
+        return row
+
+    def write_rows(ws, rows):
+        """Append bordered data rows; every cell shares one style. Returns the row count."""
+        template = WriteOnlyCell(ws)
+        template.border = thin_border
+        style = template._style
+        count = 0
+        for values in rows:
+            row = []
+            for value in values:
+                cell = WriteOnlyCell(ws, value=value)
+                cell._style = style
+                row.append(cell)
+            ws.append(row)
+            count += 1
+        return count
 
-    # Sample data
-    people_data = [
-        [1, "Alice Johnson", "Developer", "alice@example.com", 75],
-        [2, "Bob Smith", "Designer", "bob@example.com", 65],
-        [3, "Carol Williams", "Manager", "carol@example.com", 85],
-        [4, "David Brown", "Developer", "david@example.com", 70],
-    ]
-    for row_idx, row_data in enumerate(people_data, 2):
-        for col_idx, value in enumerate(row_data, 1):
-            cell = ws_people.cell(row=row_idx, column=col_idx, value=value)
-            cell.border = thin_border
+    # ========== PEOPLE SHEET ==========
+    ws_people = wb.create_sheet("People")
 
     # Set column widths
     ws_people.column_dimensions['A'].width = 10
@@ -57,30 +130,16 @@ def create_project_tracker(output_path=None):
     ws_people.column_dimensions['D'].width = 22
     ws_people.column_dimensions['E'].width = 12
 
+    ws_people.append(header_row(ws_people, PEOPLE_HEADERS))
+    people_last = max(MIN_LAST_ROW, write_rows(ws_people, people) + 1)
+
     # Create named range for People names (for dropdowns)
-    people_range = DefinedName('PeopleNames', attr_text='People!$B$2:$B$100')
+    people_range = DefinedName('PeopleNames', attr_text=f'People!$B$2:$B${people_last}')
     wb.defined_names.add(people_range)
 
     # ========== PROJECTS SHEET ==========
     ws_projects = wb.create_sheet("Projects")
 
-    project_headers = ["ProjectID", "Project Name", "Client", "Start Date", "End Date", "Budget"]
-    for col, header in enumerate(project_headers, 1):
-        cell = ws_projects.cell(row=1, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.border = thin_border
-
-    project_data = [
-        [1, "Website Redesign", "Acme Corp", "2024-01-15", "2024-04-30", 25000],
-        [2, "Mobile App", "TechStart Inc", "2024-02-01", "2024-06-30", 45000],
-        [3, "Database Migration", "Global Ltd", "2024-03-01", "2024-05-15", 18000],
-    ]
-    for row_idx, row_data in enumerate(project_data, 2):
-        for col_idx, value in enumerate(row_data, 1):
-            cell = ws_projects.cell(row=row_idx, column=col_idx, value=value)
-            cell.border = thin_border
-
     ws_projects.column_dimensions['A'].width = 10
     ws_projects.column_dimensions['B'].width = 20
     ws_projects.column_dimensions['C'].width = 15
@@ -88,56 +147,45 @@ def create_project_tracker(output_path=None):
     ws_projects.column_dimensions['E'].width = 12
     ws_projects.column_dimensions['F'].width = 12
 
+    ws_projects.append(header_row(ws_projects, PROJECT_HEADERS))
+    projects_last = max(MIN_LAST_ROW, write_rows(ws_projects, projects) + 1)
+
     # Named range for Project names
-    project_range = DefinedName('ProjectNames', attr_text='Projects!$B$2:$B$100')
+    project_range = DefinedName('ProjectNames', attr_text=f'Projects!$B$2:$B${projects_last}')
     wb.defined_names.add(project_range)
 
     # ========== TASKS SHEET ==========
     ws_tasks = wb.create_sheet("Tasks")
 
-    task_headers = ["TaskID", "Task Name", "Project", "Assignee", "Status", "Priority", "Hours Est.", "Hours Actual", "Due Date"]
-    for col, header in enumerate(task_headers, 1):
-        cell = ws_tasks.cell(row=1, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.border = thin_border
-
-    task_data = [
-        [1, "Design mockups", "Website Redesign", "Bob Smith", "Completed", "High", 20, 18, "2024-02-01"],
-        [2, "Frontend development", "Website Redesign", "Alice Johnson", "In Progress", "High", 40, 25, "2024-03-15"],
-        [3, "API integration", "Mobile App", "David Brown", "Not Started", "Medium", 30, 0, "2024-04-01"],
-        [4, "User testing", "Website Redesign", "Carol Williams", "Not Started", "Medium", 15, 0, "2024-04-15"],
-        [5, "Database schema", "Database Migration", "Alice Johnson", "In Progress", "High", 25, 12, "2024-03-20"],
-    ]
-    for row_idx, row_data in enumerate(task_data, 2):
-        for col_idx, value in enumerate(row_data, 1):
-            cell = ws_tasks.cell(row=row_idx, column=col_idx, value=value)
-            cell.border = thin_border
-
     # Column widths
-    col_widths = [8, 20, 18, 15, 12, 10, 12, 12, 12]
+    col_widths = [8, 20, 18, 15, 12, 10, 12, 12, 12, 14]
     for i, width in enumerate(col_widths, 1):
         ws_tasks.column_dimensions[get_column_letter(i)].width = width
 
+    ws_tasks.append(header_row(ws_tasks, TASK_HEADERS))
+    collector = CapacityCollector(people, projects)
+    deps = DependencyCollector()
+    tasks_last = max(MIN_LAST_ROW, write_rows(ws_tasks, deps.tap(collector.tap(tasks))) + 1)
+
     # Data Validation: Status dropdown
     status_dv = DataValidation(
         type="list",
-        formula1='"Not Started,In Progress,On Hold,Completed,Cancelled"',
+        formula1=f'"{",".join(STATUSES)}"',
         allow_blank=True
     )
     status_dv.error = "Please select a valid status"
     status_dv.errorTitle = "Invalid Status"
-    ws_tasks.add_data_validation(status_dv)
-    status_dv.add('E2:E100')
+    ws_tasks.data_validations.append(status_dv)
+    status_dv.add(f'E2:E{tasks_last}')
 
     # Data Validation: Priority dropdown
     priority_dv = DataValidation(
         type="list",
-        formula1='"Low,Medium,High,Critical"',
+        formula1=f'"{",".join(PRIORITIES)}"',
         allow_blank=True
     )
-    ws_tasks.add_data_validation(priority_dv)
-    priority_dv.add('F2:F100')
+    ws_tasks.data_validations.append(priority_dv)
+    priority_dv.add(f'F2:F{tasks_last}')
 
     # Data Validation: Project dropdown (from Projects sheet)
     project_dv = DataValidation(
@@ -146,8 +194,8 @@ def create_project_tracker(output_path=None):
         allow_blank=True
     )
     project_dv.error = "Please select a project from the list"
-    ws_tasks.add_data_validation(project_dv)
-    project_dv.add('C2:C100')
+    ws_tasks.data_validations.append(project_dv)
+    project_dv.add(f'C2:C{tasks_last}')
 
     # Data Validation: Assignee dropdown (from People sheet)
     assignee_dv = DataValidation(
@@ -156,81 +204,162 @@ def create_project_tracker(output_path=None):
         allow_blank=True
     )
     assignee_dv.error = "Please select a person from the list"
-    ws_tasks.add_data_validation(assignee_dv)
-    assignee_dv.add('D2:D100')
+    ws_tasks.data_validations.append(assignee_dv)
+    assignee_dv.add(f'D2:D{tasks_last}')
 
     # ========== DASHBOARD SHEET ==========
     ws_dash = wb.create_sheet("Dashboard")
 
+    # Column widths for dashboard
+    ws_dash.column_dimensions['A'].width = 20
+    ws_dash.column_dimensions['B'].width = 12
+    ws_dash.column_dimensions['C'].width = 12
+    ws_dash.column_dimensions['D'].width = 12
+
     # Title
-    ws_dash['A1'] = "PROJECT DASHBOARD"
-    ws_dash['A1'].font = Font(bold=True, size=16)
-    ws_dash.merge_cells('A1:D1')
+    ws_dash.append([styled(ws_dash, "PROJECT DASHBOARD", Font(bold=True, size=16))])
+    ws_dash.merged_cells.add('A1:D1')
+    ws_dash.append([])
 
     # Summary section
-    ws_dash['A3'] = "SUMMARY METRICS"
-    ws_dash['A3'].font = Font(bold=True, size=12)
+    ws_dash.append([styled(ws_dash, "SUMMARY METRICS", Font(bold=True, size=12))])
 
+    task_ids = f'Tasks!A2:A{tasks_last}'
     summary_labels = [
-        ("Total Tasks:", '=COUNTA(Tasks!A2:A100)'),
+        ("Total Tasks:", f'=COUNTA({task_ids})'),
         ("Completed:", '=COUNTIF(Tasks!E:E,"Completed")'),
         ("In Progress:", '=COUNTIF(Tasks!E:E,"In Progress")'),
         ("Not Started:", '=COUNTIF(Tasks!E:E,"Not Started")'),
-        ("Completion Rate:", '=IF(COUNTA(Tasks!A2:A100)>0,COUNTIF(Tasks!E:E,"Completed")/COUNTA(Tasks!A2:A100),0)'),
+        ("Completion Rate:", f'=IF(COUNTA({task_ids})>0,COUNTIF(Tasks!E:E,"Completed")/COUNTA({task_ids}),0)'),
         ("Total Hours Est.:", '=SUM(Tasks!G:G)'),
         ("Total Hours Actual:", '=SUM(Tasks!H:H)'),
     ]
 
-    for i, (label, formula) in enumerate(summary_labels, 4):
-        ws_dash.cell(row=i, column=1, value=label).font = Font(bold=True)
-        cell = ws_dash.cell(row=i, column=2, value=formula)
-        if "Rate" in label:
-            cell.number_format = '0%'
+    for label, formula in summary_labels:
+        ws_dash.append([
+            styled(ws_dash, label, Font(bold=True)),
+            styled(ws_dash, formula, number_format='0%' if "Rate" in label else None),
+        ])
+    ws_dash.append([])
+    ws_dash.append([])
 
-    # Tasks by Project section
-    ws_dash['A13'] = "TASKS BY PROJECT"
-    ws_dash['A13'].font = Font(bold=True, size=12)
+    def quoted(name):
+        return str(name).replace('"', '""')
 
-    ws_dash['A14'] = "Project"
-    ws_dash['B14'] = "Total"
-    ws_dash['C14'] = "Completed"
-    ws_dash['D14'] = "% Done"
-    for col in range(1, 5):
-        ws_dash.cell(row=14, column=col).font = header_font
-        ws_dash.cell(row=14, column=col).fill = header_fill
+    # Tasks by Project section
+    row = 13
+    ws_dash.append([styled(ws_dash, "TASKS BY PROJECT", Font(bold=True, size=12))])
+    ws_dash.append(header_row(ws_dash, ["Project", "Total", "Completed", "% Done"], border=False))
+    row += 2
 
     # Project summary formulas (using COUNTIF)
-    for i, project in enumerate(["Website Redesign", "Mobile App", "Database Migration"], 15):
-        ws_dash.cell(row=i, column=1, value=project)
-        ws_dash.cell(row=i, column=2, value=f'=COUNTIF(Tasks!C:C,"{project}")')
-        ws_dash.cell(row=i, column=3, value=f'=COUNTIFS(Tasks!C:C,"{project}",Tasks!E:E,"Completed")')
-        pct_cell = ws_dash.cell(row=i, column=4, value=f'=IF(B{i}>0,C{i}/B{i},0)')
-        pct_cell.number_format = '0%'
+    for project in projects:
+        name = quoted(project[1])
+        ws_dash.append([
+            project[1],
+            f'=COUNTIF(Tasks!C:C,"{name}")',
+            f'=COUNTIFS(Tasks!C:C,"{name}",Tasks!E:E,"Completed")',
+            styled(ws_dash, f'=IF(B{row}>0,C{row}/B{row},0)', number_format='0%'),
+        ])
+        row += 1
+    ws_dash.append([])
+    ws_dash.append([])
 
     # Tasks by Person section
-    ws_dash['A20'] = "TASKS BY ASSIGNEE"
-    ws_dash['A20'].font = Font(bold=True, size=12)
-
-    ws_dash['A21'] = "Assignee"
-    ws_dash['B21'] = "Assigned"
-    ws_dash['C21'] = "Completed"
-    ws_dash['D21'] = "Hours"
-    for col in range(1, 5):
-        ws_dash.cell(row=21, column=col).font = header_font
-        ws_dash.cell(row=21, column=col).fill = header_fill
+    ws_dash.append([styled(ws_dash, "TASKS BY ASSIGNEE", Font(bold=True, size=12))])
+    ws_dash.append(header_row(ws_dash, ["Assignee", "Assigned", "Completed", "Hours"], border=False))
 
     # Assignee formulas
-    for i, person in enumerate(["Alice Johnson", "Bob Smith", "Carol Williams", "David Brown"], 22):
-        ws_dash.cell(row=i, column=1, value=person)
-        ws_dash.cell(row=i, column=2, value=f'=COUNTIF(Tasks!D:D,"{person}")')
-        ws_dash.cell(row=i, column=3, value=f'=COUNTIFS(Tasks!D:D,"{person}",Tasks!E:E,"Completed")')
-        ws_dash.cell(row=i, column=4, value=f'=SUMIF(Tasks!D:D,"{person}",Tasks!H:H)')
-
-    # Column widths for dashboard
-    ws_dash.column_dimensions['A'].width = 20
-    ws_dash.column_dimensions['B'].width = 12
-    ws_dash.column_dimensions['C'].width = 12
-    ws_dash.column_dimensions['D'].width = 12
+    for person in people:
+        name = quoted(person[1])
+        ws_dash.append([
+            person[1],
+            f'=COUNTIF(Tasks!D:D,"{name}")',
+            f'=COUNTIFS(Tasks!D:D,"{name}",Tasks!E:E,"Completed")',
+            f'=SUMIF(Tasks!D:D,"{name}",Tasks!H:H)',
+        ])
+
+    # ========== CAPACITY SHEET ==========
+    cap = compute_capacity(collector, weekly_capacity)
+    ws_cap = wb.create_sheet("Capacity")
+    n_weeks = len(cap.weeks)
+    first_week_col = 5
+    last_col = get_column_letter(first_week_col + max(n_weeks, 1) - 1)
+
+    ws_cap.column_dimensions['A'].width = 20
+    for col in 'BCD':
+        ws_cap.column_dimensions[col].width = 11
+    for i in range(n_weeks):
+        ws_cap.column_dimensions[get_column_letter(first_week_col + i)].width = 9
+
+    ws_cap.freeze_panes = 'E5'
+    ws_cap.append([styled(ws_cap, "WEEKLY CAPACITY", Font(bold=True, size=16))])
+    ws_cap.append([styled(ws_cap, f"Estimated hours spread from project start to task due date. "
+                                  f"Capacity {weekly_capacity:g} h/week; weeks above it are red.",
+                          Font(italic=True, color="808080"))])
+    ws_cap.append([])
+    header = header_row(ws_cap, ["Person", "Total Hours", "Peak Week", "Weeks Over"])
+    for week in cap.weeks:
+        cell = styled(ws_cap, week, header_font, header_fill, number_format='d mmm yy')
+        cell.border = thin_border
+        header.append(cell)
+    ws_cap.append(header)
+
+    # Idle weeks stay blank so the heat map reads at a glance
+    over = cap.over
+    shown = 0
+    for i, name in enumerate(cap.names):
+        weekly = cap.load[i]
+        total = float(weekly.sum())
+        if name == cap.names[-1] and total == 0:
+            continue    # no unassigned hours
+        ws_cap.append([name, round(total, 1), round(float(weekly.max(initial=0)), 1), int(over[i])]
+                      + [round(float(v), 1) if v else None for v in weekly])
+        shown += 1
+    first_row, last_row = 5, 4 + max(shown, 1)
+    ws_cap.conditional_formatting.add(
+        f'{get_column_letter(first_week_col)}{first_row}:{last_col}{last_row}',
+        ColorScaleRule(start_type='num', start_value=0, start_color='FFFFFF',
+                       mid_type='num', mid_value=weekly_capacity * 0.75, mid_color='FFEB84',
+                       end_type='num', end_value=weekly_capacity * 1.25, end_color='F8696B'))
+    ws_cap.conditional_formatting.add(
+        f'{get_column_letter(first_week_col)}{first_row}:{last_col}{last_row}',
+        CellIsRule(operator='greaterThan', formula=[str(weekly_capacity)], font=Font(bold=True, color="9C0006")))
+    ws_cap.conditional_formatting.add(
+        f'D{first_row}:D{last_row}',
+        CellIsRule(operator='greaterThan', formula=['0'], font=Font(bold=True, color="9C0006"),
+                   fill=PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")))
+
+    # ========== PROJECT COST SHEET ==========
+    ws_cost = wb.create_sheet("Project Cost")
+    for col, width in zip('ABCDEFG', [22, 12, 12, 14, 13, 14, 12]):
+        ws_cost.column_dimensions[col].width = width
+    ws_cost.append(header_row(ws_cost, ["Project", "Budget", "Hours Est.", "Est. Cost",
+                                        "Hours Actual", "Actual Cost", "% Budget"]))
+    row = 2
+    for i, name in enumerate(cap.project_names):
+        if name == cap.project_names[-1] and not cap.est_hours[i] and not cap.actual_hours[i]:
+            continue    # every task matched a project
+        ws_cost.append([
+            name,
+            styled(ws_cost, cap.project_budget[i], number_format='$#,##0'),
+            round(float(cap.est_hours[i]), 1),
+            styled(ws_cost, round(float(cap.est_cost[i]), 2), number_format='$#,##0'),
+            round(float(cap.actual_hours[i]), 1),
+            styled(ws_cost, round(float(cap.actual_cost[i]), 2), number_format='$#,##0'),
+            styled(ws_cost, f'=IF(N(B{row})>0,F{row}/B{row},"")', number_format='0%'),
+        ])
+        row += 1
+    ws_cost.conditional_formatting.add(
+        f'G2:G{max(row - 1, 2)}',
+        CellIsRule(operator='greaterThan', formula=['1'], font=Font(bold=True, color="9C0006"),
+                   fill=PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")))
+
+    # ========== TIMELINE SHEET ==========
+    add_timeline_sheet(wb, collector)
+
+    # ========== CRITICAL PATH SHEET ==========
+    add_critical_path_sheet(wb, collector, deps)
 
     # ========== SAVE ==========
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
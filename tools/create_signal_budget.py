@@ -0,0 +1,171 @@
+"""
+Create Signal Budget Excel Workbook
+One row per wire in a .vsf project: the signal's format and data rate against
+what its connectors and cable can carry (tools/signal_budget.py):
+- Signal Budget: from / to device, port and connector, cable type, format,
+  required and rated Gb/s, headroom and a status (Over cable / Over connector /
+  Audio dropped / No format / Unrated / OK); problems sort first
+- Capabilities: the Sources capability table the connectors were joined
+  against, with the number of wire ends that matched each row
+
+    python -m tools budget show.vsf -o .tmp/show_budget.xlsx
+"""
+
+import os
+import sys
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: numpy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+if __package__ in (None, ""):
+    # Run as a script (python tools/create_signal_budget.py): put the repo root on the path so `tools` imports
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.create_cable_schedule import port_label
+from tools.signal_budget import STATUSES, CapabilityTable, check_project
+from tools.vsf import load_project, project_stem
+
+STATUS_COLORS = {
+    "Over cable": "C62828",
+    "Over connector": "AD1457",
+    "Audio dropped": "EF6C00",
+    "No format": "6A1B9A",
+    "Unrated": "546E7A",
+    "OK": "2E7D32",
+}
+
+
+def create_signal_budget(project_path, output_path=None):
+    if output_path is None:
+        name = project_stem(project_path)
+        output_path = os.path.join(os.path.dirname(__file__), '..', '.tmp', f'{name}_budget.xlsx')
+
+    project = load_project(project_path)
+    nodes = project["nodes"]
+    caps = CapabilityTable()
+    budget = check_project(project, caps)
+
+    wb = Workbook()
+
+    # Colors matching the other workbooks
+    DARK_BG = "1a1a2e"
+    HEADER_BG = "2d2d44"
+    ROW_BG = "252538"
+
+    header_font = Font(bold=True, color="FFFFFF", size=11)
+    title_font = Font(bold=True, color="FFFFFF", size=14)
+    cell_font = Font(color="FFFFFF", size=10)
+    muted_font = Font(color="AAAAAA", size=10, italic=True)
+    header_fill = PatternFill(start_color=HEADER_BG, end_color=HEADER_BG, fill_type="solid")
+    row_fill = PatternFill(start_color=ROW_BG, end_color=ROW_BG, fill_type="solid")
+    dark_fill = PatternFill(start_color=DARK_BG, end_color=DARK_BG, fill_type="solid")
+    thin_border = Border(
+        left=Side(style='thin', color="444466"),
+        right=Side(style='thin', color="444466"),
+        top=Side(style='thin', color="444466"),
+        bottom=Side(style='thin', color="444466")
+    )
+
+    def table(ws, title, note, headers, rows, widths):
+        for row in range(1, 5):
+            for col in range(1, len(headers) + 2):
+                ws.cell(row=row, column=col).fill = dark_fill
+        ws['B2'] = title
+        ws['B2'].font = title_font
+        ws['B3'] = note
+        ws['B3'].font = muted_font
+        for col, header in enumerate(headers, 2):
+            cell = ws.cell(row=5, column=col, value=header)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.border = thin_border
+            cell.alignment = Alignment(horizontal='center')
+        for r, values in enumerate(rows, 6):
+            for col, val in enumerate(values, 2):
+                cell = ws.cell(row=r, column=col, value=val)
+                cell.font = cell_font
+                cell.fill = row_fill
+                cell.border = thin_border
+        ws.freeze_panes = 'B6'
+        if rows:
+            ws.auto_filter.ref = f"B5:{get_column_letter(len(headers) + 1)}{len(rows) + 5}"
+        ws.column_dimensions['A'].width = 3
+        for col, w in enumerate(widths, 2):
+            ws.column_dimensions[get_column_letter(col)].width = w
+
+    def limit(i):
+        return caps.rows[i][3] if i >= 0 else ""
+
+    # ========== SIGNAL BUDGET SHEET ==========
+    # Headroom: share of the tighter rated limit (cable Gb/s, connector pixel rate) left unused
+    cap_rate = np.append(np.asarray(caps.pixel_rate, dtype=np.float64), np.inf)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        use = np.fmax(budget.required_gbps / budget.cable_gbps,
+                      budget.pixel_rate / np.minimum(cap_rate[budget.from_cap], cap_rate[budget.to_cap]))
+    rank = {s: i for i, s in enumerate(STATUSES)}
+    rows, statuses = [], []
+    for n in sorted(range(len(budget.connections)), key=lambda n: rank[budget.status[n]]):
+        conn = budget.connections[n]
+        from_dev, from_port = port_label(nodes, conn["from"])
+        to_dev, to_port = port_label(nodes, conn["to"])
+        fmt = budget.format[n]
+        fmt_text = f"{fmt[0]}x{fmt[1]}@{fmt[2]:g}{'*' if budget.assumed[n] else ''}" if fmt else ""
+        required = float(budget.required_gbps[n])
+        rated = float(budget.cable_gbps[n])
+        headroom = 1 - float(use[n])
+        rows.append([
+            n + 1, conn.get("label") or conn.get("id") or "", budget.cable[n] or "",
+            from_dev, from_port, budget.from_port[n][0], to_dev, to_port, budget.to_port[n][0],
+            fmt_text, round(required, 3) if required == required else None, rated if rated == rated else None,
+            " / ".join(filter(None, (limit(budget.from_cap[n]), limit(budget.to_cap[n])))),
+            headroom if np.isfinite(headroom) else None, budget.status[n],
+        ])
+        statuses.append(budget.status[n])
+
+    ws = wb.active
+    ws.title = "Signal Budget"
+    ws.sheet_properties.tabColor = "C62828"
+    counts = Counter(statuses)
+    table(
+        ws, f"SIGNAL BUDGET — {project.get('name') or os.path.basename(project_path)}",
+        "Active picture x rate x 20 bits (SDI) or 24 (RGB); * rate not entered, 60 assumed   |   "
+        + "   ".join(f"{s}: {counts[s]}" for s in STATUSES if counts[s]),
+        ["#", "Wire", "Cable Type", "From Device", "From Port", "From Connector", "To Device", "To Port",
+         "To Connector", "Format", "Needs Gb/s", "Cable Gb/s", "Connector Max", "Headroom", "Status"],
+        rows, [5, 16, 16, 20, 12, 14, 20, 12, 14, 16, 11, 11, 20, 10, 15],
+    )
+    for r, status in enumerate(statuses, 6):
+        cell = ws.cell(row=r, column=16)
+        cell.fill = PatternFill(start_color=STATUS_COLORS[status], end_color=STATUS_COLORS[status], fill_type="solid")
+        cell.font = Font(bold=True, color="FFFFFF", size=10)
+        cell.alignment = Alignment(horizontal='center')
+        ws.cell(row=r, column=15).number_format = '0%'
+
+    # ========== CAPABILITIES SHEET ==========
+    matched = Counter(budget.from_cap.tolist()) + Counter(budget.to_cap.tolist())
+    ws_caps = wb.create_sheet("Capabilities")
+    ws_caps.sheet_properties.tabColor = "00AA00"
+    table(
+        ws_caps, "CAPABILITIES", f"Sources lookup the connectors were joined against; "
+                                 f"{matched[-1]} wire ends had no matching connector",
+        ["Source Type", "Connector", "Max Resolution", "Audio Support", "Wire Ends"],
+        [[r[1], r[2], r[3], r[4], matched[i]] for i, r in enumerate(caps.rows)],
+        [16, 14, 15, 14, 10],
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    wb.save(output_path)
+    print(f"Signal budget created: {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    create_signal_budget(sys.argv[1], *sys.argv[2:3])
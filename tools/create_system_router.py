@@ -5,16 +5,58 @@ with devices, inputs, outputs, and color coding
 """
 
 import os
+import sys
 from openpyxl import Workbook
 from openpyxl.worksheet.datavalidation import DataValidation
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 from openpyxl.utils import get_column_letter
 from openpyxl.workbook.defined_name import DefinedName
 
-def create_system_router(output_path=None):
+if __package__ in (None, ""):
+    # Run as a script (python tools/create_system_router.py): put the repo root on the path so `tools` imports
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.av_model import System
+
+# Default device shown on the Devices sheet: output rows are (source type, name)
+DEFAULT_DEVICE = {
+    "name": "Laptop",
+    "outputs": [
+        {"port": "HDMI", "name": "HDMI"},
+        {"port": "SDI", "name": "USB-C"},
+    ],
+}
+
+# Source capability lookup (Sources sheet); tools/signal_budget.py joins wires against it
+SOURCE_HEADERS = ["SourceID", "Source Type", "Connector", "Max Resolution", "Audio Support"]
+SOURCE_TYPES = [
+    [1, "HDMI", "HDMI 2.1", "8K@60Hz", "Yes"],
+    [2, "SDI", "BNC", "4K@60Hz", "Embedded"],
+    [3, "DisplayPort", "DP 1.4", "8K@60Hz", "Yes"],
+    [4, "USB-C", "USB-C", "4K@60Hz", "Yes"],
+    [5, "Thunderbolt", "TB4", "8K@60Hz", "Yes"],
+    [6, "VGA", "DE-15", "1080p@60Hz", "No"],
+    [7, "DVI", "DVI-D", "2560x1600", "No"],
+    [8, "Composite", "RCA", "480i", "Separate"],
+    [9, "12G SDI", "BNC 12G", "4K@60Hz", "Embedded"],
+    [10, "3G SDI", "BNC 3G", "1080p@60Hz", "Embedded"],
+    [11, "HD SDI", "BNC HD", "1080i@60Hz", "Embedded"],
+    [12, "SMPTE Fiber", "SMPTE 311", "4K@60Hz", "Embedded"],
+    [13, "HDMI 2.0", "HDMI", "4K@60Hz", "Yes"],
+    [14, "DisplayPort 1.2", "DP 1.2", "4K@60Hz", "Yes"],
+    [15, "NDI", "Ethernet", "4K@60Hz", "Yes"],
+]
+
+
+def create_system_router(output_path=None, system=None):
     if output_path is None:
         output_path = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'system_router.xlsx')
 
+    if system is None:
+        system = System.from_dicts([DEFAULT_DEVICE])
+    device = system.devices[0]
+    ports = system.ports
+
     wb = Workbook()
 
     # Colors matching the UI
@@ -62,7 +104,7 @@ def create_system_router(output_path=None):
     # Device header
     ws_devices.merge_cells('B2:H2')
     device_title = ws_devices['B2']
-    device_title.value = "Laptop"
+    device_title.value = device.name
     device_title.font = Font(bold=True, color="FFFFFF", size=14)
     device_title.fill = header_fill
     device_title.alignment = Alignment(horizontal='center', vertical='center')
@@ -100,6 +142,14 @@ def create_system_router(output_path=None):
     ws_devices['B7'].fill = row_fill
     ws_devices['C7'].fill = row_fill
 
+    # INPUT data rows
+    for i, pid in enumerate(device.inputs, 8):
+        for col, value in ((2, ports.port[pid]), (3, ports.name[pid])):
+            cell = ws_devices.cell(row=i, column=col, value=value)
+            cell.font = cell_font
+            cell.fill = row_fill
+            cell.border = thin_border
+
     # OUTPUT section header
     ws_devices['E6'] = "OUTPUT"
     ws_devices['E6'].font = header_font
@@ -119,12 +169,9 @@ def create_system_router(output_path=None):
     ws_devices['F7'].fill = row_fill
 
     # OUTPUT data rows
-    output_data = [
-        ("HDMI", "HDMI"),
-        ("SDI", "USB-C"),
-    ]
+    for i, pid in enumerate(device.outputs, 8):
+        source, name = ports.port[pid], ports.name[pid]
 
-    for i, (source, name) in enumerate(output_data, 8):
         # Source dropdown cell
         source_cell = ws_devices.cell(row=i, column=5, value=source)
         source_cell.font = cell_font
@@ -160,24 +207,13 @@ def create_system_router(output_path=None):
     ws_sources = wb.create_sheet("Sources")
     ws_sources.sheet_properties.tabColor = "00AA00"
 
-    source_headers = ["SourceID", "Source Type", "Connector", "Max Resolution", "Audio Support"]
-    for col, header in enumerate(source_headers, 1):
+    for col, header in enumerate(SOURCE_HEADERS, 1):
         cell = ws_sources.cell(row=1, column=col, value=header)
         cell.font = header_font
         cell.fill = header_fill
         cell.border = thin_border
 
-    source_data = [
-        [1, "HDMI", "HDMI 2.1", "8K@60Hz", "Yes"],
-        [2, "SDI", "BNC", "4K@60Hz", "Embedded"],
-        [3, "DisplayPort", "DP 1.4", "8K@60Hz", "Yes"],
-        [4, "USB-C", "USB-C", "4K@60Hz", "Yes"],
-        [5, "Thunderbolt", "TB4", "8K@60Hz", "Yes"],
-        [6, "VGA", "DE-15", "1080p@60Hz", "No"],
-        [7, "DVI", "DVI-D", "2560x1600", "No"],
-        [8, "Composite", "RCA", "480i", "Separate"],
-    ]
-    for row_idx, row_data in enumerate(source_data, 2):
+    for row_idx, row_data in enumerate(SOURCE_TYPES, 2):
         for col_idx, value in enumerate(row_data, 1):
             cell = ws_sources.cell(row=row_idx, column=col_idx, value=value)
             cell.border = thin_border
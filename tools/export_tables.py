@@ -0,0 +1,186 @@
+"""
+Columnar Table Export
+The data behind the router workbook's device sheets and Routing sheet, written
+straight from an av_model.System for systems that do not want to re-parse xlsx:
+- devices, ports, routes and cables (routes that came from .vsf wires, with
+  their cable type, length and wire number) as CSV, JSON Lines or Parquet
+- Each table is produced in chunks of CHUNK_ROWS rows, one list per column,
+  sliced from the model's struct-of-arrays storage; a chunk is written and
+  dropped before the next is built, so memory stays flat whatever the row count
+- JSON Lines encodes each distinct string once per chunk (device names and port
+  codes repeat on every row) and formats whole lines with one template
+
+Parquet needs pyarrow (pip install pyarrow); CSV and JSON Lines use the stdlib.
+
+    export_system(system, ".tmp/export", formats=("csv", "parquet"))
+    python -m tools export show.vsf -o .tmp/show_tables --format jsonl
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+
+from tools.av_model import INPUT
+from tools.vsf import parse_length_ft
+
+CHUNK_ROWS = 65536
+FORMATS = ("csv", "jsonl", "parquet")
+EXTENSIONS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}
+
+# table -> [(column, kind)]; kind is "int", "float" or "str"
+TABLES = {
+    "devices": [("device_id", "int"), ("name", "str"), ("type", "str"), ("color", "str"), ("inputs", "int"),
+                ("outputs", "int"), ("manufacturer", "str"), ("model", "str"), ("tag", "str")],
+    "ports": [("port_id", "int"), ("device_id", "int"), ("device", "str"), ("direction", "str"),
+              ("port", "str"), ("name", "str"), ("signal", "str")],
+    "routes": [("route_id", "int"), ("src_port_id", "int"), ("src_device", "str"), ("src_port", "str"),
+               ("dst_port_id", "int"), ("dst_device", "str"), ("dst_port", "str"), ("signal", "str"),
+               ("status", "str"), ("wire_number", "str")],
+    "cables": [("route_id", "int"), ("wire_id", "str"), ("wire_number", "str"), ("cable_type", "str"), ("length", "str"),
+               ("length_ft", "float"), ("src_device", "str"), ("src_port", "str"), ("dst_device", "str"),
+               ("dst_port", "str"), ("label", "str")],
+}
+
+
+# ===== CHUNKS (one list per column) =====
+def device_chunks(system, size=CHUNK_ROWS):
+    devices = system.devices
+    for lo in range(0, len(devices), size):
+        part = devices[lo:lo + size]
+        metas = [d.meta if isinstance(d.meta, dict) else {} for d in part]
+        yield [
+            [d.id for d in part], [d.name for d in part], [d.type for d in part], [d.color for d in part],
+            [len(d.inputs) for d in part], [len(d.outputs) for d in part],
+            [m.get("manufacturer") or "" for m in metas], [m.get("model") or "" for m in metas],
+            [m.get("tag") or "" for m in metas],
+        ]
+
+
+def port_chunks(system, size=CHUNK_ROWS):
+    ports = system.ports
+    names = [d.name for d in system.devices]
+    for lo in range(0, len(ports), size):
+        hi = min(lo + size, len(ports))
+        device = ports.device[lo:hi].tolist()
+        yield [
+            list(range(lo, hi)), device, [names[d] for d in device],
+            ["input" if x == INPUT else "output" for x in ports.direction[lo:hi]],
+            ports.port[lo:hi], ports.name[lo:hi], ports.signal[lo:hi],
+        ]
+
+
+def _route_ends(system, part):
+    ports = system.ports
+    device_of, port_name = ports.device, ports.name
+    names = [d.name for d in system.devices]
+    src = [r.src for r in part]
+    dst = [r.dst for r in part]
+    return (src, [names[device_of[p]] for p in src], [port_name[p] for p in src],
+            dst, [names[device_of[p]] for p in dst], [port_name[p] for p in dst])
+
+
+def route_chunks(system, size=CHUNK_ROWS):
+    routes = system.routes
+    for lo in range(0, len(routes), size):
+        part = routes[lo:lo + size]
+        src, src_dev, src_port, dst, dst_dev, dst_port = _route_ends(system, part)
+        yield [[r.id for r in part], src, src_dev, src_port, dst, dst_dev, dst_port,
+               [r.signal for r in part], [r.status for r in part], [r.number for r in part]]
+
+
+def cable_chunks(system, size=CHUNK_ROWS):
+    """Routes built from .vsf wires (Route.meta is the connection dict)."""
+    wired = [r for r in system.routes if isinstance(r.meta, dict)]
+    for lo in range(0, len(wired), size):
+        part = wired[lo:lo + size]
+        conns = [r.meta for r in part]
+        lengths = [c.get("cableLength") or c.get("length") or "" for c in conns]
+        _src, src_dev, src_port, _dst, dst_dev, dst_port = _route_ends(system, part)
+        yield [[r.id for r in part], [c.get("id") or "" for c in conns], [r.number for r in part],
+               [c.get("cableType") or "" for c in conns],
+               lengths, [parse_length_ft(x) for x in lengths], src_dev, src_port, dst_dev, dst_port,
+               [c.get("label") or "" for c in conns]]
+
+
+CHUNKS = {"devices": device_chunks, "ports": port_chunks, "routes": route_chunks, "cables": cable_chunks}
+
+
+# ===== WRITERS =====
+def write_csv(path, columns, chunks):
+    rows = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([name for name, _kind in columns])
+        for chunk in chunks:
+            writer.writerows(zip(*chunk))
+            rows += len(chunk[0])
+    return rows
+
+
+def _encode_column(values, kind, cache):
+    """JSON literal per value. Strings go through a per-chunk cache: names and codes repeat."""
+    if kind == "int":
+        return list(map(str, values))
+    if kind == "float":
+        return ["null" if v is None else repr(float(v)) for v in values]
+    for v in set(values).difference(cache):
+        cache[v] = json.dumps(v, ensure_ascii=False)
+    return list(map(cache.__getitem__, values))
+
+
+def write_jsonl(path, columns, chunks):
+    template = "{" + ",".join(f"{json.dumps(name)}:%s" for name, _kind in columns) + "}\n"
+    rows = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for chunk in chunks:
+            cache = {}
+            encoded = [_encode_column(values, kind, cache) for values, (_name, kind) in zip(chunk, columns)]
+            f.write("".join(template % row for row in zip(*encoded)))
+            rows += len(chunk[0])
+    return rows
+
+
+def write_parquet(path, columns, chunks):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("ERROR: pyarrow not installed. Run: pip install pyarrow")
+        sys.exit(1)
+
+    types = {"int": pa.int64(), "float": pa.float64(), "str": pa.string()}
+    schema = pa.schema([(name, types[kind]) for name, kind in columns])
+    rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=types[kind]) for values, (_name, kind) in zip(chunk, columns)],
+                schema=schema,
+            ))
+            rows += len(chunk[0])
+    return rows
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "parquet": write_parquet}
+
+
+def export_system(system, output_dir=None, formats=("csv",), tables=tuple(TABLES), chunk_rows=CHUNK_ROWS):
+    """Write each table in each format to output_dir/<table>.<ext>. Returns {path: rows}."""
+    if output_dir is None:
+        output_dir = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'export')
+    os.makedirs(output_dir, exist_ok=True)
+    written = {}
+    for fmt in formats:
+        if fmt not in WRITERS:
+            raise ValueError(f"Unknown export format {fmt!r} (expected one of {', '.join(FORMATS)})")
+        for table in tables:
+            if table not in TABLES:
+                raise ValueError(f"Unknown table {table!r} (expected one of {', '.join(TABLES)})")
+            path = os.path.join(output_dir, table + EXTENSIONS[fmt])
+            start = time.perf_counter()
+            rows = WRITERS[fmt](path, TABLES[table], CHUNKS[table](system, chunk_rows))
+            written[path] = rows
+            print(f"Exported {rows} {table} rows: {path} ({time.perf_counter() - start:.2f} s)")
+    return written
@@ -0,0 +1,253 @@
+"""
+Content-Addressed Images
+Device logos and project images for the generators, stored once per content hash:
+- ImageStore.put_bytes / put_file: store under blobs/<sha256>.<ext>, deduplicated
+- ImageStore.thumbnail: resized copy cached on disk between runs (needs Pillow;
+  without it the original is used and only the display size shrinks)
+- fit_size: display size for an image inside a box
+- ImageStore.logo_for: manufacturer logo from nexus-x/public/logos/<name>.png
+- ImageStore.device_image: a device's embedded project image, image file or logo
+- iter_project_images: stream-decode base64 data URLs out of a .vsf without
+  loading the whole file or holding a decoded copy in memory
+- project_images: {blob key: ImageRef} for a .vsf's `_imageBlobs`
+
+Embedding into xlsx lives in tools/xlsx_writer.py (SharedImage), which writes
+each hash once to xl/media no matter how many sheets reference it.
+"""
+
+import base64
+import hashlib
+import os
+import re
+import shutil
+import struct
+import tempfile
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'images')
+LOGOS_DIR = os.path.join(os.path.dirname(__file__), '..', 'nexus-x', 'public', 'logos')
+
+_CHUNK = 1 << 20
+
+
+class ImageRef:
+    __slots__ = ("sha", "path", "format", "width", "height")
+
+    def __init__(self, sha, path, format, width, height):
+        self.sha = sha
+        self.path = path
+        self.format = format
+        self.width = width
+        self.height = height
+
+    def __repr__(self):
+        return f"ImageRef({self.sha[:12]}, {self.format}, {self.width}x{self.height})"
+
+
+def image_info(head):
+    """(format, width, height) from the first bytes of a PNG, JPEG or GIF; (None, 0, 0) if unknown."""
+    if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+        w, h = struct.unpack(">II", head[16:24])
+        return "png", w, h
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        w, h = struct.unpack("<HH", head[6:10])
+        return "gif", w, h
+    if head[:2] == b"\xff\xd8":
+        i = 2
+        while i + 9 < len(head):
+            if head[i] != 0xFF:
+                i += 1
+                continue
+            marker = head[i + 1]
+            length = struct.unpack(">H", head[i + 2:i + 4])[0]
+            if marker in (0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF):
+                h, w = struct.unpack(">HH", head[i + 5:i + 9])
+                return "jpeg", w, h
+            i += 2 + length
+        return "jpeg", 0, 0
+    return None, 0, 0
+
+
+def fit_size(ref, max_width, max_height):
+    """Display size for an image inside a box, keeping its aspect ratio and never enlarging it."""
+    if not (ref.width and ref.height):
+        return max_width, max_height
+    scale = min(max_width / ref.width, max_height / ref.height, 1.0)
+    return max(1, round(ref.width * scale)), max(1, round(ref.height * scale))
+
+
+def _read_head(path, size=64 * 1024):
+    with open(path, "rb") as f:
+        return f.read(size)
+
+
+class ImageStore:
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        self.thumb_dir = os.path.join(root, "thumbs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.thumb_dir, exist_ok=True)
+        self._refs = {}   # sha -> ImageRef (per process)
+        self._logos = {}  # (logos dir, manufacturer slug) -> ImageRef or None (per process)
+
+    # ===== STORING =====
+    def _ref(self, sha, path):
+        ref = self._refs.get(sha)
+        if ref is None:
+            fmt, w, h = image_info(_read_head(path))
+            ref = self._refs[sha] = ImageRef(sha, path, fmt or "png", w, h)
+        return ref
+
+    def _commit(self, tmp_path, sha, ext):
+        path = os.path.join(self.blob_dir, f"{sha}.{ext}")
+        if os.path.exists(path):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+        return self._ref(sha, path)
+
+    def put_bytes(self, data):
+        sha = hashlib.sha256(data).hexdigest()
+        if sha in self._refs:
+            return self._refs[sha]
+        fmt = image_info(data[:64 * 1024])[0] or "png"
+        fd, tmp = tempfile.mkstemp(dir=self.blob_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return self._commit(tmp, sha, fmt)
+
+    def put_file(self, path):
+        h = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=self.blob_dir)
+        with open(path, "rb") as src, os.fdopen(fd, "wb") as dst:
+            for chunk in iter(lambda: src.read(_CHUNK), b""):
+                h.update(chunk)
+                dst.write(chunk)
+        fmt = image_info(_read_head(tmp))[0] or "png"
+        return self._commit(tmp, h.hexdigest(), fmt)
+
+    def put_base64_chunks(self, chunks):
+        """Decode base64 text arriving in pieces; hashes and writes as it goes."""
+        h = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=self.blob_dir)
+        pending = b""
+        with os.fdopen(fd, "wb") as dst:
+            for chunk in chunks:
+                pending += chunk.replace(b"\\", b"").replace(b"\n", b"")
+                cut = len(pending) - len(pending) % 4
+                if cut:
+                    data = base64.b64decode(pending[:cut])
+                    h.update(data)
+                    dst.write(data)
+                    pending = pending[cut:]
+            if pending:
+                data = base64.b64decode(pending + b"=" * (-len(pending) % 4))
+                h.update(data)
+                dst.write(data)
+        fmt = image_info(_read_head(tmp))[0] or "png"
+        return self._commit(tmp, h.hexdigest(), fmt)
+
+    # ===== THUMBNAILS =====
+    def thumbnail(self, ref, max_width, max_height):
+        """
+        Resized PNG that fits max_width x max_height, cached as thumbs/<sha>_<w>x<h>.png.
+        Returns the original when it already fits or Pillow is not installed.
+        """
+        if ref.width and ref.height and ref.width <= max_width and ref.height <= max_height:
+            return ref
+        path = os.path.join(self.thumb_dir, f"{ref.sha}_{max_width}x{max_height}.png")
+        if not os.path.exists(path):
+            try:
+                from PIL import Image as PILImage
+            except ImportError:
+                return ref
+            with PILImage.open(ref.path) as img:
+                img.thumbnail((max_width, max_height))
+                fd, tmp = tempfile.mkstemp(dir=self.thumb_dir, suffix=".png")
+                with os.fdopen(fd, "wb") as f:
+                    img.save(f, format="PNG")
+            os.replace(tmp, path)
+        # A thumbnail is fixed by its original and box, so its id derives from the known hash
+        return self._ref(hashlib.sha256(f"{ref.sha}:{max_width}x{max_height}".encode()).hexdigest(), path)
+
+    # ===== LOGOS =====
+    def logo_for(self, manufacturer, logos_dir=LOGOS_DIR):
+        """Logo for a manufacturer name ("Blackmagic" -> logos/blackmagic.png), or None."""
+        if not manufacturer:
+            return None
+        slug = re.sub(r"[^a-z0-9]+", "-", manufacturer.strip().lower()).strip("-")
+        key = (logos_dir, slug)
+        if key not in self._logos:
+            self._logos[key] = None
+            for ext in ("png", "jpg", "jpeg", "gif"):
+                path = os.path.join(logos_dir, f"{slug}.{ext}")
+                if os.path.exists(path):
+                    self._logos[key] = self.put_file(path)
+                    break
+        return self._logos[key]
+
+    def device_image(self, meta, project_images=None):
+        """
+        Image for a device's meta: its embedded project image ("imageBlobKey" into
+        project_images), an image file ("image"), or its manufacturer's logo; None if none.
+        """
+        meta = meta or {}
+        ref = (project_images or {}).get(meta.get("imageBlobKey"))
+        if ref is not None:
+            return ref
+        if meta.get("image") and os.path.exists(meta["image"]):
+            return self.put_file(meta["image"])
+        return self.logo_for(meta.get("manufacturer"))
+
+    def clear_thumbnails(self):
+        shutil.rmtree(self.thumb_dir, ignore_errors=True)
+        os.makedirs(self.thumb_dir, exist_ok=True)
+
+
+# ===== STREAMING DATA-URL EXTRACTION =====
+_DATA_URL = re.compile(rb'"data:(image/[\w.+-]+);base64,')
+_KEY_BEFORE = re.compile(rb'"([^"\\]{1,200})"\s*:\s*$')
+
+
+def iter_project_images(path, store):
+    """
+    Yield (json key, ImageRef) for every base64 image data URL in a .vsf file,
+    reading and decoding in chunks. The key is the JSON key the URL is stored
+    under (the blobKey in `_imageBlobs`), or None for data URLs inside arrays.
+    """
+    with open(path, "rb") as f:
+        buf = b""
+        while True:
+            m = _DATA_URL.search(buf)
+            if m is None:
+                chunk = f.read(_CHUNK)
+                if not chunk:
+                    return
+                # Keep a tail in case a marker straddles two chunks
+                buf = buf[-256:] + chunk
+                continue
+
+            km = _KEY_BEFORE.search(buf[max(0, m.start() - 256):m.start()])
+            key = km.group(1).decode("utf-8", "replace") if km else None
+            rest = buf[m.end():]
+
+            def payload():
+                nonlocal rest
+                while True:
+                    end = rest.find(b'"')
+                    if end >= 0:
+                        yield rest[:end]
+                        rest = rest[end + 1:]
+                        return
+                    yield rest
+                    rest = f.read(_CHUNK)
+                    if not rest:
+                        return
+
+            yield key, store.put_base64_chunks(payload())
+            buf = rest
+
+
+def project_images(path, store):
+    """{blob key: ImageRef} for the data URLs a .vsf embeds under `_imageBlobs` (or any other key)."""
+    return {key: ref for key, ref in iter_project_images(path, store) if key is not None}
@@ -0,0 +1,326 @@
+"""
+Layout Lint for .vsf Projects
+Finds drawing problems the app does not warn about:
+- Overlapping nodes (sweep-line over box x-extents, open boxes bucketed in y
+  bands; "stacked" when one box mostly covers the other)
+- Wires that run through the body of a node other than the two they connect
+  (wire segments and node boxes bucketed into a uniform grid, then joined)
+
+Boxes come from tools/node_layout.py (position, scale, sections, row counts),
+wires from the same computeWirePath geometry the renderer uses, with beziers
+flattened to short segments. Neither check compares every pair.
+
+    python -m tools lint show.vsf
+    python -m tools lint show.vsf -o .tmp/show_lint.xlsx
+"""
+
+import json
+import os
+import sys
+from heapq import heappop, heappush
+from math import floor
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: numpy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from tools.node_layout import anchor_positions, layout_nodes
+from tools.render_diagram import WirePaths
+from tools.vsf import device_name, load_project, parse_anchor
+
+BEZIER_STEPS = 16      # segments per flattened bezier wire
+GRID_CELL = 128.0      # px; longer wire segments are split to fit one cell
+STACKED_RATIO = 0.9    # overlap / smaller box area at which two nodes count as stacked
+WIRE_INSET = 2.0       # px; grazing a node's border is not a crossing
+
+
+# ===== NODE OVERLAPS =====
+def find_overlaps(rects, min_overlap=1.0, band=None):
+    """
+    Pairs of overlapping rectangles by sweeping left to right. Boxes whose
+    x-extent is still open are kept in horizontal bands (`band` px tall, default
+    the median box height), and a box is only compared with the open boxes in
+    the bands it spans: a tall column of nodes that share an x-extent costs one
+    band lookup per node, not a comparison with every node above it.
+    Returns [(i, j, (x0, y0, x1, y1))] with the shared rectangle, sorted.
+    """
+    if not rects:
+        return []
+    if band is None:
+        band = float(np.median([y1 - y0 for _x0, y0, _x1, y1 in rects]))
+    band = max(band, 1.0)
+
+    def band_range(y0, y1):
+        return range(floor(y0 / band), floor(y1 / band) + 1)
+
+    order = sorted(range(len(rects)), key=lambda i: rects[i][0])
+    active = []   # heap of (right edge, index)
+    bands = {}    # band -> open box indices
+    found = []
+    for i in order:
+        x0, y0, x1, y1 = rects[i]
+        while active and active[0][0] <= x0 + min_overlap:
+            _right, j = heappop(active)
+            for b in band_range(rects[j][1], rects[j][3]):
+                bands[b].discard(j)
+        seen = set()
+        for b in band_range(y0, y1):
+            for j in bands.get(b, ()):
+                if j in seen:
+                    continue
+                seen.add(j)
+                a0, b0, a1, b1 = rects[j]
+                top, bottom = max(y0, b0), min(y1, b1)
+                if bottom - top >= min_overlap:
+                    right = min(x1, a1)
+                    if right - x0 >= min_overlap:
+                        found.append((j, i, (x0, top, right, bottom)))
+        for b in band_range(y0, y1):
+            bands.setdefault(b, set()).add(i)
+        heappush(active, (x1, i))
+    found.sort()
+    return found
+
+
+# ===== WIRE / NODE CROSSINGS =====
+def wire_segments(wires):
+    """Flatten WirePaths into segment arrays (x0, y0, x1, y1) plus the wire index of each."""
+    parts, owner = [], []
+    if len(wires.bez):
+        t = np.linspace(0.0, 1.0, BEZIER_STEPS + 1)[None, :]
+        u = 1 - t
+        b = wires.bez
+        xs = u ** 3 * b[:, [0]] + 3 * u * u * t * b[:, [2]] + 3 * u * t * t * b[:, [4]] + t ** 3 * b[:, [6]]
+        ys = u ** 3 * b[:, [1]] + 3 * u * u * t * b[:, [3]] + 3 * u * t * t * b[:, [5]] + t ** 3 * b[:, [7]]
+        parts.append(np.stack([xs[:, :-1], ys[:, :-1], xs[:, 1:], ys[:, 1:]], axis=-1).reshape(-1, 4))
+        bez_wires = np.flatnonzero(wires.kind == 0)
+        owner.append(np.repeat(bez_wires, BEZIER_STEPS))
+    if len(wires.pts):
+        pts = wires.pts
+        keep = np.ones(len(pts) - 1, dtype=bool)
+        keep[wires.start[1:-1] - 1] = False   # no segment from one wire's end to the next wire's start
+        parts.append(np.column_stack([pts[:-1], pts[1:]])[keep])
+        ortho_wires = np.flatnonzero(wires.kind == 1)
+        owner.append(np.repeat(ortho_wires, np.diff(wires.start) - 1))
+    if not parts:
+        return np.empty((0, 4)), np.empty(0, dtype=np.int64)
+    return np.concatenate(parts), np.concatenate(owner)
+
+
+def _split_long(segs, owner, cell):
+    """Split segments so none is longer than a grid cell (each then touches at most 2x2 cells)."""
+    length = np.hypot(segs[:, 2] - segs[:, 0], segs[:, 3] - segs[:, 1])
+    pieces = np.maximum(1, np.ceil(length / cell)).astype(np.int64)
+    if (pieces == 1).all():
+        return segs, owner
+    idx = np.repeat(np.arange(len(segs)), pieces)
+    k = np.arange(len(idx)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    n = pieces[idx]
+    s = segs[idx]
+    t0, t1 = (k / n)[:, None], ((k + 1) / n)[:, None]
+    a, d = s[:, :2], s[:, 2:] - s[:, :2]
+    return np.column_stack([a + d * t0, a + d * t1]), owner[idx]
+
+
+def find_wire_crossings(segs, owner, rects, exclude, cell=GRID_CELL, inset=WIRE_INSET):
+    """
+    (wire, rect, x, y) for each wire that passes through a rectangle's interior,
+    skipping (wire, rect) pairs in `exclude` (the wire's own endpoints).
+    Segments and rectangles are bucketed by grid cell and joined on the cell key.
+    """
+    if not len(segs) or not len(rects):
+        return []
+    segs, owner = _split_long(segs, owner, cell)
+    r = np.asarray(rects, dtype=float) + np.array([inset, inset, -inset, -inset])
+
+    def key(cx, cy):
+        return (cx.astype(np.int64) + (1 << 20)) * (1 << 21) + (cy.astype(np.int64) + (1 << 20))
+
+    # Rectangles into every cell they cover
+    c0 = np.floor(r[:, :2] / cell).astype(np.int64)
+    c1 = np.floor(r[:, 2:] / cell).astype(np.int64)
+    nx, ny = c1[:, 0] - c0[:, 0] + 1, c1[:, 1] - c0[:, 1] + 1
+    counts = np.maximum(nx, 0) * np.maximum(ny, 0)
+    rect_idx = np.repeat(np.arange(len(r)), counts)
+    k = np.arange(len(rect_idx)) - np.repeat(np.cumsum(counts) - counts, counts)
+    rx = c0[rect_idx, 0] + k % nx[rect_idx]
+    ry = c0[rect_idx, 1] + k // nx[rect_idx]
+    rect_keys = key(rx, ry)
+    order = np.argsort(rect_keys, kind="stable")
+    rect_keys, rect_idx = rect_keys[order], rect_idx[order]
+
+    # Segments into the (at most 2x2) cells their bounding box touches
+    lo = np.floor(np.minimum(segs[:, :2], segs[:, 2:]) / cell).astype(np.int64)
+    hi = np.floor(np.maximum(segs[:, :2], segs[:, 2:]) / cell).astype(np.int64)
+    seg_ids, seg_keys = [], []
+    for dx in (0, 1):
+        for dy in (0, 1):
+            ok = (lo[:, 0] + dx <= hi[:, 0]) & (lo[:, 1] + dy <= hi[:, 1])
+            ids = np.flatnonzero(ok)
+            seg_ids.append(ids)
+            seg_keys.append(key(lo[ids, 0] + dx, lo[ids, 1] + dy))
+    seg_ids, seg_keys = np.concatenate(seg_ids), np.concatenate(seg_keys)
+
+    # Join on cell key
+    first = np.searchsorted(rect_keys, seg_keys, "left")
+    last = np.searchsorted(rect_keys, seg_keys, "right")
+    n = last - first
+    pair_seg = np.repeat(seg_ids, n)
+    offs = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+    pair_rect = rect_idx[np.repeat(first, n) + offs]
+    pair_wire = owner[pair_seg]
+    if exclude:
+        ex = np.array(sorted(w * len(r) + q for w, q in exclude), dtype=np.int64)
+        code = pair_wire * len(r) + pair_rect
+        keep = ~np.isin(code, ex)
+        pair_seg, pair_rect, pair_wire = pair_seg[keep], pair_rect[keep], pair_wire[keep]
+
+    # Exact test: Liang-Barsky clip of each candidate segment against its rectangle
+    s, q = segs[pair_seg], r[pair_rect]
+    dx, dy = s[:, 2] - s[:, 0], s[:, 3] - s[:, 1]
+    t0 = np.zeros(len(s))
+    t1 = np.ones(len(s))
+    inside = np.ones(len(s), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, d in ((-dx, s[:, 0] - q[:, 0]), (dx, q[:, 2] - s[:, 0]), (-dy, s[:, 1] - q[:, 1]), (dy, q[:, 3] - s[:, 1])):
+            t = d / p
+            parallel = p == 0
+            inside &= ~(parallel & (d <= 0))
+            t0 = np.where(~parallel & (p < 0), np.maximum(t0, t), t0)
+            t1 = np.where(~parallel & (p > 0), np.minimum(t1, t), t1)
+    hit = inside & (t0 < t1)
+    pair_wire, pair_rect, t0, s = pair_wire[hit], pair_rect[hit], t0[hit], s[hit]
+
+    # One report per (wire, rect), at the first point the wire enters it
+    code = pair_wire * len(r) + pair_rect
+    _u, first_hit = np.unique(code, return_index=True)
+    out = []
+    for i in first_hit.tolist():
+        x = s[i, 0] + (s[i, 2] - s[i, 0]) * t0[i]
+        y = s[i, 1] + (s[i, 3] - s[i, 1]) * t0[i]
+        out.append((int(pair_wire[i]), int(pair_rect[i]), float(x), float(y)))
+    return out
+
+
+# ===== LINT =====
+def lint_project(project, min_overlap=1.0):
+    """Lint report dict: node overlaps and wire/node crossings with canvas coordinates."""
+    boxes = layout_nodes(project)
+    index = {box.id: i for i, box in enumerate(boxes)}
+    rects = [box.bounds for box in boxes]
+
+    overlaps = []
+    for i, j, (x0, y0, x1, y1) in find_overlaps(rects, min_overlap):
+        area = (x1 - x0) * (y1 - y0)
+        smaller = min((r[2] - r[0]) * (r[3] - r[1]) for r in (rects[i], rects[j]))
+        overlaps.append({
+            "nodes": [boxes[i].id, boxes[j].id],
+            "names": [device_name(boxes[i].node), device_name(boxes[j].node)],
+            "rect": [round(v, 1) for v in (x0, y0, x1, y1)],
+            "area": round(area, 1),
+            "stacked": smaller > 0 and area / smaller >= STACKED_RATIO,
+        })
+
+    anchors = anchor_positions(boxes)
+    side = {"left": -1.0, "right": 1.0}
+    conns, from_pos, to_pos, waypoints, exclude = [], [], [], [], set()
+    for conn in project.get("connections") or []:
+        a, b = anchors.get(conn.get("from")), anchors.get(conn.get("to"))
+        if a is None or b is None:
+            continue
+        w = len(conns)
+        conns.append(conn)
+        from_pos.append((a[0], a[1], side[a[2]]))
+        to_pos.append((b[0], b[1], side[b[2]]))
+        waypoints.append(conn.get("waypoints") or [])
+        for end in (conn["from"], conn["to"]):
+            exclude.add((w, index[parse_anchor(end)[0]]))
+
+    crossings = []
+    if conns:
+        segs, owner = wire_segments(WirePaths(from_pos, to_pos, waypoints))
+        for w, n, x, y in find_wire_crossings(segs, owner, rects, exclude):
+            conn, box = conns[w], boxes[n]
+            crossings.append({
+                "wire": conn.get("id"),
+                "from": conn.get("from"),
+                "to": conn.get("to"),
+                "node": box.id,
+                "name": device_name(box.node),
+                "at": [round(x, 1), round(y, 1)],
+            })
+
+    return {
+        "name": project.get("name"),
+        "nodes": len(boxes),
+        "wires": len(conns),
+        "overlaps": overlaps,
+        "wire_crossings": crossings,
+    }
+
+
+def write_sheet(report, output_path):
+    """Report as an xlsx with one sheet per check."""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook()
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="2d2d44", end_color="2d2d44", fill_type="solid")
+    stacked_fill = PatternFill(start_color="FFCDD2", end_color="FFCDD2", fill_type="solid")
+
+    def sheet(ws, headers, rows, widths):
+        ws.append(headers)
+        for cell in ws[1]:
+            cell.font = header_font
+            cell.fill = header_fill
+        for row in rows:
+            ws.append(row)
+        ws.freeze_panes = "A2"
+        if rows:
+            ws.auto_filter.ref = f"A1:{get_column_letter(len(headers))}{len(rows) + 1}"
+        for i, w in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(i)].width = w
+
+    ws = wb.active
+    ws.title = "Overlaps"
+    sheet(ws, ["Node A", "Name A", "Node B", "Name B", "X0", "Y0", "X1", "Y1", "Area", "Stacked"], [
+        [o["nodes"][0], o["names"][0], o["nodes"][1], o["names"][1], *o["rect"], o["area"], "Yes" if o["stacked"] else ""]
+        for o in report["overlaps"]
+    ], [20, 22, 20, 22, 9, 9, 9, 9, 10, 9])
+    for row in ws.iter_rows(min_row=2):
+        if row[9].value == "Yes":
+            for cell in row:
+                cell.fill = stacked_fill
+
+    sheet(wb.create_sheet("Wire Crossings"), ["Wire", "From", "To", "Through Node", "Name", "X", "Y"], [
+        [c["wire"], c["from"], c["to"], c["node"], c["name"], *c["at"]] for c in report["wire_crossings"]
+    ], [22, 26, 26, 20, 22, 9, 9])
+    wb.save(output_path)
+
+
+def lint_layout(project_path, output_path=None, min_overlap=1.0):
+    """Lint a .vsf file; writes JSON (or .xlsx) when output_path is given. Returns the report."""
+    report = lint_project(load_project(project_path), min_overlap)
+    report["file"] = project_path
+    if output_path:
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        if output_path.endswith(".xlsx"):
+            write_sheet(report, output_path)
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+    stacked = sum(1 for o in report["overlaps"] if o["stacked"])
+    print(f"{project_path}: {report['nodes']} nodes, {report['wires']} wires -- "
+          f"{len(report['overlaps'])} overlaps ({stacked} stacked), "
+          f"{len(report['wire_crossings'])} wires through nodes")
+    if output_path:
+        print(f"Lint report created: {output_path}")
+    return report
+
+
+if __name__ == "__main__":
+    lint_layout(sys.argv[1], *sys.argv[2:3])
@@ -0,0 +1,380 @@
+"""
+Bulk Legacy React Flow Migration
+Python port of nexus-x/src/services/legacyReactFlow.js for whole archives:
+- convert_legacy_react_flow(): the app's conversion (nodes array + edges array
+  -> SuperNode project), field for field
+- migrate_tree(): finds project files under directories, converts them across
+  a process pool and writes each .vsf atomically (temp file + rename)
+- A manifest in the output directory records each source's SHA-256; a file
+  whose content has not changed since its last conversion is skipped unread
+  beyond the hash
+
+Node ids are "node-<ms>" like the app's, but counted from the source file's
+mtime instead of the clock, so converting the same file twice gives the same
+bytes. Files already in the native or pages format are left alone. Sources that
+would write the same output (show.json next to show.vsf) are reported as failed
+instead of overwriting each other.
+
+    python -m tools migrate-legacy ~/Archive -o ~/Migrated --jobs 8
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tools.vsf import signal_palette
+
+MANIFEST = ".migrated.json"
+PROJECT_EXT_RE = re.compile(r"\.(vsf|sfw\.json|sfw|json)$", re.IGNORECASE)
+_CHUNK = 1 << 20
+
+
+# ===== CONVERSION (legacyReactFlow.js) =====
+def _hex_to_rgb(h):
+    clean = (h or "").replace("#", "", 1)
+    full = "".join(c + c for c in clean) if len(clean) == 3 else clean
+    if len(full) != 6:
+        return None
+    try:
+        return int(full[0:2], 16), int(full[2:4], 16), int(full[4:6], 16)
+    except ValueError:
+        return None
+
+
+def closest_palette_id(hex_color):
+    rgb = _hex_to_rgb(hex_color)
+    if not rgb:
+        return None
+    best_id, best_d = None, float("inf")
+    for color_id, phex in signal_palette().items():
+        prgb = _hex_to_rgb(phex)
+        if not prgb:
+            continue
+        d = sum((a - b) ** 2 for a, b in zip(rgb, prgb))
+        if d < best_d:
+            best_id, best_d = color_id, d
+    return best_id
+
+
+_RESOLUTION_RE = re.compile(r"^(\d+x\d+)(?:@(\S+))?$")
+
+
+def _parse_resolution(s):
+    if not s:
+        return "", ""
+    m = _RESOLUTION_RE.match(str(s).strip())
+    if m:
+        return m.group(1) or "", m.group(2) or ""
+    return s, ""
+
+
+def _parse_number(name, fallback):
+    if not name:
+        return fallback
+    m = re.search(r"(\d+)", str(name))
+    return int(m.group(1)) if m else fallback
+
+
+def _port(old, number, connector, resolution):
+    """Port dict in the app's key order; `id` only when the legacy port had one."""
+    res, rate = _parse_resolution(resolution)
+    port = {"id": old["id"]} if "id" in old else {}
+    port.update(number=number, connector=connector or "", resolution=res, refreshRate=rate)
+    return port
+
+
+def _make_port(old, idx, is_output):
+    number = _parse_number(old.get("name"), idx + 1)
+    port = _port(old, number, old.get("type"), old.get("resolution"))
+    default_name = f"{'OUT' if is_output else 'IN'} {number}"
+    if old.get("name") and str(old["name"]).strip().upper() != default_name:
+        port["label"] = old["name"]
+    if is_output:
+        port["destination"] = old.get("destination") or ""
+    else:
+        port["source"] = old.get("connection") or ""
+    if old.get("spacing") is not None:
+        port["spacing"] = old["spacing"]
+    return port
+
+
+def _make_card_port(old, idx, is_output):
+    port = _port(old, idx + 1, old.get("type"), old.get("resolution"))
+    if is_output:
+        port["destination"] = old.get("destination") or ""
+    else:
+        port["source"] = old.get("source") or ""
+    return port
+
+
+def _extract_port_id(handle):
+    if not handle:
+        return ""
+    if handle.startswith("output-"):
+        return handle[len("output-"):]
+    if handle.startswith("input-"):
+        return handle[len("input-"):]
+    # barcoE3 pattern: cardId(5-segment UUID) + connectorId(5-segment UUID) + side
+    parts = handle.split("-")
+    if len(parts) == 11:
+        return "-".join(parts[5:10])
+    return handle
+
+
+def is_legacy_react_flow(data):
+    return isinstance(data, dict) and isinstance(data.get("nodes"), list) and isinstance(data.get("edges"), list)
+
+
+def convert_legacy_react_flow(legacy, base_ts=None):
+    """Legacy React Flow project -> native project dict (same shape the app produces)."""
+    if base_ts is None:
+        base_ts = int(time.time() * 1000)
+    old_to_new = {n.get("id"): f"node-{base_ts + i}" for i, n in enumerate(legacy["nodes"])}
+
+    nodes = {}
+    for src in legacy["nodes"]:
+        new_id = old_to_new[src.get("id")]
+        data = src.get("data") or {}
+        input_ports, output_ports = [], []
+
+        if src.get("type") == "barcoE3":
+            for card in data.get("cards") or []:
+                is_output = card.get("cardType") == "output"
+                target = output_ports if is_output else input_ports
+                for conn in card.get("connectors") or []:
+                    target.append(_make_card_port(conn, len(target), is_output))
+        else:
+            for i, p in enumerate(data.get("inputs") or []):
+                input_ports.append(_make_port(p, i, False))
+            for i, p in enumerate(data.get("outputs") or []):
+                output_ports.append(_make_port(p, i, True))
+
+        nodes[new_id] = {
+            "id": new_id,
+            "title": data.get("label") or "Node",
+            "version": 2,
+            "signalColor": closest_palette_id(data.get("color")),
+            "position": src.get("position") or {"x": 0, "y": 0},
+            "scale": 1,
+            "rpCode": "",
+            "description": "",
+            "layout": {
+                "rows": [["system"], ["input", "output"]],
+                "inputAnchorSide": "left",
+                "outputAnchorSide": "right",
+                "systemAnchorSide": "left",
+                "systemCollapsed": True,
+                "inputCollapsed": False,
+                "outputCollapsed": False,
+            },
+            "system": {
+                "manufacturer": "", "model": "",
+                "platform": "none", "software": "none", "captureCard": "none",
+                "settings": [], "cards": [],
+                "systemSectionStyle": "aligned",
+            },
+            "inputSection": {
+                "columnName": "INPUTS",
+                "columnOrder": ["port", "connector", "source", "resolution", "rate"],
+                "ports": input_ports,
+            },
+            "outputSection": {
+                "columnName": "OUTPUTS",
+                "columnOrder": ["port", "connector", "destination", "resolution", "rate"],
+                "ports": output_ports,
+            },
+        }
+
+    connections = []
+    for e in legacy.get("edges") or []:
+        from_node = old_to_new.get(e.get("source"))
+        to_node = old_to_new.get(e.get("target"))
+        if not from_node or not to_node:
+            continue
+        edge_data = e.get("data") or {}
+        connections.append({
+            "id": e.get("id") or f"wire-{base_ts + len(connections)}",
+            "from": f"{from_node}-{_extract_port_id(e.get('sourceHandle'))}",
+            "to": f"{to_node}-{_extract_port_id(e.get('targetHandle'))}",
+            "waypoints": [],
+            "label": "",
+            "enhanced": False,
+            "dashPattern": None,
+            "cableType": edge_data.get("cableType") or "",
+            "cableLength": edge_data.get("cableLength") or "",
+            "rpCode": "",
+            "description": "",
+        })
+
+    project = {"id": legacy["id"]} if "id" in legacy else {}
+    project.update({
+        "name": legacy.get("name") or "Imported Project",
+        "version": "1.2.0",
+        "nodes": nodes,
+        "connections": connections,
+        "settings": {
+            "paperSize": "ANSI_B",
+            "orientation": "landscape",
+            "zoom": 0.5,
+            "paperEnabled": True,
+            "snapToGrid": False,
+        },
+        "userPresets": {},
+        "userSubcategories": {},
+        "backgroundImages": [],
+        "titleBlockData": {
+            "companyName": "", "drawingBy": "", "venue": "",
+            "project": legacy.get("name") or "",
+            "scale": "CUSTOM", "sheetNumber": "1",
+            "pageSize": "ANSI B", "sheetTitle": "",
+        },
+    })
+    return project
+
+
+# ===== FILES =====
+def write_atomic(path, text):
+    """Write via a temp file in the same directory and rename, so readers never see a partial file."""
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".", suffix=".tmp")
+    try:
+        os.chmod(tmp, 0o644)    # mkstemp creates 0600
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def migrate_file(job):
+    """
+    Worker: (source, destination, sha from the last run) -> result dict.
+    Status is converted / unchanged / not-legacy / failed.
+    """
+    src, dst, known_sha = job
+    start = time.perf_counter()
+    result = {"source": src, "output": dst, "sha256": None, "status": "failed", "error": None}
+    try:
+        h = hashlib.sha256()
+        chunks = []
+        with open(src, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK), b""):
+                h.update(chunk)
+                chunks.append(chunk)
+        result["sha256"] = sha = h.hexdigest()
+        if sha == known_sha and os.path.exists(dst):
+            result["status"] = "unchanged"
+        else:
+            data = json.loads(b"".join(chunks))
+            chunks = None
+            if not is_legacy_react_flow(data):
+                result["status"] = "not-legacy"
+            else:
+                base_ts = int(os.stat(src).st_mtime * 1000)
+                project = convert_legacy_react_flow(data, base_ts=base_ts)
+                write_atomic(dst, json.dumps(project, indent=2, ensure_ascii=False))
+                result["status"] = "converted"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def iter_sources(paths):
+    """(absolute source path, path relative to its root) for project files under paths."""
+    for path in paths:
+        if os.path.isfile(path):
+            yield os.path.abspath(path), os.path.basename(path)
+            continue
+        root_dir = os.path.abspath(path)
+        for root, dirs, files in os.walk(root_dir):
+            dirs.sort()
+            for name in sorted(files):
+                if PROJECT_EXT_RE.search(name):
+                    full = os.path.join(root, name)
+                    yield full, os.path.relpath(full, root_dir)
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def migrate_tree(paths, out_dir=None, jobs=None, report_path=None):
+    """Convert every legacy project under paths into out_dir. Returns the per-file results."""
+    if out_dir is None:
+        out_dir = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'migrated')
+    out_dir = os.path.abspath(out_dir)
+    manifest = load_manifest(out_dir)
+    work = []
+    for src, rel in dict(iter_sources(paths)).items():   # a file named twice is converted once
+        rel_out = PROJECT_EXT_RE.sub("", rel) + ".vsf"
+        work.append((src, os.path.join(out_dir, rel_out), (manifest.get(rel_out) or {}).get("sha256")))
+
+    # show.json and show.vsf in one folder both map to show.vsf: converting either would
+    # overwrite the other's output (or race under --jobs), so neither is converted
+    claims = {}
+    for job in work:
+        claims.setdefault(job[1].casefold(), []).append(job[0])
+    collisions = {}
+    for sources in claims.values():
+        for src in sources if len(sources) > 1 else ():
+            collisions[src] = [other for other in sources if other != src]
+    dispatch = [job for job in work if job[0] not in collisions]
+
+    start = time.perf_counter()
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(dispatch) < 2:
+        done = [migrate_file(job) for job in dispatch]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            done = list(pool.map(migrate_file, dispatch, chunksize=max(1, min(64, len(dispatch) // (jobs * 4)))))
+    elapsed = time.perf_counter() - start
+    by_source = {r["source"]: r for r in done}
+    results = []
+    for src, dst, _sha in work:
+        if src in collisions:
+            results.append({"source": src, "output": dst, "sha256": None, "status": "failed", "ms": 0.0,
+                            "error": f"output {os.path.relpath(dst, out_dir)} is also the output of "
+                                     + ", ".join(collisions[src])})
+        else:
+            results.append(by_source[src])
+
+    for r in results:
+        if r["status"] in ("converted", "unchanged"):
+            manifest[os.path.relpath(r["output"], out_dir)] = {"source": r["source"], "sha256": r["sha256"]}
+    if results:
+        write_atomic(os.path.join(out_dir, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True))
+
+    counts = {s: 0 for s in ("converted", "unchanged", "not-legacy", "failed")}
+    for r in results:
+        counts[r["status"]] += 1
+    skipped = counts["unchanged"] + counts["not-legacy"]
+    print(f"Migrated {len(results)} files into {out_dir}: {counts['converted']} converted, "
+          f"{skipped} skipped ({counts['unchanged']} unchanged, {counts['not-legacy']} not legacy), "
+          f"{counts['failed']} failed -- {elapsed:.2f} s with {jobs} worker(s)")
+    converted = [r for r in results if r["status"] == "converted"]
+    if converted:
+        ms = sorted(r["ms"] for r in converted)
+        slowest = max(converted, key=lambda r: r["ms"])
+        print(f"  per file: median {ms[len(ms) // 2]:.1f} ms, slowest {slowest['ms']:.1f} ms ({slowest['source']})")
+    for r in results:
+        if r["status"] == "failed":
+            print(f"  FAILED {r['source']}: {r['error']}", file=sys.stderr)
+    if report_path:
+        write_atomic(report_path, json.dumps({"elapsed_s": round(elapsed, 3), "counts": counts, "files": results}, indent=2))
+        print(f"Migration report created: {report_path}")
+    return results
@@ -0,0 +1,157 @@
+"""
+Node313 Box Geometry
+Where a nexus-x node's box and port anchors sit on the canvas, without a browser:
+- node_geometry(): box size, section rectangles and anchor offsets for one node
+- layout_nodes(): every node of a project as a NodeBox
+- anchor_positions(): anchor id -> canvas (x, y, side)
+
+The app measures anchors from the DOM. Here they follow renderLayout() in
+Node313.jsx: CELL_H rows under a section title bar and a column header row,
+side-by-side a|b rows, collapsed and hidden sections, sectionSpacing and
+rowSpacing. Column widths are estimated from text length, so box widths can
+differ from the browser by a few px.
+"""
+
+from tools.vsf import device_name
+
+# src/components/Node313.jsx
+CELL_H = 36
+ACTION_W = 12
+ANCHOR_W = 16
+ACTION_AREA_W = ACTION_W * 2
+SECTION_TITLE_H = 30
+HEADER_ROW_H = 22
+NODE_TITLE_H = 32
+NODE_BORDER = 2
+LAYOUTS = {
+    "ab_c": [["a", "b"], ["c"]],
+    "ba_c": [["b", "a"], ["c"]],
+    "c_ab": [["c"], ["a", "b"]],
+    "c_ba": [["c"], ["b", "a"]],
+    "a_b_c": [["a"], ["b"], ["c"]],
+    "b_a_c": [["b"], ["a"], ["c"]],
+    "c_a_b": [["c"], ["a"], ["b"]],
+    "c_b_a": [["c"], ["b"], ["a"]],
+}
+DEFAULT_LAYOUT = "ab_c"
+# Column widths follow the sizer text (16px body, 9px + 2px tracking headers)
+BODY_CHAR_W = 9.6
+HEADER_CHAR_W = 7.4
+CELL_PAD = 10
+MIN_COL_W = 24
+
+
+class NodeBox:
+    __slots__ = ("id", "node", "x", "y", "scale", "width", "height", "sections", "anchors")
+
+    def __init__(self, node_id, node):
+        self.id = node_id
+        self.node = node
+        pos = node.get("position") or {}
+        self.x = pos.get("x", 0)
+        self.y = pos.get("y", 0)
+        self.scale = node.get("scale") or 1
+        self.sections = []   # (section id, local x, local y, width, height, mirrored, visible col indexes, col widths)
+        self.anchors = {}    # anchor id -> (local x, local y, side)
+
+    @property
+    def bounds(self):
+        return self.x, self.y, self.x + self.width * self.scale, self.y + self.height * self.scale
+
+
+def visible_cols(section):
+    hidden = set(section.get("hiddenCols") or ())
+    return [i for i in range(len(section.get("cols") or ())) if i not in hidden]
+
+
+def column_widths(section, cols):
+    cols_text = section.get("cols") or []
+    rows = section.get("rows") or []
+    widths = []
+    for ci in cols:
+        longest = max((len(str(r[ci])) for r in rows if ci < len(r) and r[ci]), default=0)
+        widths.append(max(MIN_COL_W, len(cols_text[ci]) * HEADER_CHAR_W + CELL_PAD, longest * BODY_CHAR_W + CELL_PAD))
+    return widths
+
+
+def node_geometry(node_id, node):
+    """Lay out a Node313 box the way renderLayout() does; sizes in the node's unscaled px."""
+    box = NodeBox(node_id, node)
+    sections = node.get("sections") or {}
+    hidden = set(node.get("hiddenSections") or ())
+    mirrored_sections = set(node.get("mirroredSections") or ())
+    spacing = node.get("sectionSpacing") or {}
+    layout = LAYOUTS.get(node.get("layout")) or LAYOUTS[DEFAULT_LAYOUT]
+
+    # Natural widths first: side-by-side rows set the node width, full rows stretch to it
+    natural = {}
+    for sid, sec in sections.items():
+        cols = visible_cols(sec)
+        widths = column_widths(sec, cols)
+        natural[sid] = (cols, widths, ANCHOR_W + sum(widths) + len(widths) + ACTION_AREA_W)
+    title_w = len(device_name(node)) * 10 + 40
+    inner_w = title_w
+    for row in layout:
+        shown = [s for s in row if s in sections and s not in hidden]
+        if shown:
+            inner_w = max(inner_w, sum(natural[s][2] for s in shown) + 2 * (len(shown) - 1))
+
+    y = NODE_BORDER + NODE_TITLE_H
+    for row in layout:
+        shown = [s for s in row if s in sections and s not in hidden]
+        if not shown:
+            continue
+        side_by_side = len(row) == 2 and len(shown) == 2
+        max_rows = max(len(sections[s].get("rows") or ()) for s in shown)
+        row_h = 0
+        x = NODE_BORDER
+        for i, sid in enumerate(shown):
+            sec = sections[sid]
+            cols, widths, width = natural[sid]
+            if side_by_side:
+                mirrored = i == 1
+                if i == 1:
+                    width = inner_w - (x - NODE_BORDER)
+            else:
+                mirrored = sid in mirrored_sections
+                width = inner_w
+            extra = width - (ANCHOR_W + sum(widths) + len(widths) + ACTION_AREA_W)
+            if widths and extra > 0:
+                widths = widths[:-1] + [widths[-1] + extra]  # the last column takes width: 100%
+            top = y + (spacing.get(sid) or 0)
+            h = SECTION_TITLE_H
+            if not sec.get("collapsed"):
+                h += HEADER_ROW_H
+                row_spacing = sec.get("rowSpacing") or []
+                anchor_x = x + width - ANCHOR_W / 2 if mirrored else x + ANCHOR_W / 2
+                for ri in range(len(sec.get("rows") or ())):
+                    h += row_spacing[ri] if ri < len(row_spacing) and row_spacing[ri] else 0
+                    box.anchors[f"{node_id}-{sid}-{ri}"] = (anchor_x, top + h + CELL_H / 2, None)
+                    h += CELL_H
+                if side_by_side:
+                    h = max(h, SECTION_TITLE_H + HEADER_ROW_H + max_rows * CELL_H)
+            box.sections.append((sid, x, top, width, h, mirrored, cols, widths))
+            row_h = max(row_h, top - y + h)
+            x += width + 2
+        y += row_h
+
+    box.width = inner_w + 2 * NODE_BORDER
+    box.height = y + NODE_BORDER
+    mid = box.width / 2
+    for aid, (ax, ay, _side) in box.anchors.items():
+        box.anchors[aid] = (ax, ay, "left" if ax < mid else "right")
+    return box
+
+
+def layout_nodes(project):
+    return [node_geometry(node_id, node) for node_id, node in project["nodes"].items()]
+
+
+def anchor_positions(boxes):
+    """anchor id -> (canvas x, canvas y, side), nodes scaled from their top-left corner."""
+    positions = {}
+    for box in boxes:
+        s = box.scale
+        for aid, (ax, ay, side) in box.anchors.items():
+            positions[aid] = (box.x + ax * s, box.y + ay * s, side)
+    return positions
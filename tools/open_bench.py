@@ -0,0 +1,433 @@
+"""
+Open-Cost Benchmark
+How expensive is a generated workbook to open, and what in it makes it so?
+Each generator runs on synthetic input at increasing scale:
+- router: N devices (4 in / 4 out, mixed colors) with a route into every device
+- system-router: one device with N ports, half inputs and half outputs (the
+  sheet shows a single device)
+- tracker: N tasks across 12 projects and 25 people, each depending on an earlier one
+- cable-schedule / budget: the sample .vsf project repeated side by side until it
+  holds N nodes
+Every output is read back three ways: openpyxl read_only (every row of every
+sheet), a full load_workbook, and a headless LibreOffice open + recalculate +
+save (only where `soffice` is on PATH; run it locally, it is not on CI). Times
+are also given per 1k devices / ports / tasks so scales compare. The diagram and
+router-macro generators drive Excel over COM and are not benchmarked.
+The structural profile comes straight from the zip, without openpyxl: bytes per
+part and, per sheet, cells, styled cells, formulas, whole-column references,
+data validations and the cells they cover, conditional format rules, hyperlinks
+and merged ranges. --baseline compares against an earlier report and names the
+counts and parts that grew, so a bloat regression can be pinned on a sheet.
+
+    python -m tools bench --generator router --generator tracker --scale 1 --scale 4 --report bench.json
+    python -m tools bench --baseline bench.json
+    python -m tools bench --profile .tmp/av_router.xlsx
+"""
+
+import gc
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from importlib import import_module
+from zipfile import ZipFile
+
+from tools.xlsx_patch import sheet_parts
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'bench')
+SAMPLE_VSF = os.path.join(os.path.dirname(__file__), '..', 'nexus-x', 'public', 'samples', 'gear.vsf')
+
+# Growth past this share of the baseline is reported
+DEFAULT_THRESHOLD = 0.10
+# Parts smaller than this are not worth a line in the comparison
+MIN_PART_BYTES = 1024
+
+PROFILE_COUNTS = ("cells", "styled_cells", "formulas", "whole_column_formulas", "validations",
+                  "validated_cells", "conditional_rules", "hyperlinks", "merged")
+TIMINGS = ("generate_s", "read_only_s", "full_load_s", "libreoffice_s")
+
+_CELL_RE = re.compile(rb"<c\b([^>]*)>")
+_STYLE_RE = re.compile(rb'\ss="(\d+)"')
+_FORMULA_RE = re.compile(rb"<f\b[^>]*>([^<]*)</f>|<f\b[^>]*/>")
+# A:A, $E:$E, Tasks!C:C -- a column with no row on either side of the colon
+_WHOLE_COLUMN_RE = re.compile(rb"(?<![A-Za-z0-9_$])\$?[A-Z]{1,3}:\$?[A-Z]{1,3}(?![A-Za-z0-9_(])")
+_VALIDATION_RE = re.compile(rb"<dataValidation\b[^>]*\ssqref=\"([^\"]*)\"")
+_CF_RULE_RE = re.compile(rb"<cfRule\b")
+_HYPERLINK_RE = re.compile(rb"<hyperlink\b")
+_MERGE_RE = re.compile(rb"<mergeCell\b")
+_XF_COUNT_RE = re.compile(rb'<cellXfs\s+count="(\d+)"')
+
+
+# ===== STRUCTURAL PROFILE =====
+def sqref_cells(sqref):
+    """Cells covered by a space-separated sqref such as "E6:E100 G6"."""
+    from openpyxl.utils import range_boundaries
+
+    total = 0
+    for ref in sqref.split():
+        min_col, min_row, max_col, max_row = range_boundaries(ref)
+        total += (max_col - min_col + 1) * (max_row - min_row + 1)
+    return total
+
+
+def profile_sheet(xml):
+    cells = styled = 0
+    for m in _CELL_RE.finditer(xml):
+        cells += 1
+        s = _STYLE_RE.search(m.group(1))
+        if s and s.group(1) != b"0":
+            styled += 1
+    formulas = _FORMULA_RE.findall(xml)
+    validations = _VALIDATION_RE.findall(xml)
+    return {
+        "cells": cells,
+        "styled_cells": styled,
+        "formulas": len(formulas),
+        "whole_column_formulas": sum(1 for f in formulas if _WHOLE_COLUMN_RE.search(f)),
+        "validations": len(validations),
+        "validated_cells": sum(sqref_cells(v.decode()) for v in validations),
+        "conditional_rules": len(_CF_RULE_RE.findall(xml)),
+        "hyperlinks": len(_HYPERLINK_RE.findall(xml)),
+        "merged": len(_MERGE_RE.findall(xml)),
+    }
+
+
+def profile_xlsx(path):
+    """
+    {"bytes", "parts": {part: [compressed, uncompressed]}, "sheets": {name: counts},
+    "totals": counts, "cell_styles": distinct cell formats} for one xlsx file.
+    """
+    with ZipFile(path) as zf:
+        parts = {i.filename: [i.compress_size, i.file_size] for i in zf.infolist()}
+        sheets = {name: profile_sheet(zf.read(part)) for name, part in sheet_parts(zf).items()}
+        m = _XF_COUNT_RE.search(zf.read("xl/styles.xml")) if "xl/styles.xml" in parts else None
+    totals = {k: sum(s[k] for s in sheets.values()) for k in PROFILE_COUNTS}
+    return {"bytes": os.path.getsize(path), "parts": parts, "sheets": sheets, "totals": totals,
+            "cell_styles": int(m.group(1)) if m else 0}
+
+
+# ===== READ-BACK COST =====
+def time_read_only(path):
+    from openpyxl import load_workbook
+
+    start = time.perf_counter()
+    wb = load_workbook(path, read_only=True)
+    for ws in wb.worksheets:
+        for _row in ws.iter_rows(values_only=True):
+            pass
+    wb.close()
+    return time.perf_counter() - start
+
+
+def time_full_load(path):
+    from openpyxl import load_workbook
+
+    gc.collect()
+    start = time.perf_counter()
+    wb = load_workbook(path)
+    elapsed = time.perf_counter() - start
+    del wb
+    gc.collect()
+    return elapsed
+
+
+def libreoffice_binary():
+    return shutil.which("soffice") or shutil.which("libreoffice")
+
+
+# Recalculate on load: "always" (0) rather than trusting the cached values openpyxl leaves empty
+_RECALC_XCU = """<?xml version="1.0" encoding="UTF-8"?>
+<oor:items xmlns:oor="http://openoffice.org/2001/registry" xmlns:xs="http://www.w3.org/2001/XMLSchema">
+<item oor:path="/org.openoffice.Office.Calc/Formula/Load"><prop oor:name="OOXMLRecalcMode" oor:op="fuse"><value>0</value></prop></item>
+<item oor:path="/org.openoffice.Office.Calc/Formula/Load"><prop oor:name="ODFRecalcMode" oor:op="fuse"><value>0</value></prop></item>
+</oor:items>
+"""
+
+
+def time_libreoffice(path, binary=None, timeout=600):
+    """
+    Seconds for headless LibreOffice to open, fully recalculate and re-save the
+    workbook, or None without LibreOffice. A throwaway profile keeps the run
+    independent of the user's settings and of any running instance.
+    """
+    binary = binary or libreoffice_binary()
+    if not binary:
+        return None
+    with tempfile.TemporaryDirectory(prefix="bench-lo-") as tmp:
+        user = os.path.join(tmp, "profile", "user")
+        os.makedirs(user)
+        with open(os.path.join(user, "registrymodifications.xcu"), "w", encoding="utf-8") as f:
+            f.write(_RECALC_XCU)
+        out = os.path.join(tmp, "out")
+        cmd = [binary, f"-env:UserInstallation=file://{os.path.join(tmp, 'profile')}", "--headless",
+               "--norestore", "--convert-to", "xlsx", "--outdir", out, os.path.abspath(path)]
+        # The first run of a fresh profile also pays for creating it: convert twice, keep the faster
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=timeout, check=True)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=timeout, check=True)
+        return min(elapsed, time.perf_counter() - start)
+
+
+# ===== SYNTHETIC INPUT =====
+ROUTER_COLORS = ("4472C4", "7B68EE", "20B2AA", "FF6347", "FFC000", "70AD47")
+
+
+def router_system(n):
+    from tools.av_model import System
+
+    devices = [{
+        "name": f"DEV {i + 1:05d}", "color": ROUTER_COLORS[i % len(ROUTER_COLORS)],
+        "inputs": [{"port": f"IN {p}", "name": f"Input {p}", "signal": "Video"} for p in range(1, 5)],
+        "outputs": [{"port": f"OUT {p}", "name": f"Output {p}", "signal": "Video"} for p in range(1, 5)],
+    } for i in range(n)]
+    routes = [(f"DEV {i:05d}", f"OUT {i % 4 + 1}", f"DEV {i + 1:05d}", f"IN {i % 4 + 1}", "Active")
+              for i in range(1, n)]
+    return System.from_dicts(devices, routes)
+
+
+def build_router(n, output_path):
+    from tools.create_av_router import create_av_router
+    create_av_router(output_path, system=router_system(n))
+
+
+def system_router_system(n):
+    from tools.av_model import System
+
+    half = max(1, n // 2)
+    return System.from_dicts([{
+        "name": "DEV 00001", "color": ROUTER_COLORS[0],
+        "inputs": [{"port": f"IN {p}", "name": f"Input {p}", "signal": "Video"} for p in range(1, n - half + 1)],
+        "outputs": [{"port": f"OUT {p}", "name": f"Output {p}", "signal": "Video"} for p in range(1, half + 1)],
+    }])
+
+
+def build_system_router(n, output_path):
+    from tools.create_system_router import create_system_router
+    create_system_router(output_path, system=system_router_system(n))
+
+
+def tracker_rows(n):
+    from tools.create_project_tracker import PRIORITIES, STATUSES
+
+    people = [[i, f"Person {i:02d}", "Developer", f"person{i}@example.com", 60 + i] for i in range(1, 26)]
+    projects = [[i, f"Project {i:02d}", f"Client {i}", f"2024-{i:02d}-01", f"2025-{i:02d}-28", 10000 * i]
+                for i in range(1, 13)]
+    tasks = ([t, f"Task {t}", f"Project {t % 12 + 1:02d}", f"Person {t % 25 + 1:02d}",
+              STATUSES[t % len(STATUSES)], PRIORITIES[t % len(PRIORITIES)], 4 + t % 40, t % 20,
+              f"2025-{t % 12 + 1:02d}-{t % 28 + 1:02d}", str(t - 1 - t % 7) if t > 7 else None]
+             for t in range(1, n + 1))
+    return people, projects, tasks
+
+
+def build_tracker(n, output_path):
+    from tools.create_project_tracker import create_project_tracker
+    people, projects, tasks = tracker_rows(n)
+    create_project_tracker(output_path, people=people, projects=projects, tasks=tasks)
+
+
+def replicate_project(n, sample=SAMPLE_VSF):
+    """The sample project tiled until it has n nodes: copies shift right with fresh ids."""
+    from tools.vsf import load_project, parse_anchor
+
+    base = load_project(sample)
+    nodes, connections = base["nodes"], base["connections"]
+    width = max((node.get("position") or {}).get("x", 0) for node in nodes.values()) + 2000
+    ids = {node_id: int(node_id.split("-")[1]) for node_id in nodes}
+    out_nodes, out_conns = {}, []
+    copy = 0
+    while len(out_nodes) < n:
+        offset = copy * 10 ** 13
+
+        def renamed(node_id):
+            return f"node-{ids[node_id] + offset}"
+
+        for node_id, node in nodes.items():
+            if len(out_nodes) >= n:
+                break
+            node = json.loads(json.dumps(node))
+            node["id"] = renamed(node_id)
+            if copy:
+                node["tag"] = f"{node.get('tag') or node.get('title') or ''} #{copy + 1}".strip()
+                position = node.setdefault("position", {"x": 0, "y": 0})
+                position["x"] = position.get("x", 0) + copy * width
+            out_nodes[node["id"]] = node
+        for conn in connections:
+            (src, s_sec, s_row), (dst, d_sec, d_row) = parse_anchor(conn["from"]), parse_anchor(conn["to"])
+            if renamed(src) not in out_nodes or renamed(dst) not in out_nodes:
+                continue
+            conn = json.loads(json.dumps(conn))
+            conn["id"] = f"{conn['id']}-{copy}" if copy else conn["id"]
+            conn["from"] = f"{renamed(src)}-{s_sec}-{s_row}"
+            conn["to"] = f"{renamed(dst)}-{d_sec}-{d_row}"
+            conn["waypoints"] = [{**w, "x": w.get("x", 0) + copy * width} if isinstance(w, dict) else w
+                                 for w in conn.get("waypoints") or ()]
+            out_conns.append(conn)
+        copy += 1
+    return {**base, "nodes": out_nodes, "connections": out_conns}
+
+
+def _write_project(n, output_path):
+    path = os.path.splitext(output_path)[0] + ".vsf"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(replicate_project(n), f)
+    return path
+
+
+def build_cable_schedule(n, output_path):
+    from tools.create_cable_schedule import create_cable_schedule
+    create_cable_schedule(_write_project(n, output_path), output_path)
+
+
+def build_budget(n, output_path):
+    from tools.create_signal_budget import create_signal_budget
+    create_signal_budget(_write_project(n, output_path), output_path)
+
+
+# generator -> (unit, units at scale 1, build(n, output_path), module imported before timing)
+BENCHES = {
+    "router": ("devices", 100, build_router, "tools.create_av_router"),
+    "system-router": ("ports", 64, build_system_router, "tools.create_system_router"),
+    "tracker": ("tasks", 2000, build_tracker, "tools.create_project_tracker"),
+    "cable-schedule": ("devices", 35, build_cable_schedule, "tools.create_cable_schedule"),
+    "budget": ("devices", 35, build_budget, "tools.create_signal_budget"),
+}
+
+
+# ===== RUN =====
+def bench_file(path, units, full_load=True, libreoffice=True):
+    result = {"read_only_s": time_read_only(path)}
+    result["full_load_s"] = time_full_load(path) if full_load else None
+    result["libreoffice_s"] = time_libreoffice(path) if libreoffice else None
+    per_1k = 1000.0 / units if units else None
+    result["ms_per_1k"] = {k[:-2]: round(result[k] * 1000 * per_1k, 1)
+                           for k in TIMINGS if result.get(k) is not None and per_1k}
+    return result
+
+
+def run_bench(generators=None, scales=(1, 4), output_dir=DEFAULT_OUTPUT, full_load=True, libreoffice=True):
+    """One result per generator and scale: timings, cost per 1k units and the file's profile."""
+    os.makedirs(output_dir, exist_ok=True)
+    results = []
+    for name in generators or BENCHES:
+        unit, base, build, module = BENCHES[name]
+        import_module(module)     # generation times exclude the one-off import
+        for scale in scales:
+            n = int(base * scale)
+            path = os.path.join(output_dir, f"{name}_{n}.xlsx")
+            start = time.perf_counter()
+            build(n, path)
+            generate_s = time.perf_counter() - start
+            result = {"generator": name, "unit": unit, "n": n, "path": path, "generate_s": generate_s}
+            timed = bench_file(path, n, full_load=full_load, libreoffice=libreoffice)
+            timed["ms_per_1k"]["generate"] = round(generate_s * 1000 * 1000.0 / n, 1)
+            result.update(timed)
+            result["profile"] = profile_xlsx(path)
+            results.append(result)
+    return results
+
+
+# ===== REPORT =====
+def _ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.0f}"
+
+
+def print_results(results):
+    print(f"{'generator':<15}{'n':>7} {'unit':<8}{'KB':>8}{'gen ms':>9}{'ro ms':>8}{'load ms':>9}{'LO ms':>8}"
+          f"{'load/1k':>9}{'cells':>9}{'styled':>9}{'formulas':>9}{'whole col':>10}{'valid.':>9}")
+    for r in results:
+        t = r["profile"]["totals"]
+        print(f"{r['generator']:<15}{r['n']:>7} {r['unit']:<8}{r['profile']['bytes'] / 1024:>8.0f}"
+              f"{_ms(r['generate_s']):>9}{_ms(r['read_only_s']):>8}{_ms(r['full_load_s']):>9}"
+              f"{_ms(r['libreoffice_s']):>8}{r['ms_per_1k'].get('full_load', '-'):>9}"
+              f"{t['cells']:>9}{t['styled_cells']:>9}{t['formulas']:>9}{t['whole_column_formulas']:>10}"
+              f"{t['validated_cells']:>9}")
+    if results and all(r["libreoffice_s"] is None for r in results):
+        print("(LibreOffice not found on PATH: open / recalc times skipped)")
+
+
+def print_profile(path, profile):
+    print(f"{path}: {profile['bytes'] / 1024:.0f} KB, {profile['cell_styles']} cell formats")
+    print(f"  {'sheet':<24}" + "".join(f"{k[:12]:>13}" for k in PROFILE_COUNTS))
+    for name, counts in profile["sheets"].items():
+        print(f"  {name[:24]:<24}" + "".join(f"{counts[k]:>13}" for k in PROFILE_COUNTS))
+    print("  largest parts (compressed / uncompressed KB):")
+    for part, (packed, size) in sorted(profile["parts"].items(), key=lambda kv: -kv[1][0])[:8]:
+        print(f"    {part:<40}{packed / 1024:>9.1f}{size / 1024:>10.1f}")
+
+
+def _grew(old, new, threshold):
+    return new > old * (1 + threshold) and new - old > 0
+
+
+def compare(baseline, results, threshold=DEFAULT_THRESHOLD):
+    """
+    Lines naming what grew past threshold since the baseline, per generator and
+    size: per-1k timings, profile totals, per-sheet counts and part bytes.
+    Returns (timing lines, structural lines); structure is deterministic, timing is not.
+    """
+    old_by_key = {(r["generator"], r["n"]): r for r in baseline}
+    timing, structure = [], []
+    for r in results:
+        old = old_by_key.get((r["generator"], r["n"]))
+        if old is None:
+            continue
+        label = f"{r['generator']} n={r['n']}"
+        for k, v in r["ms_per_1k"].items():
+            was = old.get("ms_per_1k", {}).get(k)
+            if was and _grew(was, v, threshold):
+                timing.append(f"{label}: {k} {was:.1f} -> {v:.1f} ms per 1k {r['unit']}")
+        for sheet, counts in r["profile"]["sheets"].items():
+            was = old["profile"]["sheets"].get(sheet)
+            if was is None:
+                structure.append(f"{label}: new sheet {sheet!r} ({counts['cells']} cells)")
+                continue
+            for k in PROFILE_COUNTS:
+                if _grew(was.get(k, 0), counts[k], threshold):
+                    structure.append(f"{label}: {sheet} {k} {was.get(k, 0)} -> {counts[k]}")
+        for part, (packed, _size) in r["profile"]["parts"].items():
+            was = old["profile"]["parts"].get(part, [0, 0])[0]
+            if packed >= MIN_PART_BYTES and _grew(was, packed, threshold):
+                structure.append(f"{label}: {part} {was / 1024:.1f} -> {packed / 1024:.1f} KB")
+    return timing, structure
+
+
+def bench(generators=None, scales=(1, 4), output_dir=DEFAULT_OUTPUT, report_path=None, baseline_path=None,
+          full_load=True, libreoffice=True, threshold=DEFAULT_THRESHOLD, keep=False):
+    """Run, print and optionally save / compare. Returns 1 if the workbook structure grew past the baseline."""
+    if libreoffice and not libreoffice_binary():
+        libreoffice = False
+    results = run_bench(generators, scales, output_dir, full_load=full_load, libreoffice=libreoffice)
+    print()
+    print_results(results)
+    if report_path:
+        os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"Bench report created: {report_path}")
+    status = 0
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as f:
+            timing, structure = compare(json.load(f)["results"], results, threshold)
+        print(f"\nAgainst {baseline_path} (growth over {threshold:.0%}):")
+        for line in structure + timing:
+            print(f"  {line}")
+        if not timing and not structure:
+            print("  no regressions")
+        status = 1 if structure else 0
+    if not keep:
+        for r in results:
+            for ext in (".xlsx", ".vsf"):
+                stem = os.path.splitext(r["path"])[0] + ext
+                if os.path.exists(stem):
+                    os.remove(stem)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(bench())
@@ -0,0 +1,175 @@
+"""
+Gear Preset Library
+Device models from the nexus-x preset file (nexus-x/src/config/userPresets.json),
+loaded once per process and expanded into av_model Systems:
+- Each preset's port table (section "a" inputs, "b" outputs) is built once as a
+  PortTemplate and cloned onto every device of that model; only the tag changes
+- Device lists read like a rig sheet, one entry per model:
+    "24x URSA Broadcast G2 tagged CAM 1..24"
+    "2x Barco E3 tagged E3 A..B"       (letters count too)
+    "Videohub 40x40 tagged ROUTER"
+  A count without tags numbers the model ("E3 1", "E3 2")
+- Models are found by preset id, label, "manufacturer model", or a word-wise
+  unique part of the label ("URSA G2")
+
+SYSTEM rows ("c") are skipped, as in vsf.to_system(): without wires there is no
+telling whether they are inputs or outputs.
+
+    python -m tools router --gear "24x URSA Broadcast G2 tagged CAM 1..24" --gear "Videohub 40x40"
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+
+from tools.av_model import PortTemplate, System
+from tools.vsf import SECTION_DIRECTION, port_column, signal_color_hex
+
+USER_PRESETS_JSON = os.path.join(os.path.dirname(__file__), '..', 'nexus-x', 'src', 'config', 'userPresets.json')
+
+_SPEC_RE = re.compile(r"^\s*(?:(\d+)\s*[x×]\s+)?(.+?)(?:\s+tagged\s+(.+?))?\s*$", re.IGNORECASE)
+_RANGE_RE = re.compile(r"^(.*?)(\d+|[A-Za-z])\s*\.\.\s*(\d+|[A-Za-z])$")
+
+
+def _key(text):
+    return " ".join(str(text).split()).casefold()
+
+
+class Preset:
+    __slots__ = ("id", "node", "_template")
+
+    def __init__(self, node):
+        self.id = node.get("id") or ""
+        self.node = node
+        self._template = None
+
+    @property
+    def label(self):
+        return (self.node.get("label") or self.node.get("title") or self.id).strip()
+
+    @property
+    def name(self):
+        """Default device name: the model, as vsf.device_name() would name an untagged node."""
+        return (self.node.get("model") or self.label).strip()
+
+    @property
+    def template(self):
+        """PortTemplate of the preset's input and output rows, built on first use."""
+        if self._template is None:
+            ports = []
+            sections = self.node.get("sections") or {}
+            for sec_id, direction in SECTION_DIRECTION.items():
+                section = sections.get(sec_id)
+                if not section:
+                    continue
+                col = port_column(section)
+                for ri, row in enumerate(section.get("rows") or ()):
+                    port = row[col] if col < len(row) else ""
+                    ports.append((direction, port or f"{sec_id.upper()}{ri + 1}"))
+            self._template = PortTemplate(ports)
+        return self._template
+
+    def meta(self, tag):
+        """Device.meta for one instance: the preset's identity plus its tag."""
+        node = self.node
+        return {"manufacturer": node.get("manufacturer") or "", "model": node.get("model") or "",
+                "tag": tag, "preset": self.id}
+
+    def __repr__(self):
+        return f"Preset({self.id!r}, {self.label!r}, ports={len(self.template)})"
+
+
+class PresetLibrary:
+    def __init__(self, presets):
+        self.presets = presets
+        self._index = {}
+        for p in presets:
+            node = p.node
+            maker_model = f"{node.get('manufacturer') or ''} {node.get('model') or ''}"
+            for key in (p.id, p.label, maker_model, node.get("model")):
+                if key and _key(key):
+                    self._index.setdefault(_key(key), p)
+
+    @classmethod
+    def load(cls, path=USER_PRESETS_JSON):
+        """Presets from a userPresets.json file ({"<scope>/saved": [preset, ...]} or a plain list)."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        groups = data.values() if isinstance(data, dict) else [data]
+        return cls([Preset(node) for group in groups for node in group if isinstance(node, dict)])
+
+    def find(self, query):
+        """Preset by id, label or model; else the one preset whose label contains every word of query."""
+        key = _key(query)
+        preset = self._index.get(key)
+        if preset is not None:
+            return preset
+        words = key.split()
+        matches = {p.id: p for p in self.presets if all(w in _key(p.label).split() for w in words)}
+        if len(matches) == 1:
+            return next(iter(matches.values()))
+        if not matches:
+            raise KeyError(f"No preset matches {query!r}")
+        labels = sorted({p.label for p in matches.values()})
+        if len(labels) == 1:
+            return next(iter(matches.values()))   # the same model saved twice: first one wins
+        raise KeyError(f"{query!r} matches several presets: {', '.join(labels)}")
+
+    def expand(self, spec):
+        """(preset, [tags]) for one device-list entry."""
+        m = _SPEC_RE.match(spec)
+        if not m:
+            raise ValueError(f"Cannot read device entry {spec!r}")
+        count, query, tags = m.groups()
+        preset = self.find(query)
+        count = int(count) if count else None
+        if tags:
+            tags = expand_tags(tags)
+            if count is not None and len(tags) == 1 and count > 1:
+                tags = [f"{tags[0]} {n}" for n in range(1, count + 1)]
+            if count is not None and len(tags) != count:
+                raise ValueError(f"{spec!r}: {count} devices but {len(tags)} tags")
+        elif count is None or count == 1:
+            tags = [preset.name]
+        else:
+            tags = [f"{preset.name} {n}" for n in range(1, count + 1)]
+        return preset, tags
+
+    def build_system(self, specs, system=None):
+        """System with every device in a device list; ports are cloned from each model's template."""
+        system = system or System()
+        for spec in specs:
+            preset, tags = self.expand(spec)
+            template = preset.template
+            color = signal_color_hex(preset.node.get("signalColor"))
+            for tag in tags:
+                device = system.add_device(tag, color)
+                device.meta = preset.meta(tag)
+                system.add_ports(device, template)
+        return system
+
+
+def expand_tags(text):
+    """"CAM 1..24" -> CAM 1 .. CAM 24 (zero padding kept), "E3 A..D" -> letters, else the tag itself."""
+    m = _RANGE_RE.match(text.strip())
+    if not m:
+        return [text.strip()]
+    prefix, lo, hi = m.groups()
+    if lo.isdigit() and hi.isdigit():
+        width = len(lo) if lo.startswith("0") else 0
+        return [f"{prefix}{n:0{width}d}" for n in range(int(lo), int(hi) + 1)]
+    if lo.isalpha() and hi.isalpha():
+        return [f"{prefix}{chr(c)}" for c in range(ord(lo), ord(hi) + 1)]
+    raise ValueError(f"Cannot expand tag range {text!r}")
+
+
+@lru_cache(maxsize=None)
+def preset_library(path=USER_PRESETS_JSON):
+    """The library for a preset file, loaded once per process."""
+    return PresetLibrary.load(path)
+
+
+def build_system(specs, path=USER_PRESETS_JSON):
+    return preset_library(path).build_system(specs)
+
@@ -0,0 +1,583 @@
+"""
+Headless Diagram Renderer (.vsf -> SVG / PDF)
+Draws nexus-x projects as vector pages without a browser or Excel:
+- Node boxes and anchors from tools/node_layout.py
+- WirePaths: computeWirePath (src/utils/wirePath.js) for every wire at once, in arrays
+- page_grid(): the app's page grid (hooks/usePageGrid.js) for the project's paper settings
+- render_svg(): one .svg per page; render_pdf(): one multi-page vector .pdf
+
+Anchors are estimated (see node_layout.py); given the anchors, wire geometry
+follows computeWirePath exactly.
+
+    python -m tools render show.vsf -o .tmp/show.pdf
+    python -m tools render show.vsf --format svg -o .tmp/show_pages
+"""
+
+import os
+import re
+import sys
+import zlib
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: numpy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from tools.node_layout import (
+    ACTION_AREA_W, ANCHOR_W, CELL_H, HEADER_ROW_H, NODE_BORDER, SECTION_TITLE_H,
+    anchor_positions, layout_nodes,
+)
+from tools.vsf import device_name, load_project, parse_anchor, project_stem, signal_color_hex
+
+# ===== APP CONSTANTS =====
+# src/utils/wirePath.js
+CORNER_RADIUS = 8
+ANCHOR_OFFSET = 30
+# src/services/canvasExport.js / config/theme.js (rgba borders flattened onto the card color)
+BG_COLOR = "09090B"
+CARD = "111111"
+HEADER_BG = "0A0A0A"
+BORDER = "2A2A2A"
+TEXT = "CCCCCC"
+TEXT_MUTED = "666666"
+TITLE_TEXT = "E0E0E0"
+DEFAULT_WIRE_COLOR = "22D3EE"
+LABEL_OUTLINE = "18181B"
+
+# hooks/useCanvasSettings.js holds the paper sizes; read it instead of copying it
+CANVAS_SETTINGS_JS = os.path.join(os.path.dirname(__file__), '..', 'nexus-x', 'src', 'hooks', 'useCanvasSettings.js')
+_paper_sizes = None
+
+PX_TO_PT = 0.75  # CSS px (96 DPI) -> PDF points (72 DPI)
+
+
+def paper_size(settings):
+    """(width, height) in px for a project's paper settings, orientation applied."""
+    global _paper_sizes
+    if _paper_sizes is None:
+        try:
+            with open(CANVAS_SETTINGS_JS, encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            text = ""
+        _paper_sizes = {
+            m.group(1): (int(m.group(2)), int(m.group(3)))
+            for m in re.finditer(r"'(\w+)':\s*\{\s*width:\s*(\d+),\s*height:\s*(\d+)", text)
+        }
+    size = settings.get("paperSize") or "ANSI_B"
+    if size == "Custom":
+        w, h = settings.get("customWidth") or 1200, settings.get("customHeight") or 1200
+    else:
+        w, h = _paper_sizes.get(size) or _paper_sizes.get("ANSI_B") or (1056, 1632)
+    if settings.get("orientation", "landscape") == "landscape":
+        return max(w, h), min(w, h)
+    return min(w, h), max(w, h)
+
+
+# ===== WIRE PATHS (batch computeWirePath) =====
+class WirePaths:
+    """
+    computeWirePath for many wires at once. Wires without waypoints are cubic
+    beziers (one row of `bez` each); wires with waypoints are rounded polylines
+    stored back to back in `pts`, with `start` giving each wire's slice.
+    """
+
+    def __init__(self, from_pos, to_pos, waypoints):
+        n = len(from_pos)
+        fx, fy, fs = (np.array([p[k] for p in from_pos], dtype=float) for k in range(3))
+        tx, ty, ts = (np.array([p[k] for p in to_pos], dtype=float) for k in range(3))
+        has_wp = np.array([bool(w) for w in waypoints], dtype=bool)
+        self.n = n
+        self.kind = has_wp.astype(np.int8)            # 0 = bezier, 1 = orthogonal
+        self.index = np.zeros(n, dtype=np.int64)      # row in bez / wire in start
+
+        # Bezier wires: offset = max(50, |dx| * 0.4), control points pushed out by side
+        b = np.flatnonzero(~has_wp)
+        self.index[b] = np.arange(len(b))
+        offset = np.maximum(50.0, np.abs(tx[b] - fx[b]) * 0.4)
+        self.bez = np.column_stack([
+            fx[b], fy[b], fx[b] + fs[b] * offset, fy[b],
+            tx[b] + ts[b] * offset, ty[b], tx[b], ty[b],
+        ])
+
+        # Orthogonal wires: anchor, anchor stub, waypoints..., stub, anchor
+        o = np.flatnonzero(has_wp)
+        self.index[o] = np.arange(len(o))
+        counts = np.array([len(waypoints[i]) + 4 for i in o], dtype=np.int64)
+        self.start = np.zeros(len(o) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.start[1:])
+        pts = np.empty((int(self.start[-1]), 2))
+        for k, i in enumerate(o):
+            s = self.start[k]
+            pts[s] = fx[i], fy[i]
+            pts[s + 1] = fx[i] + fs[i] * ANCHOR_OFFSET, fy[i]
+            pts[s + 2:s + 2 + len(waypoints[i])] = [(w["x"], w["y"]) for w in waypoints[i]]
+            pts[self.start[k + 1] - 2] = tx[i] + ts[i] * ANCHOR_OFFSET, ty[i]
+            pts[self.start[k + 1] - 1] = tx[i], ty[i]
+        self.pts = pts
+
+        # Corner rounding for every interior point of every wire in one pass
+        m = len(pts)
+        interior = np.ones(m, dtype=bool)
+        interior[self.start[:-1]] = False
+        interior[self.start[1:] - 1] = False
+        prev = np.roll(pts, 1, axis=0)
+        nxt = np.roll(pts, -1, axis=0)
+        d1, d2 = pts - prev, nxt - pts
+        len1, len2 = np.hypot(d1[:, 0], d1[:, 1]), np.hypot(d2[:, 0], d2[:, 1])
+        r = np.minimum(np.minimum(len1 / 2, len2 / 2), CORNER_RADIUS)
+        self.rounded = interior & ~((r < 2) | (len1 < 4) | (len2 < 4))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.corner_in = pts - d1 / len1[:, None] * r[:, None]
+            self.corner_out = pts + d2 / len2[:, None] * r[:, None]
+
+        # Bounding boxes (control points included) for culling wires to pages
+        self.bbox = np.empty((n, 4))
+        if len(b):
+            xs, ys = self.bez[:, 0::2], self.bez[:, 1::2]
+            self.bbox[b] = np.column_stack([xs.min(1), ys.min(1), xs.max(1), ys.max(1)])
+        if len(o):
+            starts = self.start[:-1]
+            self.bbox[o] = np.column_stack([
+                np.minimum.reduceat(pts[:, 0], starts), np.minimum.reduceat(pts[:, 1], starts),
+                np.maximum.reduceat(pts[:, 0], starts), np.maximum.reduceat(pts[:, 1], starts),
+            ])
+
+    def commands(self, i):
+        """Path of wire i as ("M"|"L"|"C"|"Q", coords...) tuples, same segments as computeWirePath."""
+        k = self.index[i]
+        if self.kind[i] == 0:
+            x0, y0, c1x, c1y, c2x, c2y, x1, y1 = self.bez[k].tolist()
+            return [("M", x0, y0), ("C", c1x, c1y, c2x, c2y, x1, y1)]
+        s, e = self.start[k], self.start[k + 1]
+        pts = self.pts
+        cmds = [("M", *pts[s].tolist())]
+        for j in range(s + 1, e):
+            if self.rounded[j]:
+                cmds.append(("L", *self.corner_in[j].tolist()))
+                cmds.append(("Q", *pts[j].tolist(), *self.corner_out[j].tolist()))
+            else:
+                cmds.append(("L", *pts[j].tolist()))
+        return cmds
+
+    def midpoint(self, i):
+        """Label anchor (x, y, angle in radians) as in canvasExport.drawWireLabels."""
+        k = self.index[i]
+        if self.kind[i] == 0:
+            x0, y0, c1x, c1y, c2x, c2y, x1, y1 = self.bez[k]
+
+            def at(t, p0, p1, p2, p3):
+                u = 1 - t
+                return u * u * u * p0 + 3 * u * u * t * p1 + 3 * u * t * t * p2 + t * t * t * p3
+
+            x, y = at(0.5, x0, c1x, c2x, x1), at(0.5, y0, c1y, c2y, y1)
+            angle = np.arctan2(at(0.51, y0, c1y, c2y, y1) - at(0.49, y0, c1y, c2y, y1),
+                               at(0.51, x0, c1x, c2x, x1) - at(0.49, x0, c1x, c2x, x1))
+        else:
+            pts = self.pts[self.start[k]:self.start[k + 1]]
+            d = np.diff(pts, axis=0)
+            lengths = np.hypot(d[:, 0], d[:, 1])
+            keep = lengths >= 0.01
+            d, lengths, origins = d[keep], lengths[keep], pts[:-1][keep]
+            if not len(d):
+                return float(pts[0, 0]), float(pts[0, 1]), 0.0
+            cum = np.cumsum(lengths)
+            seg = min(int(np.searchsorted(cum, cum[-1] / 2)), len(d) - 1)
+            t = (cum[-1] / 2 - (cum[seg] - lengths[seg])) / lengths[seg]
+            x, y = origins[seg] + d[seg] * t
+            angle = np.arctan2(d[seg, 1], d[seg, 0])
+        if angle > np.pi / 2:
+            angle -= np.pi
+        if angle < -np.pi / 2:
+            angle += np.pi
+        return float(x), float(y), float(angle)
+
+
+def wire_colors(project):
+    """connectionColorMap: wireColor override, destination color, then source color."""
+    nodes = project["nodes"]
+    colors = []
+    for conn in project.get("connections") or []:
+        color = None
+        if conn.get("wireColor"):
+            color = signal_color_hex(conn["wireColor"])
+        if color is None:
+            dst = nodes.get(_node_id(conn.get("to")))
+            if dst and dst.get("signalColor") and "Destination" in (dst.get("deviceTypes") or ()):
+                color = signal_color_hex(dst["signalColor"])
+        if color is None:
+            src = nodes.get(_node_id(conn.get("from")))
+            if src and src.get("signalColor") and "Source" in (src.get("deviceTypes") or ()):
+                color = signal_color_hex(src["signalColor"])
+        colors.append(color or DEFAULT_WIRE_COLOR)
+    return colors
+
+
+def _node_id(anchor):
+    try:
+        return parse_anchor(anchor or "")[0]
+    except ValueError:
+        return None
+
+
+# ===== PAGES =====
+def page_grid(project, boxes):
+    """
+    Page rectangles (x, y, width, height, label) as usePageGrid lays them out:
+    the origin page plus every page a node overlaps, top-to-bottom then left-to-right.
+    With paper disabled, one page fits everything.
+    """
+    settings = project.get("settings") or {}
+    if settings.get("paperEnabled") is False:
+        if not boxes:
+            return [(0, 0, *paper_size(settings), "Page 1")]
+        b = np.array([box.bounds for box in boxes])
+        x0, y0 = b[:, 0].min() - 40, b[:, 1].min() - 40
+        return [(x0, y0, b[:, 2].max() + 40 - x0, b[:, 3].max() + 40 - y0, "Page 1")]
+    pw, ph = paper_size(settings)
+    occupied = {(0, 0)}
+    for box in boxes:
+        left, top, right, bottom = box.bounds
+        for col in range(int(left // pw), int((right - 1) // pw) + 1):
+            for row in range(int(top // ph), int((bottom - 1) // ph) + 1):
+                occupied.add((col, row))
+    cells = sorted(occupied, key=lambda cr: (cr[1], cr[0]))
+    return [(col * pw, row * ph, pw, ph, f"Page {i}") for i, (col, row) in enumerate(cells, 1)]
+
+
+# ===== SCENE =====
+class Diagram:
+    """Everything a page needs, computed once for the whole project."""
+
+    def __init__(self, project):
+        self.project = project
+        self.boxes = layout_nodes(project)
+        anchors = anchor_positions(self.boxes)
+        side = {"left": -1.0, "right": 1.0}
+        conns, from_pos, to_pos, waypoints = [], [], [], []
+        for conn in project.get("connections") or []:
+            a, b = anchors.get(conn.get("from")), anchors.get(conn.get("to"))
+            if a is None or b is None:
+                continue
+            conns.append(conn)
+            from_pos.append((a[0], a[1], side[a[2]]))
+            to_pos.append((b[0], b[1], side[b[2]]))
+            waypoints.append(conn.get("waypoints") or [])
+        self.connections = conns
+        self.anchors = anchors
+        self.wires = WirePaths(from_pos, to_pos, waypoints)
+        colors = dict(zip((c.get("id") for c in project.get("connections") or []), wire_colors(project)))
+        self.colors = [colors.get(c.get("id"), DEFAULT_WIRE_COLOR) for c in conns]
+        self.pages = page_grid(project, self.boxes)
+
+    def visible(self, page):
+        """(node boxes, wire indexes) that intersect a page rectangle."""
+        x, y, w, h, _label = page
+        nodes = [b for b in self.boxes if _overlaps(b.bounds, x, y, w, h)]
+        bb = self.wires.bbox
+        hit = (bb[:, 2] >= x) & (bb[:, 0] <= x + w) & (bb[:, 3] >= y) & (bb[:, 1] <= y + h)
+        return nodes, np.flatnonzero(hit).tolist()
+
+
+def _overlaps(bounds, x, y, w, h):
+    left, top, right, bottom = bounds
+    return right >= x and left <= x + w and bottom >= y and top <= y + h
+
+
+def _label_text(conn):
+    text = conn.get("label")
+    if not text and (conn.get("cableType") or conn.get("cableLength")):
+        text = " • ".join(v for v in (conn.get("cableType"), conn.get("cableLength")) if v)
+    return text
+
+
+def _dash(conn):
+    if conn.get("enhanced") and conn.get("dashPattern"):
+        return [float(v) for v in str(conn["dashPattern"]).split()]
+    return None
+
+
+def _cell_text(row, ci):
+    return str(row[ci]) if ci < len(row) and row[ci] is not None else ""
+
+
+# ===== SVG =====
+def _n(v):
+    return f"{v:.2f}".rstrip("0").rstrip(".")
+
+
+def _esc(text):
+    return str(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+
+def svg_path(cmds):
+    return " ".join(c[0] + " " + " ".join(_n(v) for v in c[1:]) for c in cmds)
+
+
+def _svg_wire(out, diagram, i):
+    conn = diagram.connections[i]
+    d = svg_path(diagram.wires.commands(i))
+    dash = _dash(conn)
+    dash_attr = f' stroke-dasharray="{" ".join(_n(v) for v in dash)}"' if dash else ""
+    if conn.get("enhanced"):
+        out.append(f'<path d="{d}" fill="none" stroke="#FFFFFF" stroke-opacity="0.15" stroke-width="5" stroke-linecap="round"{dash_attr}/>')
+    out.append(f'<path d="{d}" fill="none" stroke="#{diagram.colors[i]}" stroke-width="2" stroke-linecap="round"{dash_attr}/>')
+
+
+def _svg_node(out, box):
+    node = box.node
+    accent = signal_color_hex(node.get("signalColor"))
+    out.append(f'<g transform="translate({_n(box.x)} {_n(box.y)}) scale({_n(box.scale)})">')
+    out.append(f'<rect x="1" y="1" width="{_n(box.width - 2)}" height="{_n(box.height - 2)}" fill="#{CARD}" stroke="#{accent}" stroke-width="2"/>')
+    out.append(f'<text x="10" y="{NODE_BORDER + 21}" font-size="14" fill="#{TITLE_TEXT}" letter-spacing="2">{_esc(device_name(node))}</text>')
+    if node.get("manufacturer"):
+        out.append(f'<text x="{_n(box.width - 10)}" y="{NODE_BORDER + 21}" font-size="10" fill="#{TEXT_MUTED}" text-anchor="end">{_esc(node["manufacturer"])}</text>')
+    sections = node["sections"]
+    for sid, x, y, w, h, mirrored, cols, widths in box.sections:
+        sec = sections[sid]
+        out.append(f'<rect x="{_n(x)}" y="{_n(y)}" width="{_n(w)}" height="{SECTION_TITLE_H}" fill="#{HEADER_BG}" stroke="#{BORDER}"/>')
+        tx, anchor = (x + w - 8, "end") if mirrored else (x + 8, "start")
+        out.append(f'<text x="{_n(tx)}" y="{_n(y + 19)}" font-size="10" fill="#{accent}" letter-spacing="4" text-anchor="{anchor}">{_esc(sec.get("title", "").upper())}</text>')
+        if sec.get("collapsed"):
+            continue
+        col_x = x + (ACTION_AREA_W if mirrored else ANCHOR_W)
+        hy = y + SECTION_TITLE_H
+        out.append(f'<rect x="{_n(x)}" y="{_n(hy)}" width="{_n(w)}" height="{HEADER_ROW_H}" fill="#{HEADER_BG}"/>')
+        cx = col_x
+        for ci, cw in zip(cols, widths):
+            out.append(f'<text x="{_n(cx + cw / 2)}" y="{_n(hy + 15)}" font-size="9" fill="#{TEXT_MUTED}" text-anchor="middle" letter-spacing="2">{_esc(sec["cols"][ci])}</text>')
+            cx += cw + 1
+        for ri, row in enumerate(sec.get("rows") or ()):
+            ax, ay, _side = box.anchors[f"{box.id}-{sid}-{ri}"]
+            top = ay - CELL_H / 2
+            out.append(f'<line x1="{_n(x)}" y1="{_n(top + CELL_H)}" x2="{_n(x + w)}" y2="{_n(top + CELL_H)}" stroke="#{BORDER}"/>')
+            cx = col_x
+            for ci, cw in zip(cols, widths):
+                text = _cell_text(row, ci)
+                if text:
+                    out.append(f'<text x="{_n(cx + cw / 2)}" y="{_n(ay + 5)}" font-size="14" fill="#{TEXT}" text-anchor="middle">{_esc(text)}</text>')
+                cx += cw + 1
+            out.append(f'<circle cx="{_n(ax)}" cy="{_n(ay)}" r="4" fill="#{accent}"/>')
+    out.append("</g>")
+
+
+def page_svg(diagram, page):
+    x, y, w, h, label = page
+    nodes, wires = diagram.visible(page)
+    back = [i for i in wires if diagram.connections[i].get("zLayer") == "back"]
+    front = [i for i in wires if diagram.connections[i].get("zLayer") != "back"]
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_n(w)}" height="{_n(h)}" viewBox="{_n(x)} {_n(y)} {_n(w)} {_n(h)}" '
+        f'font-family="Space Grotesk, Helvetica, sans-serif">',
+        f"<title>{_esc(diagram.project.get('name') or '')} - {label}</title>",
+        f'<rect x="{_n(x)}" y="{_n(y)}" width="{_n(w)}" height="{_n(h)}" fill="#{BG_COLOR}"/>',
+    ]
+    # Back wires -> nodes -> front wires -> labels, as exportToCanvas draws them
+    for i in back:
+        _svg_wire(out, diagram, i)
+    for box in nodes:
+        _svg_node(out, box)
+    for i in front:
+        _svg_wire(out, diagram, i)
+    for i in wires:
+        text = _label_text(diagram.connections[i])
+        if text:
+            lx, ly, angle = diagram.wires.midpoint(i)
+            out.append(
+                f'<text transform="translate({_n(lx)} {_n(ly)}) rotate({_n(np.degrees(angle))})" y="-3" font-size="4" font-weight="500" '
+                f'text-anchor="middle" fill="#{diagram.colors[i]}" stroke="#{LABEL_OUTLINE}" stroke-width="1.5" paint-order="stroke">{_esc(text)}</text>'
+            )
+    out.append("</svg>")
+    return "\n".join(out)
+
+
+def render_svg(project, output_dir):
+    """One SVG per page in output_dir; returns the file paths."""
+    diagram = project if isinstance(project, Diagram) else Diagram(project)
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for n, page in enumerate(diagram.pages, 1):
+        path = os.path.join(output_dir, f"page_{n:02d}.svg")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page_svg(diagram, page))
+        paths.append(path)
+    return paths
+
+
+# ===== PDF =====
+def _rgb(hex_color):
+    return " ".join(_n(int(hex_color[i:i + 2], 16) / 255) for i in (0, 2, 4))
+
+
+def _pdf_str(text):
+    data = str(text).replace("•", "\x95").encode("cp1252", "replace")
+    return "(" + data.decode("latin-1").replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def pdf_path(cmds):
+    ops = []
+    cx = cy = 0.0
+    for c in cmds:
+        op = c[0]
+        if op == "M":
+            cx, cy = c[1], c[2]
+            ops.append(f"{_n(cx)} {_n(cy)} m")
+        elif op == "L":
+            cx, cy = c[1], c[2]
+            ops.append(f"{_n(cx)} {_n(cy)} l")
+        elif op == "C":
+            ops.append(" ".join(_n(v) for v in c[1:]) + " c")
+            cx, cy = c[5], c[6]
+        else:  # Q -> cubic
+            qx, qy, x, y = c[1:]
+            ops.append(f"{_n(cx + 2 / 3 * (qx - cx))} {_n(cy + 2 / 3 * (qy - cy))} "
+                       f"{_n(x + 2 / 3 * (qx - x))} {_n(y + 2 / 3 * (qy - y))} {_n(x)} {_n(y)} c")
+            cx, cy = x, y
+    return "\n".join(ops)
+
+
+def _pdf_text(out, text, x, y, size, color, align="start", angle=0.0):
+    """Text in the y-down page space; the text matrix flips glyphs back upright."""
+    width = len(text) * size * 0.55
+    dx = {"start": 0, "middle": -width / 2, "end": -width}[align]
+    cos, sin = np.cos(angle), np.sin(angle)
+    x, y = x + dx * cos, y + dx * sin
+    out.append(f"BT /F1 {_n(size)} Tf {_rgb(color)} rg {_n(cos)} {_n(sin)} {_n(sin)} {_n(-cos)} {_n(x)} {_n(y)} Tm {_pdf_str(text)} Tj ET")
+
+
+def _pdf_wire(out, diagram, i):
+    conn = diagram.connections[i]
+    path = pdf_path(diagram.wires.commands(i))
+    dash = _dash(conn)
+    dash_op = f"[{' '.join(_n(v) for v in dash)}] 0 d" if dash else "[] 0 d"
+    if conn.get("enhanced"):
+        out.append(f"q /GS15 gs 1 1 1 RG 5 w 1 J {dash_op}\n{path}\nS Q")
+    out.append(f"q {_rgb(diagram.colors[i])} RG 2 w 1 J {dash_op}\n{path}\nS Q")
+
+
+def _pdf_node(out, box):
+    node = box.node
+    accent = signal_color_hex(node.get("signalColor"))
+    out.append(f"q 1 0 0 1 {_n(box.x)} {_n(box.y)} cm {_n(box.scale)} 0 0 {_n(box.scale)} 0 0 cm")
+    out.append(f"{_rgb(CARD)} rg {_rgb(accent)} RG 2 w 1 1 {_n(box.width - 2)} {_n(box.height - 2)} re B")
+    _pdf_text(out, device_name(node), 10, NODE_BORDER + 21, 14, TITLE_TEXT)
+    if node.get("manufacturer"):
+        _pdf_text(out, node["manufacturer"], box.width - 10, NODE_BORDER + 21, 10, TEXT_MUTED, "end")
+    sections = node["sections"]
+    for sid, x, y, w, h, mirrored, cols, widths in box.sections:
+        sec = sections[sid]
+        out.append(f"{_rgb(HEADER_BG)} rg {_rgb(BORDER)} RG 1 w {_n(x)} {_n(y)} {_n(w)} {SECTION_TITLE_H} re B")
+        title = sec.get("title", "").upper()
+        _pdf_text(out, title, x + w - 8 if mirrored else x + 8, y + 19, 10, accent, "end" if mirrored else "start")
+        if sec.get("collapsed"):
+            continue
+        col_x = x + (ACTION_AREA_W if mirrored else ANCHOR_W)
+        hy = y + SECTION_TITLE_H
+        out.append(f"{_rgb(HEADER_BG)} rg {_n(x)} {_n(hy)} {_n(w)} {HEADER_ROW_H} re f")
+        cx = col_x
+        for ci, cw in zip(cols, widths):
+            _pdf_text(out, sec["cols"][ci], cx + cw / 2, hy + 15, 9, TEXT_MUTED, "middle")
+            cx += cw + 1
+        for ri, row in enumerate(sec.get("rows") or ()):
+            ax, ay, _side = box.anchors[f"{box.id}-{sid}-{ri}"]
+            bottom = ay + CELL_H / 2
+            out.append(f"{_rgb(BORDER)} RG 1 w {_n(x)} {_n(bottom)} m {_n(x + w)} {_n(bottom)} l S")
+            cx = col_x
+            for ci, cw in zip(cols, widths):
+                text = _cell_text(row, ci)
+                if text:
+                    _pdf_text(out, text, cx + cw / 2, ay + 5, 14, TEXT, "middle")
+                cx += cw + 1
+            # Circle from four cubic arcs
+            k = 4 * 0.5523
+            out.append(f"{_rgb(accent)} rg {_n(ax + 4)} {_n(ay)} m "
+                       f"{_n(ax + 4)} {_n(ay + k)} {_n(ax + k)} {_n(ay + 4)} {_n(ax)} {_n(ay + 4)} c "
+                       f"{_n(ax - k)} {_n(ay + 4)} {_n(ax - 4)} {_n(ay + k)} {_n(ax - 4)} {_n(ay)} c "
+                       f"{_n(ax - 4)} {_n(ay - k)} {_n(ax - k)} {_n(ay - 4)} {_n(ax)} {_n(ay - 4)} c "
+                       f"{_n(ax + k)} {_n(ay - 4)} {_n(ax + 4)} {_n(ay - k)} {_n(ax + 4)} {_n(ay)} c f")
+    out.append("Q")
+
+
+def page_pdf_content(diagram, page):
+    x, y, w, h, _label = page
+    nodes, wires = diagram.visible(page)
+    # Page space: CSS px, y down, origin at the page's top-left corner
+    out = [f"{_n(PX_TO_PT)} 0 0 {_n(-PX_TO_PT)} 0 {_n(h * PX_TO_PT)} cm 1 0 0 1 {_n(-x)} {_n(-y)} cm",
+           f"{_rgb(BG_COLOR)} rg {_n(x)} {_n(y)} {_n(w)} {_n(h)} re f"]
+    for i in wires:
+        if diagram.connections[i].get("zLayer") == "back":
+            _pdf_wire(out, diagram, i)
+    for box in nodes:
+        _pdf_node(out, box)
+    for i in wires:
+        if diagram.connections[i].get("zLayer") != "back":
+            _pdf_wire(out, diagram, i)
+    for i in wires:
+        text = _label_text(diagram.connections[i])
+        if text:
+            lx, ly, angle = diagram.wires.midpoint(i)
+            ox, oy = 3 * np.sin(angle), -3 * np.cos(angle)   # dy = -3 in the rotated frame
+            _pdf_text(out, text, lx + ox, ly + oy, 4, diagram.colors[i], "middle", angle)
+    return "\n".join(out)
+
+
+def render_pdf(project, output_path):
+    """All pages in one vector PDF (Helvetica for text)."""
+    diagram = project if isinstance(project, Diagram) else Diagram(project)
+    objects = [None, None]   # 1: catalog, 2: page tree; filled in below
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    objects.append("<< /Type /ExtGState /CA 0.15 >>")
+    page_ids = []
+    for page in diagram.pages:
+        _x, _y, w, h, _label = page
+        stream = zlib.compress(page_pdf_content(diagram, page).encode("latin-1", "replace"))
+        objects.append(stream)
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_n(w * PX_TO_PT)} {_n(h * PX_TO_PT)}] "
+            f"/Resources << /Font << /F1 3 0 R >> /ExtGState << /GS15 4 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    objects[0] = "<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "wb") as f:
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for num, obj in enumerate(objects, 1):
+            offsets.append(f.tell())
+            if isinstance(obj, bytes):
+                f.write(f"{num} 0 obj\n<< /Length {len(obj)} /Filter /FlateDecode >>\nstream\n".encode())
+                f.write(obj)
+                f.write(b"\nendstream\nendobj\n")
+            else:
+                f.write(f"{num} 0 obj\n{obj}\nendobj\n".encode("latin-1"))
+        xref = f.tell()
+        f.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+        for off in offsets:
+            f.write(f"{off:010d} 00000 n \n".encode())
+        f.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return output_path
+
+
+# ===== ENTRY POINT =====
+def render_diagram(project_path, output_path=None, format="pdf"):
+    project = load_project(project_path)
+    base = project_stem(project_path)
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(__file__), '..', '.tmp',
+                                   f"{base}.pdf" if format == "pdf" else f"{base}_pages")
+    diagram = Diagram(project)
+    if format == "svg":
+        paths = render_svg(diagram, output_path)
+        print(f"Diagram rendered: {len(paths)} SVG pages in {output_path}")
+    else:
+        render_pdf(diagram, output_path)
+        print(f"Diagram rendered: {len(diagram.pages)} pages, {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    render_diagram(sys.argv[1], *sys.argv[2:3])
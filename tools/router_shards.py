@@ -0,0 +1,326 @@
+"""
+Sharded AV Router Workbooks
+Splits a system too big to open comfortably into several router workbooks plus
+a small index:
+- Devices are grouped by zone, system or signalColor, read from the .vsf
+  node's fields in Device.meta: zone is the node's canvas group, system its
+  primaryDeviceType (else its first deviceTypes entry) and signalColor falls
+  back to the device colour; or only by size. Devices without the field share
+  one group, and a key no device has is an error rather than one big shard
+- Each group is packed into shards in device order under a cell budget
+  (max_cells, and max_bytes at ~BYTES_PER_CELL compressed). The estimate
+  counts device sheets, Devices rows, Routing rows and the dropdown Lists;
+  a shard whose far-end devices push it over is split in half until it fits;
+  a single device that is over the budget on its own is warned about
+- A route between two shards is listed in both. The far device appears on the
+  Devices sheet with a link into the shard that owns it, but gets no sheet
+- Shards are built in parallel (one process each, like migrate-legacy --jobs);
+  the index workbook's Devices sheet links every device to its sheet in its
+  shard and to its row on that shard's Devices sheet
+
+Scenes are not sharded: a SceneBook stays with the single-workbook router.
+
+    shard_router(".tmp/show_router.xlsx", system=system, by="signalColor", max_cells=200_000)
+    python -m tools router --catalog shows.sqlite --shard-by zone --max-cells 200000 --jobs 4
+"""
+
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from tools.av_model import INPUT, OUTPUT, System, sample_system
+
+SHARD_KEYS = ("zone", "system", "signalColor", "size")
+# Shard key -> Device.meta (node) fields, first one set wins
+SHARD_FIELDS = {"zone": ("group",), "system": ("primaryDeviceType", "deviceTypes"), "signalColor": ("signalColor",)}
+DEFAULT_MAX_CELLS = 500_000
+BYTES_PER_CELL = 16     # deflated sheet XML per styled cell, measured on generated routers (~14) plus margin
+
+# Cell estimate, matching create_av_router's layout
+WORKBOOK_CELLS = 39 * 14 + 29 * 19      # Devices and Routing background blocks
+SHEET_CELLS = 24 * 11                   # device sheet background block
+PORT_CELLS = 3
+DEVICE_ROW_CELLS = 6
+LIST_CELLS = 1          # per port and twice per device (source / destination name) on the hidden Lists sheet
+ROUTE_CELLS = 8
+
+_SLUG_RE = re.compile(r"[^A-Za-z0-9]+")
+
+
+def device_key(device, by):
+    """Group key of a device for a shard mode; "" when it has none."""
+    if by == "size":
+        return ""
+    meta = device.meta if isinstance(device.meta, dict) else {}
+    for field in SHARD_FIELDS[by]:
+        value = meta.get(field)
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if value:
+            return str(value)
+    return str(device.color or "") if by == "signalColor" else ""
+
+
+def listed_cells(device):
+    """Estimated cells of a device listed in a shard: Devices row and dropdown list entries."""
+    return DEVICE_ROW_CELLS + LIST_CELLS * (len(device.inputs) + len(device.outputs) + 2)
+
+
+def sheet_cells(device):
+    return SHEET_CELLS + PORT_CELLS * (len(device.inputs) + len(device.outputs))
+
+
+def shard_cells(sub, sheets):
+    """Estimated cells of a shard workbook: sub is its System, sheets the devices that get a sheet."""
+    return (WORKBOOK_CELLS + sum(map(listed_cells, sub.devices)) + sum(map(sheet_cells, sheets))
+            + ROUTE_CELLS * len(sub.routes))
+
+
+def cell_budget(max_cells=DEFAULT_MAX_CELLS, max_bytes=None):
+    budget = max_cells or DEFAULT_MAX_CELLS
+    return min(budget, max_bytes // BYTES_PER_CELL) if max_bytes else budget
+
+
+def partition(system, by="size", max_cells=DEFAULT_MAX_CELLS, max_bytes=None):
+    """
+    [(group key, [device ids])] in device order, packed under the cell budget
+    counting each device's own cells and its routes (far ends not yet known).
+    """
+    if by not in SHARD_KEYS:
+        raise ValueError(f"Unknown shard key {by!r} (expected one of {', '.join(SHARD_KEYS)})")
+    budget = cell_budget(max_cells, max_bytes)
+    ports = system.ports
+    route_count = [0] * len(system.devices)
+    for r in system.routes:
+        route_count[ports.device[r.src]] += 1
+        route_count[ports.device[r.dst]] += 1
+
+    groups = {}
+    for device in system.devices:
+        groups.setdefault(device_key(device, by), []).append(device)
+    if by in ("zone", "system") and list(groups) == [""]:
+        raise ValueError(f"No device has a {' / '.join(SHARD_FIELDS[by])} field to shard by {by}")
+    shards = []
+    for key, devices in groups.items():
+        current, cells = [], WORKBOOK_CELLS
+        for device in devices:
+            cost = sheet_cells(device) + listed_cells(device) + ROUTE_CELLS * route_count[device.id]
+            if current and cells + cost > budget:
+                shards.append((key, current))
+                current, cells = [], WORKBOOK_CELLS
+            current.append(device.id)
+            cells += cost
+        shards.append((key, current))
+    return shards
+
+
+def subsystem(system, owned, routes):
+    """
+    System with the owned devices, the far ends of the given routes and those
+    routes. Returns (system, {new device id: old device id}).
+    """
+    ports = system.ports
+    wanted = set(owned)
+    for r in routes:
+        wanted.add(ports.device[r.src])
+        wanted.add(ports.device[r.dst])
+    sub = System()
+    port_map, origin = {}, {}
+    for did in sorted(wanted):
+        d = system.devices[did]
+        nd = sub.add_device(d.name, d.color)
+        nd.meta = d.meta
+        origin[nd.id] = did
+        for direction, pids in ((INPUT, d.inputs), (OUTPUT, d.outputs)):
+            for pid in pids:
+                port_map[pid] = sub.add_port(nd, direction, ports.port[pid], ports.name[pid], ports.signal[pid])
+    for r in routes:
+        nr = sub.add_route(port_map[r.src], port_map[r.dst], r.signal, r.status)
+        nr.number = r.number
+        nr.meta = r.meta
+    return sub, origin
+
+
+def shard_name(stem, n, key):
+    slug = _SLUG_RE.sub("-", key).strip("-")[:24]
+    return f"{stem}_{n:02d}{'_' + slug if slug else ''}.xlsx"
+
+
+def _build_shard(job):
+    from tools.create_av_router import create_av_router
+    path, sub, external, deterministic, project_images = job
+    create_av_router(path, system=sub, scenes=None, external=external, deterministic=deterministic,
+                     project_images=project_images)
+    return path
+
+
+def shard_router(output_path=None, system=None, by="size", max_cells=DEFAULT_MAX_CELLS, max_bytes=None,
+                 jobs=None, deterministic=False, project_images=None):
+    """
+    Write the shards and the index workbook (at output_path; shards beside it).
+    project_images: {blob key: ImageRef} embedded in the source .vsf, for device sheets.
+    Returns [(shard path, device count, route count, estimated cells)].
+    """
+    from tools.create_av_router import sheet_titles
+
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'av_router.xlsx')
+    if system is None:
+        system = sample_system()
+    folder = os.path.dirname(os.path.abspath(output_path))
+    stem = os.path.splitext(os.path.basename(output_path))[0]
+    os.makedirs(folder, exist_ok=True)
+
+    budget = cell_budget(max_cells, max_bytes)
+    groups = partition(system, by, max_cells, max_bytes)
+    ports = system.ports
+    while True:
+        owner = {}
+        for n, (_key, owned) in enumerate(groups):
+            for did in owned:
+                owner[did] = n
+        shard_routes = [[] for _ in groups]
+        for r in system.routes:
+            a, b = owner[ports.device[r.src]], owner[ports.device[r.dst]]
+            shard_routes[a].append(r)
+            if b != a:
+                shard_routes[b].append(r)
+        subs, cells = [], []
+        for n, (_key, owned) in enumerate(groups):
+            sub, origin = subsystem(system, owned, shard_routes[n])
+            subs.append((sub, origin))
+            cells.append(shard_cells(sub, [d for d in sub.devices if owner[origin[d.id]] == n]))
+        over = {n for n, (_key, owned) in enumerate(groups) if cells[n] > budget and len(owned) > 1}
+        if not over:
+            break
+        split = []
+        for n, (key, owned) in enumerate(groups):
+            half = len(owned) // 2
+            split += [(key, owned[:half]), (key, owned[half:])] if n in over else [(key, owned)]
+        groups = split
+    for n, (_key, owned) in enumerate(groups):
+        if cells[n] > budget and owned:
+            print(f"Warning: shard {n + 1} ({system.devices[owned[0]].name}) is ~{cells[n]} cells, "
+                  f"over the {budget} cell budget on its own", file=sys.stderr)
+
+    # Sheet titles and Devices rows are fixed by each shard's own devices, so
+    # every shard (and the index) can link into any other before any is written
+    names = [shard_name(stem, n + 1, key) for n, (key, _owned) in enumerate(groups)]
+    place = {}      # old device id -> (shard, sheet title, Devices row)
+    for n, (sub, origin) in enumerate(subs):
+        mine = [d for d in sub.devices if owner[origin[d.id]] == n]
+        titles = sheet_titles(mine)
+        for row, d in enumerate(sub.devices, 5):
+            if owner[origin[d.id]] == n:
+                place[origin[d.id]] = (n, titles[d.id], row)
+
+    work = []
+    for n, (sub, origin) in enumerate(subs):
+        external = {}
+        for d in sub.devices:
+            far = place[origin[d.id]]
+            if far[0] != n:
+                external[d.id] = (names[far[0]], far[1])
+        work.append((os.path.join(folder, names[n]), sub, external, deterministic, project_images))
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(work) < 2:
+        list(map(_build_shard, work))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(work))) as pool:
+            list(pool.map(_build_shard, work))
+
+    results = [(path, len(groups[n][1]), len(shard_routes[n]), cells[n]) for n, (path, *_rest) in enumerate(work)]
+    create_shard_index(output_path, system, groups, names, place, results, by, deterministic)
+    return results
+
+
+def create_shard_index(output_path, system, groups, names, place, results, by, deterministic=False):
+    """Small workbook: every device linked to its shard, plus one row per shard."""
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+    from openpyxl.utils import get_column_letter
+    from openpyxl.worksheet.hyperlink import Hyperlink
+
+    from tools.xlsx_writer import save_workbook
+
+    wb = Workbook()
+    header_font = Font(bold=True, color="FFFFFF", size=11)
+    title_font = Font(bold=True, color="FFFFFF", size=14)
+    cell_font = Font(color="FFFFFF", size=10)
+    link_font = Font(color="00BFFF", size=10, underline="single")
+    header_fill = PatternFill(start_color="2d2d44", end_color="2d2d44", fill_type="solid")
+    row_fill = PatternFill(start_color="252538", end_color="252538", fill_type="solid")
+    thin_border = Border(
+        left=Side(style='thin', color="444466"),
+        right=Side(style='thin', color="444466"),
+        top=Side(style='thin', color="444466"),
+        bottom=Side(style='thin', color="444466")
+    )
+
+    def table(ws, title, headers, widths):
+        ws['B2'] = title
+        ws['B2'].font = title_font
+        ws['B2'].fill = header_fill
+        for col, header in enumerate(headers, 2):
+            cell = ws.cell(row=4, column=col, value=header)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.border = thin_border
+            cell.alignment = Alignment(horizontal='center')
+        ws.freeze_panes = 'B5'
+        for col, w in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(col)].width = w
+
+    def put(ws, row, col, value, font=cell_font):
+        cell = ws.cell(row=row, column=col, value=value)
+        cell.font = font
+        cell.fill = row_fill
+        cell.border = thin_border
+        return cell
+
+    def link(cell, target, location):
+        cell.hyperlink = Hyperlink(ref=cell.coordinate, target=target, location=location)
+        cell.font = link_font
+
+    # ===== DEVICES SHEET =====
+    ws = wb.active
+    ws.title = "Devices"
+    table(ws, f"AV SYSTEM DEVICES — {len(names)} shards by {by}",
+          ["ID", "Device Name", "Type", "Inputs", "Outputs", "Shard", "Sheet Link"], [3, 6, 18, 12, 8, 8, 24, 18])
+    for i, device in enumerate(system.devices, 1):
+        row = 4 + i
+        n, title, shard_row = place[device.id]
+        put(ws, row, 2, i)
+        put(ws, row, 3, device.name).fill = PatternFill(start_color=device.color or "252538",
+                                                        end_color=device.color or "252538", fill_type="solid")
+        put(ws, row, 4, device.type)
+        put(ws, row, 5, len(device.inputs))
+        put(ws, row, 6, len(device.outputs))
+        link(put(ws, row, 7, f"{names[n]} row {shard_row}"), names[n], f"'Devices'!B{shard_row}")
+        link(put(ws, row, 8, f"Go to {device.name}"), names[n], f"'{title}'!A1")
+    if system.devices:
+        ws.auto_filter.ref = f"B4:H{4 + len(system.devices)}"
+
+    # ===== SHARDS SHEET =====
+    ws_shards = wb.create_sheet("Shards")
+    table(ws_shards, "SHARDS", ["#", "Workbook", by if by != "size" else "Group", "Devices", "Routes", "Est. Cells"],
+          [3, 5, 30, 16, 9, 9, 11])
+    for n, (key, _owned) in enumerate(groups):
+        row = 5 + n
+        _path, devices, routes, cells = results[n]
+        put(ws_shards, row, 2, n + 1)
+        link(put(ws_shards, row, 3, names[n]), names[n], "'Devices'!A1")
+        put(ws_shards, row, 4, key or "—")
+        put(ws_shards, row, 5, devices)
+        put(ws_shards, row, 6, routes)
+        put(ws_shards, row, 7, cells)
+
+    save_workbook(wb, output_path, deterministic=deterministic)
+    print(f"AV Router index created: {output_path} ({len(names)} shards)")
+    return output_path
+
+
+if __name__ == "__main__":
+    shard_router()
@@ -0,0 +1,221 @@
+"""
+Routing Scenes (Salvos)
+Named router states such as Rehearsal / Broadcast / Strike over one System.
+
+A scene is a sorted sparse int array of crosspoints over the system's
+source-by-destination port index: crosspoint = src_index * n_dst + dst_index,
+where src_index / dst_index are positions in System.all_outputs() / all_inputs().
+A 1,000-route scene costs 4 KB whatever the router size, and diffing two of
+them is a set operation over ints rather than a walk over route rows.
+
+    book = SceneBook(system)
+    book.add("Rehearsal", system.routes)
+    book.add_named("Strike", [])
+    added, removed = book.diff("Rehearsal", "Broadcast")
+"""
+
+import base64
+import json
+from array import array
+from bisect import bisect_left
+
+from tools.av_model import INPUT, OUTPUT
+
+# Unsigned 32-bit crosspoints: up to ~65k x 65k ports
+_TYPECODE = "I" if array("I").itemsize == 4 else "L"
+
+
+def _sorted_array(codes):
+    return array(_TYPECODE, sorted(set(codes)))
+
+
+class Scene:
+    __slots__ = ("name", "cells")
+
+    def __init__(self, name, cells=()):
+        self.name = name
+        self.cells = cells if isinstance(cells, array) else _sorted_array(cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, code):
+        i = bisect_left(self.cells, code)
+        return i < len(self.cells) and self.cells[i] == code
+
+    def nbytes(self):
+        return len(self.cells) * self.cells.itemsize
+
+    def __repr__(self):
+        return f"Scene({self.name!r}, {len(self.cells)} crosspoints)"
+
+
+class SceneBook:
+    """Scenes over one System, plus the port <-> index maps they are encoded against."""
+
+    def __init__(self, system):
+        self.system = system
+        self.sources = system.all_outputs()        # src index -> port id
+        self.destinations = system.all_inputs()    # dst index -> port id
+        self.n_dst = max(len(self.destinations), 1)
+        self._src_index = {pid: i for i, pid in enumerate(self.sources)}
+        self._dst_index = {pid: i for i, pid in enumerate(self.destinations)}
+        self.scenes = {}
+
+    # ===== ENCODING =====
+    def code(self, src_pid, dst_pid):
+        return self._src_index[src_pid] * self.n_dst + self._dst_index[dst_pid]
+
+    def decode(self, code):
+        """Crosspoint -> (source port id, destination port id)."""
+        s, d = divmod(code, self.n_dst)
+        return self.sources[s], self.destinations[d]
+
+    # ===== BUILDING =====
+    def add(self, name, routes):
+        """Scene from av_model Routes (or anything with .src / .dst port ids)."""
+        scene = Scene(name, (self.code(r.src, r.dst) for r in routes))
+        self.scenes[name] = scene
+        return scene
+
+    def add_named(self, name, pairs):
+        """Scene from (src device, src port, dst device, dst port) name tuples."""
+        find = self.system.find_port
+        scene = Scene(name, (
+            self.code(find(sd, sp, OUTPUT), find(dd, dp, INPUT)) for sd, sp, dd, dp in pairs
+        ))
+        self.scenes[name] = scene
+        return scene
+
+    def __getitem__(self, name):
+        return self.scenes[name]
+
+    def __iter__(self):
+        return iter(self.scenes.values())
+
+    def _get(self, scene):
+        return self.scenes[scene] if isinstance(scene, str) else scene
+
+    # ===== SET OPERATIONS =====
+    def union(self, a, b, name=None):
+        a, b = self._get(a), self._get(b)
+        return Scene(name or f"{a.name} + {b.name}", set(a.cells).union(b.cells))
+
+    def diff(self, a, b):
+        """(added, removed) crosspoint arrays going from scene a to scene b."""
+        a, b = set(self._get(a).cells), set(self._get(b).cells)
+        return _sorted_array(b - a), _sorted_array(a - b)
+
+    def apply(self, base, salvo, name=None):
+        """
+        Fire `salvo` on top of `base`: every destination the salvo routes takes the
+        salvo's source; destinations the salvo does not touch keep their base route.
+        """
+        base, salvo = self._get(base), self._get(salvo)
+        n_dst = self.n_dst
+        touched = {c % n_dst for c in salvo.cells}
+        kept = (c for c in base.cells if c % n_dst not in touched)
+        return Scene(name or f"{base.name} <- {salvo.name}", [*kept, *salvo.cells])
+
+    def changes(self, a, b):
+        """
+        Per-destination changes from scene a to scene b, sorted by destination:
+        [(dst port id, [old src port ids], [new src port ids])].
+        """
+        added, removed = self.diff(a, b)
+        n_dst = self.n_dst
+        by_dst = {}
+        for codes, slot in ((removed, 0), (added, 1)):
+            for c in codes:
+                s, d = divmod(c, n_dst)
+                by_dst.setdefault(d, ([], []))[slot].append(self.sources[s])
+        return [(self.destinations[d], old, new) for d, (old, new) in sorted(by_dst.items())]
+
+    def routes(self, scene):
+        """Scene -> [(source port id, destination port id)] in crosspoint order."""
+        return [self.decode(c) for c in self._get(scene).cells]
+
+    # ===== STORAGE =====
+    def to_json(self):
+        """
+        Scenes keyed by port text keys so they survive port re-numbering. Sources
+        and destinations are separate lists, so a device's input and output may
+        share a port code ("USB").
+        """
+        key = self.system.port_key
+        return {
+            "sources": [key(pid) for pid in self.sources],
+            "destinations": [key(pid) for pid in self.destinations],
+            "scenes": {
+                name: base64.b64encode(scene.cells.tobytes()).decode("ascii")
+                for name, scene in self.scenes.items()
+            },
+        }
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f)
+
+    @classmethod
+    def from_json(cls, system, data):
+        """Load scenes saved against another numbering of (possibly) the same system."""
+        book = cls(system)
+        # Keyed per direction: outputs resolve source keys, inputs destination keys
+        src_keys, dst_keys = {}, {}
+        for keys, pids in ((src_keys, book.sources), (dst_keys, book.destinations)):
+            for pid in pids:
+                keys.setdefault(system.port_key(pid), pid)
+        old_src = [src_keys.get(k) for k in data["sources"]]
+        old_dst = [dst_keys.get(k) for k in data["destinations"]]
+        old_n_dst = max(len(old_dst), 1)
+        for name, blob in data["scenes"].items():
+            cells = array(_TYPECODE)
+            cells.frombytes(base64.b64decode(blob))
+            codes = []
+            for c in cells:
+                s, d = divmod(c, old_n_dst)
+                src, dst = old_src[s], old_dst[d]
+                if src is None or dst is None:
+                    missing = data["sources"][s] if src is None else data["destinations"][d]
+                    raise ValueError(f"Scene {name!r} routes port {missing!r}, which is not in the system")
+                codes.append(book.code(src, dst))
+            book.scenes[name] = Scene(name, codes)
+        return book
+
+    @classmethod
+    def load(cls, system, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if "sources" not in data:
+            # Hand-written file: {"Scene": [[src dev, src port, dst dev, dst port], ...]}
+            book = cls(system)
+            for name, pairs in data.items():
+                book.add_named(name, pairs)
+            return book
+        return cls.from_json(system, data)
+
+
+# ===== SAMPLE SCENES =====
+# For av_model.sample_system()
+SAMPLE_SCENES = {
+    "Rehearsal": [
+        ("Laptop", "HDMI Out", "Video Switcher", "Input 1"),
+        ("Video Switcher", "Program", "Display", "HDMI Input"),
+        ("Laptop", "3.5mm", "Audio Mixer", "Line In"),
+    ],
+    "Broadcast": [
+        ("Laptop", "HDMI Out", "Video Switcher", "Input 1"),
+        ("Laptop", "USB-C DP", "Video Switcher", "Input 2"),
+        ("Video Switcher", "Program", "Display", "HDMI Input"),
+        ("Video Switcher", "SDI Out", "Display", "HDMI 2"),
+        ("Laptop", "3.5mm", "Audio Mixer", "USB Audio"),
+    ],
+    "Strike": [],
+}
+
+
+def sample_scenes(system):
+    book = SceneBook(system)
+    for name, pairs in SAMPLE_SCENES.items():
+        book.add_named(name, pairs)
+    return book
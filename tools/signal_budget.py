@@ -0,0 +1,236 @@
+"""
+Signal Budget Check
+Does each wire's signal fit its link? Every .vsf connection is checked against
+the connectors at both ends and the cable between them:
+- Connectors join the system router's Sources capability table (Source Type or
+  Connector, normalized: "12G SDI" == "12G-SDI") in one dict built up front, a
+  hash join instead of a VLOOKUP per wire; a connector's limit is its Max
+  Resolution ("4K@60Hz") as a pixel rate
+- Cables are rated in Gb/s (CABLE_GBPS, the app's cable types plus common
+  variants); network and plain fiber carry compressed or transceiver-defined
+  signals and are not rated
+- The format comes from the source port's RESOLUTION / RATE, else the
+  destination's; a missing rate is taken as 60 (worst case). Required data rate
+  is active picture x rate x bits per pixel (20 for 4:2:2 10-bit SDI, 24 for
+  8-bit RGB), computed for all wires at once with numpy
+- Status per wire, worst first: Over cable, Over connector, Audio dropped (an
+  audio-carrying connector into one without audio), No format, Unrated, OK
+
+    budget = check_project(load_project("show.vsf"))
+    budget.status, budget.required_gbps
+"""
+
+import re
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: numpy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from tools.vsf import parse_anchor
+
+DEFAULT_RATE = 60.0
+SDI_BITS = 20       # 4:2:2 10-bit
+RGB_BITS = 24       # 4:4:4 8-bit
+
+# Link data rate, Gb/s: SDI line rates, HDMI / DisplayPort effective (after line coding)
+CABLE_GBPS = {
+    "12G-SDI": 11.88,
+    "6G-SDI": 5.94,
+    "3G-SDI": 2.97,
+    "HD-SDI": 1.485,
+    "SD-SDI": 0.27,
+    "SMPTE Fiber": 11.88,
+    "HDMI 1.4": 8.16,
+    "HDMI 2.0": 14.4,
+    "HDMI 2.1": 42.67,
+    "DisplayPort 1.2": 17.28,
+    "DisplayPort 1.4": 25.92,
+    "DisplayPort 2.0": 77.37,
+    "USB-C (Thunderbolt 3)": 25.92,
+}
+
+# Named resolutions (Sources sheet and hand-typed rows) -> (width, height, interlaced)
+NAMED_RESOLUTIONS = {
+    "8K": (7680, 4320, False), "4K": (3840, 2160, False), "UHD": (3840, 2160, False),
+    "DCI4K": (4096, 2160, False), "2160P": (3840, 2160, False), "1440P": (2560, 1440, False),
+    "1080P": (1920, 1080, False), "1080I": (1920, 1080, True), "720P": (1280, 720, False),
+    "576I": (720, 576, True), "480I": (720, 480, True), "480P": (720, 480, False),
+}
+
+STATUSES = ("Over cable", "Over connector", "Audio dropped", "No format", "Unrated", "OK")
+AUDIO_CARRIERS = ("yes", "embedded")
+
+_KEY_RE = re.compile(r"[^A-Z0-9]")
+_SIZE_RE = re.compile(r"(\d+)\s*[xX×]\s*(\d+)\s*([pPiI])?")
+_RATE_RE = re.compile(r"([\d.]+)")
+
+
+def link_key(text):
+    """Join key for a connector or cable name: "12G SDI", "12g-sdi" -> "12GSDI"."""
+    return _KEY_RE.sub("", str(text or "").upper())
+
+
+_CABLE_BY_KEY = {link_key(k): v for k, v in CABLE_GBPS.items()}
+
+
+def signal_bits(name):
+    """Bits per pixel a link of this name carries."""
+    key = link_key(name)
+    return SDI_BITS if ("SDI" in key or "SMPTE" in key or "BNC" in key) else RGB_BITS
+
+
+def parse_format(resolution, rate=""):
+    """
+    (width, height, frames per second, rate assumed) from RESOLUTION / RATE cells
+    or a Max Resolution such as "4K@60Hz"; None without a resolution.
+    Interlaced rates are field rates, so 1080i at 59.94 is 29.97 frames.
+    """
+    text = str(resolution or "").strip()
+    if "@" in text:
+        text, _, at = text.partition("@")
+        rate = rate or at
+    m = _SIZE_RE.search(text)
+    if m:
+        w, h, interlaced = int(m.group(1)), int(m.group(2)), (m.group(3) or "").lower() == "i"
+    else:
+        named = NAMED_RESOLUTIONS.get(link_key(text))
+        if named is None:
+            return None
+        w, h, interlaced = named
+    m = _RATE_RE.search(str(rate or ""))
+    fps = float(m.group(1)) if m else DEFAULT_RATE
+    return w, h, fps / 2 if interlaced else fps, m is None
+
+
+class CapabilityTable:
+    """Sources rows indexed by normalized Source Type and Connector (first row wins)."""
+
+    def __init__(self, rows=None):
+        if rows is None:
+            from tools.create_system_router import SOURCE_TYPES
+            rows = SOURCE_TYPES
+        self.rows = rows
+        self.index = {}
+        self.pixel_rate = []
+        for i, (_id, source_type, connector, max_res, _audio) in enumerate(rows):
+            fmt = parse_format(max_res)
+            self.pixel_rate.append(fmt[0] * fmt[1] * fmt[2] if fmt else np.inf)
+            for name in (source_type, connector):
+                self.index.setdefault(link_key(name), i)
+
+    def lookup(self, connector):
+        """Row index for a port's CONNECTOR text, or -1."""
+        key = link_key(connector)
+        if not key:
+            return -1
+        i = self.index.get(key)
+        if i is None:
+            # "HDMI 2.0 TYPE A" -> the longest known name it starts with
+            best = max((k for k in self.index if key.startswith(k)), key=len, default=None)
+            i = self.index[best] if best else -1
+            self.index[key] = i
+        return i
+
+
+class Budget:
+    """Per-connection arrays (connection order) plus the joined names for the report."""
+
+    def __init__(self, connections, from_port, to_port, cable, cable_gbps, fmt, assumed, required_gbps,
+                 pixel_rate, from_cap, to_cap, status):
+        self.connections = connections
+        self.from_port = from_port      # (connector, resolution, rate) per wire
+        self.to_port = to_port
+        self.cable = cable
+        self.cable_gbps = cable_gbps    # nan: unrated
+        self.format = fmt               # (w, h, fps) or None
+        self.assumed = assumed
+        self.required_gbps = required_gbps   # nan: no format
+        self.pixel_rate = pixel_rate
+        self.from_cap = from_cap        # capability row, -1 unknown
+        self.to_cap = to_cap
+        self.status = status
+
+    def counts(self):
+        return {s: self.status.count(s) for s in STATUSES if s in self.status}
+
+
+def _port_cells(nodes, anchor, cache):
+    """(connector, resolution, rate) of the row an anchor points at."""
+    try:
+        node_id, sec_id, ri = parse_anchor(anchor or "")
+    except ValueError:
+        return "", "", ""
+    section = ((nodes.get(node_id) or {}).get("sections") or {}).get(sec_id) or {}
+    cols = cache.get(id(section))
+    if cols is None:
+        names = section.get("cols") or []
+        cols = cache[id(section)] = tuple(names.index(c) if c in names else -1
+                                          for c in ("CONNECTOR", "RESOLUTION", "RATE"))
+    rows = section.get("rows") or []
+    row = rows[ri] if ri < len(rows) else ()
+    n = len(row)
+    return tuple(str(row[c] or "").strip() if 0 <= c < n else "" for c in cols)
+
+
+def check_project(project, capabilities=None):
+    """Budget for every connection of a loaded project."""
+    caps = capabilities or CapabilityTable()
+    nodes = project["nodes"]
+    connections = project.get("connections") or []
+    n = len(connections)
+    cols, formats = {}, {}
+    # Build side of the join: each distinct connector / cable text is normalized and looked up once
+    cap_of, cable_of = {}, {}
+
+    from_port, to_port, cables, fmts = [], [], [], []
+    from_cap, to_cap, rated, sizes = [], [], [], []
+    no_format = (np.nan, np.nan, np.nan, False)
+    for conn in connections:
+        src = _port_cells(nodes, conn.get("from"), cols)
+        dst = _port_cells(nodes, conn.get("to"), cols)
+        cable = (conn.get("cableType") or "").strip()
+        from_port.append(src)
+        to_port.append(dst)
+        cables.append(cable)
+        for text in (src[0], dst[0]):
+            if text not in cap_of:
+                cap_of[text] = caps.lookup(text)
+        from_cap.append(cap_of[src[0]])
+        to_cap.append(cap_of[dst[0]])
+        link = cable or src[0] or dst[0]
+        r = cable_of.get((cable, link))
+        if r is None:
+            r = cable_of[(cable, link)] = (_CABLE_BY_KEY.get(link_key(cable), np.nan), signal_bits(link))
+        rated.append(r)
+        res, rate = (src[1], src[2]) if src[1] else (dst[1], dst[2] or src[2])
+        fmt = formats.get((res, rate), no_format)
+        if fmt is no_format:
+            fmt = formats[(res, rate)] = parse_format(res, rate)
+        fmts.append(fmt[:3] if fmt else None)
+        sizes.append(fmt or no_format)
+
+    # Vectorized budget: nan (no format / unrated / unknown connector) never compares as over
+    from_cap = np.array(from_cap, dtype=np.int64)
+    to_cap = np.array(to_cap, dtype=np.int64)
+    cable_gbps, bits = np.array(rated, dtype=np.float64).reshape(-1, 2).T
+    size = np.array(sizes, dtype=np.float64).reshape(-1, 4)     # w, h, fps, rate assumed
+    assumed = size[:, 3] > 0
+    pixel_rate = size[:, 0] * size[:, 1] * size[:, 2]
+    required = pixel_rate * bits / 1e9
+    cap_rate = np.append(np.asarray(caps.pixel_rate, dtype=np.float64), np.inf)     # index -1 -> inf
+    conn_limit = np.minimum(cap_rate[from_cap], cap_rate[to_cap])
+    over_cable = required > cable_gbps + 1e-9
+    over_connector = pixel_rate > conn_limit * (1 + 1e-9)
+    carries = np.array([str(r[4]).strip().lower() in AUDIO_CARRIERS for r in caps.rows] + [False])
+    no_audio = np.array([str(r[4]).strip().lower() == "no" for r in caps.rows] + [False])
+    audio_dropped = carries[from_cap] & no_audio[to_cap]
+    unrated = np.isnan(cable_gbps) & (from_cap < 0) & (to_cap < 0)
+
+    code = np.select([over_cable, over_connector, audio_dropped, np.isnan(required), unrated],
+                     [0, 1, 2, 3, 4], default=5)
+    status = [STATUSES[c] for c in code.tolist()]
+    return Budget(connections, from_port, to_port, cables, cable_gbps, fmts, assumed, required,
+                  pixel_rate, from_cap, to_cap, status)
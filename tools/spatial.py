@@ -0,0 +1,102 @@
+"""
+Uniform-Grid Spatial Index
+Axis-aligned rectangles bucketed into square cells, so point / rectangle /
+segment queries only look at the rectangles near them instead of all of them.
+
+    grid = SpatialGrid(cell=64)
+    grid.insert(0, x0, y0, x1, y1)
+    grid.hit(x, y)                    # any rectangle containing the point?
+    grid.query(x0, y0, x1, y1)        # ids of rectangles overlapping a box
+    grid.segment(x0, y0, x1, y1)      # ids of rectangles an axis-aligned or diagonal segment crosses
+
+Pick `cell` near the typical rectangle size: each rectangle then lands in a
+handful of buckets and each query touches a handful of buckets.
+"""
+
+from math import floor
+
+
+class SpatialGrid:
+    __slots__ = ("cell", "buckets", "rects")
+
+    def __init__(self, cell=64.0):
+        self.cell = float(cell)
+        self.buckets = {}   # (cx, cy) -> [id, ...]
+        self.rects = {}     # id -> (x0, y0, x1, y1)
+
+    def _range(self, lo, hi):
+        c = self.cell
+        return range(floor(lo / c), floor(hi / c) + 1)
+
+    def insert(self, rid, x0, y0, x1, y1):
+        if x1 < x0:
+            x0, x1 = x1, x0
+        if y1 < y0:
+            y0, y1 = y1, y0
+        self.rects[rid] = (x0, y0, x1, y1)
+        buckets = self.buckets
+        for cx in self._range(x0, x1):
+            for cy in self._range(y0, y1):
+                buckets.setdefault((cx, cy), []).append(rid)
+
+    def __len__(self):
+        return len(self.rects)
+
+    def candidates(self, x0, y0, x1, y1):
+        """Ids in the buckets a box touches (may include rectangles that do not overlap it)."""
+        found = set()
+        buckets = self.buckets
+        for cx in self._range(x0, x1):
+            for cy in self._range(y0, y1):
+                ids = buckets.get((cx, cy))
+                if ids:
+                    found.update(ids)
+        return found
+
+    def hit(self, x, y, exclude=()):
+        """True if a rectangle strictly contains the point."""
+        c = self.cell
+        for rid in self.buckets.get((floor(x / c), floor(y / c)), ()):
+            if rid in exclude:
+                continue
+            x0, y0, x1, y1 = self.rects[rid]
+            if x0 < x < x1 and y0 < y < y1:
+                return True
+        return False
+
+    def query(self, x0, y0, x1, y1):
+        """Ids of rectangles with a positive-area overlap with the box."""
+        if x1 < x0:
+            x0, x1 = x1, x0
+        if y1 < y0:
+            y0, y1 = y1, y0
+        rects = self.rects
+        out = []
+        for rid in self.candidates(x0, y0, x1, y1):
+            a0, b0, a1, b1 = rects[rid]
+            if a0 < x1 and x0 < a1 and b0 < y1 and y0 < b1:
+                out.append(rid)
+        return out
+
+    def segment(self, x0, y0, x1, y1):
+        """Ids of rectangles whose interior the segment passes through (Liang-Barsky clip)."""
+        rects = self.rects
+        out = []
+        dx, dy = x1 - x0, y1 - y0
+        for rid in self.candidates(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)):
+            a0, b0, a1, b1 = rects[rid]
+            t0, t1 = 0.0, 1.0
+            for p, q in ((-dx, x0 - a0), (dx, a1 - x0), (-dy, y0 - b0), (dy, b1 - y0)):
+                if p == 0:
+                    if q <= 0:
+                        break
+                    continue
+                t = q / p
+                if p < 0:
+                    t0 = max(t0, t)
+                else:
+                    t1 = min(t1, t)
+            else:
+                if t0 < t1:
+                    out.append(rid)
+        return out
@@ -0,0 +1,74 @@
+"""
+Startup Budget Check
+Regression check for `python -m tools --help`:
+- wall-clock time (best of N runs) must stay under the budget
+- `-X importtime` must not show any heavy dependency being imported
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Modules that must only ever be imported inside a chosen subcommand
+HEAVY_MODULES = ("openpyxl", "win32com", "pythoncom", "numpy", "PIL", "sqlite3")
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into [(module, depth, self_us, cumulative_us)]."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # Nesting is shown as two spaces per level after the separator's own space
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def measure(argv, runs, cwd):
+    """Best wall-clock time in ms of running `python <argv>` `runs` times."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *argv], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       cwd=cwd, check=True)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def check_startup(budget_ms=50.0, runs=7, cwd=REPO_ROOT):
+    argv = ["-m", "tools", "--help"]
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        capture_output=True, text=True, cwd=cwd, check=True,
+    )
+    entries = parse_importtime(result.stderr)
+    heavy = sorted({name for name, _, _, _ in entries if name.split(".")[0] in HEAVY_MODULES})
+    top_level = sorted((e for e in entries if e[1] == 0), key=lambda e: -e[3])
+
+    best_ms = measure(argv, runs, cwd)
+
+    print(f"`python -m tools --help`: best of {runs} = {best_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    print(f"Imports: {len(entries)} modules; slowest top-level:")
+    for name, _, _, cumulative in top_level[:5]:
+        print(f"  {cumulative / 1000:7.2f} ms  {name}")
+
+    ok = True
+    if heavy:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(heavy)}")
+        ok = False
+    if best_ms > budget_ms:
+        print(f"FAIL: startup {best_ms:.1f} ms exceeds budget {budget_ms:.0f} ms")
+        ok = False
+    if ok:
+        print("OK")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(check_startup())
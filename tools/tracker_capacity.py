@@ -0,0 +1,163 @@
+"""
+Weekly Capacity for the Project Tracker
+Spreads each task's estimated hours evenly over the days from its project's
+Start Date to its Due Date, then totals them per person per week:
+- CapacityCollector taps the task stream while the Tasks sheet is written and
+  keeps five packed numbers per task (person, project, est, actual, due day)
+- compute_capacity() turns every task into two entries of a per-person daily
+  difference array (+rate on the first day, -rate after the last), so one
+  bincount + cumsum gives the daily load and a reshape gives weeks; work and
+  memory follow people x days, never tasks x weeks
+- Cost per project is hours times the assignee's Hourly Rate, for estimated and
+  actual hours
+
+Tasks without a due date or estimate are skipped; a task whose project has no
+start (or starts after the due date) lands on its due day. Unassigned hours go
+to an "(Unassigned)" row, tasks on unknown projects to "(No project)".
+"""
+
+import datetime
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: numpy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+DEFAULT_WEEKLY_CAPACITY = 40.0
+UNASSIGNED = "(Unassigned)"
+NO_PROJECT = "(No project)"
+
+
+def day_number(value, cache):
+    """Proleptic ordinal (Monday 0001-01-01 = 1) for a date, datetime or ISO string; 0 if none."""
+    if isinstance(value, datetime.date):
+        return value.toordinal()
+    if not value:
+        return 0
+    n = cache.get(value)
+    if n is None:
+        try:
+            n = datetime.date.fromisoformat(str(value).strip()[:10]).toordinal()
+        except ValueError:
+            n = 0
+        cache[value] = n
+    return n
+
+
+def _hours(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class CapacityCollector:
+    """Keeps what the capacity stage needs from each task row as it streams past."""
+
+    def __init__(self, people, projects):
+        self.people = people
+        self.projects = projects
+        self._person = {row[1]: i for i, row in enumerate(people)}
+        self._project = {row[1]: i for i, row in enumerate(projects)}
+        self._dates = {}
+        self.person = array("i")
+        self.project = array("i")
+        self.est = array("d")
+        self.actual = array("d")
+        self.due = array("i")
+
+    def tap(self, tasks):
+        """Yield task rows unchanged, recording each one."""
+        for row in tasks:
+            self.add(row)
+            yield row
+
+    def add(self, row):
+        self.person.append(self._person.get(row[3], len(self.people)))
+        self.project.append(self._project.get(row[2], len(self.projects)))
+        self.est.append(_hours(row[6]))
+        self.actual.append(_hours(row[7]))
+        self.due.append(day_number(row[8], self._dates))
+
+
+class Capacity:
+    """
+    weeks: Monday of each week (datetime.date). load: (people + 1, weeks) hours,
+    last row unassigned. project_* arrays have one extra entry for unknown projects.
+    """
+
+    def __init__(self, names, weeks, load, weekly_capacity, project_names, project_budget,
+                 est_hours, est_cost, actual_hours, actual_cost):
+        self.names = names
+        self.weeks = weeks
+        self.load = load
+        self.weekly_capacity = weekly_capacity
+        self.project_names = project_names
+        self.project_budget = project_budget
+        self.est_hours = est_hours
+        self.est_cost = est_cost
+        self.actual_hours = actual_hours
+        self.actual_cost = actual_cost
+
+    @property
+    def over(self):
+        """Weeks over capacity per person."""
+        return (self.load > self.weekly_capacity + 1e-9).sum(1)
+
+
+def task_windows(collector):
+    """
+    (start, due) day numbers per task: project start .. task due, or the due day
+    alone when the project has no usable start. 0 where a task has no due date.
+    """
+    dates = {}
+    project_start = np.array([day_number(row[3], dates) for row in collector.projects] + [0], dtype=np.int64)
+    project = np.frombuffer(collector.project, dtype=np.int32)
+    due = np.frombuffer(collector.due, dtype=np.int32).astype(np.int64)
+    start = project_start[project]
+    return np.where((start > 0) & (start <= due), start, due), due
+
+
+def compute_capacity(collector, weekly_capacity=DEFAULT_WEEKLY_CAPACITY):
+    people, projects = collector.people, collector.projects
+    n_people = len(people) + 1
+    person = np.frombuffer(collector.person, dtype=np.int32).astype(np.int64)
+    project = np.frombuffer(collector.project, dtype=np.int32).astype(np.int64)
+    est = np.frombuffer(collector.est, dtype=np.float64)
+    actual = np.frombuffer(collector.actual, dtype=np.float64)
+
+    # Cost per project: hours x assignee rate (unassigned hours cost nothing)
+    rate = np.array([_hours(row[4]) for row in people] + [0.0])
+    n_projects = len(projects) + 1
+    est_cost = np.bincount(project, est * rate[person], minlength=n_projects)
+    actual_cost = np.bincount(project, actual * rate[person], minlength=n_projects)
+    est_hours = np.bincount(project, est, minlength=n_projects)
+    actual_hours = np.bincount(project, actual, minlength=n_projects)
+
+    # Spread window: project start .. task due
+    start, due = task_windows(collector)
+    keep = (due > 0) & (est > 0)
+    weeks, load = [], np.zeros((n_people, 0))
+    if keep.any():
+        person, start, due, est = person[keep], start[keep], due[keep], est[keep]
+        d0 = (start.min() - 1) // 7 * 7 + 1             # Monday on or before the first start
+        n_days = -(-(due.max() - d0 + 1) // 7) * 7      # whole weeks
+        per_day = est / (due - start + 1)
+        stride = n_days + 1
+        diff = (np.bincount(person * stride + (start - d0), per_day, minlength=n_people * stride)
+                - np.bincount(person * stride + (due - d0 + 1), per_day, minlength=n_people * stride))
+        daily = np.cumsum(diff.reshape(n_people, stride)[:, :n_days], axis=1)
+        load = np.round(daily.reshape(n_people, n_days // 7, 7).sum(2), 2)
+        load[np.abs(load) < 0.005] = 0.0
+        weeks = [datetime.date.fromordinal(int(d0) + 7 * k) for k in range(n_days // 7)]
+
+    return Capacity(
+        [row[1] for row in people] + [UNASSIGNED], weeks, load, weekly_capacity,
+        [row[1] for row in projects] + [NO_PROJECT], [row[5] for row in projects] + [None],
+        est_hours, est_cost, actual_hours, actual_cost,
+    )
@@ -0,0 +1,281 @@
+"""
+Project Tracker Importer
+Streams People / Projects / Tasks from CSV or JSON Lines into create_project_tracker:
+- People and projects are read first and indexed by ID and by name (the build
+  side of a hash join); tasks then stream past and resolve their project and
+  assignee with one dict lookup each, written as they are read
+- Dangling references (a task naming an unknown person or project) and
+  duplicates (two people or projects with the same name or ID, two tasks with
+  the same TaskID) are reported per key, with a count and the first line they
+  appear on
+- People and projects without an ID get one derived from their name, so IDs
+  stay the same across re-imports whatever the row order; tasks without an ID
+  are numbered in file order as "T-<n>", skipping any TaskID already taken
+
+Headers match the tracker's columns case- and space-insensitively ("Task Name",
+"task_name"), plus short forms such as "name", "due", "rate" and "depends".
+Memory grows with the distinct people, projects and bad keys, plus one key per
+TaskID; task rows themselves are not kept.
+
+    python -m tools tracker-import --people people.csv --projects projects.csv --tasks tasks.jsonl
+"""
+
+import csv
+import hashlib
+import json
+import os
+import re
+
+from tools.create_project_tracker import (
+    PEOPLE_HEADERS, PROJECT_HEADERS, TASK_HEADERS, create_project_tracker,
+)
+from tools.tracker_capacity import DEFAULT_WEEKLY_CAPACITY
+from tools.tracker_schedule import task_key
+
+# normalized header -> column index in the tracker's row layout
+PEOPLE_FIELDS = {"personid": 0, "id": 0, "name": 1, "role": 2, "email": 3, "hourlyrate": 4, "rate": 4}
+PROJECT_FIELDS = {
+    "projectid": 0, "id": 0, "projectname": 1, "name": 1, "project": 1, "client": 2,
+    "startdate": 3, "start": 3, "enddate": 4, "end": 4, "budget": 5,
+}
+TASK_FIELDS = {
+    "taskid": 0, "id": 0, "taskname": 1, "name": 1, "task": 1, "project": 2, "projectid": 2,
+    "projectname": 2, "assignee": 3, "person": 3, "personid": 3, "status": 4, "priority": 5,
+    "hoursest": 6, "hoursestimate": 6, "estimate": 6, "hoursactual": 7, "actual": 7,
+    "duedate": 8, "due": 8, "dependson": 9, "depends": 9, "dependencies": 9, "predecessors": 9,
+}
+PEOPLE_NUMERIC = (4,)
+PROJECT_NUMERIC = (5,)
+TASK_NUMERIC = (6, 7)
+
+_HEADER_RE = re.compile(r"[^a-z0-9]")
+
+
+def _header(name):
+    return _HEADER_RE.sub("", str(name).lower())
+
+
+def ref_key(value):
+    """Join key for a name or ID: case-folded, whitespace collapsed."""
+    return " ".join(str(value).split()).casefold() if value is not None else ""
+
+
+def stable_id(prefix, name):
+    return f"{prefix}-{hashlib.blake2b(ref_key(name).encode('utf-8'), digest_size=4).hexdigest()}"
+
+
+def _number(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    text = str(value).strip().replace(",", "")
+    if not text:
+        return None
+    try:
+        num = float(text)
+    except ValueError:
+        return value
+    return int(num) if num.is_integer() else num
+
+
+# ===== READING =====
+def iter_records(path):
+    """(line number, dict) per record of a CSV, JSON Lines or JSON-array file."""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if ext == ".csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+            return
+        if ext == ".json":
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            f.seek(0)
+            if first == "[":
+                # A JSON array has to be parsed whole; JSON Lines streams
+                for i, record in enumerate(json.load(f), 1):
+                    yield i, record
+                return
+        for line_no, line in enumerate(f, 1):
+            if line.strip():
+                yield line_no, json.loads(line)
+
+
+def to_row(record, fields, width, numeric=()):
+    """A record dict as a tracker row; unknown keys are ignored."""
+    if not isinstance(record, dict):
+        raise ValueError(f"Expected an object per record, got {type(record).__name__}")
+    row = [None] * width
+    for key, value in record.items():
+        idx = fields.get(_header(key))
+        if idx is not None and row[idx] in (None, ""):
+            row[idx] = value
+    for idx in numeric:
+        row[idx] = _number(row[idx])
+    return row
+
+
+# ===== JOIN =====
+class RefIndex:
+    """One referenced table (people or projects): rows kept, indexed by ID and by name."""
+
+    def __init__(self, table, id_prefix):
+        self.table = table
+        self.id_prefix = id_prefix
+        self.rows = []
+        self.by_id = {}
+        self.by_name = {}
+        self.lines = []        # source line of each kept row
+        self.duplicates = {}   # (field, key) -> [value, count, first line, line kept]
+        self.unnamed = [0, None]   # rows skipped for a blank name: [count, first line]
+
+    def add(self, row, line):
+        name = ref_key(row[1])
+        if not name:
+            self.unnamed[0] += 1
+            self.unnamed[1] = self.unnamed[1] or line
+            return
+        if row[0] in (None, ""):
+            row[0] = stable_id(self.id_prefix, row[1])
+        rid = ref_key(row[0])
+        for field, key, index in (("name", name, self.by_name), ("id", rid, self.by_id)):
+            if key in index:
+                self._duplicate(field, row[0] if field == "id" else row[1], line, self.lines[index[key]])
+                return
+        n = len(self.rows)
+        self.rows.append(row)
+        self.lines.append(line)
+        self.by_name[name] = n
+        self.by_id[rid] = n
+
+    def _duplicate(self, field, value, line, kept):
+        entry = self.duplicates.get((field, ref_key(value)))
+        if entry is None:
+            self.duplicates[(field, ref_key(value))] = [value, 1, line, kept]
+        else:
+            entry[1] += 1
+
+    def resolve(self, value):
+        """Row for a name or ID, or None."""
+        key = ref_key(value)
+        n = self.by_name.get(key)
+        if n is None:
+            n = self.by_id.get(key)
+        return None if n is None else self.rows[n]
+
+
+class TrackerImport:
+    def __init__(self):
+        self.people = RefIndex("people", "P")
+        self.projects = RefIndex("projects", "PRJ")
+        self.dangling = {}     # (field, key) -> [value, count, first line]
+        self.task_count = 0
+        self.task_lines = {}   # task key -> line of the first task with that TaskID
+        self.task_duplicates = {}   # task key -> [value, count, first line, line kept]
+
+    def load_people(self, path):
+        for line, record in iter_records(path):
+            self.people.add(to_row(record, PEOPLE_FIELDS, len(PEOPLE_HEADERS), PEOPLE_NUMERIC), line)
+
+    def load_projects(self, path):
+        for line, record in iter_records(path):
+            self.projects.add(to_row(record, PROJECT_FIELDS, len(PROJECT_HEADERS), PROJECT_NUMERIC), line)
+
+    def tasks(self, path):
+        """Task rows with project / assignee resolved to canonical names. Read once, as consumed."""
+        refs = ((2, "project", self.projects), (3, "assignee", self.people))
+        for line, record in iter_records(path):
+            row = to_row(record, TASK_FIELDS, len(TASK_HEADERS), TASK_NUMERIC)
+            self.task_count += 1
+            if row[0] in (None, ""):
+                row[0] = self.auto_task_id()
+            key = task_key(row[0])
+            kept = self.task_lines.get(key)
+            if kept is None:
+                self.task_lines[key] = line
+            elif key in self.task_duplicates:
+                self.task_duplicates[key][1] += 1
+            else:
+                self.task_duplicates[key] = [row[0], 1, line, kept]
+            for idx, field, index in refs:
+                value = row[idx]
+                if value in (None, ""):
+                    continue
+                target = index.resolve(value)
+                if target is not None:
+                    row[idx] = target[1]
+                    continue
+                key = (field, ref_key(value))
+                entry = self.dangling.get(key)
+                if entry is None:
+                    self.dangling[key] = [value, 1, line]
+                else:
+                    entry[1] += 1
+            yield row
+
+    def auto_task_id(self):
+        """ "T-<task number>", or the next free number when an explicit TaskID has it."""
+        n = self.task_count
+        while task_key(f"T-{n}") in self.task_lines:
+            n += 1
+        return f"T-{n}"
+
+    def report(self):
+        dangling = [
+            {"table": "tasks", "field": field, "value": value, "count": count, "first_line": line}
+            for (field, _key), (value, count, line) in self.dangling.items()
+        ]
+        duplicates = [
+            {"table": index.table, "field": field, "value": value, "count": count,
+             "first_line": line, "kept_line": kept}
+            for index in (self.people, self.projects)
+            for (field, _key), (value, count, line, kept) in index.duplicates.items()
+        ] + [
+            {"table": "tasks", "field": "id", "value": value, "count": count, "first_line": line, "kept_line": kept}
+            for value, count, line, kept in self.task_duplicates.values()
+        ]
+        unnamed = [
+            {"table": index.table, "count": index.unnamed[0], "first_line": index.unnamed[1]}
+            for index in (self.people, self.projects) if index.unnamed[0]
+        ]
+        return {
+            "people": len(self.people.rows),
+            "projects": len(self.projects.rows),
+            "tasks": self.task_count,
+            "dangling": sorted(dangling, key=lambda d: -d["count"]),
+            "duplicates": duplicates,
+            "unnamed": unnamed,
+        }
+
+
+def import_tracker(tasks_path, people_path=None, projects_path=None, output_path=None, report_path=None,
+                   weekly_capacity=DEFAULT_WEEKLY_CAPACITY):
+    """Build the tracker workbook from files. Returns the reference report."""
+    imp = TrackerImport()
+    if people_path:
+        imp.load_people(people_path)
+    if projects_path:
+        imp.load_projects(projects_path)
+    create_project_tracker(output_path, people=imp.people.rows, projects=imp.projects.rows,
+                           tasks=imp.tasks(tasks_path), weekly_capacity=weekly_capacity)
+    report = imp.report()
+
+    print(f"Imported {report['people']} people, {report['projects']} projects, {report['tasks']} tasks")
+    for d in report["dangling"][:20]:
+        print(f"  dangling {d['field']} {d['value']!r}: {d['count']} tasks (first at line {d['first_line']})")
+    for d in report["duplicates"][:20]:
+        # Duplicate tasks are still imported; dependencies resolve to the kept one
+        fate = "rows imported" if d["table"] == "tasks" else "rows skipped"
+        print(f"  duplicate {d['table']} {d['field']} {d['value']!r}: {d['count']} {fate} "
+              f"(first at line {d['first_line']}, kept line {d['kept_line']})")
+    for d in report["unnamed"]:
+        print(f"  {d['count']} {d['table']} rows without a name skipped (first at line {d['first_line']})")
+    hidden = max(0, len(report["dangling"]) - 20) + max(0, len(report["duplicates"]) - 20)
+    if hidden:
+        print(f"  ... {hidden} more (see --report)")
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Import report created: {report_path}")
+    return report
@@ -0,0 +1,423 @@
+"""
+Dependency Scheduling for the Project Tracker
+Critical path method over the Tasks sheet's "Depends On" column:
+- Depends On lists the TaskIDs a task waits for ("3, 7; 12"); a JSON list works too
+- DependencyCollector taps the task stream like CapacityCollector and keeps the
+  TaskID and the raw dependency keys; edges are resolved once the stream ends,
+  so a task may depend on one listed after it
+- critical_path() is Kahn's topological sort with the forward pass folded in,
+  then one backward pass in reverse order: O(tasks + dependencies) over a CSR
+  adjacency (numpy argsort). Both passes take one topological level at a time as
+  array operations; narrow levels (long chains) fall back to list loops
+- Duration is Hours Est. / 8 h per calendar day, rounded up; no estimate is a
+  milestone. A task starts no earlier than its project's Start Date and should
+  finish by its Due Date; slack = late start - early start, and slack <= 0 is
+  critical (below 0 the task is already behind its due date or a successor's)
+- Tasks on a dependency cycle (or downstream of one) cannot be scheduled: they
+  are reported with one cycle spelled out, never silently dropped
+- add_critical_path_sheet() writes the results as plain values (not formulas):
+  the driving chain first, then every task by slack
+
+    deps = DependencyCollector()
+    rows = deps.tap(collector.tap(tasks))       # while the Tasks sheet is written
+    add_critical_path_sheet(wb, collector, deps)
+"""
+
+import datetime
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: numpy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import CellIsRule
+from openpyxl.styles import Border, Font, PatternFill, Side
+
+from tools.tracker_capacity import day_number
+
+HOURS_PER_DAY = 8.0
+DEPENDS_COLUMN = 9      # "Depends On" in TASK_HEADERS
+NO_DEADLINE = np.iinfo(np.int64).max // 4
+# critical_path(): topological levels narrower than this run as list loops, and a
+# run of list loops goes back to array operations at a level this wide
+NARROW_LEVEL = 256
+WIDE_LEVEL = 4096
+
+HEADERS = ["Chain", "TaskID", "Task Name", "Assignee", "Status", "Days", "Early Start", "Early Finish",
+           "Late Start", "Late Finish", "Slack", "Critical", "Driven By"]
+HEADER_ROW = 5
+
+
+def task_key(value):
+    """Join key for a TaskID: 3, 3.0 and " 3 " are the same task."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip().casefold() if value is not None else ""
+
+
+def parse_depends(value):
+    """Dependency keys from a Depends On cell: "3, 7; 12", a number, or a list."""
+    if value is None or value == "":
+        return []
+    if isinstance(value, (list, tuple)):
+        return [k for v in value for k in parse_depends(v)]
+    if isinstance(value, (int, float)):
+        return [task_key(value)]
+    return [task_key(v) for v in str(value).replace(";", ",").split(",") if v.strip()]
+
+
+def depends_text(value):
+    """A Depends On value as it is written to the sheet."""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    return value
+
+
+class DependencyCollector:
+    """Keeps each task's TaskID and dependency keys as the task stream goes past."""
+
+    def __init__(self):
+        self.ids = []               # TaskID as written, per task
+        self.index = {}             # task key -> first task with that ID
+        self.duplicates = 0
+        self.edge_task = array("i")     # dependent task
+        self.edge_key = []              # key of the task it waits for
+
+    def tap(self, tasks):
+        """Yield task rows, Depends On flattened to text, recording each one."""
+        for row in tasks:
+            if len(row) > DEPENDS_COLUMN and isinstance(row[DEPENDS_COLUMN], (list, tuple)):
+                row = list(row)
+                row[DEPENDS_COLUMN] = depends_text(row[DEPENDS_COLUMN])
+            self.add(row)
+            yield row
+
+    def add(self, row):
+        n = len(self.ids)
+        self.ids.append(row[0])
+        key = task_key(row[0])
+        if key in self.index:
+            self.duplicates += 1
+        else:
+            self.index[key] = n
+        if len(row) > DEPENDS_COLUMN:
+            for dep in parse_depends(row[DEPENDS_COLUMN]):
+                self.edge_task.append(n)
+                self.edge_key.append(dep)
+
+    def edges(self):
+        """(pred, succ) int64 arrays and the unknown keys {key: dependent count}."""
+        index = self.index
+        pred = array("i")
+        succ = array("i")
+        unknown = {}
+        for task, key in zip(self.edge_task, self.edge_key):
+            p = index.get(key)
+            if p is None:
+                unknown[key] = unknown.get(key, 0) + 1
+            else:
+                pred.append(p)
+                succ.append(task)
+        return (np.frombuffer(pred, dtype=np.int32).astype(np.int64),
+                np.frombuffer(succ, dtype=np.int32).astype(np.int64), unknown)
+
+
+class Schedule:
+    """
+    Day numbers per task (exclusive finish: a task runs es .. ef - 1). es is 0 for
+    tasks that could not be scheduled (cycle). chain: task indexes of the driving
+    chain, first to last. cycle: one dependency cycle as task indexes, or [].
+    """
+
+    def __init__(self, duration, es, ef, ls, lf, driver, scheduled, chain, cycle, unknown, duplicates):
+        self.duration = duration
+        self.es = es
+        self.ef = ef
+        self.ls = ls
+        self.lf = lf
+        self.driver = driver
+        self.scheduled = scheduled
+        self.chain = chain
+        self.cycle = cycle
+        self.unknown = unknown
+        self.duplicates = duplicates
+
+    @property
+    def slack(self):
+        return self.ls - self.es
+
+    @property
+    def critical(self):
+        return self.scheduled & (self.slack <= 0)
+
+    @property
+    def finish(self):
+        """Last early finish (exclusive day number), or 0."""
+        return int(self.ef[self.scheduled].max(initial=0))
+
+
+def _csr(n, keys, values):
+    """Offsets and values of a key -> values adjacency (int64 arrays)."""
+    order = np.argsort(keys, kind="stable")
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n), out=offsets[1:])
+    return offsets, values[order]
+
+
+def _find_cycle(blocked, pred_offsets, preds):
+    """One cycle among blocked tasks: walk predecessors inside the blocked set until one repeats."""
+    seen = {}
+    path = []
+    u = next(iter(blocked))
+    while u not in seen:
+        seen[u] = len(path)
+        path.append(u)
+        u = next(p for p in preds[pred_offsets[u]:pred_offsets[u + 1]] if p in blocked)
+    return path[seen[u]:][::-1]
+
+
+def _level_edges(level, offsets, succs):
+    """Out-edge counts per task of a level and the edge targets, grouped by source in level order."""
+    starts = offsets[level]
+    counts = offsets[level + 1] - starts
+    first = np.cumsum(counts) - counts
+    edges = np.arange(int(counts.sum()), dtype=np.int64) + np.repeat(starts - first, counts)
+    return counts, succs[edges]
+
+
+def critical_path(duration, release, deadline, pred, succ):
+    """
+    CPM over n tasks. duration, release (earliest start) and deadline (exclusive
+    latest finish, NO_DEADLINE if none) are int64 arrays; pred / succ are the
+    edges (pred must finish before succ starts). Returns
+    (es, ef, ls, lf, driver, scheduled, cycle).
+    """
+    n = len(duration)
+    succ_offsets, succs = _csr(n, pred, succ)
+    indegree = np.bincount(succ, minlength=n)
+    es = release.astype(np.int64, copy=True)
+    lists = None    # offsets, targets and durations as lists, for the list loops
+
+    # Kahn's sort with the forward pass folded in, one level of ready tasks at a
+    # time: their early starts are final, so the whole level is taken at once with
+    # array operations. Narrow levels (long chains) are cheaper as a list loop, so
+    # runs switch between the two with some hysteresis.
+    runs = []       # (True, [(level, out counts, targets)]) or (False, [tasks in queue order])
+    level = np.flatnonzero(indegree == 0)
+    while len(level):
+        if len(level) >= NARROW_LEVEL:
+            run = []
+            while len(level) >= NARROW_LEVEL:
+                counts, targets = _level_edges(level, succ_offsets, succs)
+                run.append((level, counts, targets))
+                sources = np.repeat(level, counts)
+                np.maximum.at(es, targets, es[sources] + duration[sources])
+                np.subtract.at(indegree, targets, 1)
+                level = np.unique(targets[indegree[targets] == 0])
+            runs.append((True, run))
+        else:
+            lists = lists or (succ_offsets.tolist(), succs.tolist(), duration.tolist())
+            offsets, succ_list, dur = lists
+            es_l, indegree_l = es.tolist(), indegree.tolist()
+            # Plain Kahn queue; every queued task is ready, so a long enough queue is a level
+            run = level.tolist()
+            for taken, u in enumerate(run, 1):      # sees the tasks appended while it runs
+                ef_u = es_l[u] + dur[u]
+                for v in succ_list[offsets[u]:offsets[u + 1]]:
+                    if ef_u > es_l[v]:
+                        es_l[v] = ef_u
+                    indegree_l[v] -= 1
+                    if not indegree_l[v]:
+                        run.append(v)
+                if len(run) - taken >= WIDE_LEVEL:
+                    break
+            level = np.array(run[taken:], dtype=np.int64)
+            del run[taken:]
+            runs.append((False, run))
+            es, indegree = np.array(es_l, dtype=np.int64), np.array(indegree_l, dtype=np.int64)
+
+    order = np.concatenate([np.concatenate([lv for lv, _c, _t in run]) if wide else np.array(run, dtype=np.int64)
+                            for wide, run in runs] or [np.zeros(0, dtype=np.int64)])
+    ef = es + duration
+    scheduled = np.zeros(n, dtype=bool)
+    scheduled[order] = True
+
+    # Driver: of the predecessors whose finish set a task's start (past its release), the first taken
+    position = np.zeros(n, dtype=np.int64)
+    position[order] = np.arange(len(order))
+    drives = scheduled[succ] & (ef[pred] == es[succ]) & (es[succ] > release[succ])
+    first = np.full(n, n, dtype=np.int64)
+    np.minimum.at(first, succ[drives], position[pred[drives]])
+    driver = np.full(n, -1, dtype=np.int64)
+    driven = first < n
+    driver[driven] = order[first[driven]]
+
+    # Backward pass, levels in reverse: late finish is the tighter of the due date
+    # and every successor's late start
+    finish = int(ef[scheduled].max(initial=0))
+    lf = np.where(deadline < NO_DEADLINE, deadline, finish)
+    for wide, run in reversed(runs):
+        if wide:
+            for level, counts, targets in reversed(run):
+                if len(targets):
+                    has = counts > 0
+                    starts = (np.cumsum(counts) - counts)[has]
+                    owners = level[has]
+                    lf[owners] = np.minimum(lf[owners], np.minimum.reduceat(lf[targets] - duration[targets], starts))
+        else:
+            offsets, succ_list, dur = lists
+            lf_l = lf.tolist()
+            for u in reversed(run):
+                lf_u = lf_l[u]
+                for v in succ_list[offsets[u]:offsets[u + 1]]:
+                    ls_v = lf_l[v] - dur[v]
+                    if ls_v < lf_u:
+                        lf_u = ls_v
+                lf_l[u] = lf_u
+            lf = np.array(lf_l, dtype=np.int64)
+    ls = lf - duration
+
+    cycle = []
+    if len(order) < n:
+        # Peel off tasks that only wait on a cycle; every task left has a predecessor left
+        keep = ~scheduled[pred] & ~scheduled[succ]
+        out = np.bincount(pred[keep], minlength=n).tolist()
+        on_cycle = set(np.flatnonzero(~scheduled).tolist())
+        stack = [u for u in on_cycle if not out[u]]
+        pred_offsets, preds = (a.tolist() for a in _csr(n, succ[keep], pred[keep]))
+        while stack:
+            u = stack.pop()
+            on_cycle.discard(u)
+            for p in preds[pred_offsets[u]:pred_offsets[u + 1]]:
+                out[p] -= 1
+                if not out[p]:
+                    stack.append(p)
+        cycle = _find_cycle(on_cycle, pred_offsets, preds)
+        es[~scheduled] = ef[~scheduled] = ls[~scheduled] = lf[~scheduled] = 0
+    return es, ef, ls, lf, driver, scheduled, cycle
+
+
+def compute_schedule(collector, deps, hours_per_day=HOURS_PER_DAY):
+    """Schedule every task. collector: tracker_capacity.CapacityCollector; deps: DependencyCollector."""
+    est = np.frombuffer(collector.est, dtype=np.float64)
+    due = np.frombuffer(collector.due, dtype=np.int32).astype(np.int64)
+    project = np.frombuffer(collector.project, dtype=np.int32)
+    duration = np.ceil(np.maximum(est, 0) / hours_per_day).astype(np.int64)
+
+    # Release: the project's start; tasks without one start with the earliest project
+    dates = {}
+    starts = np.array([day_number(row[3], dates) for row in collector.projects] + [0], dtype=np.int64)
+    known = starts[starts > 0]
+    fallback = int(known.min()) if len(known) else datetime.date.today().toordinal()
+    release = np.where(starts > 0, starts, fallback)[project]
+    deadline = np.where(due > 0, due + 1, NO_DEADLINE)
+
+    pred, succ, unknown = deps.edges()
+    es, ef, ls, lf, driver, scheduled, cycle = critical_path(duration, release, deadline, pred, succ)
+
+    # Driving chain: back from the tightest, latest-finishing task along the predecessors that set each start
+    chain = []
+    if scheduled.any():
+        slack = np.where(scheduled, ls - es, NO_DEADLINE)
+        tightest = np.flatnonzero(slack == slack.min())
+        u = int(tightest[np.argmax(ef[tightest])])
+        while u >= 0:
+            chain.append(u)
+            u = int(driver[u])
+        chain.reverse()
+    return Schedule(duration, es, ef, ls, lf, driver, scheduled, chain, cycle, unknown, deps.duplicates)
+
+
+def add_critical_path_sheet(wb, collector, deps, title="Critical Path", hours_per_day=HOURS_PER_DAY):
+    """Append the schedule sheet to a (write-only) workbook. Returns the Schedule."""
+    sched = compute_schedule(collector, deps, hours_per_day)
+    n = len(sched.duration)
+    ids = deps.ids
+
+    ws = wb.create_sheet(title)
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                         top=Side(style='thin'), bottom=Side(style='thin'))
+
+    def cell(value, font=None, fill=None, number_format=None):
+        c = WriteOnlyCell(ws, value=value)
+        if font:
+            c.font = font
+        if fill:
+            c.fill = fill
+        if number_format:
+            c.number_format = number_format
+        return c
+
+    for col, width in zip("ABCDEFGHIJKLM", [7, 9, 24, 16, 12, 7, 11, 11, 11, 11, 7, 9, 10]):
+        ws.column_dimensions[col].width = width
+    ws.freeze_panes = f"C{HEADER_ROW + 1}"
+
+    def day(n):
+        return datetime.date.fromordinal(n) if n > 0 else None
+
+    finish = sched.finish
+    critical = sched.critical
+    slack = sched.slack
+    ws.append([cell("CRITICAL PATH", Font(bold=True, size=16))])
+    ws.append([cell(f"Durations are Hours Est. / {hours_per_day:g} h per calendar day. Tasks start no earlier "
+                    "than their project and should finish by their due date; slack 0 or less is critical, "
+                    "below 0 is already late.", Font(italic=True, color="808080"))])
+    notes = [f"{n} tasks", f"finish {day(finish - 1) or '-'}", f"{int(critical.sum())} critical",
+             f"{int((slack[sched.scheduled] < 0).sum())} late"]
+    if sched.cycle:
+        notes.append(f"{n - int(sched.scheduled.sum())} unscheduled: cycle "
+                     + " -> ".join(str(ids[t]) for t in sched.cycle + sched.cycle[:1]))
+    if sched.unknown:
+        notes.append(f"{sum(sched.unknown.values())} dependencies on unknown TaskIDs "
+                     f"({', '.join(sorted(sched.unknown)[:5])}{', ...' if len(sched.unknown) > 5 else ''})")
+    if sched.duplicates:
+        notes.append(f"{sched.duplicates} duplicate TaskIDs (first row wins)")
+    ws.append([cell("; ".join(notes), Font(bold=True))])
+    ws.append([])
+    header = [cell(h, header_font, header_fill) for h in HEADERS]
+    for c in header:
+        c.border = thin_border
+    ws.append(header)
+
+    # Driving chain first, then scheduled tasks by slack and start, then the unscheduled
+    position = np.zeros(n, dtype=np.int64)
+    position[sched.chain] = np.arange(1, len(sched.chain) + 1)
+    order = np.lexsort((np.arange(n), sched.es, np.where(sched.scheduled, slack, NO_DEADLINE),
+                        np.where(position > 0, position, NO_DEADLINE)))
+    date_style = cell(None, number_format="yyyy-mm-dd")._style
+    bold = Font(bold=True, color="9C0006")
+    dur = sched.duration.tolist()
+    es, ef, ls, lf = sched.es.tolist(), sched.ef.tolist(), sched.ls.tolist(), sched.lf.tolist()
+    driver = sched.driver.tolist()
+    scheduled, crit, slack_l, position = sched.scheduled.tolist(), critical.tolist(), slack.tolist(), position.tolist()
+    for t in order.tolist():
+        r = t + 2   # row on the Tasks sheet
+        row = [position[t] or None, ids[t], f"=Tasks!B{r}", f"=Tasks!D{r}", f"=Tasks!E{r}", dur[t]]
+        if scheduled[t]:
+            dates = [day(es[t]), day(max(ef[t] - 1, es[t])), day(ls[t]), day(max(lf[t] - 1, ls[t]))]
+            for value in dates:
+                c = WriteOnlyCell(ws, value=value)
+                c._style = date_style
+                row.append(c)
+            row += [slack_l[t], cell("Yes", bold) if crit[t] else None,
+                    ids[driver[t]] if driver[t] >= 0 else None]
+        else:
+            row += [None, None, None, None, None, cell("Cycle", bold), None]
+        ws.append(row)
+
+    last = HEADER_ROW + max(n, 1)
+    ws.conditional_formatting.add(
+        f"K{HEADER_ROW + 1}:K{last}",
+        CellIsRule(operator='lessThan', formula=['0'], font=Font(bold=True, color="9C0006"),
+                   fill=PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")))
+    ws.conditional_formatting.add(
+        f"K{HEADER_ROW + 1}:K{last}",
+        CellIsRule(operator='equal', formula=['0'], fill=PatternFill(start_color="FFEB9C", end_color="FFEB9C",
+                                                                      fill_type="solid")))
+    return sched
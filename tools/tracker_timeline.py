@@ -0,0 +1,181 @@
+"""
+Timeline (Gantt) Sheet for the Project Tracker
+One row per project followed by its tasks, against a grid of date buckets:
+- Buckets are days, weeks or months, picked from the span between the first
+  and last date so the grid stays a few dozen to a few hundred columns wide
+- Bars are not painted cell by cell: a handful of conditional-formatting
+  formulas compare each row's Start / End with the bucket dates in the header,
+  so the grid cells stay empty and file size follows the row count
+- Task rows point at their Tasks sheet row with formulas (name, assignee,
+  status) and carry only their start / end dates, so the task stream is still
+  read once; bars span the same window the Capacity sheet spreads hours over
+
+    add_timeline_sheet(wb, collector)   # collector: tracker_capacity.CapacityCollector
+"""
+
+import datetime
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: numpy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from tools.tracker_capacity import NO_PROJECT, day_number, task_windows
+
+DAY_MAX_SPAN = 92       # up to ~3 months: one column per day
+WEEK_MAX_SPAN = 731     # up to ~2 years: one column per week, then months
+
+# Last day of the bucket whose first day is in the header cell `{c}`
+BUCKET_END = {"day": "{c}", "week": "{c}+6", "month": "EOMONTH({c},0)"}
+BUCKET_FORMAT = {"day": "d", "week": "d mmm", "month": "mmm yy"}
+BUCKET_WIDTH = {"day": 3.5, "week": 5.5, "month": 6.5}
+
+PROJECT_BAR = "305496"
+STATUS_BARS = [
+    ("Completed", "70AD47"),
+    ("In Progress", "4472C4"),
+    ("On Hold", "ED7D31"),
+    ("Cancelled", "D9D9D9"),
+]
+OTHER_BAR = "A5A5A5"    # Not Started and anything else
+TODAY_FILL = "FFF2CC"
+
+HEADERS = ["Project", "Task", "Assignee", "Status", "Start", "End"]
+FIRST_GRID_COL = len(HEADERS) + 1
+HEADER_ROW = 4
+
+
+def timeline_buckets(first, last):
+    """(unit, [bucket start dates]) covering day numbers first..last."""
+    span = last - first + 1
+    lo, hi = datetime.date.fromordinal(first), datetime.date.fromordinal(last)
+    if span <= DAY_MAX_SPAN:
+        return "day", [datetime.date.fromordinal(d) for d in range(first, last + 1)]
+    if span <= WEEK_MAX_SPAN:
+        monday = (first - 1) // 7 * 7 + 1
+        return "week", [datetime.date.fromordinal(d) for d in range(monday, last + 1, 7)]
+    months = []
+    y, m = lo.year, lo.month
+    while (y, m) <= (hi.year, hi.month):
+        months.append(datetime.date(y, m, 1))
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return "month", months
+
+
+def add_timeline_sheet(wb, collector, title="Timeline"):
+    """Append the Gantt sheet to a (write-only) workbook. Returns the sheet, or None with no dated rows."""
+    projects = collector.projects
+    dates = {}
+    start, due = task_windows(collector)
+    project = np.frombuffer(collector.project, dtype=np.int32)
+
+    # Project rows: their own Start / End dates, widened to cover their tasks
+    n_projects = len(projects) + 1
+    p_start = np.array([day_number(row[3], dates) for row in projects] + [0], dtype=np.int64)
+    p_end = np.array([day_number(row[4], dates) for row in projects] + [0], dtype=np.int64)
+    dated = due > 0
+    if dated.any():
+        big = np.iinfo(np.int64).max
+        t_min = np.full(n_projects, big)
+        np.minimum.at(t_min, project[dated], start[dated])
+        t_max = np.zeros(n_projects, dtype=np.int64)
+        np.maximum.at(t_max, project[dated], due[dated])
+        p_start = np.where(p_start > 0, np.minimum(p_start, t_min), np.where(t_min < big, t_min, 0))
+        p_end = np.maximum(p_end, t_max)
+    p_end = np.where((p_end > 0) & (p_end < p_start), p_start, p_end)
+    p_start = np.where((p_start == 0) & (p_end > 0), p_end, p_start)
+
+    days = np.concatenate([p_start[p_start > 0], p_end[p_end > 0], start[dated], due[dated]])
+    if not len(days):
+        return None
+    unit, buckets = timeline_buckets(int(days.min()), int(days.max()))
+
+    ws = wb.create_sheet(title)
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                         top=Side(style='thin'), bottom=Side(style='thin'))
+
+    def cell(value, font=None, fill=None, number_format=None, alignment=None):
+        c = WriteOnlyCell(ws, value=value)
+        if font:
+            c.font = font
+        if fill:
+            c.fill = fill
+        if number_format:
+            c.number_format = number_format
+        if alignment:
+            c.alignment = alignment
+        return c
+
+    for col, width in zip("ABCDEF", [22, 24, 16, 12, 11, 11]):
+        ws.column_dimensions[col].width = width
+    for i in range(len(buckets)):
+        ws.column_dimensions[get_column_letter(FIRST_GRID_COL + i)].width = BUCKET_WIDTH[unit]
+
+    ws.freeze_panes = f"{get_column_letter(FIRST_GRID_COL)}{HEADER_ROW + 1}"   # before the first row in write-only mode
+    ws.append([cell("TIMELINE", Font(bold=True, size=16))])
+    ws.append([cell(f"One column per {unit}, {buckets[0]:%Y-%m-%d} to "
+                    f"{datetime.date.fromordinal(int(days.max())):%Y-%m-%d}. "
+                    "Task bars run from project start to due date.", Font(italic=True, color="808080"))])
+    ws.append([])
+    header = [cell(h, header_font, header_fill) for h in HEADERS]
+    rotate = Alignment(textRotation=90, horizontal="center") if unit != "month" else Alignment(horizontal="center")
+    header += [cell(b, header_font, header_fill, BUCKET_FORMAT[unit], rotate) for b in buckets]
+    for c in header:
+        c.border = thin_border
+    ws.append(header)
+
+    def day(n):
+        return datetime.date.fromordinal(int(n)) if n > 0 else None
+
+    # Projects in sheet order, each followed by its tasks by due date
+    bold = Font(bold=True)
+    date_style = cell(None, number_format="yyyy-mm-dd")._style   # shared by every task row
+    order = np.lexsort((np.where(due > 0, due, np.iinfo(np.int64).max), project))
+    bounds = np.searchsorted(project[order], np.arange(n_projects + 1))
+    rows = 0
+    for p in range(n_projects):
+        tasks = order[bounds[p]:bounds[p + 1]]
+        if p == n_projects - 1 and not len(tasks):
+            continue    # every task matched a project
+        name = projects[p][1] if p < len(projects) else NO_PROJECT
+        ws.append([cell(name, bold), None, None, None,
+                   cell(day(p_start[p]), bold, number_format="yyyy-mm-dd"),
+                   cell(day(p_end[p]), bold, number_format="yyyy-mm-dd")])
+        rows += 1
+        for t in tasks.tolist():
+            r = t + 2   # row on the Tasks sheet
+            a, b = WriteOnlyCell(ws, value=day(start[t])), WriteOnlyCell(ws, value=day(due[t]))
+            a._style = b._style = date_style
+            ws.append([None, f"=Tasks!B{r}", f"=Tasks!D{r}", f"=Tasks!E{r}", a, b])
+            rows += 1
+
+    # Bars: one rule per bar colour over the whole grid
+    first = HEADER_ROW + 1
+    last = HEADER_ROW + max(rows, 1)
+    c0 = get_column_letter(FIRST_GRID_COL)
+    grid = f"{c0}{first}:{get_column_letter(FIRST_GRID_COL + len(buckets) - 1)}{last}"
+    bucket_start = f"{c0}${HEADER_ROW}"
+    bucket_end = BUCKET_END[unit].format(c=bucket_start)
+    overlap = f"$E{first}<={bucket_end},$F{first}>={bucket_start}"
+
+    def bar(condition, color):
+        fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+        ws.conditional_formatting.add(grid, FormulaRule(formula=[f"AND({condition},{overlap})"], fill=fill, stopIfTrue=True))
+
+    bar(f'$B{first}=""', PROJECT_BAR)
+    for status, color in STATUS_BARS:
+        bar(f'$D{first}="{status}"', color)
+    bar("TRUE", OTHER_BAR)
+    today = FormulaRule(formula=[f"AND({bucket_start}<=TODAY(),{bucket_end}>=TODAY())"],
+                        fill=PatternFill(start_color=TODAY_FILL, end_color=TODAY_FILL, fill_type="solid"))
+    ws.conditional_formatting.add(grid, today)
+    return ws
@@ -0,0 +1,332 @@
+"""
+.vsf Project Validator
+Checks structure and types of a project file in one pass, before any generator
+trusts it:
+- settings, nodes (sections a / b / c: cols, rows, hiddenCols), connections and
+  userPresets are type-checked field by field
+- every row is as wide as its section's cols
+- every connection's from / to anchor ("node-<ts>-<section>-<row>", see
+  nexus-x/src/utils/anchorId.js) resolves to an existing node, section and row;
+  wires into SuperNodes (version 2, no sections) must name one of the node's port ids;
+  their inputSection / outputSection / system ports must be arrays of objects
+- problems come back as (JSON path, message), e.g.
+    $.connections[12].to: row 9 out of range (section 'a' of node-1772497005778 has 4 rows)
+
+Node and section objects are walked once; anchors are resolved with dict and
+list lookups, so a file costs about as much to validate as to parse.
+
+    python -m tools validate shows/*.vsf
+"""
+
+import json
+import os
+import time
+
+from tools.vsf import SECTION_IDS
+
+PROJECT_EXTS = (".vsf", ".json", ".sfw")
+
+_NUMBER = (int, float)
+_SETTINGS_TYPES = {
+    "paperSize": str, "orientation": str, "zoom": _NUMBER, "paperEnabled": bool,
+    "customWidth": _NUMBER, "customHeight": _NUMBER, "snapToGrid": bool,
+}
+_NODE_TYPES = {
+    "id": str, "title": str, "model": str, "manufacturer": str, "tag": str, "signalColor": (str, type(None)),
+    "version": int, "scale": _NUMBER, "layout": (str, dict), "sections": dict, "sectionSpacing": dict,
+    "deviceTypes": list, "hiddenSections": list, "mirroredSections": list, "hiddenTitleFields": list,
+    "hiddenSystemFields": list, "position": dict, "inputSection": dict, "outputSection": dict, "system": dict,
+}
+_SECTION_TYPES = {
+    "title": str, "cols": list, "rows": list, "hiddenCols": list, "rowSpacing": list,
+    "collapsed": bool, "cardSize": int, "cardStartSlot": int,
+}
+_CONNECTION_TYPES = {
+    "id": str, "from": str, "to": str, "waypoints": list, "label": str, "enhanced": bool,
+    "cableType": str, "cableLength": str, "length": str, "dashPattern": (str, type(None)),
+    "wireColor": (str, type(None)),
+}
+_TYPE_NAMES = {str: "string", int: "integer", bool: "boolean", list: "array", dict: "object", type(None): "null"}
+
+
+def _key_path(path, key):
+    if key.isidentifier():
+        return f"{path}.{key}"
+    return f"{path}[{json.dumps(key)}]"
+
+
+def _matches(value, expected):
+    # bool is an int subclass, but a flag is never a count or a coordinate
+    if value.__class__ is bool:
+        return expected is bool or (isinstance(expected, tuple) and bool in expected)
+    return isinstance(value, expected)
+
+
+def _is_number(value):
+    return _matches(value, _NUMBER)
+
+
+def _type_name(types):
+    if isinstance(types, tuple):
+        if types == _NUMBER:
+            return "number"
+        return " or ".join(_type_name(t) for t in types)
+    return _TYPE_NAMES.get(types, types.__name__)
+
+
+class Validator:
+    """Collects (path, message) issues for one project document."""
+
+    def __init__(self):
+        self.issues = []
+
+    def error(self, path, message):
+        self.issues.append((path, message))
+
+    def fields(self, obj, types, path):
+        """Type-check the known keys present in obj (unknown keys pass)."""
+        for key, value in obj.items():
+            expected = types.get(key)
+            if expected is None or value.__class__ is expected or _matches(value, expected):
+                continue
+            self.is_type(value, expected, _key_path(path, key))   # path built only for a failure
+
+    def is_type(self, value, expected, path):
+        if _matches(value, expected):
+            return True
+        self.error(path, f"expected {_type_name(expected)}, got {_TYPE_NAMES.get(type(value), type(value).__name__)}")
+        return False
+
+    # ===== PROJECT =====
+    def project(self, data, path="$"):
+        if not self.is_type(data, dict, path):
+            return
+        if isinstance(data.get("pages"), list) and "nodes" not in data:
+            # Legacy `pages` format: the app imports the first page
+            if data["pages"] and self.is_type(data["pages"][0], dict, f"{path}.pages[0]"):
+                self.project_body(data["pages"][0], f"{path}.pages[0]")
+            else:
+                self.error(f"{path}.pages", "no pages")
+            return
+        for key in ("id", "name", "version", "savedAt"):
+            if key in data:
+                self.is_type(data[key], str, f"{path}.{key}")
+        if "settings" in data and self.is_type(data["settings"], dict, f"{path}.settings"):
+            self.fields(data["settings"], _SETTINGS_TYPES, f"{path}.settings")
+            orientation = data["settings"].get("orientation")
+            if isinstance(orientation, str) and orientation not in ("landscape", "portrait"):
+                self.error(f"{path}.settings.orientation", f"unknown orientation {orientation!r}")
+        self.project_body(data, path)
+        if "userPresets" in data:
+            self.user_presets(data["userPresets"], f"{path}.userPresets")
+
+    def project_body(self, data, path):
+        nodes = data.get("nodes")
+        if nodes is None:
+            self.error(f"{path}.nodes", "missing")
+            nodes = {}
+        elif not self.is_type(nodes, dict, f"{path}.nodes"):
+            nodes = {}
+        anchors = {}   # node id -> {section: row count} or, for SuperNodes, a set of port ids
+        for node_id, node in nodes.items():
+            npath = _key_path(f"{path}.nodes", node_id)
+            if not self.is_type(node, dict, npath):
+                continue
+            anchors[node_id] = self.node(node, npath, node_id)
+        connections = data.get("connections", [])
+        if self.is_type(connections, list, f"{path}.connections"):
+            self.connections(connections, anchors, f"{path}.connections")
+
+    # ===== NODES =====
+    def node(self, node, path, node_id=None):
+        self.fields(node, _NODE_TYPES, path)
+        if node_id is not None:
+            if node.get("id", node_id) != node_id:
+                self.error(f"{path}.id", f"{node.get('id')!r} does not match its key {node_id!r}")
+            if node_id.count("-") != 1 or not node_id.startswith("node-"):
+                self.error(path, f"node id {node_id!r} is not \"node-<timestamp>\"; its anchors cannot be resolved")
+        position = node.get("position")
+        if isinstance(position, dict):
+            for axis in ("x", "y"):
+                if not _is_number(position.get(axis)):
+                    self.error(f"{path}.position.{axis}", "expected number")
+        sections = node.get("sections")
+        if isinstance(sections, dict):
+            rows = {}
+            for sec_id, section in sections.items():
+                spath = _key_path(f"{path}.sections", sec_id)
+                if sec_id not in SECTION_IDS:
+                    self.error(spath, f"unknown section {sec_id!r} (expected a, b or c)")
+                    continue
+                if self.is_type(section, dict, spath):
+                    rows[sec_id] = self.section(section, spath)
+            return rows
+        # SuperNode (version 2): wires name port ids
+        port_ids = set()
+        for key in ("inputSection", "outputSection", "system"):
+            part = node.get(key)
+            if not isinstance(part, dict) or part.get("ports") is None:
+                continue
+            ppath = f"{path}.{key}.ports"
+            if not self.is_type(part["ports"], list, ppath):
+                continue
+            for i, port in enumerate(part["ports"]):
+                if not self.is_type(port, dict, f"{ppath}[{i}]"):
+                    continue
+                port_id = port.get("id")
+                if port_id is not None and self.is_type(port_id, (str, int), f"{ppath}[{i}].id"):
+                    port_ids.add(str(port_id))
+        return port_ids
+
+    def section(self, section, path):
+        """Validate one section; returns its row count."""
+        self.fields(section, _SECTION_TYPES, path)
+        cols = section.get("cols")
+        width = None
+        if isinstance(cols, list):
+            width = len(cols)
+            for i, col in enumerate(cols):
+                if not isinstance(col, str):
+                    self.error(f"{path}.cols[{i}]", "expected string")
+        rows = section.get("rows")
+        if rows is None:
+            self.error(f"{path}.rows", "missing")
+            return 0
+        if not isinstance(rows, list):
+            return 0
+        for i, row in enumerate(rows):
+            if row.__class__ is not list:
+                self.error(f"{path}.rows[{i}]", "expected array")
+                continue
+            if width is not None and len(row) != width:
+                self.error(f"{path}.rows[{i}]", f"{len(row)} cells, cols has {width}")
+            for j, cell in enumerate(row):
+                if cell.__class__ is not str and cell is not None and not _is_number(cell):
+                    self.error(f"{path}.rows[{i}][{j}]", "expected string")
+        hidden = section.get("hiddenCols")
+        if isinstance(hidden, list) and width is not None:
+            for i, col in enumerate(hidden):
+                if not _matches(col, int) or not 0 <= col < width:
+                    self.error(f"{path}.hiddenCols[{i}]", f"{col!r} is not a column index (0..{width - 1})")
+        return len(rows)
+
+    # ===== CONNECTIONS =====
+    def connections(self, connections, anchors, path):
+        seen = {}
+        for i, conn in enumerate(connections):
+            cpath = f"{path}[{i}]"
+            if not self.is_type(conn, dict, cpath):
+                continue
+            self.fields(conn, _CONNECTION_TYPES, cpath)
+            cid = conn.get("id")
+            if isinstance(cid, str):
+                if cid in seen:
+                    self.error(f"{cpath}.id", f"duplicate wire id {cid!r} (first at {path}[{seen[cid]}])")
+                else:
+                    seen[cid] = i
+            for end in ("from", "to"):
+                anchor = conn.get(end)
+                if anchor is None:
+                    self.error(f"{cpath}.{end}", "missing")
+                elif isinstance(anchor, str):
+                    message = self.resolve(anchor, anchors)
+                    if message:
+                        self.error(f"{cpath}.{end}", message)
+            waypoints = conn.get("waypoints")
+            for j, point in enumerate(waypoints if isinstance(waypoints, list) else ()):
+                if not isinstance(point, dict) or not (_is_number(point.get("x")) and _is_number(point.get("y"))):
+                    self.error(f"{cpath}.waypoints[{j}]", "expected {x: number, y: number}")
+
+    @staticmethod
+    def resolve(anchor, anchors):
+        """None if the anchor resolves, else what is wrong with it."""
+        parts = anchor.split("-")
+        if len(parts) < 3:
+            return f"malformed anchor id {anchor!r}"
+        node_id = f"{parts[0]}-{parts[1]}"
+        target = anchors.get(node_id)
+        if target is None:
+            return f"node {node_id!r} does not exist"
+        if isinstance(target, set):
+            port_id = "-".join(parts[2:])
+            if not target:
+                return f"node {node_id!r} has no port ids, so no wire can attach to it"
+            if port_id not in target:
+                return f"node {node_id!r} has no port {port_id!r}"
+            return None
+        if len(parts) != 4 or not parts[3].isdigit():
+            return f"malformed anchor id {anchor!r} (expected node-<ts>-<section>-<row>)"
+        sec_id, row = parts[2], int(parts[3])
+        count = target.get(sec_id)
+        if count is None:
+            return f"node {node_id!r} has no section {sec_id!r}"
+        if row >= count:
+            return f"row {row} out of range (section {sec_id!r} of {node_id} has {count} rows)"
+        return None
+
+    # ===== USER PRESETS =====
+    def user_presets(self, presets, path):
+        if not self.is_type(presets, dict, path):
+            return
+        for scope, entries in presets.items():
+            ppath = _key_path(path, scope)
+            if not self.is_type(entries, list, ppath):
+                continue
+            for i, preset in enumerate(entries):
+                if self.is_type(preset, dict, f"{ppath}[{i}]"):
+                    self.node(preset, f"{ppath}[{i}]")
+
+
+def validate_project(data):
+    """[(JSON path, message)] for a parsed project; empty when it is valid."""
+    v = Validator()
+    v.project(data)
+    return v.issues
+
+
+def validate_file(path):
+    """Issues for one file, including a parse error as a single issue at "$"."""
+    try:
+        with open(path, "rb") as f:
+            data = json.loads(f.read())
+    except (OSError, ValueError) as e:
+        return [("$", f"{type(e).__name__}: {e}")]
+    return validate_project(data)
+
+
+def iter_project_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(PROJECT_EXTS) and not name.startswith("."):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def validate_paths(paths, output_path=None, max_shown=20):
+    """Validate files and directories; prints a summary. Returns {path: issues} for invalid files."""
+    start = time.perf_counter()
+    invalid, count = {}, 0
+    for path in iter_project_files(paths):
+        count += 1
+        issues = validate_file(path)
+        if issues:
+            invalid[path] = issues
+            print(f"{path}: {len(issues)} problem{'s' if len(issues) != 1 else ''}")
+            for p, message in issues[:max_shown]:
+                print(f"  {p}: {message}")
+            if len(issues) > max_shown:
+                print(f"  ... {len(issues) - max_shown} more")
+    elapsed = time.perf_counter() - start
+    rate = f", {count / elapsed:.0f} files/s" if elapsed > 0 and count else ""
+    print(f"Validated {count} files: {count - len(invalid)} valid, {len(invalid)} invalid "
+          f"({elapsed:.2f} s{rate})")
+    if output_path:
+        report = {path: [{"path": p, "message": m} for p, m in issues] for path, issues in invalid.items()}
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Validation report created: {output_path}")
+    return invalid
@@ -0,0 +1,278 @@
+"""
+Nexus-X Project Files (.vsf)
+Readers shared by every tool that consumes nexus-x projects:
+- load_project(): parse a .vsf file (native format or legacy `pages` format), or
+  check a revision out of a project journal: "show.journal@14" (tools/vsf_journal.py)
+- normalize_project(): SuperNodes (inputSection/outputSection, "node-<ts>-<port id>"
+  anchors) are rewritten to sections, so every tool reads one node shape
+- project_stem(): output file stem for a project path or revision ref
+- parse_anchor(): "node-<ts>-<section>-<row>" -> (node id, section, row)
+- parse_length_ft(): "25 ft" / "7.5 m" -> feet
+- device_name(): the label a node is known by (tag, then model, then title)
+- signal_color_hex(): signal color id ("red") -> hex ("EF4444") from the app palette
+- signal_palette(): the whole palette, id -> hex
+- to_system(): nodes + connections -> tools.av_model.System
+
+Section "a" rows are inputs, "b" rows are outputs and "c" (SYSTEM) rows can be
+either; a "c" row takes the direction of the wires attached to it.
+"""
+
+import json
+import os
+import re
+
+from tools.av_model import INPUT, OUTPUT, System
+
+SECTION_IDS = ("a", "b", "c")
+SECTION_DIRECTION = {"a": INPUT, "b": OUTPUT}
+
+_JOURNAL_REV_RE = re.compile(r"@(-?\d+)$")
+_LENGTH_RE = re.compile(r"^\s*(\d+(?:\.\d+)?|\.\d+)\s*(ft|feet|'|m|meters?|metres?)?\s*$", re.IGNORECASE)
+_METERS_TO_FEET = 3.28084
+
+# The app's palette is the single source of truth; read it instead of copying it
+SIGNAL_COLORS_JS = os.path.join(os.path.dirname(__file__), '..', 'nexus-x', 'src', 'config', 'signalColors.js')
+DEFAULT_THEME_COLOR = "71717A"
+_signal_colors = None
+
+
+def is_journal_ref(path):
+    """True for a journal directory, with or without an @revision."""
+    return os.path.isdir(_JOURNAL_REV_RE.sub("", str(path)))
+
+
+def load_project(path):
+    if is_journal_ref(path):
+        from tools.vsf_journal import checkout
+        return normalize_project(checkout(path))
+    with open(path, encoding="utf-8") as f:
+        return normalize_project(json.load(f))
+
+
+def project_stem(path):
+    """"shows/show.vsf" -> "show"; "show.journal@14" -> "show_r14"."""
+    m = _JOURNAL_REV_RE.search(str(path))
+    base = os.path.basename(_JOURNAL_REV_RE.sub("", str(path)).rstrip("/\\"))
+    stem = os.path.splitext(base)[0]
+    return f"{stem}_r{m.group(1)}" if m else stem
+
+
+def normalize_project(data):
+    """
+    Native projects pass through; the legacy `pages` format is flattened like the app's importer.
+    SuperNodes are converted to sections and their wires re-anchored to section rows.
+    """
+    if isinstance(data.get("nodes"), dict):
+        data.setdefault("connections", [])
+    elif isinstance(data.get("pages"), list) and data["pages"] and data["pages"][0].get("nodes") is not None:
+        data["nodes"] = data["pages"][0]["nodes"]
+        data["connections"] = data["pages"][0].get("connections") or []
+        del data["pages"]
+    else:
+        raise ValueError("Unrecognized project file format")
+
+    port_anchors = {}   # SuperNode anchor "node-<ts>-<port id>" -> section anchor
+    for node_id, node in data["nodes"].items():
+        if is_supernode(node):
+            for port_id, (sec_id, row) in supernode_to_sections(node).items():
+                port_anchors[f"{node_id}-{port_id}"] = anchor_id(node_id, sec_id, row)
+    if port_anchors:
+        for conn in data["connections"]:
+            for key in ("from", "to"):
+                if conn.get(key) in port_anchors:
+                    conn[key] = port_anchors[conn[key]]
+    return data
+
+
+# ===== SUPERNODES =====
+# SuperNode part -> (section id, default port label prefix)
+_SUPERNODE_PARTS = (("inputSection", "a", "IN"), ("outputSection", "b", "OUT"), ("system", "c", "SYS"))
+# SuperNode columnOrder key -> (section column, port field)
+_SUPERNODE_COLUMNS = {
+    "port": ("PORT", None),
+    "connector": ("CONNECTOR", "connector"),
+    "source": ("SOURCE", "source"),
+    "destination": ("DESTINATION", "destination"),
+    "resolution": ("RESOLUTION", "resolution"),
+    "rate": ("RATE", "refreshRate"),
+}
+_SUPERNODE_ROW_SECTIONS = {"input": "a", "output": "b", "system": "c"}
+_SUPERNODE_ANCHOR_SIDES = {"a": "inputAnchorSide", "b": "outputAnchorSide", "c": "systemAnchorSide"}
+_SUPERNODE_COLLAPSED = {"a": "inputCollapsed", "b": "outputCollapsed", "c": "systemCollapsed"}
+
+
+def is_supernode(node):
+    """A version-2 node: ports live in inputSection / outputSection instead of sections."""
+    return isinstance(node, dict) and "sections" not in node and (
+        isinstance(node.get("inputSection"), dict) or isinstance(node.get("outputSection"), dict))
+
+
+def supernode_to_sections(node):
+    """
+    Rewrite a SuperNode in place to the sections shape (inputs "a", outputs "b", system "c").
+    Returns {port id: (section id, row)} for the ports that carry an id; the app anchors
+    SuperNode wires as "<node id>-<port id>", so ports without one cannot be wired.
+    """
+    layout = node.get("layout") if isinstance(node.get("layout"), dict) else {}
+    sections, port_rows, mirrored = {}, {}, []
+    for key, sec_id, prefix in _SUPERNODE_PARTS:
+        part = node.pop(key, None)
+        if not isinstance(part, dict):
+            continue
+        if key == "system":
+            node.setdefault("manufacturer", part.get("manufacturer") or "")
+            node.setdefault("model", part.get("model") or "")
+        ports = [p for p in part.get("ports") or () if isinstance(p, dict)]
+        if key == "system" and not ports:
+            continue
+        order = [c for c in part.get("columnOrder") or ("port", "connector") if c in _SUPERNODE_COLUMNS]
+        if "port" not in order:
+            order.insert(0, "port")
+        rows = []
+        for ri, port in enumerate(ports):
+            row = []
+            for col in order:
+                field = _SUPERNODE_COLUMNS[col][1]
+                if field is None:
+                    value = port.get("label") or f"{prefix} {port.get('number', ri + 1)}"
+                else:
+                    value = port.get(field)
+                row.append("" if value is None else str(value))
+            rows.append(row)
+            if port.get("id") is not None:
+                port_rows[str(port["id"])] = (sec_id, ri)
+        sections[sec_id] = {
+            "title": part.get("columnName") or "",
+            "cols": [_SUPERNODE_COLUMNS[c][0] for c in order],
+            "rows": rows,
+            "collapsed": bool(layout.get(_SUPERNODE_COLLAPSED[sec_id])),
+        }
+        if layout.get(_SUPERNODE_ANCHOR_SIDES[sec_id]) == "right":
+            mirrored.append(sec_id)
+    node["sections"] = sections
+    if mirrored:
+        node["mirroredSections"] = mirrored
+    rows = layout.get("rows") or ()
+    node["layout"] = "_".join(
+        "".join(_SUPERNODE_ROW_SECTIONS.get(name, "") for name in row) for row in rows if isinstance(row, list)
+    ) or None
+    return port_rows
+
+
+def parse_anchor(anchor_id):
+    """Split an anchor id into (node id, section, row). Node ids are always "node-<ts>"."""
+    parts = anchor_id.split("-")
+    if len(parts) != 4:
+        raise ValueError(f"Malformed anchor id: {anchor_id!r}")
+    return f"{parts[0]}-{parts[1]}", parts[2], int(parts[3])
+
+
+def anchor_id(node_id, section, row):
+    return f"{node_id}-{section}-{row}"
+
+
+def parse_length_ft(text):
+    """Cable length in feet, or None when blank or unparseable."""
+    if not text:
+        return None
+    m = _LENGTH_RE.match(str(text))
+    if not m:
+        return None
+    value = float(m.group(1))
+    unit = (m.group(2) or "ft").lower()
+    return round(value * _METERS_TO_FEET, 2) if unit.startswith("m") else value
+
+
+def device_name(node):
+    return (node.get("tag") or node.get("model") or node.get("title") or node.get("id", "")).strip()
+
+
+def unique_device_name(system, name, seen):
+    """
+    name, or "name (n)" for its n-th use; n counts on past any name already in
+    the system (a node really named "X (2)"). seen: name -> uses so far.
+    """
+    n = seen.get(name, 0)
+    candidate = f"{name} ({n + 1})" if n else name
+    while system.has_device(candidate):
+        n += 1
+        candidate = f"{name} ({n + 1})"
+    seen[name] = n + 1
+    return candidate
+
+
+def signal_palette():
+    """Signal color id -> hex (no '#', upper case), in the app's palette order."""
+    global _signal_colors
+    if _signal_colors is None:
+        try:
+            with open(SIGNAL_COLORS_JS, encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            text = ""
+        _signal_colors = {
+            m.group(1): m.group(2).upper()
+            for m in re.finditer(r"id:\s*'([\w-]+)',\s*hex:\s*'#([0-9a-fA-F]{6})'", text)
+        }
+    return _signal_colors
+
+
+def signal_color_hex(color_id):
+    """Hex (no '#', upper case) for a signal color id; unknown ids get the app's default theme color."""
+    if color_id and re.fullmatch(r"#?[0-9a-fA-F]{6}", color_id):
+        return color_id.lstrip("#").upper()
+    return signal_palette().get(color_id, DEFAULT_THEME_COLOR)
+
+
+def port_column(section):
+    """Index of the PORT column in a section's rows (first column if there is none)."""
+    cols = section.get("cols") or []
+    return cols.index("PORT") if "PORT" in cols else 0
+
+
+def to_system(project):
+    """
+    Build an av_model.System from a project.
+    Device.meta and Route.meta reference the original node / connection dicts.
+    """
+    nodes = project["nodes"]
+    connections = project.get("connections") or []
+
+    # "c" rows take the direction of the wires attached to them
+    c_direction = {}
+    for conn in connections:
+        for key, direction in (("from", OUTPUT), ("to", INPUT)):
+            a = conn.get(key) or ""
+            if "-c-" in a:
+                c_direction.setdefault(a, direction)
+
+    system = System()
+    anchors = {}   # anchor id -> port id
+    seen = {}
+    for node_id, node in nodes.items():
+        name = unique_device_name(system, device_name(node) or node_id, seen)
+        device = system.add_device(name, signal_color_hex(node.get("signalColor")))
+        device.meta = node
+        for sec_id in SECTION_IDS:
+            section = (node.get("sections") or {}).get(sec_id)
+            if not section:
+                continue
+            col = port_column(section)
+            for ri, row in enumerate(section.get("rows") or ()):
+                aid = anchor_id(node_id, sec_id, ri)
+                direction = SECTION_DIRECTION.get(sec_id, c_direction.get(aid))
+                if direction is None:
+                    continue
+                port = row[col] if col < len(row) else ""
+                anchors[aid] = system.add_port(device, direction, port or f"{sec_id.upper()}{ri + 1}")
+
+    for conn in connections:
+        src = anchors.get(conn.get("from"))
+        dst = anchors.get(conn.get("to"))
+        if src is None or dst is None:
+            continue
+        if system.ports.direction[src] != OUTPUT or system.ports.direction[dst] != INPUT:
+            continue
+        route = system.add_route(src, dst, signal=conn.get("cableType") or "")
+        route.meta = conn
+    return system
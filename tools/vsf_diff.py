@@ -0,0 +1,265 @@
+"""
+Structural Diff of Two .vsf Revisions
+Compares an old and a new revision of a project:
+- Nodes are matched by id. Identical nodes are dropped by one dict comparison
+  (C speed, no Python per field); the rest get content hashes, one per section
+  row plus one for the other fields (position and scale left out), and only
+  the rows whose hash changed are compared cell by cell
+- Nodes with equal content but another position or scale are "moved only"
+- Rows are compared by index, as wire anchors ("node-<ts>-<section>-<row>")
+  are; a changed row reports the columns that differ
+- Wires are matched by id, then by from / to for the ones left over (a wire
+  that was deleted and redrawn between the same ports gets a new id)
+
+Hashes are Python's own (per process, 64-bit), used only within one diff.
+
+    diff = diff_projects(load_project("show_r13.vsf"), load_project("show_r14.vsf"))
+"""
+
+import json
+
+from tools.vsf import SECTION_IDS, device_name, port_column
+
+ADDED = "Added"
+REMOVED = "Removed"
+MODIFIED = "Modified"
+MOVED = "Moved"
+
+# Node fields that only say where the node sits on the page
+PLACEMENT_FIELDS = ("position", "scale")
+# Wire fields worth naming when a wire changes (others are still compared)
+WIRE_FIELDS = ("from", "to", "cableType", "cableLength", "length", "label", "waypoints")
+
+
+def _hash_json(value):
+    return hash(json.dumps(value, sort_keys=True, separators=(",", ":"), default=str))
+
+
+def _row_hash(row):
+    try:
+        return hash(tuple(row))
+    except TypeError:   # unhashable cells: fall back to their JSON text
+        return _hash_json(row)
+
+
+class NodeDigest:
+    """Content hashes of one node: per section per row, per section, and overall."""
+
+    __slots__ = ("meta", "sections", "rows", "content")
+
+    def __init__(self, node):
+        meta = {k: v for k, v in node.items() if k != "sections" and k not in PLACEMENT_FIELDS}
+        self.meta = _hash_json(meta)
+        self.rows = {}
+        self.sections = {}
+        for sec_id, section in (node.get("sections") or {}).items():
+            if not isinstance(section, dict):
+                continue
+            rows = [_row_hash(r) for r in section.get("rows") or ()]
+            self.rows[sec_id] = rows
+            rest = {k: v for k, v in section.items() if k != "rows"}
+            self.sections[sec_id] = hash((_hash_json(rest), tuple(rows)))
+        self.content = hash((self.meta, tuple(sorted(self.sections.items()))))
+
+
+class Change:
+    __slots__ = ("kind", "node_id", "device", "item", "old", "new", "detail")
+
+    def __init__(self, kind, node_id="", device="", item="", old="", new="", detail=""):
+        self.kind = kind
+        self.node_id = node_id
+        self.device = device
+        self.item = item        # field, "a 3" (section and row) or wire id
+        self.old = old
+        self.new = new
+        self.detail = detail
+
+    def __repr__(self):
+        return f"Change({self.kind}, {self.device or self.node_id!r}, {self.item!r})"
+
+
+class ProjectDiff:
+    def __init__(self):
+        self.devices = []   # node added / removed / fields modified
+        self.ports = []     # section rows added / removed / modified
+        self.wires = []     # connections added / removed / modified
+        self.moved = []     # nodes with equal content, new position or scale
+        self.unchanged_nodes = 0
+        self.unchanged_wires = 0
+
+    def counts(self):
+        out = {}
+        for group in ("devices", "ports", "wires"):
+            for kind in (ADDED, REMOVED, MODIFIED):
+                out[f"{group} {kind.lower()}"] = sum(1 for c in getattr(self, group) if c.kind == kind)
+        out["devices moved only"] = len(self.moved)
+        return out
+
+    def __bool__(self):
+        return bool(self.devices or self.ports or self.wires or self.moved)
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(", ", ": "))
+
+
+def _row_text(section, row):
+    cols = section.get("cols") or []
+    return " | ".join(f"{c}={v}" for c, v in zip(cols, row) if v not in ("", None)) or "(empty)"
+
+
+def _diff_node(diff, node_id, name, old, new, old_digest, new_digest):
+    # Node-level fields
+    if old_digest.meta != new_digest.meta:
+        for key in sorted(set(old) | set(new)):
+            if key == "sections" or key in PLACEMENT_FIELDS:
+                continue
+            if old.get(key) != new.get(key):
+                diff.devices.append(Change(MODIFIED, node_id, name, key, _text(old.get(key)), _text(new.get(key))))
+
+    old_sections = old.get("sections") or {}
+    new_sections = new.get("sections") or {}
+    for sec_id in sorted(set(old_digest.sections) | set(new_digest.sections), key=_section_order):
+        if old_digest.sections.get(sec_id) == new_digest.sections.get(sec_id):
+            continue
+        a, b = old_sections.get(sec_id) or {}, new_sections.get(sec_id) or {}
+        a_rows, b_rows = a.get("rows") or [], b.get("rows") or []
+        if (a.get("cols") or []) != (b.get("cols") or []):
+            diff.devices.append(Change(MODIFIED, node_id, name, f"section {sec_id} columns",
+                                       ", ".join(a.get("cols") or []), ", ".join(b.get("cols") or [])))
+        ha, hb = old_digest.rows.get(sec_id, []), new_digest.rows.get(sec_id, [])
+        for i in range(max(len(ha), len(hb))):
+            if i < len(ha) and i < len(hb):
+                if ha[i] == hb[i]:
+                    continue
+                cols = b.get("cols") or a.get("cols") or []
+                changed = [
+                    f"{cols[j] if j < len(cols) else j}: {x!r} → {y!r}"
+                    for j, (x, y) in enumerate(_pad(a_rows[i], b_rows[i])) if x != y
+                ]
+                diff.ports.append(Change(MODIFIED, node_id, name, f"{sec_id} {i}", _row_text(a, a_rows[i]),
+                                         _row_text(b, b_rows[i]), "; ".join(changed)))
+            elif i < len(hb):
+                diff.ports.append(Change(ADDED, node_id, name, f"{sec_id} {i}", "", _row_text(b, b_rows[i])))
+            else:
+                diff.ports.append(Change(REMOVED, node_id, name, f"{sec_id} {i}", _row_text(a, a_rows[i]), ""))
+
+
+def _section_order(sec_id):
+    return SECTION_IDS.index(sec_id) if sec_id in SECTION_IDS else len(SECTION_IDS), sec_id
+
+
+def _pad(a, b):
+    n = max(len(a), len(b))
+    return zip(list(a) + [""] * (n - len(a)), list(b) + [""] * (n - len(b)))
+
+
+def _placement(node):
+    pos = node.get("position") or {}
+    return pos.get("x"), pos.get("y"), node.get("scale")
+
+
+def diff_projects(old, new):
+    """ProjectDiff between two loaded projects (see vsf.load_project)."""
+    diff = ProjectDiff()
+    old_nodes, new_nodes = old["nodes"], new["nodes"]
+
+    # ===== NODES =====
+    for node_id, node in old_nodes.items():
+        if node_id not in new_nodes:
+            diff.devices.append(Change(REMOVED, node_id, device_name(node) or node_id))
+    for node_id, node in new_nodes.items():
+        name = device_name(node) or node_id
+        before = old_nodes.get(node_id)
+        if before is None:
+            diff.devices.append(Change(ADDED, node_id, name))
+            continue
+        if before == node:
+            diff.unchanged_nodes += 1
+            continue
+        old_digest, new_digest = NodeDigest(before), NodeDigest(node)
+        if old_digest.content == new_digest.content:
+            a, b = _placement(before), _placement(node)
+            if a != b:
+                diff.moved.append(Change(MOVED, node_id, name, "position", a, b))
+            else:
+                diff.unchanged_nodes += 1
+            continue
+        _diff_node(diff, node_id, name, before, node, old_digest, new_digest)
+
+    # ===== WIRES =====
+    old_wires = old.get("connections") or []
+    new_wires = new.get("connections") or []
+    old_by_id = {w["id"]: w for w in old_wires if w.get("id")}
+    matched_old = set()
+    pending_new = []
+    for w in new_wires:
+        before = old_by_id.get(w.get("id")) if w.get("id") else None
+        if before is None:
+            pending_new.append(w)
+            continue
+        matched_old.add(id(before))
+        _diff_wire(diff, before, w, new_nodes)
+
+    # Leftovers: pair by endpoints, the rest are added / removed
+    by_ends = {}
+    for w in old_wires:
+        if id(w) not in matched_old:
+            by_ends.setdefault((w.get("from"), w.get("to")), []).append(w)
+    for w in pending_new:
+        same_ends = by_ends.get((w.get("from"), w.get("to")))
+        if same_ends:
+            _diff_wire(diff, same_ends.pop(0), w, new_nodes)
+        else:
+            diff.wires.append(Change(ADDED, item=w.get("id") or "", new=_wire_text(w, new_nodes)))
+    for leftovers in by_ends.values():
+        for w in leftovers:
+            diff.wires.append(Change(REMOVED, item=w.get("id") or "", old=_wire_text(w, old_nodes)))
+    return diff
+
+
+def _diff_wire(diff, old, new, nodes):
+    if old == new:
+        diff.unchanged_wires += 1
+        return
+    fields = [k for k in WIRE_FIELDS if old.get(k) != new.get(k)]
+    others = sorted(k for k in set(old) | set(new) if k not in WIRE_FIELDS and k != "id" and old.get(k) != new.get(k))
+    if old.get("id") != new.get("id"):
+        others.append("id")
+    if not fields and not others:
+        diff.unchanged_wires += 1
+        return
+    detail = "; ".join(
+        f"{k}: {_text(old.get(k))!r} → {_text(new.get(k))!r}" if k != "waypoints" else "route redrawn"
+        for k in fields + others
+    )
+    diff.wires.append(Change(MODIFIED, item=new.get("id") or old.get("id") or "",
+                             old=_wire_text(old, nodes), new=_wire_text(new, nodes), detail=detail))
+
+
+def _end_text(anchor, nodes):
+    """Device and port an anchor points at, e.g. "CAM 3 OUT 1"."""
+    parts = anchor.split("-")
+    node_id = "-".join(parts[:2])
+    node = nodes.get(node_id) or {}
+    name = device_name(node) or node_id
+    if len(parts) == 4 and parts[3].isdigit():
+        section = (node.get("sections") or {}).get(parts[2]) or {}
+        rows = section.get("rows") or []
+        row = int(parts[3])
+        port = ""
+        if row < len(rows):
+            col = port_column(section)
+            port = rows[row][col] if col < len(rows[row]) else ""
+        return f"{name} {port or parts[2].upper() + str(row + 1)}"
+    return f"{name} {'-'.join(parts[2:])}".strip()
+
+
+def _wire_text(wire, nodes):
+    text = f"{_end_text(wire.get('from') or '', nodes)} → {_end_text(wire.get('to') or '', nodes)}"
+    cable = wire.get("cableType") or ""
+    return f"{text} ({cable})" if cable else text
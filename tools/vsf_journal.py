@@ -0,0 +1,344 @@
+"""
+Project Revision Journal
+Every saved revision of a show in one directory (show.journal/) instead of a
+full .vsf copy per save:
+- journal.jsonl: one line per revision, appended; either a snapshot (the whole
+  project, in snapshots/) or the JSON-patch-style ops that turn the previous
+  revision into this one (add / replace / remove by key path, and one splice
+  per changed list so an inserted wire does not rewrite every wire after it)
+- blobs/: embedded data-URL strings (logos, images) are stored once under their
+  sha256 and referenced as {"$blob": hash}, so an unchanged logo costs nothing
+  per revision and a logo reused across revisions is kept once
+- A snapshot is written every SNAPSHOT_EVERY revisions, or sooner once the ops
+  since the last one outweigh a snapshot, so a checkout replays a short chain:
+  read the nearest snapshot, apply the few deltas after it, put blobs back
+- Every delta is checked on commit: replaying it must give the committed
+  project exactly, else that revision becomes a snapshot
+
+Revisions are stored exactly as the file was saved (SuperNodes, every page of
+a `pages` file). Anything that reads projects through vsf.load_project takes a
+revision ref, "show.journal@14" (or "@-1" for the one before the latest, no @
+for the latest), so generators and the diff run on a revision without writing
+it out; normalizing happens there.
+
+    python -m tools journal commit show.journal show_r13.vsf show_r14.vsf
+    python -m tools journal log show.journal
+    python -m tools diff show.journal@13 show.journal@14
+    python -m tools journal checkout show.journal@13 -o show_r13.vsf
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+JOURNAL_FILE = "journal.jsonl"
+SNAPSHOT_EVERY = 16
+# Strings of at least this size that start with "data:" are stored as blobs
+BLOB_MIN_CHARS = 256
+BLOB_KEY = "$blob"
+
+_REF_RE = re.compile(r"^(.*?)(?:@(-?\d+))?$")
+
+
+# ===== DELTAS =====
+def _same(a, b):
+    return type(a) is type(b) and a == b
+
+
+def diff_values(old, new, path=(), ops=None):
+    """Ops turning old into new: {"op": add / replace / remove / splice, "path": [...], ...}."""
+    ops = [] if ops is None else ops
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": [*path, key]})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": [*path, key], "value": value})
+            elif not _same(old[key], value):
+                diff_values(old[key], value, (*path, key), ops)
+    elif isinstance(old, list) and isinstance(new, list):
+        # Trim the common ends; what is left changed in place or was spliced
+        n = min(len(old), len(new))
+        start = 0
+        while start < n and _same(old[start], new[start]):
+            start += 1
+        end = 0
+        while end < n - start and _same(old[-1 - end], new[-1 - end]):
+            end += 1
+        old_mid, new_mid = old[start:len(old) - end], new[start:len(new) - end]
+        if len(old_mid) == len(new_mid):
+            for i, (a, b) in enumerate(zip(old_mid, new_mid), start):
+                if not _same(a, b):
+                    diff_values(a, b, (*path, i), ops)
+        else:
+            ops.append({"op": "splice", "path": list(path), "at": start, "remove": len(old_mid), "value": new_mid})
+    else:
+        ops.append({"op": "replace", "path": list(path), "value": new})
+    return ops
+
+
+def apply_ops(doc, ops):
+    """Apply diff_values() ops to doc in place; returns doc (replaced whole when an op targets the root)."""
+    for op in ops:
+        path = op["path"]
+        if op["op"] == "splice":
+            target = doc
+            for key in path:
+                target = target[key]
+            target[op["at"]:op["at"] + op["remove"]] = op["value"]
+            continue
+        if not path:
+            doc = op["value"]
+            continue
+        parent = doc
+        for key in path[:-1]:
+            parent = parent[key]
+        if op["op"] == "remove":
+            del parent[path[-1]]
+        else:
+            parent[path[-1]] = op["value"]
+    return doc
+
+
+def _canonical(doc):
+    return json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+# ===== BLOBS =====
+def _is_blob(value):
+    return isinstance(value, str) and len(value) >= BLOB_MIN_CHARS and value.startswith("data:")
+
+
+def _blob_ref(value):
+    return isinstance(value, dict) and len(value) == 1 and BLOB_KEY in value
+
+
+def _atomic_write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class Journal:
+    def __init__(self, path, create=False):
+        self.path = path
+        self.file = os.path.join(path, JOURNAL_FILE)
+        if not os.path.exists(self.file):
+            if not create:
+                raise FileNotFoundError(f"No revision journal at {path}")
+            os.makedirs(path, exist_ok=True)
+            open(self.file, "a").close()
+        self.entries = []
+        self.lines = []         # raw lines: ops are parsed afresh per checkout, never shared
+        with open(self.file, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    self.lines.append(line)
+                    self.entries.append(json.loads(line))
+        self._blobs = {}
+        self._head = None       # (rev, blob-referencing doc) of the last commit
+
+    @property
+    def head(self):
+        """Latest revision number, 0 for an empty journal."""
+        return len(self.entries)
+
+    def resolve(self, rev=None):
+        """Revision number for rev: None is the latest, 0 or less counts back from it."""
+        if rev is None:
+            rev = self.head
+        elif rev <= 0:
+            rev = self.head + rev
+        if not 1 <= rev <= self.head:
+            raise KeyError(f"{self.path} has revisions 1..{self.head}, not {rev}")
+        return rev
+
+    # ===== BLOB STORE =====
+    def blob_path(self, digest):
+        return os.path.join(self.path, "blobs", digest[:2], digest)
+
+    def _store_blobs(self, value, counter):
+        """Copy of a project with every data-URL string swapped for a blob ref."""
+        if isinstance(value, dict):
+            return {k: self._store_blobs(v, counter) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._store_blobs(v, counter) for v in value]
+        if _is_blob(value):
+            data = value.encode("utf-8")
+            digest = hashlib.sha256(data).hexdigest()
+            path = self.blob_path(digest)
+            if not os.path.exists(path):
+                _atomic_write(path, data)
+            self._blobs[digest] = value
+            counter.append(digest)
+            return {BLOB_KEY: digest}
+        return value
+
+    def _load_blobs(self, value):
+        """Put blob contents back in place of refs, in place."""
+        items = value.items() if isinstance(value, dict) else enumerate(value)
+        for k, v in items:
+            if _blob_ref(v):
+                digest = v[BLOB_KEY]
+                blob = self._blobs.get(digest)
+                if blob is None:
+                    with open(self.blob_path(digest), encoding="utf-8") as f:
+                        blob = self._blobs[digest] = f.read()
+                value[k] = blob
+            elif isinstance(v, (dict, list)):
+                self._load_blobs(v)
+        return value
+
+    # ===== CHECKOUT =====
+    def snapshot_path(self, rev):
+        return os.path.join(self.path, "snapshots", f"{rev:06d}.json")
+
+    def _checkout_refs(self, rev):
+        """Revision rev with blob refs left in: the nearest snapshot at or before it, then the deltas."""
+        base = rev
+        while "snapshot" not in self.entries[base - 1]:
+            base -= 1
+        with open(self.snapshot_path(base), encoding="utf-8") as f:
+            doc = json.load(f)
+        for r in range(base + 1, rev + 1):
+            doc = apply_ops(doc, json.loads(self.lines[r - 1])["ops"])
+        return doc
+
+    def checkout(self, rev=None, blobs=True):
+        """Project dict of a revision (default: the latest). blobs=False leaves {"$blob": hash} refs."""
+        rev = self.resolve(rev)
+        doc = self._checkout_refs(rev)
+        if blobs and self.entries[rev - 1].get("blobs"):
+            self._load_blobs(doc)
+        return doc
+
+    # ===== COMMIT =====
+    def _needs_snapshot(self, rev, delta_bytes):
+        base = rev - 1
+        chain = 0
+        while "snapshot" not in self.entries[base - 1]:
+            chain += len(self.lines[base - 1])
+            base -= 1
+        if rev - base >= SNAPSHOT_EVERY:
+            return True
+        return chain + delta_bytes > os.path.getsize(self.snapshot_path(base))
+
+    def commit(self, project, message="", source_bytes=None):
+        """
+        Append a project dict as the next revision. Returns its number, or the
+        latest revision's when nothing changed.
+        """
+        digests = []
+        doc = self._store_blobs(project, digests)
+        rev = self.head + 1
+        entry = {"rev": rev, "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "message": message,
+                 "name": project.get("name"), "savedAt": project.get("savedAt"),
+                 "blobs": len(digests), "source_bytes": source_bytes}
+        text = _canonical(doc)
+
+        snapshot = rev == 1
+        if not snapshot:
+            prev = self._head[1] if self._head and self._head[0] == rev - 1 else self._checkout_refs(rev - 1)
+            ops = diff_values(prev, doc)
+            if not ops:
+                return rev - 1
+            replayed = apply_ops(json.loads(json.dumps(prev)), json.loads(json.dumps(ops)))
+            delta = json.dumps(ops, separators=(",", ":"), ensure_ascii=False)
+            snapshot = _canonical(replayed) != text or self._needs_snapshot(rev, len(delta))
+        if snapshot:
+            _atomic_write(self.snapshot_path(rev),
+                          json.dumps(doc, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+            entry["snapshot"] = True
+        else:
+            entry["ops"] = ops
+
+        line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n"
+        with open(self.file, "a", encoding="utf-8") as f:
+            f.write(line)
+        self.lines.append(line)
+        self.entries.append(entry)
+        self._head = (rev, doc)
+        return rev
+
+    def commit_file(self, path, message=""):
+        """
+        Commit a .vsf exactly as saved. Normalizing (SuperNodes to sections, pages
+        flattened) happens on the way out, in vsf.load_project, never in the journal.
+        """
+        from tools.vsf import normalize_project
+        with open(path, "rb") as f:
+            data = f.read()
+        normalize_project(json.loads(data))     # raises for a file that is not a project
+        return self.commit(json.loads(data), message or os.path.basename(path), len(data))
+
+    # ===== STATS =====
+    def disk_bytes(self):
+        total = 0
+        for root, _dirs, files in os.walk(self.path):
+            total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+        return total
+
+
+def parse_ref(ref):
+    """"show.journal@14" -> ("show.journal", 14); no @ -> (path, None)."""
+    m = _REF_RE.match(str(ref))
+    path, rev = m.group(1), m.group(2)
+    return path.rstrip("/\\"), int(rev) if rev is not None else None
+
+
+def checkout(ref, blobs=True):
+    """Project dict for a revision ref; what vsf.load_project returns for "show.journal@14"."""
+    path, rev = parse_ref(ref)
+    return Journal(path).checkout(rev, blobs=blobs)
+
+
+def run(args):
+    if args.action == "commit":
+        journal = Journal(args.journal, create=True)
+        for path in args.files:
+            before = journal.head
+            start = time.perf_counter()
+            rev = journal.commit_file(path, args.message or "")
+            if rev == before:
+                print(f"{path}: unchanged since r{rev}")
+                continue
+            entry = journal.entries[-1]
+            kind = "snapshot" if "snapshot" in entry else f"{len(entry['ops'])} ops"
+            print(f"r{rev} {path}: {kind}, {len(journal.lines[-1]) / 1024:.1f} KB journal line "
+                  f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+        return 0
+    if args.action == "log":
+        journal = Journal(args.journal)
+        for e in journal.entries:
+            kind = "snapshot" if "snapshot" in e else f"{len(e['ops'])} ops"
+            print(f"r{e['rev']:<5} {e['time']}  {kind:<10} {e.get('savedAt') or '':<26} {e.get('message') or ''}")
+        full = sum(e.get("source_bytes") or 0 for e in journal.entries)
+        print(f"{journal.head} revisions, {journal.disk_bytes() / 1024:.0f} KB on disk"
+              + (f" ({full / 1024:.0f} KB as full copies)" if full else ""))
+        return 0
+    if args.action == "checkout":
+        path, rev = parse_ref(args.ref)
+        journal = Journal(path)
+        rev = journal.resolve(rev)
+        start = time.perf_counter()
+        project = journal.checkout(rev)
+        elapsed = time.perf_counter() - start
+        from tools.vsf import project_stem
+        output = args.output or os.path.join(os.path.dirname(__file__), '..', '.tmp', f"{project_stem(path)}_r{rev}.vsf")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(project, f, ensure_ascii=False)
+        print(f"Revision r{rev} checked out ({elapsed * 1000:.1f} ms): {output}")
+        return 0
+    return 2
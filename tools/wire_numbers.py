@@ -0,0 +1,210 @@
+"""
+Stable Wire Numbers
+Human-readable cable numbers for .vsf connections that survive revisions:
+- A scheme groups wires and names the group; numbers count up within a group,
+  and groups that would print alike are told apart ("CAM 1 (2)-003"):
+    global   W-00042
+    source   CAM 1-003          (source device; follows a rename, keeps the number)
+    signal   12G-SDI-0042       (cable type)
+    color    RED-012            (source node's signal color, the drawing's system / zone)
+- The wire id -> number map is kept next to the project (show.wires.json) and
+  reloaded on every run, so a wire keeps its number however the rows move
+- A wire deleted and redrawn between the same two ports inherits the old number
+- Numbers of deleted wires go on a per-group free list; new wires take the
+  lowest gap first, then the next number. Each allocation is a list pop or a
+  counter increment; the free lists are built once per run
+
+    numbers = WireNumbering.load("show.wires.json", scheme="source")
+    labels = numbers.assign(project)       # wire id -> "CAM 1-003"
+    numbers.save("show.wires.json")
+    python -m tools wire-numbers show.vsf --scheme signal
+"""
+
+import json
+import os
+
+from tools.migrate_legacy import write_atomic
+from tools.vsf import device_name
+
+FORMAT_VERSION = 1
+DEFAULT_WIDTHS = {"global": 5, "source": 3, "signal": 4, "color": 3}
+
+
+# ===== SCHEMES =====
+# scheme -> (group key of a wire, group label of a key). A number is kept under
+# its key; the label is only printed, so renaming a device relabels its wires.
+def _source_node(conn):
+    anchor = conn.get("from") or ""
+    return anchor[:anchor.rfind("-", 0, anchor.rfind("-"))]     # "node-<ts>-b-0" -> "node-<ts>"
+
+
+def _color_key(conn, nodes):
+    return (nodes.get(_source_node(conn)) or {}).get("signalColor") or ""
+
+
+SCHEMES = {
+    "global": (lambda conn, nodes: "", lambda key, nodes: "W"),
+    "source": (lambda conn, nodes: _source_node(conn),
+               lambda key, nodes: device_name(nodes.get(key) or {}) or key or "WIRE"),
+    "signal": (lambda conn, nodes: (conn.get("cableType") or "").strip(), lambda key, nodes: key or "WIRE"),
+    "color": (_color_key, lambda key, nodes: key.upper() or "NONE"),
+}
+
+
+def default_map_path(project_path):
+    return os.path.splitext(project_path)[0] + ".wires.json"
+
+
+class WireNumbering:
+    """Persistent wire id -> (group, number) map for one project and scheme."""
+
+    def __init__(self, scheme="source", width=None, separator="-"):
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown numbering scheme {scheme!r} (expected one of {', '.join(SCHEMES)})")
+        self.scheme = scheme
+        self.width = width or DEFAULT_WIDTHS[scheme]
+        self.separator = separator
+        self.wires = {}     # wire id -> [group key, number, from, to]
+        self.stats = {}
+
+    @classmethod
+    def load(cls, path, scheme=None, renumber=False):
+        """The map at path; a new one if there is none (or renumber). scheme=None keeps the stored scheme."""
+        if renumber or not os.path.exists(path):
+            return cls(scheme or "source")
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        stored = data.get("scheme") or "source"
+        if scheme is not None and scheme != stored:
+            raise ValueError(f"{path} numbers wires by {stored!r}, not {scheme!r}; "
+                             f"renumber to start again")
+        numbering = cls(stored, data.get("width"), data.get("separator") or "-")
+        numbering.wires = data.get("wires") or {}
+        return numbering
+
+    def save(self, path):
+        write_atomic(path, json.dumps({
+            "version": FORMAT_VERSION, "scheme": self.scheme, "width": self.width,
+            "separator": self.separator, "wires": self.wires,
+        }, separators=(",", ":")) + "\n")
+
+    def label(self, group_label, number):
+        return f"{group_label}{self.separator}{number:0{self.width}d}"
+
+    def group_labels(self, nodes):
+        """
+        {group key: printed label}, unique across groups. Groups that print alike (two
+        devices named "Converter", a cable type literally called "WIRE" next to the
+        untyped fallback) get " (2)", " (3)" ... in node order, untyped last, skipping
+        labels another group already prints.
+        """
+        label_of = SCHEMES[self.scheme][1]
+        position = {node_id: i for i, node_id in enumerate(nodes)}
+        keys = sorted({entry[0] for entry in self.wires.values()},
+                      key=lambda k: (k == "", position.get(k, len(position)), k))
+        base = {key: label_of(key, nodes) for key in keys}
+        printed = set(base.values())
+        labels, used = {}, set()
+        for key in keys:
+            label, n = base[key], 1
+            while label in used or (n > 1 and label in printed):
+                n += 1
+                label = f"{base[key]} ({n})"
+            labels[key] = label
+            used.add(label)
+        return labels
+
+    def labels(self, nodes):
+        """{wire id: label} for the current map."""
+        prefixes = {key: label + self.separator for key, label in self.group_labels(nodes).items()}
+        width = self.width
+        return {wire_id: "%s%0*d" % (prefixes[key], width, number)
+                for wire_id, (key, number, _s, _d) in self.wires.items()}
+
+    def assign(self, project):
+        """Number every connection of a loaded project; returns {wire id: label}. Updates the map."""
+        nodes = project["nodes"]
+        key_of = SCHEMES[self.scheme][0]
+        old = self.wires
+        wires = {}
+        kept = inherited = 0
+        pending = []    # (conn, key) still without a number
+
+        # Same id, same group: the number stays
+        for conn in project.get("connections") or []:
+            wire_id = conn.get("id")
+            if not wire_id or wire_id in wires:
+                continue
+            key = key_of(conn, nodes)
+            entry = old.get(wire_id)
+            if entry is not None and entry[0] == key:
+                wires[wire_id] = [key, entry[1], conn.get("from"), conn.get("to")]
+                kept += 1
+            else:
+                pending.append((conn, key))
+
+        # Redrawn wires: a released number with the same ends and group
+        by_ends = {}
+        for wire_id, (key, number, src, dst) in old.items():
+            if wire_id not in wires:
+                by_ends.setdefault((key, src, dst), []).append(number)
+        used = {}
+        for entry in wires.values():
+            used.setdefault(entry[0], set()).add(entry[1])
+        new = []
+        for conn, key in pending:
+            numbers = by_ends.get((key, conn.get("from"), conn.get("to")))
+            while numbers and numbers[-1] in used.get(key, ()):
+                numbers.pop()
+            if numbers:
+                number = numbers.pop()
+                wires[conn["id"]] = [key, number, conn.get("from"), conn.get("to")]
+                used.setdefault(key, set()).add(number)
+                inherited += 1
+            else:
+                new.append((conn, key))
+
+        # New wires: lowest free gap in the group, then the next number
+        free, top = {}, {}
+        for conn, key in new:
+            if key not in free:
+                taken = used.get(key, set())
+                top[key] = max(taken, default=0)
+                free[key] = [n for n in range(top[key], 0, -1) if n not in taken]   # descending: pop() is lowest
+            if free[key]:
+                number = free[key].pop()
+            else:
+                top[key] += 1
+                number = top[key]
+            wires[conn["id"]] = [key, number, conn.get("from"), conn.get("to")]
+
+        self.wires = wires
+        self.stats = {"kept": kept, "inherited": inherited, "new": len(new),
+                      "released": len(set(old) - set(wires))}
+        return self.labels(nodes)
+
+
+def number_project(project, project_path, scheme=None, map_path=None, renumber=False):
+    """Assign numbers from (and save them to) the project's map file. Returns {wire id: label}."""
+    map_path = map_path or default_map_path(project_path)
+    numbering = WireNumbering.load(map_path, scheme, renumber)
+    labels = numbering.assign(project)
+    numbering.save(map_path)
+    stats = numbering.stats
+    print(f"Wire numbers ({numbering.scheme}): {map_path} ({stats['kept']} kept, {stats['inherited']} redrawn, "
+          f"{stats['new']} new, {stats['released']} released)")
+    return labels
+
+
+def number_routes(system, labels):
+    """Route.number for every route built from a .vsf wire (Route.meta is the connection)."""
+    for route in system.routes:
+        if isinstance(route.meta, dict):
+            route.number = labels.get(route.meta.get("id"), "")
+    return system
+
+
+if __name__ == "__main__":
+    import sys
+    from tools.vsf import load_project
+    number_project(load_project(sys.argv[1]), sys.argv[1], *sys.argv[2:3])
@@ -0,0 +1,210 @@
+"""
+Orthogonal Wire Router
+Routes wires port-to-port with horizontal/vertical segments around device boxes:
+- Device rectangles (plus a clearance margin) go into a SpatialGrid, so a
+  blocked-cell test looks at the few boxes nearby, never at every box
+- Each wire is an A* search over a routing grid (`pitch` apart) that starts and
+  ends with a short stub leaving the port on its side of the box
+- Bends cost extra, and grid edges already used by earlier wires in the same
+  direction cost less, so parallel wires share channels and run as bundles
+
+Work per wire grows with its length, not with the number of boxes or wires,
+so routing N wires scales close to linearly.
+
+    router = WireRouter([(x0, y0, x1, y1), ...])
+    points = router.route((ax, ay, "right"), (bx, by, "left"))
+"""
+
+from heapq import heappop, heappush
+from math import floor
+
+from tools.spatial import SpatialGrid
+
+SIDES = {"left": (-1, 0), "right": (1, 0), "up": (0, -1), "down": (0, 1)}
+_DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class WireRouter:
+    def __init__(self, boxes, pitch=10.0, margin=6.0, stub=12.0,
+                 bend_cost=3.0, reuse_cost=0.5, cross_cost=0.5, greed=1.5, max_expand=20000):
+        """
+        boxes: device rectangles (x0, y0, x1, y1).
+        reuse_cost: cost of a grid step already used by a wire in the same direction
+        (1.0 = no bundling). cross_cost: extra cost to cross a used perpendicular edge.
+        greed: heuristic weight; above 1 trades slightly longer routes for far fewer expansions.
+        max_expand: search budget per wire before falling back to a plain elbow.
+        """
+        self.pitch = float(pitch)
+        self.margin = margin
+        self.stub = max(stub, margin + pitch / 2)
+        self.bend_cost = bend_cost
+        self.reuse_cost = reuse_cost
+        self.cross_cost = cross_cost
+        self.greed = greed
+        self.max_expand = max_expand
+        cell = max(pitch * 8, 64.0)
+        self.obstacles = SpatialGrid(cell)
+        for i, (x0, y0, x1, y1) in enumerate(boxes):
+            self.obstacles.insert(i, x0 - margin, y0 - margin, x1 + margin, y1 + margin)
+        self._blocked = {}
+        self._used = {}      # (ix, iy, axis) -> wires through that grid edge origin
+        if boxes:
+            xs = [b[0] for b in boxes] + [b[2] for b in boxes]
+            ys = [b[1] for b in boxes] + [b[3] for b in boxes]
+            pad = 4 * pitch + margin
+            self.bounds = (min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad)
+        else:
+            self.bounds = None
+
+    # ===== GRID =====
+    def _cell(self, x, y):
+        return round(x / self.pitch), round(y / self.pitch)
+
+    def _is_blocked(self, ix, iy):
+        key = (ix, iy)
+        b = self._blocked.get(key)
+        if b is None:
+            b = self._blocked[key] = self.obstacles.hit(ix * self.pitch, iy * self.pitch)
+        return b
+
+    def _stub(self, anchor):
+        x, y, side = anchor
+        dx, dy = SIDES[side]
+        return self._cell(x + dx * self.stub, y + dy * self.stub), (dx, dy)
+
+    # ===== SEARCH =====
+    def _search(self, start, start_dir, goal, goal_dir):
+        """A* over (cell, heading). Returns grid cells start..goal, or None."""
+        bounds = self.bounds
+        if bounds is not None:
+            p = self.pitch
+            lo_x = floor(min(bounds[0], start[0] * p, goal[0] * p) / p) - 2
+            lo_y = floor(min(bounds[1], start[1] * p, goal[1] * p) / p) - 2
+            hi_x = floor(max(bounds[2], start[0] * p, goal[0] * p) / p) + 2
+            hi_y = floor(max(bounds[3], start[1] * p, goal[1] * p) / p) + 2
+        gx, gy = goal
+        # Arriving against the goal side means a U-turn into the port; treat it as a bend
+        arrive = (-goal_dir[0], -goal_dir[1])
+        used = self._used
+        reuse, cross, bend, w = self.reuse_cost, self.cross_cost, self.bend_cost, self.greed
+        blocked = self._is_blocked
+
+        g_best = {(start, start_dir): 0.0}
+        came = {}
+        heap = [(w * (abs(gx - start[0]) + abs(gy - start[1])), 0.0, start, start_dir)]
+        expanded = 0
+        while heap:
+            _f, g, cell, heading = heappop(heap)
+            if cell == goal:
+                path = [cell]
+                state = (cell, heading)
+                while state in came:
+                    state = came[state]
+                    path.append(state[0])
+                path.reverse()
+                return path
+            if g > g_best.get((cell, heading), float("inf")):
+                continue
+            expanded += 1
+            if expanded > self.max_expand:
+                return None
+            cx, cy = cell
+            for d in _DIRS:
+                if d[0] == -heading[0] and d[1] == -heading[1]:
+                    continue
+                nx, ny = cx + d[0], cy + d[1]
+                if bounds is not None and not (lo_x <= nx <= hi_x and lo_y <= ny <= hi_y):
+                    continue
+                if (nx, ny) != goal and blocked(nx, ny):
+                    continue
+                axis = 0 if d[1] == 0 else 1
+                edge = (min(cx, nx), min(cy, ny), axis)
+                step = reuse if used.get(edge) else 1.0
+                if used.get((nx, ny, 1 - axis)):
+                    step += cross
+                if d != heading:
+                    step += bend
+                if (nx, ny) == goal and d != arrive:
+                    step += bend
+                ng = g + step
+                state = ((nx, ny), d)
+                if ng < g_best.get(state, float("inf")):
+                    g_best[state] = ng
+                    came[state] = (cell, heading)
+                    heappush(heap, (ng + w * (abs(gx - nx) + abs(gy - ny)), ng, (nx, ny), d))
+        return None
+
+    def _mark(self, cells):
+        used = self._used
+        for (x0, y0), (x1, y1) in zip(cells, cells[1:]):
+            axis = 0 if y0 == y1 else 1
+            edge = (min(x0, x1), min(y0, y1), axis)
+            used[edge] = used.get(edge, 0) + 1
+
+    # ===== PUBLIC =====
+    def route(self, src, dst):
+        """
+        src / dst: (x, y, side) with side "left" / "right" / "up" / "down" -- the
+        direction the wire leaves (src) or enters (dst) the port from.
+        Returns corner points from src to dst; every segment is horizontal or vertical.
+        """
+        start, start_dir = self._stub(src)
+        goal, goal_dir = self._stub(dst)
+        cells = self._search(start, start_dir, goal, goal_dir)
+        p = self.pitch
+        if cells is None:
+            sx, sy = start[0] * p, start[1] * p
+            ex, ey = goal[0] * p, goal[1] * p
+            mid = [(sx, sy), ((sx + ex) / 2, sy), ((sx + ex) / 2, ey), (ex, ey)]
+        else:
+            self._mark(cells)
+            mid = [(cx * p, cy * p) for cx, cy in cells]
+        # Anchor -> stub along the port's axis, then jog onto the grid
+        sx, sy, sside = src
+        ex, ey, eside = dst
+        if SIDES[sside][1] == 0:
+            head = [(sx, sy), (mid[0][0], sy)]
+        else:
+            head = [(sx, sy), (sx, mid[0][1])]
+        if SIDES[eside][1] == 0:
+            tail = [(mid[-1][0], ey), (ex, ey)]
+        else:
+            tail = [(ex, mid[-1][1]), (ex, ey)]
+        points = simplify(head + mid + tail)
+        points = self._straighten(points)
+        return self._straighten(points[::-1])[::-1]
+
+    def _straighten(self, points):
+        """
+        Grid snapping leaves a small jog right after the port when the port is off-grid.
+        Slide the first run onto the port's line instead, if that run stays clear.
+        """
+        if len(points) < 5:
+            return points
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3), (x4, y4) = points[:5]
+        if y0 == y1 and x1 == x2 and y2 == y3 and abs(y2 - y0) < self.pitch and x3 == x4:
+            if not self.obstacles.segment(x1, y0, x3, y0):
+                return simplify([(x0, y0), (x3, y0)] + points[4:])
+        if x0 == x1 and y1 == y2 and x2 == x3 and abs(x2 - x0) < self.pitch and y3 == y4:
+            if not self.obstacles.segment(x0, y1, x0, y3):
+                return simplify([(x0, y0), (x0, y3)] + points[4:])
+        return points
+
+    def route_all(self, wires):
+        """Route (src, dst) pairs in order; earlier wires open channels for later ones."""
+        return [self.route(src, dst) for src, dst in wires]
+
+
+def simplify(points):
+    """Drop repeated and collinear points."""
+    out = []
+    for pt in points:
+        if out and abs(out[-1][0] - pt[0]) < 1e-9 and abs(out[-1][1] - pt[1]) < 1e-9:
+            continue
+        if len(out) >= 2:
+            (x0, y0), (x1, y1) = out[-2], out[-1]
+            if (abs(x0 - x1) < 1e-9 and abs(x1 - pt[0]) < 1e-9) or (abs(y0 - y1) < 1e-9 and abs(y1 - pt[1]) < 1e-9):
+                out[-1] = pt
+                continue
+        out.append(pt)
+    return out
@@ -0,0 +1,509 @@
+"""
+Patch Generated Workbooks In Place
+Small edits to an existing xlsx without loading it in openpyxl or rebuilding it:
+- Only the worksheet parts an edit touches are rewritten, streamed through in
+  1 MB chunks; a chunk holding no edited row is written on without parsing
+- Every other part (styles, images, untouched sheets) is copied as its
+  compressed bytes, so the cost is the size of the edited sheets, not the file
+- Cells keep their style; text is written as an inline string, as openpyxl does
+- Router workbook edits (create_av_router.py layout): set_route_status,
+  add_route (first blank Routing row, or a new row styled like the last one)
+  and rename_device (cells, dropdown lists, hyperlinks and the sheet tab)
+- The patched file replaces the original atomically
+
+Edits are queued and written by save(); each touched part is read once.
+
+    with WorkbookPatch("show_router.xlsx") as patch:
+        patch.set_route_status(12, "Fault")
+        patch.rename_device("CAM 3", "CAM 3 (spare)")
+    python -m tools patch show_router.xlsx --status 12=Fault --rename "CAM 3=CAM 3 (spare)"
+"""
+
+import os
+import posixpath
+import re
+import struct
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from copy import copy
+from xml.sax.saxutils import escape
+from zipfile import ZIP_DEFLATED, ZipFile
+
+CHUNK_BYTES = 1 << 20
+# Rewritten sheets: deflate level 1 is ~3x faster than the default 6, output ~30% larger
+STREAM_COMPRESSLEVEL = 1
+
+SHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# Router workbook layout (create_av_router.py)
+ROUTE_FIRST_ROW = 7
+ROUTE_STATUSES = ("Active", "Inactive", "Testing", "Fault")
+ROUTER_SHEETS = {"devices", "routing", "lists", "scenes", "scene changes"}
+INVALID_SHEET_CHARS = str.maketrans({c: "_" for c in '[]:*?/\\'})   # as create_av_router.sheet_titles
+
+_ROW_RE = re.compile(rb'<row r="(\d+)"[^>]*?(?:/>|>.*?</row>)', re.DOTALL)
+_ROW_START = b'<row r="'
+_CELL_RE = re.compile(rb'<c r="([A-Z]+)\d+"([^>]*?)(?:/>|>.*?</c>)', re.DOTALL)
+_STYLE_RE = re.compile(rb'\ss="\d+"')
+_SPANS_RE = re.compile(rb'\sspans="[^"]*"')
+_REF_RE = re.compile(r"^([A-Z]+)(\d+)$")
+
+
+def split_ref(ref):
+    """"I12" -> ("I", 12)."""
+    m = _REF_RE.match(ref.upper())
+    if not m:
+        raise ValueError(f"Not a cell reference: {ref!r}")
+    return m.group(1), int(m.group(2))
+
+
+def _xml_text(text):
+    return escape(text).encode("utf-8")
+
+
+def cell_xml(col, row, value, style=b""):
+    """One <c> element; style is the cell's ' s="N"' attribute (kept from the cell it replaces)."""
+    ref = f'{col}{row}"'.encode()
+    if value is None:
+        return b'<c r="' + ref + style + b' />'
+    if isinstance(value, bool):
+        return b'<c r="' + ref + style + b' t="b"><v>' + (b"1" if value else b"0") + b'</v></c>'
+    if isinstance(value, (int, float)):
+        return b'<c r="' + ref + style + b' t="n"><v>' + repr(value).encode() + b'</v></c>'
+    text = str(value)
+    space = b' xml:space="preserve"' if text != text.strip() else b""
+    return (b'<c r="' + ref + style + b' t="inlineStr"><is><t' + space + b'>' + _xml_text(text)
+            + b'</t></is></c>')
+
+
+def edit_row(row_xml, row, values):
+    """A <row> element with the cells in values ({column letters: value}) replaced or inserted."""
+    m = re.match(rb'<row\b[^>]*?(/?)>', row_xml)
+    open_tag = _SPANS_RE.sub(b"", m.group(0)[:-2 if m.group(1) else -1].rstrip()) + b">"
+    cells = {}
+    for c in _CELL_RE.finditer(row_xml, m.end()):
+        cells[c.group(1).decode()] = (c.group(0), _STYLE_RE.search(c.group(2)))
+    for col, value in values.items():
+        old = cells.get(col)
+        style = old[1].group(0) if old and old[1] else b""
+        cells[col] = (cell_xml(col, row, value, style), None)
+    body = b"".join(cells[col][0] for col in sorted(cells, key=lambda c: (len(c), c)))
+    return open_tag + body + b"</row>"
+
+
+def template_row(row_xml, row, values):
+    """A new row styled like row_xml (every cell's style, values blank) with values filled in."""
+    cells = {}
+    for c in _CELL_RE.finditer(row_xml):
+        style = _STYLE_RE.search(c.group(2))
+        cells[c.group(1).decode()] = style.group(0) if style else b""
+    filled = {col: values.get(col) for col in cells}
+    filled.update(values)
+    body = b"".join(cell_xml(col, row, filled[col], cells.get(col, b""))
+                    for col in sorted(filled, key=lambda c: (len(c), c)))
+    return f'<row r="{row}">'.encode() + body + b"</row>"
+
+
+def _text_replacements(mapping, prefixes=()):
+    """Byte replacements for cell text equal to a key of mapping, or starting with one of prefixes."""
+    pairs = []
+    for tag in (b"<t>", b'<t xml:space="preserve">'):
+        for old, new in mapping.items():
+            pairs.append((tag + _xml_text(old) + b"</t>", tag + _xml_text(new) + b"</t>"))
+        for old, new in prefixes:
+            pairs.append((tag + _xml_text(old), tag + _xml_text(new)))
+    return pairs
+
+
+class SheetEdit:
+    """Queued edits to one worksheet part."""
+
+    def __init__(self):
+        self.rows = {}          # row -> {column letters: value}
+        self.new_rows = {}      # row -> whole <row> element, replacing or inserting that row
+        self.text = []          # (old bytes, new bytes) within <sheetData>
+        self.tail = []          # (old bytes, new bytes) after </sheetData> (validations, hyperlinks)
+        self.fill = None        # RowFill, resolved to a row while streaming
+
+    def pending(self):
+        return sorted(set(self.rows) | set(self.new_rows))
+
+    def take(self, row, existing=None):
+        """The edited <row> element (existing is the row as it is, if there is one); done with row."""
+        xml = self.new_rows.pop(row, None) or existing or f'<row r="{row}">'.encode()
+        values = self.rows.pop(row, None)
+        return edit_row(xml, row, values) if values else xml
+
+
+class RowFill:
+    """
+    Values for the first blank row of a table: rows from first on that contain
+    marker, with nothing in column. Past the table's last row, the next row is
+    rebuilt in the last row's style with appended(row) and the sheet tail is
+    passed through grow(tail, row).
+    """
+
+    def __init__(self, column, first, marker, values, appended, grow):
+        self.blank = re.compile(rb'<c r="' + column.encode() + rb'(\d+)"[^>]*?(?:/>|><is><t\s*/></is></c>|'
+                                rb'><is><t></t></is></c>)')
+        self.first = first
+        self.marker = marker
+        self.values = values
+        self.appended = appended
+        self.grow = grow
+        self.template = None    # last table row seen
+        self.row = None
+
+    def scan(self, head):
+        """Row number to fill if head (a run of whole rows) has it; remembers the last table row."""
+        blank = self.blank.search(head)
+        if blank is None and head.count(_ROW_START) == head.count(self.marker):
+            start = head.rfind(_ROW_START)
+            if start >= 0 and int(head[start + 8:head.index(b'"', start + 8)]) >= self.first:
+                self.template = head[start:]
+                return None
+        for m in _ROW_RE.finditer(head):
+            row = int(m.group(1))
+            if row < self.first:
+                continue
+            if self.template is not None and row > self.next_row():
+                return self.next_row()           # gap after the table: the row is missing
+            xml = m.group(0)
+            if self.marker not in xml:
+                if self.template is None:
+                    continue
+                return row
+            if self.blank.search(xml):
+                return row
+            self.template = xml
+        return None
+
+    def next_row(self):
+        return int(re.match(rb'<row r="(\d+)"', self.template).group(1)) + 1
+
+    def resolve(self, edit, row, blank):
+        """Queue the fill of row: values into a blank table row, else a new row styled like the last one."""
+        self.row = row
+        if blank:
+            edit.rows.setdefault(row, {}).update(self.values)
+        elif self.template is not None:
+            edit.new_rows[row] = template_row(self.template, row, self.appended(row))
+        else:
+            edit.new_rows[row] = (f'<row r="{row}">'.encode() + b"".join(
+                cell_xml(c, row, v) for c, v in sorted(self.appended(row).items())) + b"</row>")
+
+
+def sheet_parts(zf):
+    """{sheet name: zip part} of an open xlsx ZipFile, in workbook order."""
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    for rel in rels.iter(f"{{{PKG_REL_NS}}}Relationship"):
+        target = rel.get("Target")
+        target = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+        targets[rel.get("Id")] = target
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    return {sheet.get("name"): targets[sheet.get(f"{{{REL_NS}}}id")]
+            for sheet in workbook.iter(f"{{{SHEET_NS}}}sheet")}
+
+
+class WorkbookPatch:
+    def __init__(self, path):
+        self.path = path
+        self.zip = ZipFile(path)
+        self.sheets = sheet_parts(self.zip)
+        self.edits = {}       # part -> SheetEdit
+        self.parts = {}       # part -> [(old bytes, new bytes)]: small parts rewritten whole
+        self.renamed = {}     # old sheet name -> new
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None and (self.edits or self.parts):
+            self.save()
+        self.close()
+
+    def close(self):
+        self.zip.close()
+
+    def sheet(self, name):
+        if name not in self.sheets:
+            raise KeyError(f"No sheet {name!r} in {self.path}")
+        return self.edits.setdefault(self.sheets[name], SheetEdit())
+
+    # ===== CELL EDITS =====
+    def set_cell(self, sheet, ref, value):
+        col, row = split_ref(ref)
+        self.sheet(sheet).rows.setdefault(row, {})[col] = value
+
+    def set_cells(self, sheet, values):
+        """{"I12": "Fault", ...}"""
+        for ref, value in values.items():
+            self.set_cell(sheet, ref, value)
+
+    def replace_text(self, sheet, mapping, prefixes=()):
+        """Cells whose whole text is a key of mapping get its value; prefixes are (old, new) pairs."""
+        self.sheet(sheet).text.extend(_text_replacements(mapping, prefixes))
+
+    # ===== ROUTER WORKBOOK EDITS =====
+    def set_route_status(self, number, status):
+        """Status of the number-th route row of the Routing sheet (1 is the first)."""
+        if status not in ROUTE_STATUSES:
+            raise ValueError(f"Unknown status {status!r} (expected one of {', '.join(ROUTE_STATUSES)})")
+        self.set_cell("Routing", f"I{ROUTE_FIRST_ROW - 1 + number}", status)
+
+    def add_route(self, src_device, src_port, dst_device, dst_port, signal="", status="Active"):
+        """Route in the first Routing row with no source device, or a new row after the last one."""
+        edit = self.sheet("Routing")
+        if edit.fill is not None:
+            raise ValueError("One add_route per patch: the next blank row is only known while streaming")
+        values = {"C": src_device, "D": src_port, "F": dst_device, "G": dst_port, "H": signal, "I": status}
+
+        def appended(row):
+            return dict(values, B=row - ROUTE_FIRST_ROW + 1, E="→")
+
+        def grow_dropdowns(tail, row):
+            # Dropdowns cover the route rows; stretch them over the new one
+            return re.sub(rb'sqref="([CFI])7:\1(\d+)"',
+                          lambda m: m.group(0) if int(m.group(2)) >= row else b'sqref="%s7:%s%d"' % (
+                              m.group(1), m.group(1), row), tail)
+
+        # Route rows (numbered or blank) are the ones with the arrow in column E
+        edit.fill = RowFill("C", ROUTE_FIRST_ROW, b"<t>\xe2\x86\x92</t>", values, appended, grow_dropdowns)
+
+    def rename_device(self, old, new):
+        """
+        Device name everywhere create_av_router writes it: Devices row and link, the
+        device sheet title and tab, Routing, scenes, and the dropdown lists.
+        """
+        text = {old: new, f"Go to {old}": f"Go to {new}"}
+        labels = [(f"{old}: ", f"{new}: ")]
+        for name in ("Devices", "Routing", "Lists", "Scenes", "Scene Changes"):
+            if name in self.sheets:
+                self.replace_text(name, text, labels if name in ("Lists", "Scene Changes") else ())
+        if "Scene Changes" in self.sheets:
+            # Sources there are label lists: "CAM 1: SDI Out, CAM 2: SDI Out"
+            self.sheet("Scene Changes").text.append((b", " + _xml_text(old) + b": ", b", " + _xml_text(new) + b": "))
+
+        # Inline dropdown lists ("A,B,C"); long lists live on the Lists sheet, edited above
+        old_x, new_x = _xml_text(old), _xml_text(new)
+        items = [(a + old_x + b, a + new_x + b) for a in (b'"', b",") for b in (b'"', b",", b": ")]
+        self.sheet("Routing").tail.extend(items)
+        if "Lists" not in self.sheets:
+            # Port lists are inline too, on every device sheet (small workbooks only)
+            for name in self.sheets:
+                if name.lower() not in ROUTER_SHEETS:
+                    self.sheet(name).tail.extend(items)
+
+        title = self.device_sheet(old)
+        if title is None:
+            return
+        self.replace_text(title, {old: new})
+        new_title = new.translate(INVALID_SHEET_CHARS).strip("'")[:31] or title
+        taken = {n.lower() for n in self.sheets if n != title} | ROUTER_SHEETS
+        base, n = new_title, 1
+        while new_title.lower() in taken:
+            n += 1
+            new_title = f"{base[:31 - len(str(n)) - 1]} {n}"
+        if new_title != title:
+            self.rename_sheet(title, new_title)
+
+    def device_sheet(self, name):
+        """Tab title create_av_router gave the device called name, if that sheet exists."""
+        title = name.translate(INVALID_SHEET_CHARS).strip("'")[:31]
+        return title if title in self.sheets and title.lower() not in ROUTER_SHEETS else None
+
+    def rename_sheet(self, old, new):
+        """Sheet tab, plus the internal hyperlinks and app properties that name it."""
+        quote = lambda s: escape(s, {'"': "&quot;"}).encode("utf-8")
+        self.parts.setdefault("xl/workbook.xml", []).append(
+            (b'name="' + quote(old) + b'"', b'name="' + quote(new) + b'"'))
+        if "docProps/app.xml" in self.zip.NameToInfo:
+            self.parts.setdefault("docProps/app.xml", []).append(
+                (b"<vt:lpstr>" + _xml_text(old) + b"</vt:lpstr>", b"<vt:lpstr>" + _xml_text(new) + b"</vt:lpstr>"))
+        link_old = quote(f"'{old}'!").replace(b"'", b"&apos;"), quote(f"'{old}'!")
+        link_new = quote(f"'{new}'!")
+        for part in self.sheets.values():
+            rels = posixpath.join(posixpath.dirname(part), "_rels", posixpath.basename(part) + ".rels")
+            if rels in self.zip.NameToInfo:
+                data = self.zip.read(rels)
+                if any(o in data for o in link_old):
+                    self.parts.setdefault(rels, []).extend((o, link_new) for o in link_old)
+        if "Devices" in self.sheets:
+            self.sheet("Devices").tail.extend((b'location="' + o, b'location="' + link_new) for o in link_old)
+        self.sheets[new] = self.sheets.pop(old)
+        self.renamed[old] = new
+
+    # ===== WRITE =====
+    def save(self, output_path=None):
+        """Write the patched workbook to output_path (default: replace the original). Returns the path."""
+        output_path = output_path or self.path
+        start = time.perf_counter()
+        directory = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".patch-", suffix=".xlsx")
+        rewritten = 0
+        try:
+            with os.fdopen(fd, "wb") as f, open(self.path, "rb") as raw:
+                with ZipFile(f, "w", ZIP_DEFLATED, allowZip64=True) as out:
+                    for info in self.zip.infolist():
+                        if info.filename in self.edits:
+                            self._stream_sheet(out, info, self.edits[info.filename])
+                            rewritten += 1
+                        elif info.filename in self.parts:
+                            data = self.zip.read(info.filename)
+                            for old, new in self.parts[info.filename]:
+                                data = data.replace(old, new)
+                            out.writestr(copy(info), data)
+                            rewritten += 1
+                        else:
+                            _copy_compressed(raw, out, info)
+                os.chmod(tmp, 0o644)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.abspath(output_path) == os.path.abspath(self.path):
+                self.zip.close()
+            os.replace(tmp, output_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        elapsed = time.perf_counter() - start
+        print(f"Workbook patched: {output_path} ({rewritten} parts rewritten, "
+              f"{len(self.zip.infolist()) - rewritten} copied, {elapsed:.2f} s)")
+        self.edits, self.parts = {}, {}
+        if os.path.abspath(output_path) == os.path.abspath(self.path):
+            self.zip = ZipFile(self.path)
+        return output_path
+
+    def _stream_sheet(self, out, info, edit):
+        target = copy(info)
+        target.compress_type = ZIP_DEFLATED
+        target._compresslevel = STREAM_COMPRESSLEVEL
+        tail = None
+        with self.zip.open(info) as src, out.open(target, "w", force_zip64=True) as dst:
+            buf = b""
+            while tail is None:
+                chunk = src.read(CHUNK_BYTES)
+                buf += chunk
+                end = buf.find(b"</sheetData>")
+                if end < 0:
+                    end = buf.find(b"<sheetData/>")
+                if end >= 0:
+                    head, tail = buf[:end], buf[end:]
+                elif not chunk:
+                    raise ValueError(f"{info.filename}: no <sheetData> element")
+                else:
+                    cut = buf.rfind(b"</row>")
+                    if cut < 0:
+                        continue
+                    head, buf = buf[:cut + 6], buf[cut + 6:]
+                dst.write(self._edit_rows(head, edit))
+
+            # Rows past the last one in the sheet
+            fill = edit.fill
+            if fill is not None:
+                if fill.row is None:
+                    fill.resolve(edit, fill.next_row() if fill.template is not None else fill.first, blank=False)
+                tail = fill.grow(tail, fill.row)
+            new_rows = b"".join(edit.take(row) for row in edit.pending())
+            if tail.startswith(b"<sheetData/>"):
+                tail = b"<sheetData>" + new_rows + b"</sheetData>" + tail[len(b"<sheetData/>"):]
+            else:
+                dst.write(new_rows)
+            while True:
+                chunk = src.read(CHUNK_BYTES)
+                if not chunk:
+                    break
+                tail += chunk
+            for old, new in edit.tail:
+                tail = tail.replace(old, new)
+            dst.write(tail)
+
+    def _edit_rows(self, head, edit):
+        """One run of whole rows with text replacements and row edits applied."""
+        for old, new in edit.text:
+            head = head.replace(old, new)
+        fill = edit.fill
+        if fill is not None and fill.row is None:
+            row = fill.scan(head)
+            if row is not None:
+                m = re.search(rb'<row r="%d"[^>]*?(?:/>|>.*?</row>)' % row, head, re.DOTALL)
+                fill.resolve(edit, row, blank=m is not None and fill.marker in m.group(0))
+        pending = edit.pending()
+        if not pending:
+            return head
+        last = head.rfind(_ROW_START)
+        if last < 0 or int(head[last + 8:head.index(b'"', last + 8)]) < pending[0]:
+            return head
+
+        # This run holds an edited row (or the place a missing one goes)
+        parts, pos = [], 0
+        for m in _ROW_RE.finditer(head):
+            row = int(m.group(1))
+            while pending and pending[0] < row:
+                parts.append(head[pos:m.start()])
+                pos = m.start()
+                parts.append(edit.take(pending.pop(0)))
+            if pending and pending[0] == row:
+                parts.append(head[pos:m.start()])
+                parts.append(edit.take(pending.pop(0), m.group(0)))
+                pos = m.end()
+            if not pending:
+                break
+        parts.append(head[pos:])
+        return b"".join(parts)
+
+
+def _copy_compressed(raw, out, info):
+    """Copy one member's local header and compressed data as they are; no inflate, no deflate."""
+    raw.seek(info.header_offset)
+    header = raw.read(30)
+    name_len, extra_len = struct.unpack("<HH", header[26:30])
+    size = name_len + extra_len + info.compress_size
+    if info.flag_bits & 0x08:
+        # Data descriptor after the data: optional signature, CRC, then 32- or 64-bit sizes
+        raw.seek(info.header_offset + 30 + size)
+        signed = raw.read(4) == b"PK\x07\x08"
+        zip64 = info.compress_size >= 0xFFFFFFFF or info.file_size >= 0xFFFFFFFF
+        size += (4 if signed else 0) + 4 + (16 if zip64 else 8)
+        raw.seek(info.header_offset + 30)
+    target = copy(info)
+    target.header_offset = out.fp.tell()
+    out.fp.write(header)
+    remaining = size
+    while remaining:
+        block = raw.read(min(CHUNK_BYTES, remaining))
+        if not block:
+            raise ValueError(f"{info.filename}: truncated member")
+        out.fp.write(block)
+        remaining -= len(block)
+    out.filelist.append(target)
+    out.NameToInfo[target.filename] = target
+    out.start_dir = out.fp.tell()
+    out._didModify = True
+
+
+def patch_workbook(path, output_path=None, statuses=(), routes=(), renames=(), cells=()):
+    """
+    One patch from lists of edits: statuses [(route number, status)], routes [(src
+    device, src port, dst device, dst port[, signal])], renames [(old, new)] and
+    cells [(sheet, ref, value)]. Returns the output path.
+    """
+    with WorkbookPatch(path) as patch:
+        for number, status in statuses:
+            patch.set_route_status(number, status)
+        for route in routes:
+            patch.add_route(*route)
+        for old, new in renames:
+            patch.rename_device(old, new)
+        for sheet, ref, value in cells:
+            patch.set_cell(patch.renamed.get(sheet, sheet), ref, value)
+        return patch.save(output_path)
+
+
+if __name__ == "__main__":
+    import sys
+    patch_workbook(sys.argv[1], cells=[tuple(sys.argv[2:5])])
@@ -0,0 +1,102 @@
+"""
+Workbook Saving With Shared Images
+openpyxl writes one xl/media file per placed image, so a logo on 400 device
+sheets is stored 400 times. This module stores each distinct image once:
+- SharedImage: an openpyxl image backed by a tools.images.ImageRef; its media
+  path is derived from the content hash, so equal images share one part
+- save_workbook(): drop-in for Workbook.save() that writes each media part once
+- deterministic=True: the same workbook gives the same bytes on every run. Zip
+  entries get one fixed timestamp and mode, and the document properties one
+  fixed created / modified time (SOURCE_DATE_EPOCH if set, else 1980-01-01).
+  openpyxl already writes parts, attributes and style indexes in build order
+
+SharedImage reads sizes from the file header, so placing images does not need
+Pillow (openpyxl's own Image does).
+"""
+
+import datetime
+import os
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+
+from openpyxl.drawing.image import Image
+from openpyxl.writer.excel import ExcelWriter
+
+from tools.images import fit_size
+
+
+class SharedImage(Image):
+    """One placement of a stored image. Create one per sheet; they share the media part."""
+
+    def __init__(self, ref, width=None, height=None):
+        self.ref = ref.path
+        self.format = ref.format
+        self.sha = ref.sha
+        self.width, self.height = ref.width, ref.height
+        if width or height:
+            self.width, self.height = fit_size(ref, width or ref.width, height or ref.height)
+
+    def _data(self):
+        with open(self.ref, "rb") as f:
+            return f.read()
+
+    @property
+    def path(self):
+        return f"/xl/media/{self.sha[:16]}.{self.format}"
+
+
+class SharedMediaWriter(ExcelWriter):
+    def _write_images(self):
+        written = set()
+        for img in self._images:
+            path = img.path
+            if path in written:
+                continue
+            written.add(path)
+            self._archive.writestr(path[1:], img._data())
+
+
+def fixed_timestamp():
+    """SOURCE_DATE_EPOCH (the reproducible-builds convention) or the zip epoch, as naive UTC."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.datetime.fromtimestamp(int(epoch), tz=datetime.timezone.utc).replace(tzinfo=None)
+    return datetime.datetime(1980, 1, 1)
+
+
+class FixedTimeZipFile(ZipFile):
+    """ZipFile whose entries all carry one timestamp and mode, whatever the clock or temp file says."""
+
+    def __init__(self, *args, date_time=(1980, 1, 1, 0, 0, 0), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.date_time = date_time
+
+    def _info(self, arcname):
+        info = ZipInfo(arcname, date_time=self.date_time)
+        info.compress_type = self.compression
+        info.external_attr = 0o600 << 16
+        return info
+
+    def writestr(self, zinfo_or_arcname, data, *args, **kwargs):
+        if not isinstance(zinfo_or_arcname, ZipInfo):
+            zinfo_or_arcname = self._info(zinfo_or_arcname)
+        super().writestr(zinfo_or_arcname, data, *args, **kwargs)
+
+    def write(self, filename, arcname=None, *args, **kwargs):
+        # openpyxl writes worksheets through temp files: take the bytes, not the file's mtime
+        with open(filename, "rb") as f:
+            self.writestr(arcname or os.path.basename(filename), f.read())
+
+
+def save_workbook(workbook, filename, deterministic=False):
+    """Save like Workbook.save(), writing each shared image to xl/media once."""
+    if deterministic:
+        stamp = fixed_timestamp()
+        archive = FixedTimeZipFile(filename, "w", ZIP_DEFLATED, allowZip64=True,
+                                   date_time=stamp.timetuple()[:6])
+        workbook.properties.created = workbook.properties.modified = stamp
+        workbook.properties.lastModifiedBy = None
+    else:
+        archive = ZipFile(filename, "w", ZIP_DEFLATED, allowZip64=True)
+        workbook.properties.modified = datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)
+    SharedMediaWriter(workbook, archive).save()
+    return True